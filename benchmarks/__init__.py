@@ -0,0 +1 @@
+"""性能基准测试：合成数据生成与导入、存储、匹配、导出各环节的计时。"""
@@ -0,0 +1,135 @@
+"""比较两次基准测试结果，发现性能回退时以非零状态码退出。
+
+用法示例：
+    python -m benchmarks.compare benchmark_1.2.0.json benchmark_1.2.1.json
+    python -m benchmarks.compare base.json new.json --threshold 0.2 --min-seconds 0.01
+
+判定规则（按用例和行数逐项比较各自多次重复的中位数）：
+- 变慢比例超过 threshold，且
+- 中位数差值超过两次结果中较大的 IQR（四分位距，即测量噪声），且
+- 中位数差值超过 min-seconds（过短的用例计时抖动大，不参与判定），
+三个条件同时满足才视为回退；变快时按同样的条件视为改进。
+
+退出状态码：0 无回退，1 参数或文件错误，2 存在回退。
+"""
+
+import argparse
+import statistics
+import sys
+from dataclasses import dataclass
+
+from benchmarks.run import load_results
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MIN_SECONDS = 0.005
+EXIT_REGRESSION = 2
+
+
+@dataclass
+class CaseDelta:
+    """单个用例的比较结果"""
+    case: str                     # 用例名
+    rows: int                     # 数据行数
+    base_median: float            # 基准中位数（秒）
+    current_median: float         # 当前中位数（秒）
+    noise: float                  # 两次结果中较大的 IQR（秒）
+    status: str                   # "回退" / "改进" / "持平"
+
+    @property
+    def ratio(self) -> float:
+        """相对变化比例，正数表示变慢。"""
+        if self.base_median <= 0:
+            return 0.0
+        return self.current_median / self.base_median - 1
+
+
+def iqr(seconds: list[float]) -> float:
+    """四分位距，少于 2 次重复时为 0。"""
+    if len(seconds) < 2:
+        return 0.0
+    q1, _, q3 = statistics.quantiles(seconds, n=4, method="inclusive")
+    return q3 - q1
+
+
+def compare_reports(base: dict, current: dict, threshold: float = DEFAULT_THRESHOLD,
+                    min_seconds: float = DEFAULT_MIN_SECONDS) -> list[CaseDelta]:
+    """
+    逐项比较两份结果中都存在的 (用例, 行数)，按当前结果的顺序返回。
+
+    Args:
+        base: 基准结果（load_results 的返回值）
+        current: 当前结果
+        threshold: 相对变化阈值，0.1 表示 10%
+        min_seconds: 中位数差值的最小绝对值（秒）
+    """
+    base_items = {(item["case"], item["rows"]): item for item in base["results"]}
+    deltas = []
+    for item in current["results"]:
+        key = (item["case"], item["rows"])
+        if key not in base_items:
+            continue
+        base_seconds = base_items[key]["seconds"]
+        current_seconds = item["seconds"]
+        base_median = statistics.median(base_seconds)
+        current_median = statistics.median(current_seconds)
+        noise = max(iqr(base_seconds), iqr(current_seconds))
+        diff = current_median - base_median
+        significant = abs(diff) > max(noise, min_seconds) and base_median > 0
+        if significant and diff > base_median * threshold:
+            status = "回退"
+        elif significant and -diff > base_median * threshold:
+            status = "改进"
+        else:
+            status = "持平"
+        deltas.append(CaseDelta(key[0], key[1], base_median, current_median, noise, status))
+    return deltas
+
+
+def format_delta(delta: CaseDelta) -> str:
+    """格式化单个比较结果行。"""
+    return (
+        f"{delta.case:<14}{delta.rows:>10,} 行  "
+        f"{delta.base_median:.4f}s -> {delta.current_median:.4f}s  "
+        f"{delta.ratio:+.1%}  (噪声 {delta.noise:.4f}s)  {delta.status}"
+    )
+
+
+def parse_args(argv=None):
+    """解析命令行参数。"""
+    parser = argparse.ArgumentParser(description="比较两次基准测试结果，发现性能回退时以状态码 2 退出")
+    parser.add_argument("base", help="基准结果 JSON（如上一版本）")
+    parser.add_argument("current", help="当前结果 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"相对变慢阈值，默认 {DEFAULT_THRESHOLD}（即 {DEFAULT_THRESHOLD:.0%}）")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help=f"忽略中位数差值小于该秒数的变化，默认 {DEFAULT_MIN_SECONDS}")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """比较结果并输出表格；有回退时以状态码 2 退出。"""
+    args = parse_args(argv)
+    try:
+        base = load_results(args.base)
+        current = load_results(args.current)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    deltas = compare_reports(base, current, args.threshold, args.min_seconds)
+    print(f"{base.get('version', '?')} -> {current.get('version', '?')}")
+    for delta in deltas:
+        print(format_delta(delta))
+
+    regressions = [d for d in deltas if d.status == "回退"]
+    if not deltas:
+        print("两份结果没有共同的用例")
+    elif regressions:
+        print(f"发现 {len(regressions)} 项性能回退", file=sys.stderr)
+        sys.exit(EXIT_REGRESSION)
+    else:
+        print("未发现性能回退")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""确定性合成数据生成：中文剧名、月度收入表和剧名库。
+
+相同的数量和随机种子总是生成相同的数据，不同版本之间的基准结果可以直接比较。
+"""
+
+import random
+
+from openpyxl import Workbook
+
+DEFAULT_SEED = 20260101
+
+_PREFIXES = [
+    "锦绣", "长安", "逆袭", "重生", "霸道", "倾城", "盛世", "江湖", "烈火", "星河",
+    "繁花", "凤归", "龙城", "千金", "闪婚", "傲娇", "隐婚", "神医", "战神", "落跑",
+    "医妃", "萌宝", "总裁", "将军", "王妃", "少帅", "天降", "替嫁", "离婚", "回到",
+]
+_CORES = [
+    "情缘", "风云", "归来", "传奇", "之恋", "天下", "契约", "谜案", "人生", "江山",
+    "娇妻", "宠妃", "少年", "芳华", "密令", "山河", "鸳鸯", "烟火", "青云", "明月",
+]
+_SUFFIXES = ["", "之路", "计划", "秘史", "前传", "外传", "日记", "物语", "新篇", "往事"]
+
+HEADERS = ["合集名称", "播放量", "收入", "分成比例", "结算日期", "备注"]
+
+
+def drama_title(index: int) -> str:
+    """第 index 个剧名。前若干个为词语组合，超出组合数后追加季数，保证互不相同。"""
+    base = len(_PREFIXES) * len(_CORES) * len(_SUFFIXES)
+    season, rest = divmod(index, base)
+    rest, suffix = divmod(rest, len(_SUFFIXES))
+    prefix, core = divmod(rest, len(_CORES))
+    title = _PREFIXES[prefix] + _CORES[core] + _SUFFIXES[suffix]
+    return f"{title}第{season + 1}季" if season else title
+
+
+def library(count: int, seed: int = DEFAULT_SEED) -> list[str]:
+    """生成 count 个互不相同的剧名作为剧名库，顺序由 seed 决定。"""
+    rng = random.Random(seed)
+    # 在更大的编号空间中抽样，使剧名库与月度数据中的未命中剧名交错分布
+    indices = rng.sample(range(count * 2), count)
+    return [drama_title(i) for i in indices]
+
+
+def month_rows(count: int, library_names: list[str], hit_rate: float = 0.3,
+               seed: int = DEFAULT_SEED) -> tuple[list[str], list[list]]:
+    """
+    生成月度收入表，返回 (headers, rows)。
+
+    约 hit_rate 比例的行使用剧名库中的剧名（可匹配），其余为库外剧名；
+    约 5% 的剧名带首尾空格，约 1% 的行剧名为空，模拟真实导出文件。
+    """
+    rng = random.Random(seed + count)
+    library_size = len(library_names)
+    miss_base = library_size * 2
+    rows = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.01:
+            name = None
+        elif library_names and roll < hit_rate:
+            name = library_names[rng.randrange(library_size)]
+        else:
+            name = drama_title(miss_base + rng.randrange(max(count, 1)))
+        if name and rng.random() < 0.05:
+            name = f" {name} "
+        plays = rng.randint(100, 5_000_000)
+        revenue = round(rng.uniform(0, 50_000), 2)
+        share = round(rng.choice((0.3, 0.5, 0.6, 0.7)), 2)
+        day = f"2026-01-{rng.randint(1, 31):02d}"
+        note = "" if rng.random() < 0.8 else f"批次{i % 97}"
+        rows.append([name, plays, revenue, share, day, note])
+    return list(HEADERS), rows
+
+
+def write_month_xlsx(file_path: str, headers: list[str], rows: list[list]) -> None:
+    """以 write-only 模式写出 .xlsx，百万行也只占用少量内存。"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+    wb.save(file_path)
@@ -0,0 +1,276 @@
+"""运行基准测试并保存 JSON 结果。
+
+用法示例：
+    python -m benchmarks.run                               # 1k、100k 行，全部用例
+    python -m benchmarks.run --sizes 1k,100k,1m --repeats 5 --out 1.2.1.json
+    python -m benchmarks.run --cases match,column_sums --sizes 1m
+
+每个用例先在计时之外准备数据，再重复执行 repeats 次，记录每次耗时（秒）。
+结果文件包含版本号和运行环境，可用于不同版本之间的比较。
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from openpyxl import Workbook
+
+from benchmarks.datagen import DEFAULT_SEED, library, month_rows, write_month_xlsx
+from src import memprofile
+from src.dao.backend_dao import BackendDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import MonthDAO
+from src.database import Database
+from src.excel_importer import ExcelImporter
+from src.exporter import Exporter
+from src.highlighter import highlight_rows
+from src.match_engine import MatchEngine
+from src.version import __version__
+from src.view_helpers import compute_column_sums
+
+DEFAULT_SIZES = "1k,100k"
+DEFAULT_REPEATS = 3
+DEFAULT_LIBRARY_SIZE = 10_000
+
+
+class BenchData:
+    """单个数据规模下各用例共用的数据：内存中的行、剧名库、临时 xlsx 和数据库。"""
+
+    def __init__(self, work_dir: str, rows: int, library_size: int, seed: int):
+        self.work_dir = work_dir
+        self.library = library(library_size, seed)
+        self.library_set = set(self.library)
+        self.headers, self.rows = month_rows(rows, self.library, seed=seed)
+        self.matched = MatchEngine.match(self.rows, 0, self.library_set)
+        self._xlsx_path = None
+        self._db = None
+        self._month_id = None
+
+    @property
+    def xlsx_path(self) -> str:
+        """按需生成的月度 .xlsx 文件。"""
+        if self._xlsx_path is None:
+            self._xlsx_path = os.path.join(self.work_dir, "month.xlsx")
+            write_month_xlsx(self._xlsx_path, self.headers, self.rows)
+        return self._xlsx_path
+
+    def database(self) -> tuple[Database, int]:
+        """按需创建的数据库和月份 ID。"""
+        if self._db is None:
+            self._db = Database(os.path.join(self.work_dir, "bench.db"))
+            backend_id = BackendDAO(self._db).create("基准")
+            self._month_id = MonthDAO(self._db).create(backend_id, "2026年01月")
+        return self._db, self._month_id
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+
+
+# 每个用例接收 BenchData，完成计时之外的准备后返回需要计时的无参函数
+
+def _case_import(data: BenchData):
+    path = data.xlsx_path
+    return lambda: ExcelImporter.import_file(path)
+
+
+def _case_save_data(data: BenchData):
+    db, month_id = data.database()
+    dao = ImportedDataDAO(db)
+    return lambda: dao.save_data(month_id, data.headers, data.rows)
+
+
+def _case_get_all_rows(data: BenchData):
+    db, month_id = data.database()
+    dao = ImportedDataDAO(db)
+    if not dao.has_data(month_id):
+        dao.save_data(month_id, data.headers, data.rows)
+    return lambda: dao.get_all_rows(month_id)
+
+
+def _case_match(data: BenchData):
+    return lambda: MatchEngine.match(data.rows, 0, data.library_set)
+
+
+def _case_column_sums(data: BenchData):
+    return lambda: compute_column_sums(data.rows, len(data.headers))
+
+
+def _case_highlight(data: BenchData):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(data.headers)
+    for row in data.rows:
+        ws.append(row)
+    matched_rows = [i + 2 for i in data.matched]
+    return lambda: highlight_rows(ws, matched_rows)
+
+
+def _case_export(data: BenchData):
+    path = os.path.join(data.work_dir, "export.xlsx")
+    return lambda: Exporter.export_with_highlight(path, data.headers, data.rows, data.matched)
+
+
+CASES = {
+    "import": _case_import,
+    "save_data": _case_save_data,
+    "get_all_rows": _case_get_all_rows,
+    "match": _case_match,
+    "column_sums": _case_column_sums,
+    "highlight": _case_highlight,
+    "export": _case_export,
+}
+
+
+def parse_size(text: str) -> int:
+    """解析规模：支持 1000、1k、100k、1m 写法。"""
+    value = text.strip().lower()
+    multiplier = 1
+    if value.endswith("k"):
+        multiplier, value = 1_000, value[:-1]
+    elif value.endswith("m"):
+        multiplier, value = 1_000_000, value[:-1]
+    try:
+        size = int(float(value) * multiplier)
+    except ValueError:
+        raise ValueError(f"无效的数据规模: '{text}'")
+    if size <= 0:
+        raise ValueError(f"无效的数据规模: '{text}'")
+    return size
+
+
+def run_benchmarks(sizes: list[int], cases: list[str], repeats: int = DEFAULT_REPEATS,
+                   library_size: int = DEFAULT_LIBRARY_SIZE, seed: int = DEFAULT_SEED,
+                   memory: bool = False, on_result=None) -> dict:
+    """
+    按规模和用例运行基准测试，返回可直接保存为 JSON 的结果字典。
+
+    Args:
+        sizes: 行数列表
+        cases: 用例名列表（CASES 的键）
+        repeats: 每个用例的重复次数
+        library_size: 剧名库大小
+        seed: 随机种子
+        memory: 计时之后再用 tracemalloc 额外执行一次，记录峰值和分子系统内存
+        on_result: 每完成一个用例时回调 on_result(结果项)
+    """
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        raise ValueError(f"未知的用例: {', '.join(unknown)}。可用: {', '.join(CASES)}")
+    if repeats < 1:
+        raise ValueError("重复次数必须大于 0")
+
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as work_dir:
+            data = BenchData(work_dir, size, library_size, seed)
+            try:
+                for name in cases:
+                    func = CASES[name](data)
+                    seconds = []
+                    for _ in range(repeats):
+                        start = time.perf_counter()
+                        func()
+                        seconds.append(time.perf_counter() - start)
+                    median = statistics.median(seconds)
+                    item = {
+                        "case": name,
+                        "rows": size,
+                        "seconds": seconds,
+                        "median": median,
+                        "rows_per_sec": size / median if median > 0 else None,
+                    }
+                    if memory:
+                        record = memprofile.measure(func, name)
+                        item["peak_bytes"] = record.peak_bytes
+                        item["net_bytes"] = record.net_bytes
+                        item["memory_by_subsystem"] = record.by_subsystem
+                    if on_result is not None:
+                        on_result(item)
+                    results.append(item)
+            finally:
+                data.close()
+
+    return {
+        "version": __version__,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "library_size": library_size,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def save_results(file_path: str, report: dict) -> None:
+    """保存结果 JSON（UTF-8，保留中文）。"""
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_results(file_path: str) -> dict:
+    """读取结果 JSON。"""
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"文件未找到: {file_path}")
+    with open(file_path, encoding="utf-8") as f:
+        report = json.load(f)
+    if not isinstance(report, dict) or "results" not in report:
+        raise ValueError(f"不是有效的基准结果文件: {file_path}")
+    return report
+
+
+def format_result(item: dict) -> str:
+    """格式化单个结果行。"""
+    rate = f"{item['rows_per_sec']:,.0f} 行/秒" if item["rows_per_sec"] else "-"
+    line = f"{item['case']:<14}{item['rows']:>10,} 行  中位 {item['median']:.4f}s  {rate}"
+    if "peak_bytes" in item:
+        line += f"  峰值内存 {item['peak_bytes'] / (1024 * 1024):.1f} MB"
+    return line
+
+
+def parse_args(argv=None):
+    """解析命令行参数。"""
+    parser = argparse.ArgumentParser(description="剧名数据管理系统性能基准测试")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"数据行数，逗号分隔，支持 k/m 后缀，默认 {DEFAULT_SIZES}")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help=f"用例，逗号分隔，默认全部: {','.join(CASES)}")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help=f"每个用例重复次数，默认 {DEFAULT_REPEATS}")
+    parser.add_argument("--library-size", type=int, default=DEFAULT_LIBRARY_SIZE,
+                        help=f"剧名库大小，默认 {DEFAULT_LIBRARY_SIZE}")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="随机种子")
+    parser.add_argument("--memory", action="store_true",
+                        help="额外用 tracemalloc 测量每个用例的峰值和分子系统内存（不影响计时）")
+    parser.add_argument("--out", default=f"benchmark_{__version__}.json",
+                        help="结果 JSON 文件路径，默认 benchmark_<版本号>.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """运行基准测试并保存结果，参数错误时输出错误并以状态码 1 退出。"""
+    args = parse_args(argv)
+    try:
+        sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+        cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+        print(f"版本 {__version__}，重复 {args.repeats} 次")
+        report = run_benchmarks(
+            sizes, cases, args.repeats, args.library_size, args.seed, args.memory,
+            on_result=lambda item: print(format_result(item), flush=True),
+        )
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        sys.exit(1)
+    save_results(args.out, report)
+    print(f"结果已保存到 {args.out}")
+
+
+if __name__ == "__main__":
+    main()
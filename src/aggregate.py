@@ -0,0 +1,266 @@
+"""列聚合引擎：计算 sum / count / mean / min / max / distinct，可按行下标筛选。
+
+对 MonthTable 直接在类型化的列上计算，不经过逐行的 RowView：
+- 安装了 NumPy 时用 np.frombuffer 零拷贝读取列的 array 缓冲区做向量化计算；
+- 否则退回纯 Python 实现：数值列用 itertools.compress + math.fsum，
+  字典编码列先统计各编号出现次数，再按去重后的取值计算。
+其它行序列（list[list] 等）逐行取值计算。
+
+数值指 int / float（含 bool，与 isinstance(value, (int, float)) 一致），其它取值不参与
+sum / count / mean / min / max；distinct 统计除 None 以外的不同取值个数。
+sum / mean / min / max 的结果均为 float，没有数值时为 None。
+
+用法：
+    from src.aggregate import aggregate, column_sums
+
+    stats = aggregate(table, 1, ("sum", "mean"), indices=displayed_indices)
+    sums = column_sums(table, len(headers))
+
+PartitionSums 按匹配状态分区维护列合计，匹配集合变化时增量更新。
+"""
+
+import math
+from array import array
+from collections import Counter
+from itertools import compress
+
+from src.month_table import MonthTable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖
+    np = None
+
+OPERATIONS = ("sum", "count", "mean", "min", "max", "distinct")
+
+
+def aggregate(rows, column: int, ops=OPERATIONS, indices=None) -> dict:
+    """
+    计算一列的聚合值。
+
+    Args:
+        rows: MonthTable 或行序列
+        column: 列下标，超出列数时视为全部缺失
+        ops: 要计算的聚合，取自 OPERATIONS
+        indices: 参与计算的行下标（如当前显示的行），None 表示全部行
+
+    Returns:
+        {聚合名: 值}
+    """
+    for op in ops:
+        if op not in OPERATIONS:
+            raise ValueError(f"无效的聚合: {op}")
+    if isinstance(rows, MonthTable):
+        if column >= rows.num_columns or ("distinct" not in ops and not rows.column_has_numbers(column)):
+            # 列不存在或不含数值（如剧名、日期列）：无需扫描
+            return _result([], (), ops)
+        kind, first, second = rows.column_arrays(column)
+        if np is not None:
+            return _aggregate_numpy(kind, first, second, ops, indices)
+        if kind == "number":
+            return _aggregate_numbers(first, second, ops, indices)
+        return _aggregate_codes(first, second, ops, indices)
+    return _aggregate_values(rows, column, ops, indices)
+
+
+def column_sums(rows, num_columns: int, indices=None) -> list:
+    """每列求和：有数值的列为合计（float），没有数值的列为空字符串。"""
+    sums = []
+    for col in range(num_columns):
+        total = aggregate(rows, col, ("sum",), indices)["sum"]
+        sums.append("" if total is None else float(total))
+    return sums
+
+
+def _is_numeric(value) -> bool:
+    return isinstance(value, (int, float))
+
+
+def _result(numbers, distinct_values, ops) -> dict:
+    """由数值列表和去重取值计算结果。"""
+    result = {}
+    for op in ops:
+        if op == "count":
+            result[op] = len(numbers)
+        elif op == "distinct":
+            result[op] = len(distinct_values)
+        elif not numbers:
+            result[op] = None
+        elif op == "sum":
+            result[op] = math.fsum(numbers)
+        elif op == "mean":
+            result[op] = math.fsum(numbers) / len(numbers)
+        elif op == "min":
+            result[op] = float(min(numbers))
+        else:
+            result[op] = float(max(numbers))
+    return result
+
+
+def _aggregate_values(rows, column: int, ops, indices) -> dict:
+    selected = rows if indices is None else (rows[i] for i in indices)
+    values = [row[column] for row in selected if column < len(row)]
+    numbers = [v for v in values if _is_numeric(v)]
+    distinct = set(values) - {None} if "distinct" in ops else ()
+    return _result(numbers, distinct, ops)
+
+
+def _aggregate_numbers(values: array, kinds: bytearray, ops, indices) -> dict:
+    if indices is None:
+        numbers = list(compress(values, kinds))
+    else:
+        numbers = [values[i] for i in indices if kinds[i]]
+    distinct = set(numbers) if "distinct" in ops else ()
+    return _result(numbers, distinct, ops)
+
+
+def _aggregate_codes(codes: array, lookup: list, ops, indices) -> dict:
+    counts = Counter(codes if indices is None else (codes[i] for i in indices))
+    return _from_code_counts(counts.items(), lookup, ops)
+
+
+def _from_code_counts(code_counts, lookup: list, ops) -> dict:
+    """字典编码列：按 (编号, 出现次数) 计算，每种取值只处理一次。"""
+    code_counts = [(code, count) for code, count in code_counts if count]
+    present = [lookup[code] for code, _ in code_counts]
+    weighted = [(lookup[code], count) for code, count in code_counts if _is_numeric(lookup[code])]
+    count = sum(n for _, n in weighted)
+    total = math.fsum(value * n for value, n in weighted)
+    distinct = set(present) - {None}
+    result = {}
+    for op in ops:
+        if op == "count":
+            result[op] = count
+        elif op == "distinct":
+            result[op] = len(distinct)
+        elif not weighted:
+            result[op] = None
+        elif op == "sum":
+            result[op] = total
+        elif op == "mean":
+            result[op] = total / count
+        elif op == "min":
+            result[op] = float(min(value for value, _ in weighted))
+        else:
+            result[op] = float(max(value for value, _ in weighted))
+    return result
+
+
+def _index_array(indices):
+    if isinstance(indices, array):
+        return np.frombuffer(indices, dtype=indices.typecode).astype(np.intp, copy=False)
+    return np.asarray(indices, dtype=np.intp)
+
+
+def _aggregate_numpy(kind: str, first: array, second, ops, indices) -> dict:
+    if kind == "dict":
+        codes = np.frombuffer(first, dtype=first.typecode) if len(first) else np.zeros(0, np.uint32)
+        if indices is not None:
+            codes = codes[_index_array(indices)]
+        counts = np.bincount(codes, minlength=len(second))
+        return _from_code_counts(enumerate(counts.tolist()), second, ops)
+
+    if not len(first):
+        return _result([], [], ops)
+    values = np.frombuffer(first, dtype=np.float64)
+    kinds = np.frombuffer(second, dtype=np.uint8)
+    if indices is not None:
+        index = _index_array(indices)
+        values = values[index]
+        kinds = kinds[index]
+    numbers = values[kinds != 0]
+    result = {}
+    for op in ops:
+        if op == "count":
+            result[op] = int(numbers.size)
+        elif op == "distinct":
+            result[op] = int(np.unique(numbers).size)
+        elif not numbers.size:
+            result[op] = None
+        elif op == "sum":
+            result[op] = float(numbers.sum())
+        elif op == "mean":
+            result[op] = float(numbers.mean())
+        elif op == "min":
+            result[op] = float(numbers.min())
+        else:
+            result[op] = float(numbers.max())
+    return result
+
+
+class PartitionSums:
+    """
+    按匹配状态分区维护的列合计，供 全部 / 仅匹配 / 仅未匹配 视图切换时直接取用。
+
+    创建时对全部行和已匹配行各计算一次（未匹配 = 全部 - 已匹配），之后匹配集合变化时
+    只处理发生变化的行。增量加减的浮点合计可能与重新求和有末位舍入差异。
+    """
+
+    def __init__(self, rows, num_columns: int, matched_indices=()):
+        """
+        Args:
+            rows: MonthTable 或行序列，之后不应再修改
+            num_columns: 列数
+            matched_indices: 已匹配的行下标
+        """
+        self._rows = rows
+        self._num_columns = num_columns
+        totals = [aggregate(rows, col, ("sum", "count")) for col in range(num_columns)]
+        self._total_sums = [item["sum"] or 0.0 for item in totals]
+        self._total_counts = [item["count"] for item in totals]
+        self._matched = set(matched_indices)
+        self._recompute_matched()
+
+    def add_matched(self, indices) -> None:
+        """把 indices 中尚未匹配的行计入已匹配分区。"""
+        for index in indices:
+            if index not in self._matched:
+                self._matched.add(index)
+                self._move(index, 1)
+
+    def set_matched(self, matched_indices) -> None:
+        """替换匹配集合（如重新匹配）；变化的行较多时直接重新计算。"""
+        matched = set(matched_indices)
+        added = matched - self._matched
+        removed = self._matched - matched
+        self._matched = matched
+        if len(added) + len(removed) > len(matched):
+            self._recompute_matched()
+            return
+        for index in added:
+            self._move(index, 1)
+        for index in removed:
+            self._move(index, -1)
+
+    def sums(self, mode: str) -> list:
+        """
+        返回指定分区的列合计，格式与 column_sums 相同。
+        mode: "all" = 全部, "matched" = 仅匹配, "unmatched" = 仅未匹配
+        """
+        if mode == "all":
+            pairs = zip(self._total_sums, self._total_counts)
+        elif mode == "matched":
+            pairs = zip(self._matched_sums, self._matched_counts)
+        elif mode == "unmatched":
+            pairs = zip(
+                (total - part for total, part in zip(self._total_sums, self._matched_sums)),
+                (total - part for total, part in zip(self._total_counts, self._matched_counts)),
+            )
+        else:
+            raise ValueError(f"无效的筛选模式: {mode}")
+        return [float(total) if count else "" for total, count in pairs]
+
+    def _recompute_matched(self) -> None:
+        indices = sorted(self._matched)
+        matched = [aggregate(self._rows, col, ("sum", "count"), indices)
+                   for col in range(self._num_columns)]
+        self._matched_sums = [item["sum"] or 0.0 for item in matched]
+        self._matched_counts = [item["count"] for item in matched]
+
+    def _move(self, index: int, sign: int) -> None:
+        row = self._rows[index]
+        for col in range(min(len(row), self._num_columns)):
+            value = row[col]
+            if _is_numeric(value):
+                self._matched_sums[col] += sign * value
+                self._matched_counts[col] += sign
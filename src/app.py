@@ -1,14 +1,40 @@
 """应用入口 - 初始化数据库、创建主窗口、启动事件循环。"""
 
+import argparse
+import multiprocessing
 import tkinter as tk
+
+from src import memprofile, tracing
 from src.database import Database
 from src.gui.main_window import MainWindow
 from src.version import __version__
-from src.updater import check_update
+from src.updater import check_update, manual_check_update
+
+
+def parse_args(argv=None):
+    """解析命令行参数。"""
+    parser = argparse.ArgumentParser(description="剧名数据管理系统")
+    parser.add_argument("--trace", default=None, metavar="JSON",
+                        help="开启阶段追踪：退出时输出各阶段耗时汇总，并将 Chrome Trace 写入该文件")
+    parser.add_argument("--memprofile", action="store_true",
+                        help="内存分析模式：记录加载月份、导入、导出的峰值和分子系统内存，退出时输出报告")
+    parser.add_argument("--sql-stats", action="store_true",
+                        help="统计 SQL 语句耗时，可在 帮助 > 数据库查询统计 中查看")
+    parser.add_argument("--slow-ms", type=float, default=None,
+                        help="输出耗时超过该毫秒数的慢查询（隐含 --sql-stats）")
+    return parser.parse_args(argv)
+
 
+def main(argv=None):
+    args = parse_args(argv)
+    if args.trace:
+        tracing.enable()
+    if args.memprofile:
+        memprofile.enable()
 
-def main():
     db = Database()
+    if args.sql_stats or args.slow_ms is not None:
+        db.enable_query_stats(args.slow_ms)
 
     root = tk.Tk()
     root.title(f"剧名数据管理系统 v{__version__}")
@@ -16,6 +42,7 @@ def main():
     root.minsize(640, 480)
 
     MainWindow(root, db)
+    _build_menu(root, db)
 
     # 启动后台检查更新
     check_update(root)
@@ -23,10 +50,29 @@ def main():
     def on_close():
         db.close()
         root.destroy()
+        if args.trace:
+            print(tracing.format_summary())
+            tracing.dump_chrome_trace(args.trace)
+        if args.memprofile:
+            print(memprofile.format_report())
 
     root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
 
 
+def _build_menu(root: tk.Tk, db: Database):
+    """构建菜单栏：帮助菜单提供数据库查询统计和检查更新。"""
+    from src.gui.query_stats_dialog import QueryStatsDialog
+
+    menubar = tk.Menu(root)
+    help_menu = tk.Menu(menubar, tearoff=0)
+    help_menu.add_command(label="数据库查询统计", command=lambda: QueryStatsDialog(root, db))
+    help_menu.add_command(label="检查更新", command=lambda: manual_check_update(root))
+    menubar.add_cascade(label="帮助", menu=help_menu)
+    root.config(menu=menubar)
+
+
 if __name__ == "__main__":
+    # 打包为 exe 后进程池的子进程会重新启动程序本身，需先交给 multiprocessing 处理
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,122 @@
+"""批量匹配：一次加载B文档剧名集合，用进程池并行处理多个A文档，并输出汇总报告。"""
+
+import csv
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from src.models import BatchFileResult
+from src.pipeline import process_master
+
+# 工作进程内的剧名集合，由进程池 initializer 设置一次
+_worker_lookup: set[str] = set()
+
+
+def find_master_files(pattern: str) -> list[str]:
+    """
+    解析批量输入：目录则取其中所有 .xlsx 文件，否则按通配符匹配。
+    跳过 Excel 打开文件时生成的 ~$ 临时文件，结果按路径排序。
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.xlsx")
+    files = [
+        path for path in glob.glob(pattern)
+        if os.path.isfile(path) and not os.path.basename(path).startswith("~$")
+    ]
+    return sorted(files)
+
+
+def run_batch(master_files: list[str], lookup_set: set[str], master_col: str,
+              highlight_mode: str = "cell", workers: int = None,
+              on_result=None) -> list[BatchFileResult]:
+    """
+    并行处理多个A文档，返回与 master_files 顺序一致的结果列表。
+    单个文件失败不影响其它文件，错误记录在结果的 error 字段；工作进程异常退出
+    （如内存不足被系统终止）导致进程池损坏时，尚未完成的文件都记为失败并注明原因。
+
+    Args:
+        master_files: A文档路径列表
+        lookup_set: 已加载的B文档剧名集合
+        master_col: A文档剧名列标识
+        highlight_mode: 高亮方式，同 src.main 的 --highlight-mode
+        workers: 进程数，默认 CPU 核数；为 1 时在当前进程内顺序处理
+        on_result: 每完成一个文件时按完成顺序回调 on_result(BatchFileResult)
+    """
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, max(len(master_files), 1))
+
+    if workers == 1:
+        _init_worker(lookup_set)
+        results = []
+        for path in master_files:
+            item = _process_one(path, master_col, highlight_mode)
+            if on_result is not None:
+                on_result(item)
+            results.append(item)
+        return results
+
+    results: list[BatchFileResult | None] = [None] * len(master_files)
+
+    def finish(index: int, item: BatchFileResult) -> None:
+        results[index] = item
+        if on_result is not None:
+            on_result(item)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(lookup_set,)) as pool:
+        futures = {}
+        try:
+            for index, path in enumerate(master_files):
+                futures[pool.submit(_process_one, path, master_col, highlight_mode)] = index
+        except BrokenProcessPool as e:
+            for index in range(len(futures), len(master_files)):
+                finish(index, _broken_result(master_files[index], e))
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                item = future.result()
+            except BrokenProcessPool as e:
+                item = _broken_result(master_files[index], e)
+            finish(index, item)
+    return results
+
+
+def write_report(report_path: str, results: list[BatchFileResult]) -> None:
+    """将每个文件的统计和耗时写入 CSV（UTF-8 BOM，Excel 可直接打开）。"""
+    with open(report_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["文件", "A文档总数", "匹配数量", "耗时(秒)", "阶段耗时", "错误"])
+        for item in results:
+            stages = "; ".join(f"{name} {seconds:.3f}s" for name, seconds in item.timings.items())
+            writer.writerow([
+                item.path, item.total_master, item.match_count,
+                f"{item.seconds:.3f}", stages, item.error,
+            ])
+
+
+def _init_worker(lookup_set: set[str]) -> None:
+    global _worker_lookup
+    _worker_lookup = lookup_set
+
+
+def _broken_result(path: str, error: BrokenProcessPool) -> BatchFileResult:
+    """进程池损坏时未完成文件的结果。"""
+    return BatchFileResult(path=path, error=f"工作进程异常退出，未完成处理: {error}")
+
+
+def _process_one(path: str, master_col: str, highlight_mode: str) -> BatchFileResult:
+    """处理单个A文档（在工作进程中执行）。"""
+    start = time.perf_counter()
+    try:
+        result, timings = process_master(path, master_col, _worker_lookup, highlight_mode)
+    except Exception as e:
+        return BatchFileResult(path=path, seconds=time.perf_counter() - start, error=str(e))
+    return BatchFileResult(
+        path=path,
+        total_master=result.total_master,
+        match_count=result.match_count,
+        seconds=time.perf_counter() - start,
+        timings=timings,
+    )
@@ -0,0 +1,492 @@
+"""无界面命令行：直接操作 SQLite 数据库完成导入、匹配、导出和剧名库导入。
+
+用法示例：
+    python -m src.cli --db drama_manager.db import-month --backend 抖音 --month 2026年01月 --file 1月.xlsx --create
+    python -m src.cli import-month --backend 抖音 --month 2026年01月 --file 1月_1.xlsx 1月_2.xlsx --workers 4
+    python -m src.cli import-month --backend 抖音 --month 2026年01月 --file 1月_补充.xlsx --merge --key 合集名称 --replace
+    python -m src.cli sheets --file 1月.xlsx
+    python -m src.cli import-month --backend 抖音 --month 2026年01月 --file 1月.xlsx --all-sheets --create
+    python -m src.cli match --backend 抖音 --month 2026年01月
+    python -m src.cli match-all --backend 抖音
+    python -m src.cli export --backend 抖音 --month 2026年01月 --out 1月_导出.xlsx
+    python -m src.cli library-import --backend 抖音 --file 剧名.txt
+    python -m src.cli watch --dir 待导入 --create --workers 2
+    python -m src.cli groupby --backend 抖音 --month 2026年01月 --by 合集名称 --values 收入 --agg sum count
+    python -m src.cli diff --backend 抖音 --month 2026年02月 --base 2026年01月 --out 对比.xlsx
+
+本模块不导入 tkinter，可在无图形界面的服务器上运行。
+"""
+
+import argparse
+import multiprocessing
+import sqlite3
+import sys
+import threading
+import time
+import zipfile
+
+from openpyxl.utils.exceptions import InvalidFileException
+from xlrd import XLRDError
+
+from src import tracing
+from src.dao.backend_dao import BackendDAO
+from src.dao.drama_dao import DramaDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import MonthDAO, previous_month
+from src.dao.summary_dao import SummaryDAO
+from src.database import Database
+from src.excel_importer import ExcelImporter
+from src.exporter import Exporter
+from src.groupby import AGGREGATIONS, GroupBy, format_summary, resolve_columns
+from src.import_cache import import_file
+from src.ingest import DEFAULT_NAME_PATTERN, IngestService
+from src.main import positive_int
+from src.match_engine import MatchEngine
+from src.month_diff import diff_months, format_diff
+from src.merge_import import merge_rows
+from src.multi_import import import_files, import_sheets
+
+DEFAULT_DB = "drama_manager.db"
+DEFAULT_MATCH_COLUMN = "合集名称"
+
+
+def parse_args(argv=None):
+    """解析命令行参数。"""
+    parser = argparse.ArgumentParser(
+        description="剧名数据管理系统命令行：导入、匹配、导出（无需图形界面）"
+    )
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"数据库文件路径，默认 {DEFAULT_DB}")
+    parser.add_argument("--trace", default=None, metavar="JSON",
+                        help="开启阶段追踪：结束时输出各阶段耗时汇总，并将 Chrome Trace 写入该文件")
+    parser.add_argument("--sql-stats", action="store_true",
+                        help="统计 SQL 语句的次数、总耗时和 p95，结束时输出报告")
+    parser.add_argument("--slow-ms", type=float, default=None,
+                        help="输出耗时超过该毫秒数的慢查询（隐含 --sql-stats）")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import-month", help="导入 Excel 到指定月份（替换该月已有数据）")
+    _add_backend_arg(p)
+    p.add_argument("--month", required=True, help="月份标签，如 2026年01月")
+    p.add_argument("--file", required=True, nargs="+",
+                   help="Excel 文件路径（.xlsx/.xls），可多个，按顺序合并到同一月份")
+    p.add_argument("--append", action="store_true", help="追加到该月已有数据之后（默认替换）")
+    p.add_argument("--merge", action="store_true",
+                   help="合并到该月已有数据：按行去重，只写入新增的行（与 --append 互斥）")
+    p.add_argument("--key", nargs="+", default=None,
+                   help="合并时判断重复的键列（列名或列号，可多个），默认整行")
+    p.add_argument("--replace", action="store_true", help="合并时用新行替换键相同的旧行（默认跳过）")
+    p.add_argument("--sheet", nargs="+", default=None,
+                   help="导入指定的工作表（可多个，多个时各自写入 <月份>/<工作表> 子表），默认活动工作表")
+    p.add_argument("--all-sheets", action="store_true", help="导入全部工作表，各自写入 <月份>/<工作表> 子表")
+    p.add_argument("--workers", type=positive_int, default=None, help="多个文件或工作表时的解析进程数，默认 CPU 核数")
+    p.add_argument("--create", action="store_true", help="后台或月份不存在时自动创建")
+    p.add_argument("--match", action="store_true", help="导入后立即与剧名库匹配")
+    p.add_argument("--column", default=DEFAULT_MATCH_COLUMN, help="匹配列名（配合 --match）")
+
+    p = sub.add_parser("sheets", help="列出工作簿中的工作表和尺寸（不解析单元格数据）")
+    p.add_argument("--file", required=True, help="Excel 文件路径（.xlsx/.xls）")
+
+    p = sub.add_parser("match", help="对指定月份执行剧名匹配")
+    _add_backend_arg(p)
+    p.add_argument("--month", required=True, help="月份标签")
+    p.add_argument("--column", default=DEFAULT_MATCH_COLUMN, help=f"匹配列名，默认 {DEFAULT_MATCH_COLUMN}")
+
+    p = sub.add_parser("match-all", help="对后台下所有已导入数据的月份执行匹配")
+    _add_backend_arg(p)
+    p.add_argument("--column", default=DEFAULT_MATCH_COLUMN, help=f"匹配列名，默认 {DEFAULT_MATCH_COLUMN}")
+
+    p = sub.add_parser("export", help="导出月份数据，匹配行高亮")
+    _add_backend_arg(p)
+    p.add_argument("--month", required=True, help="月份标签")
+    p.add_argument("--out", required=True, help="输出 .xlsx 文件路径")
+
+    p = sub.add_parser("library-import", help="从 Excel/文本文件批量导入剧名库")
+    _add_backend_arg(p)
+    p.add_argument("--file", required=True, help="剧名文件路径（.xlsx/.xls/.txt）")
+    p.add_argument("--column", default=None, help="Excel 剧名列（列名或列号），默认第一列")
+    p.add_argument("--create", action="store_true", help="后台不存在时自动创建")
+
+    p = sub.add_parser("watch", help="监控目录，自动导入并匹配新放入的月度文件")
+    p.add_argument("--dir", required=True, help="监控目录")
+    p.add_argument("--pattern", default=DEFAULT_NAME_PATTERN,
+                   help="文件名正则（含 backend、month 命名分组），默认 <后台>_<月份>.xlsx")
+    p.add_argument("--column", default=DEFAULT_MATCH_COLUMN, help=f"匹配列名，默认 {DEFAULT_MATCH_COLUMN}")
+    p.add_argument("--workers", type=positive_int, default=None, help="解析进程数，默认 CPU 核数")
+    p.add_argument("--interval", type=float, default=10.0, help="扫描间隔（秒），默认 10")
+    p.add_argument("--create", action="store_true", help="后台或月份不存在时自动创建")
+    p.add_argument("--once", action="store_true", help="只扫描一次后退出")
+
+    p = sub.add_parser("groupby", help="按列分组汇总月份数据（类似数据透视表）")
+    _add_backend_arg(p)
+    p.add_argument("--month", required=True, help="月份标签")
+    p.add_argument("--by", nargs="+", default=[DEFAULT_MATCH_COLUMN],
+                   help=f"分组列（列名或列号，可多个），默认 {DEFAULT_MATCH_COLUMN}")
+    p.add_argument("--values", nargs="*", default=[], help="聚合的数值列（列名或列号，可多个）")
+    p.add_argument("--agg", nargs="+", default=["sum"], choices=list(AGGREGATIONS),
+                   help="聚合方式，默认 sum")
+    p.add_argument("--rows", default="all", choices=["all", "matched", "unmatched"],
+                   help="参与汇总的行：全部 / 仅匹配 / 仅未匹配，默认 all")
+    p.add_argument("--limit", type=int, default=50, help="最多输出的分组数，默认 50，0 表示全部")
+    p.add_argument("--out", default=None, help="同时将全部分组写入该 .xlsx 文件")
+
+    p = sub.add_parser("diff", help="对比两个月份：新增、消失和数据变化的剧名")
+    _add_backend_arg(p)
+    p.add_argument("--month", required=True, help="月份标签")
+    p.add_argument("--base", default=None, help="对比的旧月份，默认按标签中的年月取该后台的上一个月份")
+    p.add_argument("--column", default=DEFAULT_MATCH_COLUMN, help=f"剧名列名，默认 {DEFAULT_MATCH_COLUMN}")
+    p.add_argument("--all", action="store_true", help="同时列出数据不变的剧名")
+    p.add_argument("--limit", type=int, default=50, help="最多输出的行数，默认 50，0 表示全部")
+    p.add_argument("--out", default=None, help="同时将全部对比结果写入该 .xlsx 文件")
+
+    return parser.parse_args(argv)
+
+
+def _add_backend_arg(parser):
+    parser.add_argument("--backend", required=True, help="后台名称")
+
+
+def main(argv=None):
+    """解析参数并执行子命令，出错时输出错误并以状态码 1 退出。"""
+    args = parse_args(argv)
+    if args.trace:
+        tracing.enable()
+    try:
+        db = Database(args.db)
+    except sqlite3.Error as e:
+        _exit_with_error(f"无法打开数据库 {args.db}: {e}")
+    if args.sql_stats or args.slow_ms is not None:
+        db.enable_query_stats(args.slow_ms)
+    start = time.perf_counter()
+    try:
+        COMMANDS[args.command](db, args)
+    except (FileNotFoundError, ValueError) as e:
+        _exit_with_error(str(e))
+    except (zipfile.BadZipFile, InvalidFileException, XLRDError) as e:
+        _exit_with_error(f"无法读取 Excel 文件（文件损坏或不是有效的 Excel 文件）: {e}")
+    except sqlite3.Error as e:
+        _exit_with_error(f"数据库操作失败: {e}")
+    finally:
+        if db.query_stats is not None:
+            print(db.query_stats.format_report())
+        db.close()
+        if args.trace:
+            _dump_trace(args.trace)
+    print(f"耗时: {time.perf_counter() - start:.3f}s")
+
+
+def _exit_with_error(message: str) -> None:
+    print(f"错误: {message}", file=sys.stderr)
+    sys.exit(1)
+
+
+def _dump_trace(trace_path: str) -> None:
+    """输出追踪汇总并写出 Chrome Trace 文件。"""
+    print(tracing.format_summary())
+    tracing.dump_chrome_trace(trace_path)
+    print(f"追踪已写入 {trace_path}（可在 chrome://tracing 中打开）")
+    tracing.disable()
+    tracing.reset()
+
+
+def cmd_import_month(db: Database, args) -> None:
+    """导入 Excel 到月份：逐行读取并写入数据库，替换时清空旧匹配结果。多个文件时并行解析。"""
+    backend_id = resolve_backend(db, args.backend, create=args.create)
+    month_id = resolve_month(db, backend_id, args.month, create=args.create)
+    data_dao = ImportedDataDAO(db)
+    if args.sheet or args.all_sheets:
+        _import_sheets(db, backend_id, args)
+        return
+    if args.merge:
+        _merge_month(db, backend_id, month_id, args)
+        return
+    if args.key or args.replace:
+        raise ValueError("--key 和 --replace 需配合 --merge 使用")
+
+    start = time.perf_counter()
+    cached = False
+    if len(args.file) == 1 and args.append:
+        headers, rows = ExcelImporter.iter_file(args.file[0], convert=False)
+        count = data_dao.save_data(month_id, headers, rows, append=True)
+    elif len(args.file) == 1:
+        result = import_file(db, month_id, args.file[0])
+        count, cached = result.row_count, result.cached
+    else:
+        def _print_file(file_result):
+            print(f"  {file_result.path}: {file_result.row_count} 行（解析 {file_result.parse_seconds:.3f}s）")
+
+        count = import_files(db, month_id, args.file, args.workers, args.append, _print_file).row_count
+    if not args.append:
+        data_dao.save_match_results(month_id, [])
+    elapsed = time.perf_counter() - start
+    print(f"已导入 {count} 行到 {args.backend}/{args.month}（{_rate(count, elapsed)}）"
+          + ("，文件与已导入的数据相同，未重新解析" if cached else ""))
+
+    if args.match:
+        _match_month(db, backend_id, month_id, args.month, args.column)
+    else:
+        SummaryDAO(db).rebuild_from_db(month_id, args.column)
+
+
+def _import_sheets(db: Database, backend_id: int, args) -> None:
+    """按工作表导入一个工作簿，各工作表替换写入子表月份，清空匹配结果后匹配或重建汇总。"""
+    if len(args.file) != 1:
+        raise ValueError("--sheet / --all-sheets 只能配合一个文件使用")
+    if args.append or args.merge:
+        raise ValueError("--sheet / --all-sheets 不能与 --append、--merge 同时使用")
+    data_dao = ImportedDataDAO(db)
+
+    def _print_sheet(sheet_result):
+        if sheet_result.month_id is None:
+            print(f"  [{sheet_result.sheet}]: 空工作表，已跳过")
+        else:
+            print(f"  [{sheet_result.sheet}] -> {sheet_result.month_label}: {sheet_result.row_count} 行"
+                  f"（解析 {sheet_result.parse_seconds:.3f}s）")
+
+    sheets = None if args.all_sheets else args.sheet
+    result = import_sheets(db, backend_id, args.month, args.file[0], sheets, args.workers, _print_sheet)
+    print(f"已导入 {result.row_count} 行到 {args.backend}/{args.month} 的 "
+          f"{sum(1 for s in result.sheets if s.month_id is not None)} 个工作表"
+          f"（{_rate(result.row_count, result.seconds)}）")
+    for sheet_result in result.sheets:
+        if sheet_result.month_id is None:
+            continue
+        data_dao.save_match_results(sheet_result.month_id, [])
+        if args.match:
+            _match_month(db, backend_id, sheet_result.month_id, sheet_result.month_label, args.column)
+        else:
+            SummaryDAO(db).rebuild_from_db(sheet_result.month_id, args.column)
+
+
+def _merge_month(db: Database, backend_id: int, month_id: int, args) -> None:
+    """逐个文件合并到月份，按行去重；--match 时只对新增和被替换的行匹配。"""
+    if args.append:
+        raise ValueError("--merge 与 --append 不能同时使用")
+    data_dao = ImportedDataDAO(db)
+    drama_set = None
+    if args.match:
+        drama_set = DramaDAO(db).get_set(backend_id)
+        if not drama_set:
+            raise ValueError("剧名库为空，请先导入剧名")
+
+    start = time.perf_counter()
+    inserted = replaced = skipped = 0
+    for path in args.file:
+        headers, rows = ExcelImporter.iter_file(path, convert=False)
+        key_columns = resolve_columns(headers, args.key) if args.key else None
+        result = merge_rows(db, month_id, headers, rows, key_columns, args.replace, drama_set, args.column)
+        print(f"  {path}: 新增 {len(result.inserted)} 行，替换 {len(result.replaced)} 行，"
+              f"跳过重复 {result.skipped} 行")
+        inserted += len(result.inserted)
+        replaced += len(result.replaced)
+        skipped += result.skipped
+    elapsed = time.perf_counter() - start
+    total = inserted + replaced + skipped
+    print(f"已合并到 {args.backend}/{args.month}：新增 {inserted} 行，替换 {replaced} 行，"
+          f"跳过重复 {skipped} 行（{_rate(total, elapsed)}）")
+    if args.match:
+        print(f"{args.month}: 共匹配 {len(data_dao.get_match_results(month_id))} 行"
+              f"（总 {data_dao.count_rows(month_id)} 行）")
+
+
+def cmd_sheets(db: Database, args) -> None:
+    """列出工作簿中的工作表、声明的尺寸和活动工作表。"""
+    for info in ExcelImporter.list_sheets(args.file):
+        rows = "?" if info.max_row is None else max(info.max_row - 1, 0)
+        columns = "?" if info.max_column is None else info.max_column
+        print(f"{info.index + 1}. {info.name}\t{rows} 行 × {columns} 列" + ("\t（活动）" if info.active else ""))
+
+
+def cmd_match(db: Database, args) -> None:
+    """对单个月份执行匹配。"""
+    backend_id = resolve_backend(db, args.backend)
+    month_id = resolve_month(db, backend_id, args.month)
+    _match_month(db, backend_id, month_id, args.month, args.column)
+
+
+def cmd_match_all(db: Database, args) -> None:
+    """对后台下所有已导入数据的月份执行匹配。"""
+    backend_id = resolve_backend(db, args.backend)
+    data_dao = ImportedDataDAO(db)
+    months = [(mid, label) for mid, label in MonthDAO(db).list_all(backend_id) if data_dao.has_data(mid)]
+    if not months:
+        print("没有已导入数据的月份")
+        return
+    for month_id, label in months:
+        _match_month(db, backend_id, month_id, label, args.column)
+
+
+def cmd_export(db: Database, args) -> None:
+    """流式导出月份数据，匹配行高亮。"""
+    backend_id = resolve_backend(db, args.backend)
+    month_id = resolve_month(db, backend_id, args.month)
+    data_dao = ImportedDataDAO(db)
+    headers = data_dao.get_headers(month_id)
+    if not headers:
+        raise ValueError(f"月份 '{args.month}' 没有数据可导出")
+    matched = data_dao.get_match_results(month_id)
+
+    start = time.perf_counter()
+    count = Exporter.export_streaming(
+        args.out, headers, data_dao.iter_rows(month_id), matched,
+        total=data_dao.count_rows(month_id),
+    )
+    elapsed = time.perf_counter() - start
+    print(f"已导出 {count} 行（其中 {len(matched)} 行高亮）到 {args.out}（{_rate(count, elapsed)}）")
+
+
+def cmd_library_import(db: Database, args) -> None:
+    """从文件批量导入剧名库。"""
+    backend_id = resolve_backend(db, args.backend, create=args.create)
+    names = ExcelImporter.import_drama_names(args.file, args.column)
+    added = DramaDAO(db).add_batch(backend_id, names)
+    print(f"读取 {len(names)} 个剧名，新增 {added} 个")
+
+
+def cmd_watch(db: Database, args) -> None:
+    """监控目录入库，Ctrl+C 停止；--once 时只处理一轮。"""
+    service = IngestService(
+        db, args.dir, name_pattern=args.pattern, column=args.column,
+        workers=args.workers, create=args.create,
+        settle_seconds=0 if args.once else 2.0,
+    )
+    if args.once:
+        service.scan_once(_print_ingest_result)
+        return
+    print(f"正在监控 {args.dir}（每 {args.interval:g} 秒扫描一次，Ctrl+C 停止）")
+    stop_event = threading.Event()
+    try:
+        service.run_forever(stop_event, args.interval, _print_ingest_result)
+    except KeyboardInterrupt:
+        stop_event.set()
+
+
+def cmd_groupby(db: Database, args) -> None:
+    """逐页读取月份数据分组汇总，输出制表符分隔的表格。"""
+    backend_id = resolve_backend(db, args.backend)
+    month_id = resolve_month(db, backend_id, args.month)
+    data_dao = ImportedDataDAO(db)
+    headers = data_dao.get_headers(month_id)
+    if not headers:
+        raise ValueError(f"月份 '{args.month}' 没有导入数据")
+    grouping = GroupBy.from_headers(headers, args.by, args.values, args.agg)
+    matched = data_dao.get_match_results(month_id) if args.rows != "all" else []
+
+    start = time.perf_counter()
+    grouping.add_rows(data_dao.iter_rows(month_id), matched, args.rows)
+    summary = grouping.summary()
+    elapsed = time.perf_counter() - start
+    print(format_summary(summary, args.limit or None))
+    print(f"共 {len(summary.rows)} 个分组（{_rate(summary.source_rows, elapsed)}）")
+    if args.out:
+        Exporter.export_to_excel(args.out, summary.headers, summary.rows)
+        print(f"已写入 {args.out}")
+
+
+def cmd_diff(db: Database, args) -> None:
+    """逐页读取两个月份的数据，按剧名对比。"""
+    backend_id = resolve_backend(db, args.backend)
+    month_id = resolve_month(db, backend_id, args.month)
+    if args.base is None:
+        base = previous_month(MonthDAO(db).list_all(backend_id), month_id)
+        if base is None:
+            raise ValueError(f"月份 '{args.month}' 之前没有可对比的月份（或先后无法从标签确定），请用 --base 指定")
+        base_id, base_label = base
+    else:
+        base_id, base_label = resolve_month(db, backend_id, args.base), args.base
+    data_dao = ImportedDataDAO(db)
+    for mid, label in [(base_id, base_label), (month_id, args.month)]:
+        if not data_dao.get_headers(mid):
+            raise ValueError(f"月份 '{label}' 没有导入数据")
+
+    start = time.perf_counter()
+    diff = diff_months(
+        data_dao.get_headers(base_id), data_dao.iter_rows(base_id),
+        data_dao.get_headers(month_id), data_dao.iter_rows(month_id),
+        args.column, base_label, args.month, include_unchanged=args.all,
+    )
+    elapsed = time.perf_counter() - start
+    print(format_diff(diff, args.limit or None))
+    total = data_dao.count_rows(base_id) + data_dao.count_rows(month_id)
+    print(f"{base_label} -> {args.month}（{_rate(total, elapsed)}）")
+    if args.out:
+        Exporter.export_to_excel(args.out, *diff.table())
+        print(f"已写入 {args.out}")
+
+
+def _print_ingest_result(result) -> None:
+    name = f"{result.backend}/{result.month}"
+    if result.error:
+        print(f"[失败] {result.path} ({name}): {result.error}")
+    elif result.skipped:
+        print(f"[跳过] {result.path}: 内容与已入库文件相同")
+    else:
+        print(f"[完成] {result.path} -> {name}: {result.row_count} 行，"
+              f"匹配 {result.matched_count} 行（{_rate(result.row_count, result.seconds)}）")
+
+
+COMMANDS = {
+    "import-month": cmd_import_month,
+    "match": cmd_match,
+    "match-all": cmd_match_all,
+    "export": cmd_export,
+    "library-import": cmd_library_import,
+    "watch": cmd_watch,
+    "groupby": cmd_groupby,
+    "diff": cmd_diff,
+    "sheets": cmd_sheets,
+}
+
+
+def resolve_backend(db: Database, name: str, create: bool = False) -> int:
+    """按名称查找后台 ID，create=True 时不存在则创建。"""
+    backend_dao = BackendDAO(db)
+    backend_id = backend_dao.get_id(name)
+    if backend_id is None:
+        if not create:
+            raise ValueError(f"后台 '{name}' 不存在")
+        backend_id = backend_dao.create(name)
+    return backend_id
+
+
+def resolve_month(db: Database, backend_id: int, label: str, create: bool = False) -> int:
+    """按标签查找月份 ID，create=True 时不存在则创建。"""
+    month_dao = MonthDAO(db)
+    month_id = month_dao.get_id(backend_id, label)
+    if month_id is None:
+        if not create:
+            raise ValueError(f"月份 '{label}' 不存在")
+        month_id = month_dao.create(backend_id, label)
+    return month_id
+
+
+def _match_month(db: Database, backend_id: int, month_id: int, label: str, column: str) -> None:
+    """流式读取月份数据并与剧名库匹配，保存匹配结果。"""
+    data_dao = ImportedDataDAO(db)
+    headers = data_dao.get_headers(month_id)
+    if not headers:
+        raise ValueError(f"月份 '{label}' 没有导入数据")
+    drama_set = DramaDAO(db).get_set(backend_id)
+    if not drama_set:
+        raise ValueError("剧名库为空，请先导入剧名")
+    col_index = MatchEngine.find_column_index(headers, column)
+
+    start = time.perf_counter()
+    matched = MatchEngine.match(data_dao.iter_rows(month_id), col_index, drama_set)
+    data_dao.save_match_results(month_id, matched)
+    elapsed = time.perf_counter() - start
+    SummaryDAO(db).rebuild(month_id, headers, data_dao.iter_rows(month_id), matched, column)
+    total = data_dao.count_rows(month_id)
+    print(f"{label}: 共匹配 {len(matched)} 行（总 {total} 行，{_rate(total, elapsed)}）")
+
+
+def _rate(count: int, seconds: float) -> str:
+    """格式化耗时和吞吐量。"""
+    if seconds <= 0:
+        return f"{seconds:.3f}s"
+    return f"{seconds:.3f}s，{count / seconds:,.0f} 行/秒"
+
+
+if __name__ == "__main__":
+    # 打包为 exe 后进程池的子进程会重新启动程序本身，需先交给 multiprocessing 处理
+    multiprocessing.freeze_support()
+    main()
@@ -49,6 +49,19 @@ class BackendDAO:
         cursor = conn.execute("SELECT id, name FROM backends ORDER BY id")
         return cursor.fetchall()
 
+    def get_id(self, name: str) -> int | None:
+        """按名称查找后台 ID。
+
+        Args:
+            name: 后台名称。
+
+        Returns:
+            后台 ID，不存在时返回 None。
+        """
+        conn = self._db.get_connection()
+        row = conn.execute("SELECT id FROM backends WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
     def rename(self, backend_id: int, new_name: str) -> None:
         """重命名后台。
 
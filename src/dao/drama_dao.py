@@ -1,5 +1,6 @@
 """剧名库数据访问对象 - 管理 drama_names 表的 CRUD 操作。"""
 
+from src import tracing
 from src.database import Database
 
 
@@ -80,6 +81,7 @@ class DramaDAO:
         )
         return [row[0] for row in cursor.fetchall()]
 
+    @tracing.traced("DramaDAO.get_set")
     def get_set(self, backend_id: int) -> set[str]:
         """返回指定后台的剧名集合，用于快速匹配。
 
@@ -95,3 +97,19 @@ class DramaDAO:
             (backend_id,),
         )
         return {row[0] for row in cursor.fetchall()}
+
+    def get_version(self, backend_id: int) -> tuple[int, int]:
+        """返回剧名库的版本标识 (数量, 最大 ID)，剧名增删后会变化，用于缓存失效判断。
+
+        Args:
+            backend_id: 后台 ID。
+
+        Returns:
+            (剧名数量, 最大剧名 ID)。
+        """
+        conn = self._db.get_connection()
+        row = conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM drama_names WHERE backend_id = ?",
+            (backend_id,),
+        ).fetchone()
+        return row[0], row[1]
@@ -0,0 +1,73 @@
+"""导入缓存数据访问对象 - 管理 import_cache 表，记录哪个月份的数据恰为某个文件单独导入的结果。
+
+重新导入相同内容的文件时可直接复制该月份已编码的行，不再解析 Excel。
+月份数据被改写（追加、合并、替换）时 ImportedDataDAO 删除该月份的记录，
+被删除月份的记录随外键级联删除。
+"""
+
+from src.database import Database
+
+
+class ImportCacheDAO:
+    """导入缓存数据访问对象，提供文件指纹的登记与查询功能。"""
+
+    def __init__(self, db: Database):
+        self._db = db
+
+    def known_hash(self, file_path: str, file_size: int, file_mtime_ns: int) -> str | None:
+        """同一路径、大小和修改时间的文件已计算过的内容哈希，没有时返回 None。
+
+        Args:
+            file_path: 文件绝对路径。
+            file_size: 文件大小（字节）。
+            file_mtime_ns: 文件修改时间（纳秒）。
+
+        Returns:
+            内容哈希，或 None。
+        """
+        conn = self._db.get_connection()
+        row = conn.execute(
+            "SELECT file_hash FROM import_cache "
+            "WHERE file_path = ? AND file_size = ? AND file_mtime_ns = ? LIMIT 1",
+            (file_path, file_size, file_mtime_ns),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def find_month(self, file_hash: str, prefer_month_id: int | None = None) -> tuple[int, int] | None:
+        """查找数据为该文件导入结果的月份。
+
+        Args:
+            file_hash: 文件内容哈希。
+            prefer_month_id: 有多个月份时优先返回该月份。
+
+        Returns:
+            (月份 ID, 行数)，没有时返回 None。
+        """
+        conn = self._db.get_connection()
+        row = conn.execute(
+            "SELECT month_id, row_count FROM import_cache WHERE file_hash = ? "
+            "ORDER BY month_id = ? DESC, id DESC LIMIT 1",
+            (file_hash, prefer_month_id),
+        ).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def record(self, file_hash: str, file_size: int, file_mtime_ns: int, file_path: str,
+               month_id: int, row_count: int) -> None:
+        """登记月份的数据为该文件单独导入的结果（同一文件和月份重复登记时覆盖）。
+
+        Args:
+            file_hash: 文件内容哈希。
+            file_size: 文件大小（字节）。
+            file_mtime_ns: 文件修改时间（纳秒）。
+            file_path: 文件绝对路径。
+            month_id: 月份 ID。
+            row_count: 导入行数。
+        """
+        conn = self._db.get_connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO import_cache "
+            "(file_hash, file_size, file_mtime_ns, file_path, month_id, row_count) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (file_hash, file_size, file_mtime_ns, file_path, month_id, row_count),
+        )
+        conn.commit()
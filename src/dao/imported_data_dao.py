@@ -1,7 +1,16 @@
-"""导入数据访问对象 - 管理 imported_headers、imported_rows、match_results 表。"""
+"""导入数据访问对象 - 管理 imported_headers、imported_rows、match_results 表，改写数据时清除月份的导入缓存记录。"""
 
+import hashlib
 import json
+from collections.abc import Iterable, Iterator
+
+from src import tracing
 from src.database import Database
+from src.models import MergeResult
+from src.schema import convert_row, number_columns, typed_rows
+
+# iter_rows 每次从游标取出的行数
+PAGE_SIZE = 1000
 
 
 class ImportedDataDAO:
@@ -10,28 +19,185 @@ class ImportedDataDAO:
     def __init__(self, db: Database):
         self._db = db
 
-    def save_data(self, month_id: int, headers: list[str], rows: list[list]) -> None:
-        """保存导入数据（先清除旧数据再写入）。
+    def save_data(self, month_id: int, headers: list[str], rows: Iterable[list], append: bool = False) -> int:
+        """保存导入数据（先清除旧数据再写入；append 为 True 时追加到已有数据之后）。
+
+        rows 可以是任意可迭代对象（如 ExcelImporter.iter_file(..., convert=False) 返回的迭代器），
+        逐行编码写入，不要求整表在内存中。写入前抽样推断列类型（见 src.schema），
+        转换数值列中以文本保存的数字，列类型与表头一起保存。
+        追加时沿用已保存的表头、列类型和行键，表头不一致时抛出 ValueError。
+        写入出错（包括 rows 迭代时抛出的异常）时回滚，月份数据保持不变。
 
         Args:
             month_id: 月份 ID。
             headers: 表头列名列表。
-            rows: 每行数据列表的列表。
+            rows: 每行数据列表的可迭代对象。
+            append: 是否追加。
+
+        Returns:
+            写入的行数。
         """
         conn = self._db.get_connection()
-        conn.execute("DELETE FROM imported_rows WHERE month_id = ?", (month_id,))
-        conn.execute("DELETE FROM imported_headers WHERE month_id = ?", (month_id,))
+        with tracing.span("ImportedDataDAO.save_data") as sp:
+            existing = self.get_headers(month_id) if append else []
+            try:
+                self._forget_cache(month_id)
+                if existing:
+                    if existing != headers:
+                        raise ValueError(f"表头与月份已有数据不一致: {headers} != {existing}")
+                    columns = number_columns(self.get_column_types(month_id))
+                    rows = (convert_row(row, columns) for row in rows) if columns else rows
+                    key_columns = self.get_row_key(month_id)
+                    start = self._next_row_index(month_id)
+                else:
+                    column_types, rows = typed_rows(rows, len(headers))
+                    self._replace_headers(month_id, headers, column_types, None)
+                    key_columns = None
+                    start = 0
+                count = self._insert_rows(month_id, enumerate(rows, start), key_columns)
+            except BaseException:
+                conn.rollback()
+                raise
+            with tracing.span("ImportedDataDAO.save_data.提交"):
+                conn.commit()
+            sp.set_rows(count)
+        return count
 
-        conn.execute(
-            "INSERT INTO imported_headers (month_id, headers_json) VALUES (?, ?)",
-            (month_id, json.dumps(headers, ensure_ascii=False)),
-        )
-        for idx, row in enumerate(rows):
-            conn.execute(
-                "INSERT INTO imported_rows (month_id, row_index, row_json) VALUES (?, ?, ?)",
-                (month_id, idx, json.dumps(row, ensure_ascii=False)),
-            )
-        conn.commit()
+    def merge_data(self, month_id: int, headers: list[str], rows: Iterable[list],
+                   key_columns: list[int] | None = None, replace: bool = False) -> MergeResult:
+        """按行哈希合并导入：已存在的行跳过（replace 为 True 时替换），只写入差异。
+
+        行哈希保存在 imported_rows.row_hash（带索引）。key_columns 为 None 时按整行判断重复，
+        否则按这些列的取值（文本去除首尾空格）判断；与月份上次使用的键不同时先重新计算已有行的哈希。
+        替换时键相同的已有行（可能有多行）全部改为新行内容，行下标不变；
+        本次数据中键重复的行，跳过模式保留第一行，替换模式保留最后一行。
+        月份没有数据时等同于首次导入。出错时回滚。
+
+        Args:
+            month_id: 月份 ID。
+            headers: 表头列名列表，需与月份已有数据一致。
+            rows: 每行数据列表的可迭代对象。
+            key_columns: 作为行键的列下标，None 表示整行。
+            replace: 是否替换键相同的已有行。
+
+        Returns:
+            MergeResult：新增行、被替换行（含旧内容）和跳过的行数。
+        """
+        conn = self._db.get_connection()
+        result = MergeResult()
+        with tracing.span("ImportedDataDAO.merge_data") as sp:
+            existing = self.get_headers(month_id)
+            try:
+                if existing:
+                    if existing != headers:
+                        raise ValueError(f"表头与月份已有数据不一致: {headers} != {existing}")
+                    columns = number_columns(self.get_column_types(month_id))
+                    if key_columns != self.get_row_key(month_id) or self._has_unhashed_rows(month_id):
+                        self._rehash(month_id, key_columns)
+                else:
+                    column_types, rows = typed_rows(rows, len(headers))
+                    columns = []
+                    self._replace_headers(month_id, headers, column_types, key_columns)
+
+                # 新增行：哈希 -> (行, JSON)，保持首次出现的顺序；替换：哈希 -> (行, JSON)
+                inserts: dict[int, tuple[list, str]] = {}
+                replacements: dict[int, tuple[list, str]] = {}
+                for row in rows:
+                    row = convert_row(row, columns) if columns else row
+                    text = json.dumps(row, ensure_ascii=False)
+                    digest = row_hash(row, text, key_columns)
+                    if digest in inserts:
+                        result.skipped += 1
+                        if replace:
+                            inserts[digest] = (row, text)
+                    elif digest in replacements or (existing and self._has_hash(month_id, digest)):
+                        if replace:
+                            if digest in replacements:
+                                result.skipped += 1
+                            replacements[digest] = (row, text)
+                        else:
+                            result.skipped += 1
+                    else:
+                        inserts[digest] = (row, text)
+
+                for digest, (row, text) in replacements.items():
+                    old_rows = conn.execute(
+                        "SELECT row_index, row_json FROM imported_rows WHERE month_id = ? AND row_hash = ?",
+                        (month_id, digest),
+                    ).fetchall()
+                    changed = [(idx, json.loads(old_json), row) for idx, old_json in old_rows if old_json != text]
+                    if not changed:
+                        result.skipped += 1
+                        continue
+                    result.replaced.extend(changed)
+                    conn.execute(
+                        "UPDATE imported_rows SET row_json = ? WHERE month_id = ? AND row_hash = ?",
+                        (text, month_id, digest),
+                    )
+                result.start_index = self._next_row_index(month_id)
+                result.inserted = [row for row, _ in inserts.values()]
+                if result.inserted or result.replaced or not existing:
+                    self._forget_cache(month_id)
+                self._insert_rows(
+                    month_id,
+                    ((idx, row) for idx, (row, _) in enumerate(inserts.values(), result.start_index)),
+                    key_columns,
+                )
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            sp.set_rows(len(result.inserted) + len(result.replaced))
+        return result
+
+    def copy_month(self, source_month_id: int, month_id: int) -> int:
+        """用源月份的表头、列类型和已编码的行替换月份数据（在 SQLite 内复制，不解码行）。
+
+        匹配结果不复制。出错时回滚。
+
+        Args:
+            source_month_id: 源月份 ID。
+            month_id: 目标月份 ID。
+
+        Returns:
+            复制的行数。
+        """
+        if source_month_id == month_id:
+            return self.count_rows(month_id)
+        conn = self._db.get_connection()
+        with tracing.span("ImportedDataDAO.copy_month") as sp:
+            try:
+                self._forget_cache(month_id)
+                conn.execute("DELETE FROM imported_rows WHERE month_id = ?", (month_id,))
+                conn.execute("DELETE FROM imported_headers WHERE month_id = ?", (month_id,))
+                conn.execute(
+                    "INSERT INTO imported_headers (month_id, headers_json, column_types_json, row_key_json) "
+                    "SELECT ?, headers_json, column_types_json, row_key_json FROM imported_headers "
+                    "WHERE month_id = ?",
+                    (month_id, source_month_id),
+                )
+                count = conn.execute(
+                    "INSERT INTO imported_rows (month_id, row_index, row_json, row_hash) "
+                    "SELECT ?, row_index, row_json, row_hash FROM imported_rows "
+                    "WHERE month_id = ? ORDER BY row_index",
+                    (month_id, source_month_id),
+                ).rowcount
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            sp.set_rows(count)
+        return count
+
+    def get_row_key(self, month_id: int) -> list[int] | None:
+        """获取月份行哈希使用的键列下标，None 表示整行（或月份没有数据）。"""
+        conn = self._db.get_connection()
+        row = conn.execute(
+            "SELECT row_key_json FROM imported_headers WHERE month_id = ?", (month_id,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
 
     def get_headers(self, month_id: int) -> list[str]:
         """获取表头。
@@ -51,6 +217,24 @@ class ImportedDataDAO:
             return []
         return json.loads(row[0])
 
+    def get_column_types(self, month_id: int) -> list[str]:
+        """获取导入时推断的列类型（src.schema 的 NUMBER / TEXT / EMPTY）。
+
+        Args:
+            month_id: 月份 ID。
+
+        Returns:
+            与表头一一对应的列类型列表；无数据或旧版本导入（未记录类型）时返回空列表。
+        """
+        conn = self._db.get_connection()
+        row = conn.execute(
+            "SELECT column_types_json FROM imported_headers WHERE month_id = ?",
+            (month_id,),
+        ).fetchone()
+        if row is None or row[0] is None:
+            return []
+        return json.loads(row[0])
+
     def get_all_rows(self, month_id: int) -> list[list]:
         """获取所有行数据，按 row_index 排序。
 
@@ -60,13 +244,90 @@ class ImportedDataDAO:
         Returns:
             行数据列表，每行为一个列表。
         """
+        return self.decode_rows(self.fetch_row_json(month_id))
+
+    def fetch_row_json(self, month_id: int) -> list[str]:
+        """读取所有行的原始 JSON 文本（不解码），按 row_index 排序。
+
+        与 decode_rows 分开，便于分别统计数据库读取和 JSON 解码的耗时。
+
+        Args:
+            month_id: 月份 ID。
+
+        Returns:
+            每行的 JSON 文本列表。
+        """
+        conn = self._db.get_connection()
+        with tracing.span("ImportedDataDAO.fetch_row_json") as sp:
+            cursor = conn.execute(
+                "SELECT row_json FROM imported_rows WHERE month_id = ? ORDER BY row_index",
+                (month_id,),
+            )
+            row_jsons = [r[0] for r in cursor.fetchall()]
+            sp.set_rows(len(row_jsons))
+        return row_jsons
+
+    @staticmethod
+    def decode_rows(row_jsons: list[str]) -> list[list]:
+        """将 fetch_row_json 返回的 JSON 文本解码为行数据列表。
+
+        Args:
+            row_jsons: 每行的 JSON 文本列表。
+
+        Returns:
+            行数据列表，每行为一个列表。
+        """
+        with tracing.span("ImportedDataDAO.decode_rows", len(row_jsons)):
+            return [json.loads(text) for text in row_jsons]
+
+    @staticmethod
+    def iter_decode_rows(row_jsons: Iterable[str]) -> Iterator[list]:
+        """逐行解码 JSON 文本，配合 MonthTable.from_rows 使用时不必先生成整表的行列表。
+
+        Args:
+            row_jsons: 每行的 JSON 文本。
+
+        Yields:
+            每行数据列表。
+        """
+        for text in row_jsons:
+            yield json.loads(text)
+
+    def iter_rows(self, month_id: int, page_size: int = PAGE_SIZE) -> Iterator[list]:
+        """按 row_index 顺序逐页读取并解码行数据，不一次性载入整月数据。
+
+        Args:
+            month_id: 月份 ID。
+            page_size: 每次从游标读取的行数。
+
+        Yields:
+            每行数据列表。
+        """
         conn = self._db.get_connection()
         cursor = conn.execute(
             "SELECT row_json FROM imported_rows WHERE month_id = ? ORDER BY row_index",
             (month_id,),
         )
-        return [json.loads(r[0]) for r in cursor.fetchall()]
+        while True:
+            page = cursor.fetchmany(page_size)
+            if not page:
+                return
+            for (row_json,) in page:
+                yield json.loads(row_json)
+
+    def count_rows(self, month_id: int) -> int:
+        """返回月份的数据行数。
+
+        Args:
+            month_id: 月份 ID。
+        """
+        conn = self._db.get_connection()
+        row = conn.execute(
+            "SELECT COUNT(*) FROM imported_rows WHERE month_id = ?", (month_id,)
+        ).fetchone()
+        return row[0]
 
+    @tracing.traced("ImportedDataDAO.save_match_results")
     def save_match_results(self, month_id: int, matched_indices: list[int]) -> None:
         """保存匹配结果（行索引列表）。
 
@@ -81,6 +342,7 @@ class ImportedDataDAO:
         )
         conn.commit()
 
+    @tracing.traced("ImportedDataDAO.get_match_results")
     def get_match_results(self, month_id: int) -> list[int]:
         """获取匹配结果行索引列表。
 
@@ -114,3 +376,87 @@ class ImportedDataDAO:
             (month_id,),
         ).fetchone()
         return row is not None
+
+    # --- private helpers ---
+
+    def _replace_headers(self, month_id: int, headers: list[str], column_types: list[str],
+                         key_columns: list[int] | None) -> None:
+        """清除月份已有数据，写入表头、列类型和行键（在调用方的事务中执行）。"""
+        conn = self._db.get_connection()
+        conn.execute("DELETE FROM imported_rows WHERE month_id = ?", (month_id,))
+        conn.execute("DELETE FROM imported_headers WHERE month_id = ?", (month_id,))
+        conn.execute(
+            "INSERT INTO imported_headers (month_id, headers_json, column_types_json, row_key_json) "
+            "VALUES (?, ?, ?, ?)",
+            (month_id, json.dumps(headers, ensure_ascii=False), json.dumps(column_types),
+             None if key_columns is None else json.dumps(key_columns)),
+        )
+
+    def _insert_rows(self, month_id: int, indexed_rows: Iterable[tuple[int, list]],
+                     key_columns: list[int] | None) -> int:
+        """逐行编码并写入 (row_index, 行)，返回写入的行数（在调用方的事务中执行）。"""
+        count = 0
+
+        def _params():
+            nonlocal count
+            for idx, row in indexed_rows:
+                count += 1
+                text = json.dumps(row, ensure_ascii=False)
+                yield month_id, idx, text, row_hash(row, text, key_columns)
+
+        # 取行与 JSON 编码的耗时单独记录，其余为 SQLite 写入（rows 为流式迭代器时含上游解析）
+        self._db.get_connection().executemany(
+            "INSERT INTO imported_rows (month_id, row_index, row_json, row_hash) VALUES (?, ?, ?, ?)",
+            tracing.timed_iter("ImportedDataDAO.save_data.取行编码", _params()),
+        )
+        return count
+
+    def _forget_cache(self, month_id: int) -> None:
+        # 月份数据不再是某个文件单独导入的结果
+        self._db.get_connection().execute("DELETE FROM import_cache WHERE month_id = ?", (month_id,))
+
+    def _next_row_index(self, month_id: int) -> int:
+        return self._db.get_connection().execute(
+            "SELECT COALESCE(MAX(row_index) + 1, 0) FROM imported_rows WHERE month_id = ?",
+            (month_id,),
+        ).fetchone()[0]
+
+    def _has_hash(self, month_id: int, digest: int) -> bool:
+        return self._db.get_connection().execute(
+            "SELECT 1 FROM imported_rows WHERE month_id = ? AND row_hash = ? LIMIT 1",
+            (month_id, digest),
+        ).fetchone() is not None
+
+    def _has_unhashed_rows(self, month_id: int) -> bool:
+        # 升级前导入的行没有哈希
+        return self._db.get_connection().execute(
+            "SELECT 1 FROM imported_rows WHERE month_id = ? AND row_hash IS NULL LIMIT 1",
+            (month_id,),
+        ).fetchone() is not None
+
+    def _rehash(self, month_id: int, key_columns: list[int] | None) -> None:
+        """按新的行键重新计算月份已有行的哈希（在调用方的事务中执行）。"""
+        conn = self._db.get_connection()
+        with tracing.span("ImportedDataDAO.rehash") as sp:
+            cursor = conn.execute(
+                "SELECT id, row_json FROM imported_rows WHERE month_id = ?", (month_id,)
+            )
+            params = [(row_hash(json.loads(text), text, key_columns), row_id) for row_id, text in cursor]
+            conn.executemany("UPDATE imported_rows SET row_hash = ? WHERE id = ?", params)
+            conn.execute(
+                "UPDATE imported_headers SET row_key_json = ? WHERE month_id = ?",
+                (None if key_columns is None else json.dumps(key_columns), month_id),
+            )
+            sp.set_rows(len(params))
+
+
+def row_hash(row: list, text: str, key_columns: list[int] | None = None) -> int:
+    """
+    行哈希（8 字节有符号整数，可直接存入 SQLite INTEGER）。
+    key_columns 为 None 时对整行的 JSON 文本 text 计算，否则对键列取值（文本去除首尾空格）计算。
+    """
+    if key_columns is not None:
+        length = len(row)
+        key = [row[i] if i < length else None for i in key_columns]
+        text = json.dumps([v.strip() if type(v) is str else v for v in key], ensure_ascii=False)
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big", signed=True)
@@ -0,0 +1,61 @@
+"""入库记录数据访问对象 - 管理 ingested_files 表，按文件内容哈希保证重复文件只处理一次。"""
+
+from src.database import Database
+
+
+class IngestDAO:
+    """入库记录数据访问对象，提供已处理文件的登记与查询功能。"""
+
+    def __init__(self, db: Database):
+        self._db = db
+
+    def is_ingested(self, file_hash: str) -> bool:
+        """检查该内容哈希的文件是否已入库。
+
+        Args:
+            file_hash: 文件内容哈希。
+
+        Returns:
+            True 如果已入库。
+        """
+        conn = self._db.get_connection()
+        row = conn.execute(
+            "SELECT 1 FROM ingested_files WHERE file_hash = ?", (file_hash,)
+        ).fetchone()
+        return row is not None
+
+    def record(self, file_hash: str, file_name: str, month_id: int,
+               row_count: int, matched_count: int) -> None:
+        """登记一个已入库的文件（同一哈希重复登记时覆盖）。
+
+        Args:
+            file_hash: 文件内容哈希。
+            file_name: 文件名。
+            month_id: 导入到的月份 ID。
+            row_count: 导入行数。
+            matched_count: 匹配行数。
+        """
+        conn = self._db.get_connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO ingested_files "
+            "(file_hash, file_name, month_id, row_count, matched_count) VALUES (?, ?, ?, ?, ?)",
+            (file_hash, file_name, month_id, row_count, matched_count),
+        )
+        conn.commit()
+
+    def list_recent(self, limit: int = 50) -> list[tuple[str, int, int, int, str]]:
+        """返回最近入库的文件。
+
+        Args:
+            limit: 最多返回条数。
+
+        Returns:
+            (file_name, month_id, row_count, matched_count, ingested_at) 元组列表，最新的在前。
+        """
+        conn = self._db.get_connection()
+        cursor = conn.execute(
+            "SELECT file_name, month_id, row_count, matched_count, ingested_at "
+            "FROM ingested_files ORDER BY id DESC LIMIT ?",
+            (limit,),
+        )
+        return cursor.fetchall()
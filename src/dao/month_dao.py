@@ -1,8 +1,77 @@
-"""月份数据访问对象 - 管理 months 表的 CRUD 操作。"""
+"""月份数据访问对象 - 管理 months 表的 CRUD 操作。
 
+月份标签是用户输入的文本，months 表按创建顺序编号；需要按时间先后排列时
+用 month_sort_key 解析标签（如 "2026年01月"、"2026-01"、"1月"），不依赖 ID 顺序。
+"""
+
+import re
 import sqlite3
 from src.database import Database
 
+# 工作表子表的月份标签："<月份>/<工作表>"
+SUBTABLE_SEPARATOR = "/"
+
+# 月份标签：可选的四位年份 + 1-2 位月份，如 "2026年01月"、"2026-1"、"202601"、"1月"
+_MONTH_PATTERN = re.compile(r"\s*(?:(\d{4})\s*[-年./_]?\s*)?(\d{1,2})\s*(?:月份?)?\s*")
+
+
+def parse_month_label(label: str) -> tuple[int, int] | None:
+    """解析月份标签，返回 (年份, 月份)，没有年份时年份为 0；无法识别时返回 None。"""
+    m = _MONTH_PATTERN.fullmatch(label)
+    if m is None or not 1 <= int(m.group(2)) <= 12:
+        return None
+    return int(m.group(1) or 0), int(m.group(2))
+
+
+def split_month_label(label: str) -> tuple[str, str]:
+    """拆分子表月份标签为 (月份, 工作表)，普通月份的工作表为空字符串。"""
+    if parse_month_label(label) is not None:
+        return label, ""
+    month, sep, sheet = label.partition(SUBTABLE_SEPARATOR)
+    return (month, sheet) if sep else (label, "")
+
+
+def month_sort_key(label: str, month_id: int = 0) -> tuple:
+    """
+    月份的排序键：可识别的标签按 (年份, 月份) 排在前面，子表紧跟在所属月份之后；
+    无法识别的标签排在最后，按 ID（创建顺序）排列。
+    """
+    month, sheet = split_month_label(label)
+    parsed = parse_month_label(month)
+    return parsed is None, parsed or (0, 0), sheet, month_id
+
+
+def previous_month(months: list[tuple[int, str]], month_id: int) -> tuple[int, str] | None:
+    """
+    按标签中的年月找出 month_id 的上一个月份（子表只与同名工作表的子表比较）。
+
+    Args:
+        months: 后台的 (月份 ID, 标签) 列表，顺序不限。
+        month_id: 当前月份 ID。
+
+    Returns:
+        上一个月份的 (ID, 标签)；当前标签无法识别、没有更早的月份，
+        或更早的月份中最近的年月对应多个标签（先后无法确定）时返回 None。
+    """
+    label = dict(months)[month_id]
+    month, sheet = split_month_label(label)
+    current = parse_month_label(month)
+    if current is None:
+        return None
+    candidates = {}
+    for mid, other in months:
+        other_month, other_sheet = split_month_label(other)
+        parsed = parse_month_label(other_month)
+        # 有年份和没有年份的标签无法比较先后
+        if mid == month_id or other_sheet != sheet or parsed is None or (parsed[0] == 0) != (current[0] == 0):
+            continue
+        if parsed < current:
+            candidates.setdefault(parsed, []).append((mid, other))
+    if not candidates:
+        return None
+    nearest = candidates[max(candidates)]
+    return nearest[0] if len(nearest) == 1 else None
+
 
 class MonthDAO:
     """月份数据访问对象，提供月份空间的创建、删除和查询功能。"""
@@ -61,6 +130,23 @@ class MonthDAO:
         )
         return cursor.fetchall()
 
+    def get_id(self, backend_id: int, label: str) -> int | None:
+        """按标签查找月份 ID。
+
+        Args:
+            backend_id: 后台 ID。
+            label: 月份标签。
+
+        Returns:
+            月份 ID，不存在时返回 None。
+        """
+        conn = self._db.get_connection()
+        row = conn.execute(
+            "SELECT id FROM months WHERE backend_id = ? AND label = ?",
+            (backend_id, label),
+        ).fetchone()
+        return row[0] if row else None
+
     def rename(self, month_id: int, new_label: str) -> None:
         """重命名月份。
 
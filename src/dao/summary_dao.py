@@ -0,0 +1,272 @@
+"""月度汇总数据访问对象 - 管理 month_summaries 表，跨月份查询剧名趋势和按月、按年合计。
+
+汇总在导入、匹配时由 rebuild() 重新生成：每个月份按 (剧名, 是否匹配) 分组，
+记录行数和各数值列的合计、数值个数。查询只读汇总表，不解码原始行数据。
+"""
+
+import re
+from collections.abc import Iterable
+
+from src import tracing
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import month_sort_key
+from src.database import Database
+from src.groupby import GroupBy
+from src.match_engine import MatchEngine
+
+DEFAULT_TITLE_COLUMN = "合集名称"
+
+# 月份标签中的年份（如 "2026年01月" -> 2026），没有年份的月份归入 OTHER_YEAR
+_YEAR_PATTERN = re.compile(r"(\d{4})")
+OTHER_YEAR = "其他"
+
+
+class SummaryDAO:
+    """月度汇总数据访问对象，提供汇总的重建和跨月份查询功能。"""
+
+    def __init__(self, db: Database):
+        self._db = db
+
+    def rebuild(self, month_id: int, headers: list[str], rows: Iterable,
+                matched_indices: Iterable[int], title_column: str = DEFAULT_TITLE_COLUMN) -> int:
+        """重新生成月份汇总（替换该月已有汇总）。
+
+        表头中没有剧名列时只清除旧汇总。
+
+        Args:
+            month_id: 月份 ID。
+            headers: 表头列名列表。
+            rows: 行数据（MonthTable、行列表或 ImportedDataDAO.iter_rows 的迭代器）。
+            matched_indices: 匹配行的索引。
+            title_column: 剧名列名。
+
+        Returns:
+            写入的分组数（剧名 × 是否匹配）。
+        """
+        conn = self._db.get_connection()
+        with tracing.span("SummaryDAO.rebuild") as sp:
+            try:
+                conn.execute("DELETE FROM month_summaries WHERE month_id = ?", (month_id,))
+                try:
+                    title_index = MatchEngine.find_column_index(headers, title_column)
+                except ValueError:
+                    conn.commit()
+                    return 0
+                grouping = _group(headers, title_index, rows, matched_indices)
+                conn.executemany(_UPSERT_SQL, _summary_params(month_id, headers, title_index, grouping))
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            sp.set_rows(grouping.group_count)
+        return grouping.group_count
+
+    def apply_delta(self, month_id: int, headers: list[str], removed: list[tuple[list, bool]],
+                    added: list[tuple[list, bool]], title_column: str = DEFAULT_TITLE_COLUMN) -> int:
+        """按变化的行增量更新月份汇总（合并导入时使用），月份还没有汇总时从数据库重建。
+
+        先减去 removed 行、再加上 added 行的行数和合计，清除行数减为 0 的分组。
+
+        Args:
+            month_id: 月份 ID。
+            headers: 表头列名列表。
+            removed: 被删除或替换前的 (行, 是否匹配) 列表。
+            added: 新增或替换后的 (行, 是否匹配) 列表。
+            title_column: 剧名列名。
+
+        Returns:
+            更新的分组数。
+        """
+        conn = self._db.get_connection()
+        has_summary = conn.execute(
+            "SELECT 1 FROM month_summaries WHERE month_id = ? LIMIT 1", (month_id,)
+        ).fetchone()
+        if has_summary is None:
+            return self.rebuild_from_db(month_id, title_column)
+        try:
+            title_index = MatchEngine.find_column_index(headers, title_column)
+        except ValueError:
+            return 0
+        with tracing.span("SummaryDAO.apply_delta") as sp:
+            count = 0
+            try:
+                for changes, sign in ((removed, -1), (added, 1)):
+                    rows = [row for row, _ in changes]
+                    matched = [i for i, (_, is_matched) in enumerate(changes) if is_matched]
+                    grouping = _group(headers, title_index, rows, matched)
+                    conn.executemany(_UPSERT_SQL, _summary_params(month_id, headers, title_index, grouping, sign))
+                    count += grouping.group_count
+                conn.execute(
+                    "DELETE FROM month_summaries WHERE month_id = ? AND "
+                    "(row_count <= 0 OR (column_name != '' AND value_count <= 0))",
+                    (month_id,),
+                )
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            sp.set_rows(count)
+        return count
+
+    def rebuild_from_db(self, month_id: int, title_column: str = DEFAULT_TITLE_COLUMN) -> int:
+        """从数据库逐页读取月份数据和匹配结果，重新生成汇总。
+
+        Args:
+            month_id: 月份 ID。
+            title_column: 剧名列名。
+
+        Returns:
+            写入的分组数。
+        """
+        data_dao = ImportedDataDAO(self._db)
+        headers = data_dao.get_headers(month_id)
+        matched = data_dao.get_match_results(month_id)
+        return self.rebuild(month_id, headers, data_dao.iter_rows(month_id), matched, title_column)
+
+    def title_trend(self, backend_id: int, title: str) -> list[tuple[str, int, int, dict[str, float]]]:
+        """查询剧名在后台各月份的数据。
+
+        Args:
+            backend_id: 后台 ID。
+            title: 剧名（去除首尾空格后精确匹配）。
+
+        Returns:
+            (月份标签, 行数, 匹配行数, {数值列: 合计}) 元组列表，只包含有该剧名的月份，按标签中的年月排序
+            （见 month_sort_key，无法识别的标签排在最后）。
+        """
+        conn = self._db.get_connection()
+        cursor = conn.execute(
+            "SELECT m.id, m.label, s.matched, s.column_name, s.total, s.row_count "
+            "FROM month_summaries s JOIN months m ON m.id = s.month_id "
+            "WHERE m.backend_id = ? AND s.title = ? ORDER BY m.id",
+            (backend_id, title.strip()),
+        )
+        months: dict[int, list] = {}
+        for month_id, label, matched, column_name, total, row_count in cursor.fetchall():
+            item = months.setdefault(month_id, [label, 0, 0, {}])
+            if column_name == "":
+                item[1] += row_count
+                if matched:
+                    item[2] += row_count
+            else:
+                item[3][column_name] = item[3].get(column_name, 0.0) + total
+        return [tuple(item) for _, item in sorted(months.items(), key=lambda m: month_sort_key(m[1][0], m[0]))]
+
+    def totals_by_month(self, backend_id: int,
+                        matched: bool | None = None) -> list[tuple[str, int, dict[str, float]]]:
+        """按月份汇总后台的行数和各数值列合计。
+
+        Args:
+            backend_id: 后台 ID。
+            matched: True 只统计匹配行，False 只统计未匹配行，None 统计全部。
+
+        Returns:
+            (月份标签, 行数, {数值列: 合计}) 元组列表，只包含有汇总的月份，按标签中的年月排序
+            （见 month_sort_key，无法识别的标签排在最后）。
+        """
+        sql = (
+            "SELECT m.id, m.label, s.column_name, SUM(s.total), SUM(s.row_count) "
+            "FROM month_summaries s JOIN months m ON m.id = s.month_id WHERE m.backend_id = ?"
+        )
+        params: list = [backend_id]
+        if matched is not None:
+            sql += " AND s.matched = ?"
+            params.append(int(matched))
+        sql += " GROUP BY m.id, s.column_name ORDER BY m.id"
+
+        conn = self._db.get_connection()
+        months: dict[int, list] = {}
+        for month_id, label, column_name, total, row_count in conn.execute(sql, params).fetchall():
+            item = months.setdefault(month_id, [label, 0, {}])
+            if column_name == "":
+                item[1] = row_count
+            else:
+                item[2][column_name] = total
+        return [tuple(item) for _, item in sorted(months.items(), key=lambda m: month_sort_key(m[1][0], m[0]))]
+
+    def totals_by_year(self, backend_id: int,
+                       matched: bool | None = None) -> list[tuple[str, int, dict[str, float]]]:
+        """按年份（取月份标签中的四位数字）汇总，参数同 totals_by_month。
+
+        Returns:
+            (年份, 行数, {数值列: 合计}) 元组列表，按年份首次出现的顺序；没有年份的月份归入 "其他"。
+        """
+        years: dict[str, list] = {}
+        for label, row_count, totals in self.totals_by_month(backend_id, matched):
+            match = _YEAR_PATTERN.search(label)
+            item = years.setdefault(match.group(1) if match else OTHER_YEAR, [0, {}])
+            item[0] += row_count
+            for column_name, total in totals.items():
+                item[1][column_name] = item[1].get(column_name, 0.0) + total
+        return [(year, row_count, totals) for year, (row_count, totals) in years.items()]
+
+    def search_titles(self, backend_id: int, keyword: str, limit: int = 100) -> list[str]:
+        """按关键词查找后台汇总中出现过的剧名。
+
+        Args:
+            backend_id: 后台 ID。
+            keyword: 关键词（包含匹配）。
+            limit: 最多返回条数。
+
+        Returns:
+            剧名列表，按名称排序。
+        """
+        conn = self._db.get_connection()
+        cursor = conn.execute(
+            "SELECT DISTINCT s.title FROM month_summaries s JOIN months m ON m.id = s.month_id "
+            "WHERE m.backend_id = ? AND instr(s.title, ?) > 0 ORDER BY s.title LIMIT ?",
+            (backend_id, keyword.strip(), limit),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def months_without_summary(self, backend_id: int) -> list[tuple[int, str]]:
+        """返回有导入数据但没有汇总的月份（如升级前导入的月份）。
+
+        Args:
+            backend_id: 后台 ID。
+
+        Returns:
+            (id, label) 元组列表，按月份 ID 升序。
+        """
+        conn = self._db.get_connection()
+        cursor = conn.execute(
+            "SELECT m.id, m.label FROM months m JOIN imported_headers h ON h.month_id = m.id "
+            "WHERE m.backend_id = ? AND NOT EXISTS "
+            "(SELECT 1 FROM month_summaries s WHERE s.month_id = m.id) ORDER BY m.id",
+            (backend_id,),
+        )
+        return cursor.fetchall()
+
+
+# 不同类型的剧名（如 123 与 "123"）转为文本后相同时合并
+_UPSERT_SQL = (
+    "INSERT INTO month_summaries "
+    "(month_id, title, matched, column_name, total, value_count, row_count) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(month_id, title, matched, column_name) DO UPDATE SET "
+    "total = total + excluded.total, value_count = value_count + excluded.value_count, "
+    "row_count = row_count + excluded.row_count"
+)
+
+
+def _group(headers: list[str], title_index: int, rows: Iterable, matched_indices: Iterable[int]) -> GroupBy:
+    """按 (剧名, 是否匹配) 分组，累加除剧名列外各列的数值。"""
+    value_columns = [i for i in range(len(headers)) if i != title_index]
+    grouping = GroupBy([title_index], value_columns, split_matched=True)
+    grouping.add_rows(rows, matched_indices)
+    return grouping
+
+
+def _summary_params(month_id: int, headers: list[str], title_index: int, grouping: GroupBy,
+                    sign: int = 1) -> list[tuple]:
+    """分组结果转换为 month_summaries 的写入参数，sign 为 -1 时各数值取反（用于减去）。"""
+    value_columns = [i for i in range(len(headers)) if i != title_index]
+    params = []
+    for (title, matched), row_count, stats in grouping.iter_groups():
+        title = "" if title is None else str(title)
+        params.append((month_id, title, int(matched), "", 0.0, 0, sign * row_count))
+        for col, (total, count, _, _) in zip(value_columns, stats):
+            if count:
+                params.append((month_id, title, int(matched), str(headers[col]),
+                               sign * total, sign * count, sign * row_count))
+    return params
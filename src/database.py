@@ -2,6 +2,8 @@
 
 import sqlite3
 
+from src.query_stats import InstrumentedConnection, QueryStats
+
 
 class Database:
     """SQLite 数据库管理器，负责连接管理和表创建。"""
@@ -10,12 +12,33 @@ class Database:
         """初始化数据库连接，启用外键，创建所有表。"""
         self._conn = sqlite3.connect(db_path)
         self._conn.execute("PRAGMA foreign_keys = ON")
+        self._instrumented = None
         self._create_tables()
 
     def get_connection(self) -> sqlite3.Connection:
-        """获取数据库连接。"""
+        """获取数据库连接。开启语句统计后返回带计时的包装连接。"""
+        if self._instrumented is not None:
+            return self._instrumented
         return self._conn
 
+    def enable_query_stats(self, slow_query_ms: float | None = None) -> QueryStats:
+        """开启 SQL 语句统计（可重复调用，仅更新慢查询阈值），返回统计对象。
+
+        Args:
+            slow_query_ms: 慢查询阈值（毫秒），None 表示不输出慢查询。
+        """
+        if self._instrumented is None:
+            self._instrumented = InstrumentedConnection(self._conn, QueryStats(slow_query_ms))
+        self._instrumented.stats.slow_query_ms = slow_query_ms
+        return self._instrumented.stats
+
+    @property
+    def query_stats(self) -> QueryStats | None:
+        """SQL 语句统计对象，未开启时为 None。"""
+        if self._instrumented is None:
+            return None
+        return self._instrumented.stats
+
     def close(self):
         """关闭数据库连接。"""
         self._conn.close()
@@ -56,6 +79,8 @@ class Database:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 month_id INTEGER NOT NULL UNIQUE,
                 headers_json TEXT NOT NULL,
+                column_types_json TEXT,
+                row_key_json TEXT,
                 FOREIGN KEY (month_id) REFERENCES months(id) ON DELETE CASCADE
             )
         """)
@@ -66,6 +91,7 @@ class Database:
                 month_id INTEGER NOT NULL,
                 row_index INTEGER NOT NULL,
                 row_json TEXT NOT NULL,
+                row_hash INTEGER,
                 FOREIGN KEY (month_id) REFERENCES months(id) ON DELETE CASCADE
             )
         """)
@@ -79,4 +105,76 @@ class Database:
             )
         """)
 
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ingested_files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_hash TEXT NOT NULL UNIQUE,
+                file_name TEXT NOT NULL,
+                month_id INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                matched_count INTEGER NOT NULL,
+                ingested_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime')),
+                FOREIGN KEY (month_id) REFERENCES months(id) ON DELETE CASCADE
+            )
+        """)
+
+        # 导入缓存：month_id 的数据恰为该文件（按大小、修改时间和内容哈希识别）单独导入的解析结果，
+        # 月份数据被改写时删除对应记录
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_hash TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                file_mtime_ns INTEGER NOT NULL,
+                file_path TEXT NOT NULL,
+                month_id INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                cached_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime')),
+                FOREIGN KEY (month_id) REFERENCES months(id) ON DELETE CASCADE,
+                UNIQUE(file_hash, month_id)
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_import_cache_path ON import_cache(file_path)"
+        )
+
+        # 月度汇总：每个月份按 (剧名, 是否匹配, 数值列) 的合计，column_name 为空串的一行只记录行数
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS month_summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                month_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                matched INTEGER NOT NULL,
+                column_name TEXT NOT NULL,
+                total REAL NOT NULL,
+                value_count INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                FOREIGN KEY (month_id) REFERENCES months(id) ON DELETE CASCADE,
+                UNIQUE(month_id, title, matched, column_name)
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_month_summaries_title ON month_summaries(title)"
+        )
+
+        self._migrate(cursor)
         self._conn.commit()
+
+    # 旧版本数据库需要补充的列：(表, 列, 类型)
+    _ADDED_COLUMNS = [
+        ("imported_headers", "column_types_json", "TEXT"),
+        ("imported_headers", "row_key_json", "TEXT"),
+        ("imported_rows", "row_hash", "INTEGER"),
+    ]
+
+    @staticmethod
+    def _migrate(cursor):
+        """为旧版本创建的数据库补充新增的列和索引。"""
+        for table, column, column_type in Database._ADDED_COLUMNS:
+            columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        # 合并导入时按行哈希查找重复行
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_imported_rows_hash ON imported_rows(month_id, row_hash)"
+        )
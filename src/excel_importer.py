@@ -1,10 +1,16 @@
 """Excel 导入器：读取 Excel 文件数据和从 Excel/文本文件导入剧名列表。"""
 
 import os
+from collections.abc import Iterator
+
+from src import memprofile, tracing
+from src.models import SheetInfo
+from src.schema import typed_rows
 
 
 class ExcelImporter:
     @staticmethod
+    @memprofile.profiled("ExcelImporter.import_file")
     def import_file(file_path: str) -> tuple[list[str], list[list]]:
         """
         读取 Excel 文件，返回 (headers, rows)。
@@ -12,17 +18,61 @@ class ExcelImporter:
         rows: 其余行数据列表的列表
         支持 .xlsx 和 .xls 格式。
         """
-        if not os.path.isfile(file_path):
-            raise FileNotFoundError(f"文件未找到: {file_path}")
-
-        ext = os.path.splitext(file_path)[1].lower()
+        with tracing.span("ExcelImporter.import_file") as sp:
+            headers, rows = ExcelImporter.iter_file(file_path)
+            rows = list(rows)
+            sp.set_rows(len(rows))
+        return headers, rows
 
+    @staticmethod
+    def iter_file(file_path: str, sheet: str | None = None,
+                  convert: bool = True) -> tuple[list[str], Iterator[list]]:
+        """
+        流式读取 Excel 文件，返回 (headers, rows 迭代器)。
+        sheet 为工作表名称，默认读取活动工作表（.xls 为第一个工作表），只解析该工作表。
+        .xlsx 以只读模式逐行解析，迭代结束（或迭代器被关闭）时释放文件。
+        convert 为 True 时将数值列中以文本保存的数字（"12,345.6"、"1.2万"）转换为数值，见 src.schema；
+        写入数据库的调用方传 False，由 ImportedDataDAO 推断一次列类型并转换。
+        """
+        ext = ExcelImporter._check_workbook(file_path)
         if ext == ".xlsx":
-            return ExcelImporter._import_file_xlsx(file_path)
-        elif ext == ".xls":
-            return ExcelImporter._import_file_xls(file_path)
+            headers, rows = ExcelImporter._iter_file_xlsx(file_path, sheet)
         else:
-            raise ValueError(f"不支持的文件格式: '{ext}'。支持 .xlsx 和 .xls 格式")
+            headers, rows = ExcelImporter._iter_file_xls(file_path, sheet)
+        # 追踪开启时单独记录逐行解析的耗时
+        rows = tracing.timed_iter("ExcelImporter.解析行", rows)
+        if convert:
+            _, rows = typed_rows(rows, len(headers))
+        return headers, rows
+
+    @staticmethod
+    def list_sheets(file_path: str) -> list[SheetInfo]:
+        """
+        读取工作簿中各工作表的名称和尺寸，不解析单元格数据。
+        .xlsx 的尺寸取自工作表声明的维度（可能不准确，未声明时为 None）；
+        .xls 只读取工作表名称，尺寸为 None。
+        """
+        ext = ExcelImporter._check_workbook(file_path)
+        if ext == ".xlsx":
+            from openpyxl import load_workbook
+
+            wb = load_workbook(file_path, read_only=True)
+            try:
+                active = wb.active.title if wb.active is not None else None
+                return [
+                    SheetInfo(ws.title, index, ws.max_row, ws.max_column, ws.title == active)
+                    for index, ws in enumerate(wb.worksheets)
+                ]
+            finally:
+                wb.close()
+
+        import xlrd
+
+        wb = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            return [SheetInfo(name, index, active=index == 0) for index, name in enumerate(wb.sheet_names())]
+        finally:
+            wb.release_resources()
 
     @staticmethod
     def import_drama_names(file_path: str, column_id: str = None) -> list[str]:
@@ -47,38 +97,72 @@ class ExcelImporter:
     # --- private helpers ---
 
     @staticmethod
-    def _import_file_xlsx(file_path: str) -> tuple[list[str], list[list]]:
+    def _check_workbook(file_path: str) -> str:
+        """检查文件存在且为 .xlsx / .xls，返回小写的扩展名。"""
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"文件未找到: {file_path}")
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext not in (".xlsx", ".xls"):
+            raise ValueError(f"不支持的文件格式: '{ext}'。支持 .xlsx 和 .xls 格式")
+        return ext
+
+    @staticmethod
+    def _iter_file_xlsx(file_path: str, sheet: str | None = None) -> tuple[list[str], Iterator[list]]:
         from openpyxl import load_workbook
 
-        wb = load_workbook(file_path, read_only=False)
+        wb = load_workbook(file_path, read_only=True)
         try:
-            ws = wb.active
-            rows_iter = ws.iter_rows()
+            if sheet is None:
+                ws = wb.active
+            elif sheet in wb.sheetnames:
+                ws = wb[sheet]
+            else:
+                raise ValueError(f"工作表不存在: {sheet}。可用的工作表: {wb.sheetnames}")
+            # 维度信息可能不准确：记下声明的列数后重置，按实际内容读取
+            declared_max_col = ws.max_column or 0
+            ws.reset_dimensions()
+            rows_iter = ws.iter_rows(min_row=1, values_only=True)
 
             # 读取表头
             first_row = next(rows_iter, None)
-            if first_row is None:
-                return [], []
-            headers = [str(cell.value) if cell.value is not None else "" for cell in first_row]
-
-            # 读取数据行
-            rows = []
-            for row in rows_iter:
-                row_data = [ExcelImporter._convert_cell_value(cell.value) for cell in row]
-                rows.append(row_data)
-            return headers, rows
-        finally:
+        except BaseException:
+            wb.close()
+            raise
+        if first_row is None:
             wb.close()
+            return [], iter(())
+
+        width = max(len(first_row), declared_max_col)
+        headers = [str(value) if value is not None else "" for value in first_row]
+        headers.extend([""] * (width - len(headers)))
+
+        def _rows():
+            try:
+                for row in rows_iter:
+                    row_data = [ExcelImporter._convert_cell_value(value) for value in row]
+                    if len(row_data) < width:
+                        row_data.extend([None] * (width - len(row_data)))
+                    yield row_data
+            finally:
+                wb.close()
+
+        return headers, _rows()
 
     @staticmethod
-    def _import_file_xls(file_path: str) -> tuple[list[str], list[list]]:
+    def _iter_file_xls(file_path: str, sheet: str | None = None) -> tuple[list[str], Iterator[list]]:
         import xlrd
 
-        wb = xlrd.open_workbook(file_path)
-        ws = wb.sheet_by_index(0)
+        # 按需加载：只解析读取的工作表
+        wb = xlrd.open_workbook(file_path, on_demand=True)
+        if sheet is None:
+            ws = wb.sheet_by_index(0)
+        elif sheet in wb.sheet_names():
+            ws = wb.sheet_by_name(sheet)
+        else:
+            raise ValueError(f"工作表不存在: {sheet}。可用的工作表: {wb.sheet_names()}")
 
         if ws.nrows == 0:
-            return [], []
+            return [], iter(())
 
         # 读取表头
         headers = [
@@ -87,14 +171,14 @@ class ExcelImporter:
         ]
 
         # 读取数据行
-        rows = []
-        for row_idx in range(1, ws.nrows):
-            row_data = [
-                ExcelImporter._convert_xls_cell(ws, row_idx, col_idx)
-                for col_idx in range(ws.ncols)
-            ]
-            rows.append(row_data)
-        return headers, rows
+        def _rows():
+            for row_idx in range(1, ws.nrows):
+                yield [
+                    ExcelImporter._convert_xls_cell(ws, row_idx, col_idx)
+                    for col_idx in range(ws.ncols)
+                ]
+
+        return headers, _rows()
 
     @staticmethod
     def _import_names_from_text(file_path: str) -> list[str]:
@@ -112,19 +196,26 @@ class ExcelImporter:
     @staticmethod
     def _import_names_xlsx(file_path: str, column_id: str = None) -> list[str]:
         from openpyxl import load_workbook
+        from src.reader import resolve_header_index
 
-        wb = load_workbook(file_path, read_only=False)
+        wb = load_workbook(file_path, read_only=True)
         try:
             ws = wb.active
-            if ws.max_row is None or ws.max_row < 1:
+            declared_max_col = ws.max_column or 0
+            ws.reset_dimensions()
+            header = next(ws.iter_rows(max_row=1, values_only=True), None)
+            if header is None:
                 return []
 
             # 确定列索引（1-based）
-            col_idx = ExcelImporter._resolve_xlsx_column(ws, column_id)
+            if column_id is None:
+                col_idx = 1
+            else:
+                col_idx = resolve_header_index(list(header), column_id, max(len(header), declared_max_col))
 
             names = []
-            for row_num in range(2, ws.max_row + 1):
-                cell_value = ws.cell(row=row_num, column=col_idx).value
+            column = ws.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx, values_only=True)
+            for (cell_value,) in column:
                 if cell_value is not None:
                     name = str(cell_value).strip()
                     if name:
@@ -147,37 +238,13 @@ class ExcelImporter:
         col_idx = ExcelImporter._resolve_xls_column(ws, column_id)
 
         names = []
-        for row_num in range(1, ws.nrows):
-            cell_value = ws.cell_value(row_num, col_idx)
+        for cell_value in ws.col_values(col_idx, start_rowx=1):
             if cell_value is not None:
                 name = str(cell_value).strip()
                 if name:
                     names.append(name)
         return names
 
-    @staticmethod
-    def _resolve_xlsx_column(ws, column_id: str = None) -> int:
-        """解析 xlsx 列索引（返回 1-based）。column_id 为 None 时返回第一列。"""
-        if column_id is None:
-            return 1
-
-        # 先尝试按表头名匹配
-        for cell in ws[1]:
-            if cell.value is not None and str(cell.value).strip() == column_id.strip():
-                return cell.column
-
-        # 再尝试解析为数字列号
-        try:
-            col_num = int(column_id)
-            if 1 <= col_num <= ws.max_column:
-                return col_num
-            raise ValueError(f"列号 {col_num} 超出范围（1-{ws.max_column}）")
-        except ValueError as e:
-            if "超出范围" in str(e):
-                raise
-            headers = [str(c.value).strip() for c in ws[1] if c.value is not None]
-            raise ValueError(f"列标识 '{column_id}' 未找到。可用的列名: {headers}")
-
     @staticmethod
     def _resolve_xls_column(ws, column_id: str = None) -> int:
         """解析 xls 列索引（返回 0-based）。column_id 为 None 时返回第一列。"""
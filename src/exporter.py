@@ -1,39 +1,132 @@
-"""数据导出器：将数据导出为 Excel 文件。"""
+"""数据导出器：将数据导出为 Excel 文件。
+
+导出基于 openpyxl 的 write-only 模式流式写入：每行只写一次，匹配行在写入时
+直接带上共享的高亮样式，内存占用与行数无关。
+"""
+
+import os
+import tempfile
+from collections.abc import Callable, Iterable
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill
 
+from src import memprofile, tracing
 
 YELLOW_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
 
+# 每写入多少行回调一次进度、检查一次取消
+PROGRESS_INTERVAL = 1000
+
+
+class ExportCancelled(Exception):
+    """导出被用户取消。目标文件不会被写入。"""
+
 
 class Exporter:
     @staticmethod
-    def export_to_excel(file_path: str, headers: list[str], rows: list[list]) -> None:
+    def export_to_excel(file_path: str, headers: list[str], rows: Iterable[list]) -> None:
         """将数据导出为 Excel 文件。"""
-        wb = Workbook()
-        ws = wb.active
-        if headers:
-            ws.append(headers)
-        for row in rows:
-            ws.append(row)
-        wb.save(file_path)
+        Exporter.export_streaming(file_path, headers, rows)
 
     @staticmethod
-    def export_with_highlight(file_path: str, headers: list[str], rows: list[list],
-                              matched_indices: list[int]) -> None:
+    @memprofile.profiled("Exporter.export_with_highlight")
+    def export_with_highlight(file_path: str, headers: list[str], rows: Iterable[list],
+                              matched_indices: list[int], progress_callback=None,
+                              cancel_check=None) -> None:
         """导出完整表格，匹配行高亮黄色。"""
-        wb = Workbook()
-        ws = wb.active
+        total = len(rows) if hasattr(rows, "__len__") else None
+        Exporter.export_streaming(
+            file_path, headers, rows, matched_indices,
+            total=total, progress_callback=progress_callback, cancel_check=cancel_check,
+        )
+
+    @staticmethod
+    def export_streaming(file_path: str, headers: list[str], rows: Iterable[list],
+                         matched_indices: Iterable[int] = (), fill: PatternFill = YELLOW_FILL,
+                         total: int | None = None,
+                         progress_callback: Callable[[int, int | None], None] | None = None,
+                         cancel_check: Callable[[], bool] | None = None) -> int:
+        """
+        流式导出：从行迭代器逐行写入 write-only 工作簿，匹配行写入时直接应用高亮。
+
+        Args:
+            file_path: 目标 .xlsx 文件路径。
+            headers: 表头列名列表，为空时不写表头。
+            rows: 数据行的可迭代对象（0-based 行索引与 matched_indices 对应）。
+            matched_indices: 需要高亮的行索引。
+            fill: 高亮填充样式，所有匹配单元格共享同一个样式。
+            total: 总行数（可选），仅用于进度回调。
+            progress_callback: 进度回调 callback(已写入行数, total)。
+            cancel_check: 返回 True 时中止导出并抛出 ExportCancelled。
+
+        Returns:
+            写入的数据行数（不含表头）。
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
         if headers:
-            ws.append(headers)
+            ws.append(list(headers))
 
         matched_set = set(matched_indices)
-        for i, row in enumerate(rows):
-            ws.append(row)
-            if i in matched_set:
-                excel_row = i + 2  # +1 表头 +1 openpyxl 1-based
-                for col in range(1, len(headers) + 1):
-                    ws.cell(row=excel_row, column=col).fill = YELLOW_FILL
-
-        wb.save(file_path)
+        num_columns = len(headers)
+        written = 0
+        with tracing.span("Exporter.写入行") as sp:
+            for i, row in enumerate(rows):
+                if i in matched_set:
+                    # 与旧实现保持一致：至少高亮到表头宽度
+                    values = list(row)
+                    if len(values) < num_columns:
+                        values.extend([None] * (num_columns - len(values)))
+                    cells = []
+                    for value in values:
+                        cell = WriteOnlyCell(ws, value=value)
+                        cell.fill = fill
+                        cells.append(cell)
+                    ws.append(cells)
+                else:
+                    ws.append(list(row))
+                written += 1
+
+                if written % PROGRESS_INTERVAL == 0:
+                    if cancel_check is not None and cancel_check():
+                        _discard(wb, ws)
+                        raise ExportCancelled("导出已取消")
+                    if progress_callback is not None:
+                        progress_callback(written, total)
+            sp.set_rows(written)
+
+        if cancel_check is not None and cancel_check():
+            _discard(wb, ws)
+            raise ExportCancelled("导出已取消")
+        with tracing.span("Exporter.保存", written):
+            wb.save(file_path)
+        if progress_callback is not None:
+            progress_callback(written, total)
+        return written
+
+
+def _discard(wb, ws) -> None:
+    """
+    结束 write-only 工作表的写入流并删除其临时文件（取消导出时使用）。
+
+    openpyxl 没有公开的丢弃接口：有私有的 _writer.cleanup() 时直接删除临时文件；
+    否则用公开接口保存到一个临时路径（保存时 openpyxl 会删除工作表的临时文件）后删除该文件。
+    """
+    cleanup = _writer_cleanup(ws)
+    if cleanup is not None:
+        ws.close()
+        cleanup()
+        return
+    fd, tmp_path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        wb.save(tmp_path)
+    finally:
+        os.remove(tmp_path)
+
+
+def _writer_cleanup(ws):
+    """write-only 工作表私有的临时文件清理方法（openpyxl 3.1），不存在时返回 None。"""
+    return getattr(getattr(ws, "_writer", None), "cleanup", None)
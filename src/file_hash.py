@@ -0,0 +1,14 @@
+"""文件内容指纹：流式计算文件哈希，用于判断文件是否已处理过。"""
+
+import hashlib
+
+CHUNK_SIZE = 1 << 20
+
+
+def hash_file(file_path: str) -> str:
+    """流式计算文件内容的 SHA-256，返回十六进制字符串。"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
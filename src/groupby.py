@@ -0,0 +1,263 @@
+"""分组汇总（类似 Excel 数据透视表）：按一列或多列分组，对数值列求和、计数、平均、最小、最大。
+
+哈希聚合，逐行流式处理：rows 可以是 ImportedDataDAO.iter_rows 逐页读取的迭代器，
+也可以是内存中的 MonthTable。每个分组只保存一组累加器，不保存分组内的行，
+内存只与分组数有关，与行数无关。
+
+分组键中的文本去除首尾空格（与匹配时的比较方式一致），缺失值作为单独的一组。
+数值指 int / float，其它取值不参与聚合。
+
+用法：
+    from src.groupby import GroupBy
+
+    grouping = GroupBy.from_headers(headers, ["合集名称"], ["收入"], ["sum", "count"])
+    grouping.add_rows(data_dao.iter_rows(month_id))
+    summary = grouping.summary()
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from operator import itemgetter
+
+from src import tracing
+from src.month_table import MonthTable
+
+# 聚合名 -> 表头中显示的名称
+AGGREGATIONS = {
+    "sum": "求和",
+    "count": "计数",
+    "mean": "平均",
+    "min": "最小",
+    "max": "最大",
+}
+
+ROW_COUNT_HEADER = "行数"
+MATCHED_HEADER = "匹配"
+
+
+@dataclass
+class GroupSummary:
+    """分组汇总结果"""
+    headers: list[str]            # 分组列名 + 行数 + "<数值列> <聚合>"
+    rows: list[list]              # 每个分组一行，按第一个聚合值（无数值列时按行数）降序
+    source_rows: int              # 参与分组的数据行数
+
+
+def resolve_columns(headers: list[str], columns: Iterable) -> list[int]:
+    """
+    将列名或列号（从 1 开始）解析为列下标。未找到时抛出 ValueError。
+    """
+    indices = []
+    for column in columns:
+        if isinstance(column, int):
+            index = column - 1
+        else:
+            name = str(column).strip()
+            names = [str(h).strip() for h in headers]
+            if name in names:
+                index = names.index(name)
+            elif name.isdigit():
+                index = int(name) - 1
+            else:
+                raise ValueError(f"未找到列: {name}。可用的列名: {names}")
+        if not 0 <= index < len(headers):
+            raise ValueError(f"列号 {index + 1} 超出范围（1-{len(headers)}）")
+        indices.append(index)
+    return indices
+
+
+class GroupBy:
+    """流式哈希分组聚合器。"""
+
+    def __init__(self, key_columns: list[int], value_columns: list[int],
+                 aggregations: Iterable[str] = ("sum",),
+                 key_headers: list[str] | None = None, value_headers: list[str] | None = None,
+                 split_matched: bool = False):
+        """
+        Args:
+            key_columns: 分组列下标
+            value_columns: 聚合的数值列下标
+            aggregations: 聚合，取自 AGGREGATIONS
+            key_headers / value_headers: 结果表头中使用的列名，默认为 "列1"、"列2"...
+            split_matched: 为 True 时把行是否匹配作为最后一个分组键（结果中显示为 是 / 否）
+        """
+        if not key_columns:
+            raise ValueError("至少需要一个分组列")
+        self.aggregations = list(aggregations)
+        for name in self.aggregations:
+            if name not in AGGREGATIONS:
+                raise ValueError(f"无效的聚合: {name}")
+        self.key_columns = list(key_columns)
+        self.value_columns = list(value_columns)
+        self.key_headers = key_headers or [f"列{i + 1}" for i in self.key_columns]
+        self.value_headers = value_headers or [f"列{i + 1}" for i in self.value_columns]
+        self.split_matched = split_matched
+        # 分组键（只有一个分组列时为该列的值，否则为元组）
+        # -> [行数, 各数值列的 (和, 个数, 最小, 最大) 依次展开]
+        self._groups: dict = {}
+        self._rows = 0
+
+    @classmethod
+    def from_headers(cls, headers: list[str], keys: Iterable, values: Iterable,
+                     aggregations: Iterable[str] = ("sum",)) -> "GroupBy":
+        """按列名或列号（从 1 开始）创建。"""
+        key_columns = resolve_columns(headers, keys)
+        value_columns = resolve_columns(headers, values)
+        return cls(
+            key_columns, value_columns, aggregations,
+            key_headers=[headers[i] for i in key_columns],
+            value_headers=[headers[i] for i in value_columns],
+        )
+
+    @property
+    def group_count(self) -> int:
+        """当前的分组数。"""
+        return len(self._groups)
+
+    def add(self, row) -> None:
+        """累加一行。"""
+        self.add_rows([row])
+
+    def add_rows(self, rows: Iterable, matched_indices: Iterable[int] = (), mode: str = "all") -> None:
+        """
+        累加多行。rows 为 MonthTable 时按列读取，不逐行创建 RowView。
+        mode 与 filter_rows 相同："all" = 全部, "matched" = 仅匹配, "unmatched" = 仅未匹配，
+        按行在 rows 中的顺序（从 0 开始）与 matched_indices 比较。
+        """
+        if mode not in ("all", "matched", "unmatched"):
+            raise ValueError(f"无效的筛选模式: {mode}")
+        columns = self.key_columns + self.value_columns
+        if isinstance(rows, MonthTable):
+            selected = rows.iter_columns(columns)
+        else:
+            selected = _select(rows, columns)
+        if mode != "all" or self.split_matched:
+            matched_set = set(matched_indices)
+        if mode != "all":
+            keep = mode == "matched"
+            selected = (values for index, values in enumerate(selected) if (index in matched_set) == keep)
+        if self.split_matched:
+            num_keys = len(self.key_columns)
+            selected = (values[:num_keys] + (index in matched_set,) + values[num_keys:]
+                        for index, values in enumerate(selected))
+        with tracing.span("GroupBy.add_rows") as sp:
+            sp.set_rows(self._accumulate(selected))
+
+    def _accumulate(self, selected: Iterable[tuple]) -> int:
+        groups = self._groups
+        num_keys = self._num_keys
+        num_values = len(self.value_columns)
+        single_key = num_keys == 1
+        count = 0
+        for values in selected:
+            count += 1
+            if single_key:
+                key = values[0]
+                if type(key) is str:
+                    key = key.strip()
+            else:
+                key = tuple(v.strip() if type(v) is str else v for v in values[:num_keys])
+            acc = groups.get(key)
+            if acc is None:
+                acc = groups[key] = [0] + [0.0, 0, None, None] * num_values
+            acc[0] += 1
+            pos = 1
+            for value in values[num_keys:]:
+                if isinstance(value, (int, float)):
+                    acc[pos] += value
+                    acc[pos + 1] += 1
+                    low = acc[pos + 2]
+                    if low is None or value < low:
+                        acc[pos + 2] = value
+                    high = acc[pos + 3]
+                    if high is None or value > high:
+                        acc[pos + 3] = value
+                pos += 4
+        self._rows += count
+        return count
+
+    @property
+    def _num_keys(self) -> int:
+        return len(self.key_columns) + (1 if self.split_matched else 0)
+
+    def iter_groups(self) -> Iterator[tuple[tuple, int, list[tuple]]]:
+        """
+        依次返回 (分组键元组, 行数, [各数值列的 (和, 数值个数, 最小, 最大)])，按分组首次出现的顺序。
+        split_matched 时分组键最后一项为 bool。
+        """
+        single_key = self._num_keys == 1
+        for key, acc in self._groups.items():
+            stats = [tuple(acc[pos:pos + 4]) for pos in range(1, len(acc), 4)]
+            yield ((key,) if single_key else key), acc[0], stats
+
+    def summary(self) -> GroupSummary:
+        """生成汇总结果。"""
+        headers = list(self.key_headers) + ([MATCHED_HEADER] if self.split_matched else []) + [ROW_COUNT_HEADER]
+        for name in self.value_headers:
+            headers.extend(f"{name} {AGGREGATIONS[agg]}" for agg in self.aggregations)
+
+        result = []
+        for key, row_count, stats in self.iter_groups():
+            line = ["" if value is None else value for value in key]
+            if self.split_matched:
+                line[-1] = "是" if line[-1] else "否"
+            line.append(row_count)
+            for total, count, low, high in stats:
+                line.extend(_aggregate_value(agg, total, count, low, high) for agg in self.aggregations)
+            result.append(line)
+
+        sort_pos = self._num_keys + (1 if self.value_columns and self.aggregations else 0)
+        result.sort(key=lambda line: _sort_value(line[sort_pos]), reverse=True)
+        return GroupSummary(headers, result, self._rows)
+
+
+def _select(rows: Iterable, columns: list[int]) -> Iterator[tuple]:
+    """逐行取出 columns 列组成元组，行较短时缺失的列为 None。"""
+    getter = itemgetter(*columns)
+    single = len(columns) == 1
+    for row in rows:
+        try:
+            values = getter(row)
+        except IndexError:
+            length = len(row)
+            yield tuple(row[i] if i < length else None for i in columns)
+            continue
+        yield (values,) if single else values
+
+
+def _aggregate_value(name: str, total: float, count: int, low, high):
+    if name == "count":
+        return count
+    if not count:
+        return None
+    if name == "sum":
+        return total
+    if name == "mean":
+        return total / count
+    if name == "min":
+        return low
+    return high
+
+
+def _sort_value(value) -> float:
+    return value if isinstance(value, (int, float)) else float("-inf")
+
+
+def format_summary(summary: GroupSummary, limit: int | None = None) -> str:
+    """格式化为文本表格（制表符分隔，可直接粘贴到 Excel），最多 limit 个分组。"""
+    lines = ["\t".join(summary.headers)]
+    shown = summary.rows if limit is None else summary.rows[:limit]
+    for row in shown:
+        lines.append("\t".join(format_cell(value) for value in row))
+    if len(shown) < len(summary.rows):
+        lines.append(f"... 另有 {len(summary.rows) - len(shown)} 个分组")
+    return "\n".join(lines)
+
+
+def format_cell(value) -> str:
+    """格式化汇总结果中的单元格：缺失为空，浮点数保留两位小数（整数值不带小数）。"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.0f}" if value.is_integer() else f"{value:.2f}"
+    return str(value)
@@ -51,6 +51,8 @@ class BackendView:
         tk.Button(btn_frame, text="重命名", font=FONT, command=self._rename_month).pack(side=tk.LEFT, padx=8)
         tk.Button(btn_frame, text="删除月份", font=FONT, command=self._delete_month).pack(side=tk.LEFT, padx=8)
         tk.Button(btn_frame, text="管理剧名库", font=FONT, command=self._open_drama_library).pack(side=tk.LEFT, padx=8)
+        tk.Button(btn_frame, text="趋势分析", font=FONT, command=self._open_trend).pack(side=tk.LEFT, padx=8)
+        tk.Button(btn_frame, text="月份对比", font=FONT, command=self._open_diff).pack(side=tk.LEFT, padx=8)
 
         self._refresh_list()
 
@@ -119,6 +121,20 @@ class BackendView:
         from src.gui.drama_library_dialog import DramaLibraryDialog
         DramaLibraryDialog(self.parent, self.db, self.backend_id)
 
+    def _open_trend(self):
+        """打开趋势分析对话框（剧名跨月份趋势、按月 / 按年合计）。"""
+        from src.gui.trend_dialog import TrendDialog
+        TrendDialog(self.parent, self.db, self.backend_id, self.backend_name)
+
+    def _open_diff(self):
+        """打开月份对比对话框，默认对比选中月份与标签年月上的上一个月份。"""
+        if len(self._months) < 2:
+            messagebox.showinfo("提示", "至少需要两个月份才能对比", parent=self.parent)
+            return
+        from src.gui.diff_dialog import DiffDialog
+        sel = self.listbox.curselection()
+        DiffDialog(self.parent, self.db, self._months, sel[0] if sel else None)
+
     def _enter_month(self):
         """双击月份进入月份数据界面。"""
         sel = self.listbox.curselection()
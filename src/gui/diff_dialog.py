@@ -0,0 +1,175 @@
+"""月份对比对话框 - 选择同一后台的两个月份，按剧名列出新增、消失和数据变化的剧名，可导出。"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+from src.database import Database
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import previous_month
+from src.exporter import Exporter
+from src.groupby import format_cell
+from src.month_diff import ADDED, CHANGED, REMOVED, STATUSES, MonthDiff, diff_months
+
+FONT = ("Microsoft YaHei", 11)
+FONT_SMALL = ("Microsoft YaHei", 10)
+
+# 表格中最多显示的行数（导出包含全部）
+MAX_DISPLAY_ROWS = 1000
+
+
+def default_labels(months: list[tuple[int, str]], default_index: int | None = None) -> tuple[str, str]:
+    """
+    对话框默认的 (旧月份, 新月份) 标签。
+
+    新月份为 months[default_index]（None 为最后一项）；旧月份为标签年月上的上一个月份
+    （见 previous_month），无法确定时为空字符串，由用户选择。
+    """
+    if not months:
+        return "", ""
+    if default_index is None:
+        default_index = len(months) - 1
+    month_id, new_label = months[default_index]
+    base = previous_month(months, month_id)
+    return (base[1] if base else ""), new_label
+
+
+class DiffDialog(tk.Toplevel):
+    """月份对比弹窗。"""
+
+    def __init__(self, parent, db: Database, months: list[tuple[int, str]], default_index: int | None = None):
+        """
+        Args:
+            parent: 父窗口
+            db: 数据库
+            months: 后台的 (月份 ID, 标签) 列表，按 ID 升序
+            default_index: 默认作为新月份的下标，None 为最后一项；旧月份默认为标签年月上的
+                上一个月份，无法确定时留空由用户选择（见 default_labels）
+        """
+        super().__init__(parent)
+        self.db = db
+        self.months = months
+        self.data_dao = ImportedDataDAO(db)
+        self._diff: MonthDiff | None = None
+
+        labels = [label for _, label in months]
+        old_label, new_label = default_labels(months, default_index)
+        self.new_var = tk.StringVar(value=new_label)
+        self.old_var = tk.StringVar(value=old_label)
+        self.status_var = tk.StringVar(value="")
+
+        self.title("月份对比")
+        self.geometry("900x600")
+        self.resizable(True, True)
+        self.transient(parent)
+        self._build(labels)
+        if new_label and not old_label:
+            self.info_label.config(text=f"无法从标签确定 \"{new_label}\" 的上一个月份，请选择旧月份")
+
+    def _build(self, labels: list[str]):
+        """构建对话框界面。"""
+        options = tk.Frame(self)
+        options.pack(fill=tk.X, padx=8, pady=8)
+        tk.Label(options, text="旧月份：", font=FONT).pack(side=tk.LEFT)
+        ttk.Combobox(options, textvariable=self.old_var, values=labels, state="readonly",
+                     width=14).pack(side=tk.LEFT)
+        tk.Label(options, text="  新月份：", font=FONT).pack(side=tk.LEFT)
+        ttk.Combobox(options, textvariable=self.new_var, values=labels, state="readonly",
+                     width=14).pack(side=tk.LEFT)
+        tk.Button(options, text="对比", font=FONT, command=self._compare).pack(side=tk.LEFT, padx=8)
+
+        tk.Label(options, text="显示：", font=FONT_SMALL).pack(side=tk.LEFT, padx=(16, 0))
+        for text, val in [("全部", ""), (ADDED, ADDED), (REMOVED, REMOVED), (CHANGED, CHANGED)]:
+            tk.Radiobutton(options, text=text, variable=self.status_var, value=val, font=FONT_SMALL,
+                           command=self._show).pack(side=tk.LEFT)
+
+        bottom = tk.Frame(self)
+        bottom.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=8)
+        self.info_label = tk.Label(bottom, text="", font=FONT_SMALL, anchor=tk.W)
+        self.info_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Button(bottom, text="关闭", font=FONT, command=self.destroy).pack(side=tk.RIGHT, padx=4)
+        tk.Button(bottom, text="导出", font=FONT, command=self._export).pack(side=tk.RIGHT, padx=4)
+
+        frame = tk.Frame(self)
+        frame.pack(fill=tk.BOTH, expand=True, padx=8)
+        self.tree = ttk.Treeview(frame, show="headings")
+        vsb = tk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        hsb = tk.Scrollbar(frame, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        hsb.pack(side=tk.BOTTOM, fill=tk.X)
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+    def _month_id(self, label: str) -> int | None:
+        for month_id, month_label in self.months:
+            if month_label == label:
+                return month_id
+        return None
+
+    def _compare(self):
+        """逐页读取两个月份的数据并对比。"""
+        old_label, new_label = self.old_var.get(), self.new_var.get()
+        old_id, new_id = self._month_id(old_label), self._month_id(new_label)
+        if old_id is None or new_id is None or old_id == new_id:
+            messagebox.showinfo("提示", "请选择两个不同的月份", parent=self)
+            return
+        old_headers = self.data_dao.get_headers(old_id)
+        new_headers = self.data_dao.get_headers(new_id)
+        for label, headers in [(old_label, old_headers), (new_label, new_headers)]:
+            if not headers:
+                messagebox.showinfo("提示", f"月份 \"{label}\" 没有导入数据", parent=self)
+                return
+
+        self.config(cursor="watch")
+        self.update_idletasks()
+        try:
+            self._diff = diff_months(
+                old_headers, self.data_dao.iter_rows(old_id),
+                new_headers, self.data_dao.iter_rows(new_id),
+                old_label=old_label, new_label=new_label,
+            )
+        except ValueError as e:
+            messagebox.showerror("对比失败", str(e), parent=self)
+            return
+        finally:
+            self.config(cursor="")
+        self._show()
+
+    def _show(self):
+        """按当前的状态筛选显示对比结果（最多 MAX_DISPLAY_ROWS 行）。"""
+        if self._diff is None:
+            return
+        status = self.status_var.get()
+        headers, rows = self._diff.table([status] if status else STATUSES)
+        self.tree.delete(*self.tree.get_children())
+        cols = [f"c{i}" for i in range(len(headers))]
+        self.tree["columns"] = cols
+        for col, header in zip(cols, headers):
+            self.tree.heading(col, text=header)
+            self.tree.column(col, width=110, minwidth=50, stretch=False)
+        for row in rows[:MAX_DISPLAY_ROWS]:
+            self.tree.insert("", tk.END, values=[format_cell(v) for v in row])
+        text = "，".join(f"{name} {self._diff.count(name)} 个" for name in STATUSES)
+        if len(rows) > MAX_DISPLAY_ROWS:
+            text += f"（表格中显示前 {MAX_DISPLAY_ROWS} 行，导出包含全部）"
+        self.info_label.config(text=text)
+
+    def _export(self):
+        """导出对比结果（新增、消失、变化）到 Excel。"""
+        if self._diff is None:
+            messagebox.showinfo("提示", "请先对比", parent=self)
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="导出月份对比",
+            defaultextension=".xlsx",
+            filetypes=[("Excel 文件", "*.xlsx")],
+            parent=self,
+        )
+        if not file_path:
+            return
+        headers, rows = self._diff.table()
+        try:
+            Exporter.export_to_excel(file_path, headers, rows)
+        except Exception as e:
+            messagebox.showerror("导出失败", str(e), parent=self)
+            return
+        messagebox.showinfo("导出成功", f"已导出 {len(rows)} 行到:\n{file_path}", parent=self)
@@ -0,0 +1,184 @@
+"""分组汇总对话框 - 选择分组列、数值列和聚合方式，显示汇总表格，可复制或导出。"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+from src.exporter import Exporter
+from src.groupby import AGGREGATIONS, GroupBy, GroupSummary, format_cell, format_summary
+
+FONT = ("Microsoft YaHei", 11)
+FONT_SMALL = ("Microsoft YaHei", 10)
+
+# 表格中最多显示的分组数（复制、导出包含全部分组）
+MAX_DISPLAY_GROUPS = 1000
+
+
+class GroupByDialog(tk.Toplevel):
+    """分组汇总弹窗，在后台线程中计算，不阻塞界面。"""
+
+    def __init__(self, parent, headers: list[str], rows, matched_indices: list[int],
+                 view_mode: str = "all", default_key: str = "合集名称"):
+        """
+        Args:
+            parent: 父窗口
+            headers: 表头
+            rows: 月份数据（MonthTable 或行列表）
+            matched_indices: 匹配行下标
+            view_mode: 默认的数据范围（"all" / "matched" / "unmatched"）
+            default_key: 默认勾选的分组列
+        """
+        super().__init__(parent)
+        self.headers = headers
+        self.rows = rows
+        self.matched_indices = matched_indices
+        self._summary: GroupSummary | None = None
+
+        self.title("分组汇总")
+        self.geometry("900x600")
+        self.resizable(True, True)
+        self.transient(parent)
+
+        self.range_var = tk.StringVar(value=view_mode)
+        self.agg_vars = {name: tk.BooleanVar(value=name == "sum") for name in AGGREGATIONS}
+        self._build(default_key)
+
+    def _build(self, default_key: str):
+        """构建对话框界面。"""
+        options = tk.Frame(self)
+        options.pack(side=tk.LEFT, fill=tk.Y, padx=8, pady=8)
+
+        tk.Label(options, text="分组列：", font=FONT).pack(anchor=tk.W)
+        self.key_list = self._column_listbox(options)
+        if default_key in self.headers:
+            self.key_list.selection_set(self.headers.index(default_key))
+
+        tk.Label(options, text="数值列：", font=FONT).pack(anchor=tk.W, pady=(8, 0))
+        self.value_list = self._column_listbox(options)
+
+        tk.Label(options, text="聚合：", font=FONT).pack(anchor=tk.W, pady=(8, 0))
+        agg_frame = tk.Frame(options)
+        agg_frame.pack(anchor=tk.W)
+        for name, label in AGGREGATIONS.items():
+            tk.Checkbutton(agg_frame, text=label, variable=self.agg_vars[name],
+                           font=FONT_SMALL).pack(side=tk.LEFT)
+
+        range_frame = tk.Frame(options)
+        range_frame.pack(anchor=tk.W, pady=(8, 0))
+        for text, val in [("全部", "all"), ("仅匹配", "matched"), ("仅未匹配", "unmatched")]:
+            tk.Radiobutton(range_frame, text=text, variable=self.range_var, value=val,
+                           font=FONT_SMALL).pack(side=tk.LEFT)
+
+        btn_frame = tk.Frame(options)
+        btn_frame.pack(side=tk.BOTTOM, pady=(8, 0))
+        self.calc_btn = tk.Button(btn_frame, text="计算", font=FONT, command=self._calculate)
+        self.calc_btn.pack(side=tk.LEFT, padx=4)
+        tk.Button(btn_frame, text="复制", font=FONT, command=self._copy).pack(side=tk.LEFT, padx=4)
+        tk.Button(btn_frame, text="导出", font=FONT, command=self._export).pack(side=tk.LEFT, padx=4)
+        tk.Button(btn_frame, text="关闭", font=FONT, command=self.destroy).pack(side=tk.LEFT, padx=4)
+
+        result_frame = tk.Frame(self)
+        result_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 8), pady=8)
+        self.status_label = tk.Label(result_frame, text="", font=FONT_SMALL, anchor=tk.W)
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.tree = ttk.Treeview(result_frame, show="headings")
+        vsb = tk.Scrollbar(result_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        hsb = tk.Scrollbar(result_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        hsb.pack(side=tk.BOTTOM, fill=tk.X)
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+    def _column_listbox(self, parent) -> tk.Listbox:
+        listbox = tk.Listbox(parent, selectmode=tk.MULTIPLE, exportselection=False,
+                             height=min(len(self.headers), 8), font=FONT_SMALL)
+        for header in self.headers:
+            listbox.insert(tk.END, header)
+        listbox.pack(fill=tk.X)
+        return listbox
+
+    def _calculate(self):
+        """在后台线程中分组汇总。"""
+        keys = list(self.key_list.curselection())
+        if not keys:
+            messagebox.showinfo("提示", "请至少选择一个分组列", parent=self)
+            return
+        values = list(self.value_list.curselection())
+        aggregations = [name for name, var in self.agg_vars.items() if var.get()]
+        grouping = GroupBy(
+            keys, values, aggregations,
+            key_headers=[self.headers[i] for i in keys],
+            value_headers=[self.headers[i] for i in values],
+        )
+        mode = self.range_var.get()
+        result = {}
+
+        def _worker():
+            try:
+                grouping.add_rows(self.rows, self.matched_indices, mode)
+                result["summary"] = grouping.summary()
+            except Exception as e:
+                result["error"] = e
+
+        def _poll():
+            if not self.winfo_exists():
+                return
+            if not result:
+                self.after(100, _poll)
+                return
+            self.calc_btn.config(state=tk.NORMAL)
+            if "error" in result:
+                messagebox.showerror("汇总失败", str(result["error"]), parent=self)
+                return
+            self._show(result["summary"])
+
+        self.calc_btn.config(state=tk.DISABLED)
+        self.status_label.config(text="正在计算...")
+        threading.Thread(target=_worker, daemon=True).start()
+        self.after(100, _poll)
+
+    def _show(self, summary: GroupSummary):
+        """显示汇总结果（最多 MAX_DISPLAY_GROUPS 个分组）。"""
+        self._summary = summary
+        self.tree.delete(*self.tree.get_children())
+        cols = [f"c{i}" for i in range(len(summary.headers))]
+        self.tree["columns"] = cols
+        for col, header in zip(cols, summary.headers):
+            self.tree.heading(col, text=header)
+            self.tree.column(col, width=120, minwidth=50, stretch=False)
+        for row in summary.rows[:MAX_DISPLAY_GROUPS]:
+            self.tree.insert("", tk.END, values=[format_cell(v) for v in row])
+        text = f"共 {len(summary.rows)} 个分组（{summary.source_rows} 行）"
+        if len(summary.rows) > MAX_DISPLAY_GROUPS:
+            text += f"，表格中显示前 {MAX_DISPLAY_GROUPS} 个，复制和导出包含全部分组"
+        self.status_label.config(text=text)
+
+    def _copy(self):
+        """复制全部分组（制表符分隔，可直接粘贴到 Excel）。"""
+        if self._summary is None:
+            messagebox.showinfo("提示", "请先计算", parent=self)
+            return
+        self.clipboard_clear()
+        self.clipboard_append(format_summary(self._summary))
+        self.status_label.config(text="已复制到剪贴板")
+
+    def _export(self):
+        """导出全部分组到 Excel。"""
+        if self._summary is None:
+            messagebox.showinfo("提示", "请先计算", parent=self)
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="导出分组汇总",
+            defaultextension=".xlsx",
+            filetypes=[("Excel 文件", "*.xlsx")],
+            parent=self,
+        )
+        if not file_path:
+            return
+        try:
+            Exporter.export_to_excel(file_path, self._summary.headers, self._summary.rows)
+        except Exception as e:
+            messagebox.showerror("导出失败", str(e), parent=self)
+            return
+        messagebox.showinfo("导出成功", f"已导出 {len(self._summary.rows)} 个分组到:\n{file_path}", parent=self)
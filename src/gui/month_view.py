@@ -1,20 +1,41 @@
 """月份数据界面 - 数据表格、导入/匹配/导出、视图切换、统计。"""
 
+import os
+import platform
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
+from src import memprofile, tracing
+from src.aggregate import PartitionSums, aggregate
 from src.database import Database
 from src.dao.imported_data_dao import ImportedDataDAO
 from src.dao.drama_dao import DramaDAO
+from src.dao.summary_dao import DEFAULT_TITLE_COLUMN, SummaryDAO
 from src.excel_importer import ExcelImporter
-from src.exporter import Exporter
+from src.exporter import Exporter, ExportCancelled
+from src.gui.groupby_dialog import GroupByDialog
+from src.import_cache import import_file
 from src.match_engine import MatchEngine
-from src.view_helpers import filter_rows, compute_column_sums
+from src.merge_import import merge_rows
+from src.month_table import MonthTable
+from src.multi_import import import_files, import_sheets
+from src.version import __version__
+from src.view_helpers import (
+    compute_column_sums,
+    format_bytes,
+    format_perf,
+    sum_candidate_columns,
+)
 
 FONT = ("Microsoft YaHei", 11)
 FONT_TITLE = ("Microsoft YaHei", 14, "bold")
 FONT_SMALL = ("Microsoft YaHei", 10)
 
+# 多文件导入完成时提示中逐个列出的文件数
+MAX_LISTED_FILES = 15
+
 
 class MonthView:
     """月份数据界面，显示数据表格，提供导入/匹配/导出功能。"""
@@ -32,7 +53,8 @@ class MonthView:
         self.drama_dao = DramaDAO(db)
 
         self.headers: list[str] = []
-        self.all_rows: list[list] = []
+        self.column_types: list[str] = []  # 导入时推断的列类型，旧版本导入的月份为空
+        self.all_rows: MonthTable = MonthTable()
         self.matched_indices: list[int] = []
         self.view_mode = tk.StringVar(value="all")
         self.search_var = tk.StringVar()
@@ -42,6 +64,9 @@ class MonthView:
         self._hidden_cols: set[int] = set()
         self._selected_cell_value: str = ""
         self._zoom_level: int = 100  # 缩放百分比
+        self._perf: dict[str, float] = {}  # 最近一次操作各阶段耗时（毫秒）
+        self._rows_memory: int | None = None  # all_rows 估算内存（字节）
+        self._partition_sums: PartitionSums | None = None  # 全部/匹配/未匹配三个分区的列合计
 
         self._build()
         self._load_data()
@@ -63,6 +88,7 @@ class MonthView:
         tk.Button(toolbar, text="匹配", font=FONT, command=self._run_match).pack(side=tk.LEFT, padx=4)
         tk.Button(toolbar, text="手动添加", font=FONT, command=self._manual_add).pack(side=tk.LEFT, padx=4)
         tk.Button(toolbar, text="列求和", font=FONT, command=self._column_sum_dialog).pack(side=tk.LEFT, padx=4)
+        tk.Button(toolbar, text="分组汇总", font=FONT, command=self._groupby_dialog).pack(side=tk.LEFT, padx=4)
         tk.Button(toolbar, text="隐藏列", font=FONT, command=self._toggle_columns_dialog).pack(side=tk.LEFT, padx=4)
         tk.Button(toolbar, text="剧名库", font=FONT, command=self._open_drama_library).pack(side=tk.LEFT, padx=4)
         tk.Button(toolbar, text="导出", font=FONT, command=self._export_data).pack(side=tk.LEFT, padx=4)
@@ -129,27 +155,50 @@ class MonthView:
         stats_frame = tk.Frame(self.parent)
         stats_frame.pack(fill=tk.X, padx=16, pady=(0, 8))
 
-        self.stats_label = tk.Label(stats_frame, text="", font=FONT_SMALL, anchor=tk.W)
-        self.stats_label.pack(fill=tk.X)
+        stats_row = tk.Frame(stats_frame)
+        stats_row.pack(fill=tk.X)
+        self.stats_label = tk.Label(stats_row, text="", font=FONT_SMALL, anchor=tk.W)
+        self.stats_label.pack(side=tk.LEFT)
+        tk.Button(stats_row, text="复制诊断信息", font=FONT_SMALL,
+                  command=self._copy_diagnostics).pack(side=tk.RIGHT)
+        self.perf_label = tk.Label(stats_row, text="", font=FONT_SMALL, fg="gray", anchor=tk.E)
+        self.perf_label.pack(side=tk.RIGHT, padx=8)
 
         self.sums_text = tk.Text(stats_frame, font=FONT_SMALL, height=3, wrap=tk.WORD,
                                  state=tk.DISABLED, relief=tk.FLAT, bg=self.parent.cget("bg"))
         self.sums_text.pack(fill=tk.X)
 
+    @memprofile.profiled("MonthView._load_data")
     def _load_data(self):
         """从数据库加载已有数据和匹配结果。"""
+        start = time.perf_counter()
         self.headers = self.data_dao.get_headers(self.month_id)
-        self.all_rows = self.data_dao.get_all_rows(self.month_id)
+        self.column_types = self.data_dao.get_column_types(self.month_id)
+        row_jsons = self.data_dao.fetch_row_json(self.month_id)
         self.matched_indices = self.data_dao.get_match_results(self.month_id)
+        self._perf = {"加载": _elapsed_ms(start)}
+
+        start = time.perf_counter()
+        # 逐行解码直接写入按列存储的 MonthTable，不保留整表的 list 形式
+        self.all_rows = MonthTable.from_rows(
+            ImportedDataDAO.iter_decode_rows(row_jsons), len(self.headers)
+        )
+        del row_jsons
+        self._perf["解码"] = _elapsed_ms(start)
+        self._rows_memory = self.all_rows.memory_bytes()
+        self._reset_partition_sums()
         self._refresh_table()
 
+    @tracing.traced("MonthView._refresh_table")
     def _refresh_table(self):
         """根据当前视图模式、搜索关键词刷新表格数据。"""
-        self.tree.delete(*self.tree.get_children())
+        with tracing.span("MonthView.清空表格"):
+            self.tree.delete(*self.tree.get_children())
 
         if not self.headers:
             self.tree["columns"] = ()
-            self._update_stats([])
+            self._update_stats()
+            self._update_perf_label()
             return
 
         # 设置列（带排序点击），跳过隐藏列
@@ -157,40 +206,47 @@ class MonthView:
         cols = [f"c{i}" for i, _ in visible_cols]
         self.tree["columns"] = cols
 
-        # 筛选行（视图模式） - 保留原始索引
-        matched_set_filter = set(self.matched_indices)
-        if self.view_mode.get() == "all":
-            indexed_rows = list(enumerate(self.all_rows))
-        elif self.view_mode.get() == "matched":
-            indexed_rows = [(i, row) for i, row in enumerate(self.all_rows) if i in matched_set_filter]
-        else:
-            indexed_rows = [(i, row) for i, row in enumerate(self.all_rows) if i not in matched_set_filter]
-
-        # 搜索过滤
-        keyword = self.search_var.get().strip()
-        if keyword:
-            keyword_lower = keyword.lower()
-            indexed_rows = [
-                (i, row) for i, row in indexed_rows
-                if any(keyword_lower in str(v).lower() for v in row if v is not None)
-            ]
-
-        # 排序
-        if self._sort_col is not None and self._sort_col < len(self.headers):
-            col_idx = self._sort_col
-
-            def sort_key(item):
-                row = item[1]
-                if col_idx >= len(row) or row[col_idx] is None:
-                    return (1, "")
-                val = row[col_idx]
-                if isinstance(val, (int, float)):
-                    return (0, val)
-                return (1, str(val).lower())
-
-            indexed_rows = sorted(indexed_rows, key=sort_key, reverse=self._sort_reverse)
+        with tracing.span("MonthView.筛选排序", len(self.all_rows)):
+            start = time.perf_counter()
+            # 筛选行（视图模式） - 保留原始索引
+            matched_set_filter = set(self.matched_indices)
+            if self.view_mode.get() == "all":
+                indexed_rows = list(enumerate(self.all_rows))
+            elif self.view_mode.get() == "matched":
+                indexed_rows = [(i, row) for i, row in enumerate(self.all_rows) if i in matched_set_filter]
+            else:
+                indexed_rows = [(i, row) for i, row in enumerate(self.all_rows) if i not in matched_set_filter]
+
+            # 搜索过滤
+            keyword = self.search_var.get().strip()
+            if keyword:
+                keyword_lower = keyword.lower()
+                indexed_rows = [
+                    (i, row) for i, row in indexed_rows
+                    if any(keyword_lower in str(v).lower() for v in row if v is not None)
+                ]
+
+            self._perf["筛选"] = _elapsed_ms(start)
+
+            # 排序
+            start = time.perf_counter()
+            if self._sort_col is not None and self._sort_col < len(self.headers):
+                col_idx = self._sort_col
+
+                def sort_key(item):
+                    row = item[1]
+                    if col_idx >= len(row) or row[col_idx] is None:
+                        return (1, "")
+                    val = row[col_idx]
+                    if isinstance(val, (int, float)):
+                        return (0, val)
+                    return (1, str(val).lower())
+
+                indexed_rows = sorted(indexed_rows, key=sort_key, reverse=self._sort_reverse)
+            self._perf["排序"] = _elapsed_ms(start)
 
         # 计算列宽
+        start = time.perf_counter()
         col_widths = []
         for i, header in visible_cols:
             max_len = len(str(header))
@@ -212,22 +268,24 @@ class MonthView:
         self._displayed_original_indices = []
         matched_set = set(self.matched_indices)
         visible_indices = [i for i, _ in visible_cols]
-        for orig_idx, row in indexed_rows:
-            self._displayed_original_indices.append(orig_idx)
-            values = []
-            for i in visible_indices:
-                if i < len(row) and row[i] is not None:
-                    values.append(str(row[i]))
-                else:
-                    values.append("")
-            tag = "matched" if orig_idx in matched_set else ""
-            self.tree.insert("", tk.END, values=values, tags=(tag,))
+        with tracing.span("MonthView.插入表格行", len(indexed_rows)):
+            for orig_idx, row in indexed_rows:
+                self._displayed_original_indices.append(orig_idx)
+                values = []
+                for i in visible_indices:
+                    if i < len(row) and row[i] is not None:
+                        values.append(str(row[i]))
+                    else:
+                        values.append("")
+                tag = "matched" if orig_idx in matched_set else ""
+                self.tree.insert("", tk.END, values=values, tags=(tag,))
 
         # 高亮匹配行
         self.tree.tag_configure("matched", background="#FFFFCC")
 
-        filtered = [row for _, row in indexed_rows]
-        self._update_stats(filtered)
+        self._update_stats()
+        self._perf["渲染"] = _elapsed_ms(start)
+        self._update_perf_label()
 
     def _on_sort(self, col_index: int):
         """点击表头排序：再次点击同一列切换升降序。"""
@@ -250,11 +308,11 @@ class MonthView:
             return f"{val:g}"
         return str(val)
 
-    def _update_stats(self, displayed_rows: list[list]):
-        """更新底部统计栏。"""
+    def _update_stats(self):
+        """更新底部统计栏（合计按当前显示的行计算）。"""
         total = len(self.all_rows)
         matched = len(self.matched_indices)
-        displayed = len(displayed_rows)
+        displayed = len(self._displayed_original_indices) if self.headers else 0
 
         self.stats_label.config(
             text=f"总行数: {total}  |  匹配: {matched}  |  当前显示: {displayed}"
@@ -262,8 +320,15 @@ class MonthView:
 
         # 合计行
         sums_text = ""
-        if displayed_rows and self.headers:
-            sums = compute_column_sums(displayed_rows, len(self.headers))
+        if displayed and self.headers:
+            if self._partition_sums is not None and not self.search_var.get().strip():
+                # 未搜索时显示的正好是一个分区，直接取预先维护的合计
+                sums = self._partition_sums.sums(self.view_mode.get())
+            else:
+                # 显示全部行时不传行下标，直接对整列计算
+                indices = None if displayed == total else self._displayed_original_indices
+                with tracing.span("compute_column_sums", displayed):
+                    sums = compute_column_sums(self.all_rows, len(self.headers), indices)
             parts = []
             for i, s in enumerate(sums):
                 if s != "":
@@ -276,29 +341,236 @@ class MonthView:
         self.sums_text.insert("1.0", sums_text)
         self.sums_text.config(state=tk.DISABLED)
 
+    def _reset_partition_sums(self):
+        """all_rows 或匹配结果整体替换后重建分区合计。"""
+        start = time.perf_counter()
+        self._partition_sums = PartitionSums(self.all_rows, len(self.headers), self.matched_indices)
+        self._perf["分区合计"] = _elapsed_ms(start)
+
+    def _update_perf_label(self):
+        """在统计栏右侧显示最近一次操作的耗时和内存。"""
+        self.perf_label.config(text=format_perf(self._perf, self._rows_memory))
+
+    def _diagnostics_text(self) -> str:
+        """生成诊断信息文本，用于问题反馈。"""
+        displayed = len(self._displayed_original_indices)
+        lines = [
+            f"剧名数据管理系统 v{__version__}",
+            f"Python {platform.python_version()} / {platform.platform()}",
+            f"月份: {self.month_label} (ID {self.month_id})",
+            f"行数: {len(self.all_rows)}  列数: {len(self.headers)}  隐藏列: {len(self._hidden_cols)}",
+            f"匹配: {len(self.matched_indices)}  当前显示: {displayed}",
+            f"视图: {self.view_mode.get()}  查找: {self.search_var.get()!r}  排序列: {self._sort_col}",
+        ]
+        lines.extend(f"{name}: {ms:.1f}ms" for name, ms in self._perf.items())
+        if self._rows_memory is not None:
+            lines.append(f"行数据内存 ≈ {format_bytes(self._rows_memory)}")
+        return "\n".join(lines)
+
+    def _copy_diagnostics(self):
+        """复制诊断信息到剪贴板。"""
+        self.parent.clipboard_clear()
+        self.parent.clipboard_append(self._diagnostics_text())
+        messagebox.showinfo("提示", "诊断信息已复制到剪贴板", parent=self.parent)
+
     def _import_data(self):
-        """导入 Excel 文件数据。"""
-        file_path = filedialog.askopenfilename(
-            title="选择 Excel 文件",
+        """导入 Excel 文件数据（可多选，多个文件按顺序合并到本月份）。"""
+        file_paths = filedialog.askopenfilenames(
+            title="选择 Excel 文件（可多选）",
             filetypes=[
                 ("Excel 文件", "*.xlsx *.xls"),
                 ("所有文件", "*.*"),
             ],
             parent=self.parent,
         )
-        if not file_path:
+        if not file_paths:
             return
+        append = False
+        if self.all_rows:
+            mode = self._ask_import_mode()
+            if mode is None:
+                return
+            if mode == "merge":
+                self._merge_files(list(file_paths))
+                return
+            append = mode == "append"
+        if len(file_paths) > 1 or append:
+            self._import_files(list(file_paths), append)
+            return
+        file_path = file_paths[0]
+        try:
+            sheets = ExcelImporter.list_sheets(file_path)
+        except Exception as e:
+            messagebox.showerror("导入失败", str(e), parent=self.parent)
+            return
+        if len(sheets) > 1:
+            selected = self._ask_sheets(sheets)
+            if selected is None:
+                return
+            active = next((info.name for info in sheets if info.active), None)
+            if selected != [active]:
+                self._import_sheets(file_path, selected)
+                return
         try:
-            headers, rows = ExcelImporter.import_file(file_path)
-            self.data_dao.save_data(self.month_id, headers, rows)
-            self.headers = headers
-            self.all_rows = rows
+            start = time.perf_counter()
+            result = import_file(self.db, self.month_id, file_path, keep_rows=True)
+            elapsed = _elapsed_ms(start)
+            self.data_dao.save_match_results(self.month_id, [])
+            if result.cached:
+                # 内容相同的文件已导入过：行已在数据库中复制，从数据库加载
+                self._load_data()
+                self._perf = {"复制": elapsed, **self._perf}
+            else:
+                self._perf = {"解析+写入": elapsed}
+                self.headers = result.headers
+                self.column_types = self.data_dao.get_column_types(self.month_id)
+                self.all_rows = MonthTable.from_rows(result.rows, len(result.headers))
+                result.rows = None
+                self._rows_memory = self.all_rows.memory_bytes()
             self.matched_indices = []
+            self._reset_partition_sums()
+            self._rebuild_summary()
             self.view_mode.set("all")
             self._refresh_table()
-            messagebox.showinfo("导入成功", f"已导入 {len(rows)} 行数据", parent=self.parent)
+            messagebox.showinfo("导入成功", f"已导入 {len(self.all_rows)} 行数据", parent=self.parent)
+        except Exception as e:
+            messagebox.showerror("导入失败", str(e), parent=self.parent)
+
+    def _import_files(self, file_paths: list[str], append: bool):
+        """并行解析多个文件，按顺序写入本月份后重新加载。"""
+        self.parent.config(cursor="watch")
+        self.parent.update_idletasks()
+        try:
+            start = time.perf_counter()
+            result = import_files(self.db, self.month_id, file_paths, append=append)
+            if not append:
+                self.data_dao.save_match_results(self.month_id, [])
+            elapsed = _elapsed_ms(start)
+            self._load_data()
+            self._perf = {"导入": elapsed, **self._perf}
+            self._rebuild_summary()
+        except Exception as e:
+            messagebox.showerror("导入失败", str(e), parent=self.parent)
+            return
+        finally:
+            self.parent.config(cursor="")
+
+        lines = [f"{os.path.basename(f.path)}: {f.row_count} 行" for f in result.files[:MAX_LISTED_FILES]]
+        if len(result.files) > MAX_LISTED_FILES:
+            lines.append(f"... 共 {len(result.files)} 个文件")
+        rate = result.row_count / result.seconds if result.seconds > 0 else 0
+        lines.append(f"\n{'追加' if append else '导入'} {result.row_count} 行，"
+                     f"耗时 {result.seconds:.1f}s（{rate:,.0f} 行/秒）")
+        messagebox.showinfo("导入成功", "\n".join(lines), parent=self.parent)
+
+    def _ask_import_mode(self) -> str | None:
+        """月份已有数据时选择导入方式：replace / append / merge，取消时返回 None。"""
+        dialog = tk.Toplevel(self.parent)
+        dialog.title("导入方式")
+        dialog.transient(self.parent)
+        dialog.grab_set()
+        dialog.resizable(False, False)
+
+        tk.Label(dialog, text="该月份已有数据，请选择导入方式：", font=FONT).pack(padx=16, pady=8, anchor=tk.W)
+        mode = tk.StringVar(value="merge")
+        for text, val in [("合并：跳过与已有数据重复的行，只写入新行", "merge"),
+                          ("追加：全部追加到已有数据之后", "append"),
+                          ("替换：清除已有数据和匹配结果", "replace")]:
+            tk.Radiobutton(dialog, text=text, variable=mode, value=val, font=FONT_SMALL).pack(padx=16, anchor=tk.W)
+
+        result = [None]
+
+        def on_confirm():
+            result[0] = mode.get()
+            dialog.destroy()
+
+        buttons = tk.Frame(dialog)
+        buttons.pack(pady=8)
+        tk.Button(buttons, text="确定", font=FONT, command=on_confirm).pack(side=tk.LEFT, padx=4)
+        tk.Button(buttons, text="取消", font=FONT, command=dialog.destroy).pack(side=tk.LEFT, padx=4)
+        dialog.wait_window()
+        return result[0]
+
+    def _ask_sheets(self, sheets: list) -> list[str] | None:
+        """工作簿有多个工作表时选择要导入的工作表（只读取元数据），取消时返回 None。"""
+        dialog = tk.Toplevel(self.parent)
+        dialog.title("选择工作表")
+        dialog.transient(self.parent)
+        dialog.grab_set()
+        dialog.geometry("380x360")
+
+        tk.Label(dialog, text="选择要导入的工作表（可多选）：\n多个工作表分别写入 \"月份/工作表\" 子表",
+                 font=FONT).pack(pady=8)
+        listbox = tk.Listbox(dialog, font=FONT, selectmode=tk.EXTENDED)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=16, pady=4)
+        for i, info in enumerate(sheets):
+            size = "" if info.max_row is None else f"（{max(info.max_row - 1, 0)} 行 × {info.max_column} 列）"
+            listbox.insert(tk.END, f"{info.name}{size}")
+            if info.active:
+                listbox.selection_set(i)
+
+        result = [None]
+
+        def on_confirm():
+            sel = listbox.curselection()
+            if sel:
+                result[0] = [sheets[i].name for i in sel]
+                dialog.destroy()
+
+        tk.Button(dialog, text="确定", font=FONT, command=on_confirm).pack(pady=8)
+        dialog.wait_window()
+        return result[0]
+
+    def _import_sheets(self, file_path: str, sheets: list[str]):
+        """按工作表导入：只选一个时写入本月份，多个时各自写入 "月份/工作表" 子表。"""
+        self.parent.config(cursor="watch")
+        self.parent.update_idletasks()
+        try:
+            result = import_sheets(self.db, self.backend_id, self.month_label, file_path, sheets)
+            for sheet_result in result.sheets:
+                if sheet_result.month_id is not None:
+                    self.data_dao.save_match_results(sheet_result.month_id, [])
+                    if sheet_result.month_id != self.month_id:
+                        SummaryDAO(self.db).rebuild_from_db(sheet_result.month_id)
+            if any(sheet_result.month_id == self.month_id for sheet_result in result.sheets):
+                self._load_data()
+                self._rebuild_summary()
+        except Exception as e:
+            messagebox.showerror("导入失败", str(e), parent=self.parent)
+            return
+        finally:
+            self.parent.config(cursor="")
+
+        lines = [f"[{r.sheet}] -> {r.month_label}: {r.row_count} 行" if r.month_id is not None
+                 else f"[{r.sheet}]: 空工作表，已跳过" for r in result.sheets]
+        if len(result.sheets) > 1:
+            lines.append("\n子表可在后台的月份列表中打开")
+        messagebox.showinfo("导入成功", "\n".join(lines), parent=self.parent)
+
+    def _merge_files(self, file_paths: list[str]):
+        """逐个文件合并到本月份（整行去重），已匹配的月份只对新增行匹配，完成后重新加载。"""
+        drama_set = None
+        if self.matched_indices and DEFAULT_TITLE_COLUMN in [str(h).strip() for h in self.headers]:
+            drama_set = self.drama_dao.get_set(self.backend_id)
+        self.parent.config(cursor="watch")
+        self.parent.update_idletasks()
+        inserted = skipped = 0
+        try:
+            start = time.perf_counter()
+            for path in file_paths:
+                headers, rows = ExcelImporter.iter_file(path, convert=False)
+                result = merge_rows(self.db, self.month_id, headers, rows, drama_set=drama_set)
+                inserted += len(result.inserted)
+                skipped += result.skipped
+            elapsed = _elapsed_ms(start)
+            self._load_data()
+            self._perf = {"合并": elapsed, **self._perf}
         except Exception as e:
             messagebox.showerror("导入失败", str(e), parent=self.parent)
+            return
+        finally:
+            self.parent.config(cursor="")
+        messagebox.showinfo("合并完成", f"新增 {inserted} 行，跳过重复 {skipped} 行", parent=self.parent)
 
     def _run_match(self):
         """执行匹配操作。"""
@@ -319,9 +591,14 @@ class MonthView:
             if col_index is None:
                 return
 
+        start = time.perf_counter()
         matched = MatchEngine.match(self.all_rows, col_index, drama_set)
+        self._perf = {"匹配": _elapsed_ms(start)}
         self.matched_indices = matched
         self.data_dao.save_match_results(self.month_id, matched)
+        if self._partition_sums is not None:
+            self._partition_sums.set_matched(matched)
+        self._rebuild_summary(self.headers[col_index])
 
         self.view_mode.set("matched")
         self._refresh_table()
@@ -331,6 +608,13 @@ class MonthView:
             parent=self.parent,
         )
 
+    def _rebuild_summary(self, title_column: str = DEFAULT_TITLE_COLUMN):
+        """按当前数据和匹配结果重新生成月度汇总（供后台趋势分析使用）。"""
+        start = time.perf_counter()
+        SummaryDAO(self.db).rebuild(self.month_id, self.headers, self.all_rows,
+                                    self.matched_indices, title_column)
+        self._perf["汇总"] = _elapsed_ms(start)
+
     def _ask_column_index(self) -> int | None:
         """弹出对话框让用户选择匹配列。"""
         if not self.headers:
@@ -362,7 +646,7 @@ class MonthView:
         return result[0]
 
     def _export_data(self):
-        """导出完整表格，匹配行高亮黄色。"""
+        """导出完整表格，匹配行高亮黄色。后台线程流式写入，可取消。"""
         if not self.headers:
             messagebox.showinfo("提示", "没有数据可导出", parent=self.parent)
             return
@@ -375,17 +659,62 @@ class MonthView:
         )
         if not file_path:
             return
-        try:
-            Exporter.export_with_highlight(
-                file_path, self.headers, self.all_rows, self.matched_indices
-            )
-            messagebox.showinfo(
-                "导出成功",
-                f"已导出 {len(self.all_rows)} 行（其中 {len(self.matched_indices)} 行高亮）到:\n{file_path}",
-                parent=self.parent,
-            )
-        except Exception as e:
-            messagebox.showerror("导出失败", str(e), parent=self.parent)
+
+        total = len(self.all_rows)
+        state = {"written": 0, "done": False, "error": None}
+        cancel_event = threading.Event()
+
+        dialog = tk.Toplevel(self.parent)
+        dialog.title("正在导出")
+        dialog.transient(self.parent)
+        dialog.grab_set()
+        dialog.resizable(False, False)
+        dialog.protocol("WM_DELETE_WINDOW", cancel_event.set)
+
+        progress_label = tk.Label(dialog, text=f"已写入 0 / {total} 行", font=FONT_SMALL)
+        progress_label.pack(padx=16, pady=(12, 4))
+        progress = ttk.Progressbar(dialog, mode="determinate", length=320, maximum=max(total, 1))
+        progress.pack(padx=16, pady=4)
+        cancel_btn = tk.Button(dialog, text="取消", font=FONT, command=cancel_event.set)
+        cancel_btn.pack(pady=(4, 12))
+
+        def _on_progress(written, _total):
+            state["written"] = written
+
+        def _worker():
+            try:
+                Exporter.export_with_highlight(
+                    file_path, self.headers, self.all_rows, self.matched_indices,
+                    progress_callback=_on_progress, cancel_check=cancel_event.is_set,
+                )
+            except Exception as e:
+                state["error"] = e
+            finally:
+                state["done"] = True
+
+        def _poll():
+            progress["value"] = state["written"]
+            progress_label.config(text=f"已写入 {state['written']} / {total} 行")
+            if cancel_event.is_set() and not state["done"]:
+                cancel_btn.config(state=tk.DISABLED, text="正在取消…")
+            if not state["done"]:
+                dialog.after(100, _poll)
+                return
+            dialog.destroy()
+            error = state["error"]
+            if isinstance(error, ExportCancelled):
+                messagebox.showinfo("提示", "导出已取消", parent=self.parent)
+            elif error is not None:
+                messagebox.showerror("导出失败", str(error), parent=self.parent)
+            else:
+                messagebox.showinfo(
+                    "导出成功",
+                    f"已导出 {total} 行（其中 {len(self.matched_indices)} 行高亮）到:\n{file_path}",
+                    parent=self.parent,
+                )
+
+        threading.Thread(target=_worker, daemon=True).start()
+        dialog.after(100, _poll)
 
     def _manual_add(self):
         """手动将选中的未匹配行添加为匹配，同时将剧名存入剧名库。"""
@@ -404,7 +733,7 @@ class MonthView:
 
         matched_set = set(self.matched_indices)
         added_names = []
-        added_count = 0
+        added_indices = []
         all_items = self.tree.get_children()
 
         for item in selected:
@@ -414,20 +743,23 @@ class MonthView:
                 orig_idx = self._displayed_original_indices[display_idx]
                 if orig_idx is not None and orig_idx not in matched_set:
                     matched_set.add(orig_idx)
-                    added_count += 1
+                    added_indices.append(orig_idx)
                     # 获取剧名
                     if col_index < len(self.all_rows[orig_idx]):
                         name = str(self.all_rows[orig_idx][col_index]).strip()
                         if name:
                             added_names.append(name)
 
-        if added_count == 0:
+        if not added_indices:
             messagebox.showinfo("提示", "选中的行已全部匹配", parent=self.parent)
             return
 
         # 更新匹配结果
         self.matched_indices = sorted(matched_set)
         self.data_dao.save_match_results(self.month_id, self.matched_indices)
+        if self._partition_sums is not None:
+            self._partition_sums.add_matched(added_indices)
+        self._rebuild_summary(self.headers[col_index])
 
         # 将剧名存入剧名库
         if added_names:
@@ -440,7 +772,7 @@ class MonthView:
             names_str += f" 等{len(added_names)}个"
         messagebox.showinfo(
             "手动添加",
-            f"已添加 {added_count} 行为匹配\n剧名已存入剧名库: {names_str}",
+            f"已添加 {len(added_indices)} 行为匹配\n剧名已存入剧名库: {names_str}",
             parent=self.parent,
         )
 
@@ -450,13 +782,7 @@ class MonthView:
             messagebox.showinfo("提示", "没有数据", parent=self.parent)
             return
 
-        # 找出数值列
-        numeric_cols = []
-        for i in range(len(self.headers)):
-            for row in self.all_rows:
-                if i < len(row) and isinstance(row[i], (int, float)):
-                    numeric_cols.append(i)
-                    break
+        numeric_cols = sum_candidate_columns(self.all_rows, len(self.headers), self.column_types)
 
         if not numeric_cols:
             messagebox.showinfo("提示", "没有可求和的数值列", parent=self.parent)
@@ -521,26 +847,20 @@ class MonthView:
                 messagebox.showinfo("提示", "请至少选择一列", parent=dialog)
                 return
 
-            if range_var.get() == "displayed":
-                rows = filter_rows(self.all_rows, self.matched_indices, self.view_mode.get())
-                keyword = self.search_var.get().strip()
-                if keyword:
-                    keyword_lower = keyword.lower()
-                    rows = [r for r in rows if any(keyword_lower in str(v).lower() for v in r if v is not None)]
-            else:
-                rows = self.all_rows
+            displayed = range_var.get() == "displayed"
+            # 当前显示行即表格中的行（已按视图模式和搜索筛选）；显示全部行时不传行下标
+            indices = self._displayed_original_indices if displayed else None
+            if indices is not None and len(indices) == len(self.all_rows):
+                indices = None
+            row_count = len(self.all_rows) if indices is None else len(indices)
 
-            lines = [f"数据范围: {'当前显示' if range_var.get() == 'displayed' else '全部'} ({len(rows)} 行)\n"]
+            lines = [f"数据范围: {'当前显示' if displayed else '全部'} ({row_count} 行)\n"]
             grand_total = 0.0
             for col_idx in selected_cols:
-                total = 0.0
-                count = 0
-                for row in rows:
-                    if col_idx < len(row) and isinstance(row[col_idx], (int, float)):
-                        total += row[col_idx]
-                        count += 1
+                stats = aggregate(self.all_rows, col_idx, ("sum", "count"), indices)
+                total = stats["sum"] or 0.0
                 grand_total += total
-                lines.append(f"{self.headers[col_idx]}: {self._format_number(total)}  ({count} 个数值)")
+                lines.append(f"{self.headers[col_idx]}: {self._format_number(total)}  ({stats['count']} 个数值)")
 
             if len(selected_cols) > 1:
                 lines.append(f"\n合计总和: {self._format_number(grand_total)}")
@@ -553,6 +873,14 @@ class MonthView:
         tk.Button(btn_frame, text="计算", font=FONT, command=_calc).pack(side=tk.LEFT, padx=8)
         tk.Button(btn_frame, text="关闭", font=FONT, command=dialog.destroy).pack(side=tk.LEFT, padx=8)
 
+    def _groupby_dialog(self):
+        """弹出分组汇总对话框，默认数据范围为当前视图模式。"""
+        if not self.headers or not self.all_rows:
+            messagebox.showinfo("提示", "没有数据", parent=self.parent)
+            return
+        GroupByDialog(self.parent, self.headers, self.all_rows, self.matched_indices,
+                      view_mode=self.view_mode.get())
+
     def _toggle_columns_dialog(self):
         """弹出对话框让用户勾选要显示/隐藏的列。"""
         if not self.headers:
@@ -689,3 +1017,8 @@ class MonthView:
         """返回后台界面。"""
         if self.on_back:
             self.on_back()
+
+
+def _elapsed_ms(start: float) -> float:
+    """从 start（perf_counter 时间）到现在经过的毫秒数。"""
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,65 @@
+"""SQL 语句统计对话框 - 显示各语句的执行次数、总耗时和 p95，可刷新、清空、复制。"""
+
+import tkinter as tk
+
+from src.database import Database
+
+FONT = ("Microsoft YaHei", 11)
+FONT_MONO = ("Consolas", 10)
+
+
+class QueryStatsDialog(tk.Toplevel):
+    """SQL 语句统计弹窗。未开启统计时提示启动参数。"""
+
+    def __init__(self, parent, db: Database):
+        super().__init__(parent)
+        self.db = db
+
+        self.title("数据库查询统计")
+        self.geometry("900x480")
+        self.resizable(True, True)
+        self.transient(parent)
+
+        self._build()
+        self._refresh()
+
+    def _build(self):
+        """构建对话框界面。"""
+        btn_frame = tk.Frame(self)
+        btn_frame.pack(side=tk.BOTTOM, pady=8)
+        tk.Button(btn_frame, text="刷新", font=FONT, command=self._refresh).pack(side=tk.LEFT, padx=6)
+        tk.Button(btn_frame, text="清空", font=FONT, command=self._reset).pack(side=tk.LEFT, padx=6)
+        tk.Button(btn_frame, text="复制", font=FONT, command=self._copy).pack(side=tk.LEFT, padx=6)
+        tk.Button(btn_frame, text="关闭", font=FONT, command=self.destroy).pack(side=tk.LEFT, padx=6)
+
+        text_frame = tk.Frame(self)
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=8, pady=(8, 0))
+        scrollbar = tk.Scrollbar(text_frame, orient=tk.VERTICAL)
+        self.text = tk.Text(text_frame, font=FONT_MONO, wrap=tk.NONE, yscrollcommand=scrollbar.set)
+        scrollbar.config(command=self.text.yview)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def _report(self) -> str:
+        stats = self.db.query_stats
+        if stats is None:
+            return "SQL 统计未开启。请使用 --sql-stats（或 --slow-ms 毫秒数）参数启动程序。"
+        return stats.format_report(limit=200)
+
+    def _refresh(self):
+        """重新生成报告。"""
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", self._report())
+        self.text.config(state=tk.DISABLED)
+
+    def _reset(self):
+        """清空已有统计。"""
+        if self.db.query_stats is not None:
+            self.db.query_stats.reset()
+        self._refresh()
+
+    def _copy(self):
+        """复制报告到剪贴板。"""
+        self.clipboard_clear()
+        self.clipboard_append(self._report())
@@ -0,0 +1,175 @@
+"""趋势分析对话框 - 查询剧名在各月份的数据，按月、按年查看后台合计。
+
+数据来自 month_summaries 汇总表（导入、匹配时生成），不解码月份的原始行数据。
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from src.database import Database
+from src.dao.summary_dao import SummaryDAO
+from src.groupby import ROW_COUNT_HEADER, format_cell
+
+FONT = ("Microsoft YaHei", 11)
+FONT_SMALL = ("Microsoft YaHei", 10)
+
+MATCHED_ROWS_HEADER = "匹配行数"
+
+
+class TrendDialog(tk.Toplevel):
+    """后台趋势分析弹窗：剧名趋势、月度 / 年度合计。"""
+
+    def __init__(self, parent, db: Database, backend_id: int, backend_name: str = ""):
+        super().__init__(parent)
+        self.db = db
+        self.backend_id = backend_id
+        self.summary_dao = SummaryDAO(db)
+        self.search_var = tk.StringVar()
+        self.period_var = tk.StringVar(value="month")
+        self.range_var = tk.StringVar(value="all")
+        self._titles: list[str] = []
+
+        self.title(f"趋势分析 - {backend_name}" if backend_name else "趋势分析")
+        self.geometry("900x600")
+        self.resizable(True, True)
+        self.transient(parent)
+
+        self._build()
+        self._refresh_totals()
+        self._update_status()
+
+    def _build(self):
+        """构建对话框界面。"""
+        bottom = tk.Frame(self)
+        bottom.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=8)
+        self.status_label = tk.Label(bottom, text="", font=FONT_SMALL, anchor=tk.W)
+        self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Button(bottom, text="关闭", font=FONT, command=self.destroy).pack(side=tk.RIGHT, padx=4)
+        tk.Button(bottom, text="重建汇总", font=FONT, command=self._rebuild_missing).pack(side=tk.RIGHT, padx=4)
+
+        notebook = ttk.Notebook(self)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=8, pady=(8, 0))
+
+        # 剧名趋势
+        trend_tab = tk.Frame(notebook)
+        notebook.add(trend_tab, text="剧名趋势")
+        left = tk.Frame(trend_tab)
+        left.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 8), pady=8)
+        search_frame = tk.Frame(left)
+        search_frame.pack(fill=tk.X)
+        entry = tk.Entry(search_frame, textvariable=self.search_var, font=FONT, width=16)
+        entry.pack(side=tk.LEFT)
+        entry.bind("<Return>", lambda e: self._search())
+        tk.Button(search_frame, text="搜索", font=FONT_SMALL, command=self._search).pack(side=tk.LEFT, padx=4)
+        self.title_list = tk.Listbox(left, font=FONT_SMALL, exportselection=False)
+        self.title_list.pack(fill=tk.BOTH, expand=True, pady=(4, 0))
+        self.title_list.bind("<<ListboxSelect>>", lambda e: self._show_trend())
+        self.trend_tree = self._treeview(trend_tab)
+
+        # 月度 / 年度合计
+        totals_tab = tk.Frame(notebook)
+        notebook.add(totals_tab, text="月度 / 年度合计")
+        options = tk.Frame(totals_tab)
+        options.pack(fill=tk.X, pady=(8, 0))
+        for text, val in [("按月", "month"), ("按年", "year")]:
+            tk.Radiobutton(options, text=text, variable=self.period_var, value=val, font=FONT_SMALL,
+                           command=self._refresh_totals).pack(side=tk.LEFT)
+        tk.Label(options, text="  ").pack(side=tk.LEFT)
+        for text, val in [("全部", "all"), ("仅匹配", "matched"), ("仅未匹配", "unmatched")]:
+            tk.Radiobutton(options, text=text, variable=self.range_var, value=val, font=FONT_SMALL,
+                           command=self._refresh_totals).pack(side=tk.LEFT)
+        self.totals_tree = self._treeview(totals_tab)
+
+    @staticmethod
+    def _treeview(parent) -> ttk.Treeview:
+        frame = tk.Frame(parent)
+        frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=8)
+        tree = ttk.Treeview(frame, show="headings")
+        vsb = tk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        hsb = tk.Scrollbar(frame, orient=tk.HORIZONTAL, command=tree.xview)
+        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        hsb.pack(side=tk.BOTTOM, fill=tk.X)
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(fill=tk.BOTH, expand=True)
+        return tree
+
+    @staticmethod
+    def _fill(tree: ttk.Treeview, headers: list[str], rows: list[list]):
+        """用表头和行数据替换表格内容。"""
+        tree.delete(*tree.get_children())
+        cols = [f"c{i}" for i in range(len(headers))]
+        tree["columns"] = cols
+        for col, header in zip(cols, headers):
+            tree.heading(col, text=header)
+            tree.column(col, width=110, minwidth=50, stretch=False)
+        for row in rows:
+            tree.insert("", tk.END, values=[format_cell(v) for v in row])
+
+    def _search(self):
+        """按关键词查找剧名。"""
+        self._titles = self.summary_dao.search_titles(self.backend_id, self.search_var.get())
+        self.title_list.delete(0, tk.END)
+        for title in self._titles:
+            self.title_list.insert(tk.END, title)
+        if len(self._titles) == 1:
+            self.title_list.selection_set(0)
+            self._show_trend()
+
+    def _show_trend(self):
+        """显示选中剧名在各月份的行数和数值列合计。"""
+        sel = self.title_list.curselection()
+        if not sel:
+            return
+        trend = self.summary_dao.title_trend(self.backend_id, self._titles[sel[0]])
+        columns = _column_names(totals for _, _, _, totals in trend)
+        rows = [[label, row_count, matched_count] + [totals.get(name) for name in columns]
+                for label, row_count, matched_count, totals in trend]
+        self._fill(self.trend_tree, ["月份", ROW_COUNT_HEADER, MATCHED_ROWS_HEADER] + columns, rows)
+
+    def _refresh_totals(self):
+        """按当前的周期和数据范围显示合计。"""
+        matched = {"all": None, "matched": True, "unmatched": False}[self.range_var.get()]
+        if self.period_var.get() == "year":
+            items = self.summary_dao.totals_by_year(self.backend_id, matched)
+            first = "年份"
+        else:
+            items = self.summary_dao.totals_by_month(self.backend_id, matched)
+            first = "月份"
+        columns = _column_names(totals for _, _, totals in items)
+        rows = [[label, row_count] + [totals.get(name) for name in columns]
+                for label, row_count, totals in items]
+        self._fill(self.totals_tree, [first, ROW_COUNT_HEADER] + columns, rows)
+
+    def _update_status(self):
+        missing = self.summary_dao.months_without_summary(self.backend_id)
+        if missing:
+            text = f"{len(missing)} 个月份没有汇总（如升级前导入的数据），点击“重建汇总”生成"
+        else:
+            text = "所有月份均已汇总"
+        self.status_label.config(text=text)
+
+    def _rebuild_missing(self):
+        """为没有汇总的月份重新生成汇总。"""
+        missing = self.summary_dao.months_without_summary(self.backend_id)
+        if not missing:
+            messagebox.showinfo("提示", "所有月份均已汇总", parent=self)
+            return
+        self.config(cursor="watch")
+        self.update_idletasks()
+        try:
+            for month_id, _ in missing:
+                self.summary_dao.rebuild_from_db(month_id)
+        except Exception as e:
+            messagebox.showerror("重建失败", str(e), parent=self)
+        finally:
+            self.config(cursor="")
+        self._refresh_totals()
+        self._update_status()
+
+
+def _column_names(totals_list) -> list[str]:
+    """各行合计中出现的数值列名，按首次出现的顺序。"""
+    names: dict[str, None] = {}
+    for totals in totals_list:
+        names.update(dict.fromkeys(totals))
+    return list(names)
@@ -1,11 +1,15 @@
 """高亮标记器：将匹配到的行标记颜色高亮。"""
 
-from copy import copy
-
+from openpyxl.formatting.rule import Rule
 from openpyxl.styles import PatternFill
+from openpyxl.styles.differential import DifferentialStyle
+from openpyxl.utils import get_column_letter
+
+# cell: 逐单元格设置共享填充；conditional: 整个工作表只加一条条件格式规则
+HIGHLIGHT_MODES = ("cell", "conditional")
 
 
-def highlight_rows(ws, matched_rows: list, color: str = "FFFF00") -> None:
+def highlight_rows(ws, matched_rows: list, color: str = "FFFF00", mode: str = "cell") -> None:
     """
     将指定行的所有单元格背景色设置为指定颜色。
 
@@ -13,20 +17,45 @@ def highlight_rows(ws, matched_rows: list, color: str = "FFFF00") -> None:
         ws: openpyxl工作表对象
         matched_rows: 需要高亮的行号列表（1-based）
         color: 十六进制颜色值，默认黄色
+        mode: "cell" 为每个单元格设置同一个共享填充（字体、边框等其余样式不变）；
+              "conditional" 添加一条覆盖所有匹配行的条件格式规则，不改动任何单元格样式
     """
+    if mode not in HIGHLIGHT_MODES:
+        raise ValueError(f"无效的高亮模式: {mode}")
     if not matched_rows:
         return
 
+    if mode == "conditional":
+        _highlight_conditional(ws, matched_rows, color)
+        return
+
+    # openpyxl 的单元格样式按 id 分别保存字体、边框、填充等，
+    # 只替换填充即可保留原有格式，无需逐项复制样式对象
     fill = PatternFill(fill_type="solid", fgColor=color)
-    matched_set = set(matched_rows)
     max_col = ws.max_column
 
-    for row_num in matched_set:
+    for row_num in sorted(set(matched_rows)):
         for col in range(1, max_col + 1):
-            cell = ws.cell(row=row_num, column=col)
-            cell.font = copy(cell.font)
-            cell.border = copy(cell.border)
-            cell.alignment = copy(cell.alignment)
-            cell.number_format = cell.number_format
-            cell.protection = copy(cell.protection)
-            cell.fill = fill
+            ws.cell(row=row_num, column=col).fill = fill
+
+
+def row_ranges(matched_rows: list) -> list[tuple[int, int]]:
+    """将行号列表合并为连续区间 [(起始行, 结束行), ...]，按行号升序。"""
+    ranges = []
+    for row_num in sorted(set(matched_rows)):
+        if ranges and row_num == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], row_num)
+        else:
+            ranges.append((row_num, row_num))
+    return ranges
+
+
+def _highlight_conditional(ws, matched_rows: list, color: str) -> None:
+    """用一条条件格式规则高亮所有匹配行（连续行合并为一个区域）。"""
+    last_col = get_column_letter(max(ws.max_column, 1))
+    sqref = " ".join(
+        f"A{start}:{last_col}{end}" for start, end in row_ranges(matched_rows)
+    )
+    fill = PatternFill(fill_type="solid", fgColor=color, bgColor=color)
+    rule = Rule(type="expression", formula=["TRUE"], dxf=DifferentialStyle(fill=fill))
+    ws.conditional_formatting.add(sqref, rule)
@@ -0,0 +1,65 @@
+"""导入缓存：重新导入内容相同的文件时，复制已导入月份中编码好的行，不再解析 Excel。
+
+- 文件指纹为 (大小, 修改时间, 内容 SHA-256)：路径、大小和修改时间都与已登记的文件相同时
+  直接沿用登记的哈希，否则流式计算哈希（仍远快于 openpyxl 解析）；
+- import_cache 表记录哪些月份的数据恰为某个文件单独替换导入的结果，
+  命中时用 ImportedDataDAO.copy_month 在 SQLite 内复制表头和行（INSERT ... SELECT）；
+- 月份数据被追加、合并或替换后 ImportedDataDAO 删除该月份的记录，缓存不会指向已改动的数据；
+- 未命中时正常解析写入，并登记该文件与月份。
+
+用法：
+    from src.import_cache import import_file
+
+    result = import_file(db, month_id, "1月.xlsx")
+    if result.cached:
+        ...
+"""
+
+import os
+
+from src import tracing
+from src.dao.import_cache_dao import ImportCacheDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.database import Database
+from src.excel_importer import ExcelImporter
+from src.file_hash import hash_file
+from src.models import CachedImportResult
+
+
+def import_file(db: Database, month_id: int, path: str, keep_rows: bool = False) -> CachedImportResult:
+    """
+    导入单个文件到月份（替换已有数据），内容相同的文件已导入过时复制已编码的行。
+
+    Args:
+        db: 数据库
+        month_id: 月份 ID
+        path: Excel 文件路径
+        keep_rows: 重新解析时在结果中保留行数据（供界面直接显示，避免再从数据库读取）
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"文件未找到: {path}")
+    cache_dao = ImportCacheDAO(db)
+    data_dao = ImportedDataDAO(db)
+
+    with tracing.span("import_cache.import_file") as sp:
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        file_hash = cache_dao.known_hash(path, stat.st_size, stat.st_mtime_ns) or hash_file(path)
+        result = CachedImportResult(file_hash=file_hash)
+
+        found = cache_dao.find_month(file_hash, prefer_month_id=month_id)
+        if found is not None:
+            result.source_month_id, result.row_count = found
+            if result.source_month_id != month_id:
+                result.row_count = data_dao.copy_month(result.source_month_id, month_id)
+            result.headers = data_dao.get_headers(month_id)
+        else:
+            headers, rows = ExcelImporter.iter_file(path, convert=False)
+            if keep_rows:
+                rows = list(rows)
+                result.rows = rows
+            result.headers = headers
+            result.row_count = data_dao.save_data(month_id, headers, rows)
+        cache_dao.record(file_hash, stat.st_size, stat.st_mtime_ns, path, month_id, result.row_count)
+        sp.set_rows(result.row_count)
+    return result
@@ -0,0 +1,243 @@
+"""目录监控入库：轮询目录中的月度 Excel 文件，按文件名映射到 (后台, 月份)，
+自动导入并与剧名库匹配。
+
+- 文件名规则默认为 ``<后台>_<月份>.xlsx``（如 ``抖音_2026年01月.xlsx``），
+  可通过正则自定义，正则需包含 backend 和 month 两个命名分组；
+- 按文件内容哈希去重：同一内容的文件只入库一次，改名或重复拷贝不会重复导入；
+- 解析在有界进程池中进行，同时在途的文件数不超过 workers，突发大量文件时不会压垮机器；
+  数据库写入和匹配只在主线程中进行；
+- 剧名库按后台缓存，剧名增删后（数量或最大 ID 变化）自动重新加载。
+"""
+
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.dao.backend_dao import BackendDAO
+from src.dao.drama_dao import DramaDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.ingest_dao import IngestDAO
+from src.dao.month_dao import MonthDAO
+from src.dao.summary_dao import SummaryDAO
+from src.database import Database
+from src.excel_importer import ExcelImporter
+from src.file_hash import hash_file
+from src.match_engine import MatchEngine
+from src.models import IngestFileResult
+
+DEFAULT_NAME_PATTERN = r"^(?P<backend>[^_]+)_(?P<month>[^_.]+)"
+DEFAULT_MATCH_COLUMN = "合集名称"
+SUPPORTED_EXTENSIONS = (".xlsx", ".xls")
+
+
+class LibraryCache:
+    """按后台缓存剧名库集合，剧名库版本变化时重新加载。"""
+
+    def __init__(self, db: Database):
+        self._dao = DramaDAO(db)
+        self._cache: dict[int, tuple[tuple[int, int], set[str]]] = {}
+
+    def get(self, backend_id: int) -> set[str]:
+        """返回后台的剧名集合。"""
+        version = self._dao.get_version(backend_id)
+        cached = self._cache.get(backend_id)
+        if cached is None or cached[0] != version:
+            cached = (version, self._dao.get_set(backend_id))
+            self._cache[backend_id] = cached
+        return cached[1]
+
+
+class IngestService:
+    """目录监控入库服务。scan_once 处理一轮，run_forever 持续轮询直到停止。"""
+
+    def __init__(self, db: Database, directory: str, name_pattern: str = DEFAULT_NAME_PATTERN,
+                 column: str = DEFAULT_MATCH_COLUMN, workers: int = None,
+                 create: bool = False, settle_seconds: float = 2.0):
+        """
+        Args:
+            db: 数据库
+            directory: 监控目录
+            name_pattern: 文件名（不含扩展名）正则，需包含 backend 和 month 命名分组
+            column: 匹配列名
+            workers: 解析进程数，默认 CPU 核数；为 1 时在当前进程内解析
+            create: 后台或月份不存在时自动创建
+            settle_seconds: 文件最后修改后需静置的秒数，避免读取仍在拷贝中的文件
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"目录未找到: {directory}")
+        self._db = db
+        self._directory = directory
+        self._name_re = re.compile(name_pattern)
+        missing = {"backend", "month"} - set(self._name_re.groupindex)
+        if missing:
+            raise ValueError(f"文件名规则缺少命名分组: {', '.join(sorted(missing))}")
+        self._column = column
+        self._workers = max(workers or os.cpu_count() or 1, 1)
+        self._create = create
+        self._settle_seconds = settle_seconds
+        self._library = LibraryCache(db)
+        self._ingest_dao = IngestDAO(db)
+        # 路径 -> (mtime, size)：已处理或已失败的文件，未变化时不再重复哈希和解析
+        self._seen: dict[str, tuple[float, int]] = {}
+
+    def pending_files(self) -> list[tuple[str, str, str]]:
+        """
+        列出待处理文件，返回 [(路径, 后台, 月份), ...]，按路径排序。
+        跳过 ~$ 临时文件、不符合命名规则的文件、仍在写入的文件以及已处理且未变化的文件。
+        """
+        now = time.time()
+        pending = []
+        for entry in sorted(os.scandir(self._directory), key=lambda e: e.name):
+            if not entry.is_file() or entry.name.startswith("~$"):
+                continue
+            stem, ext = os.path.splitext(entry.name)
+            if ext.lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime < self._settle_seconds:
+                continue
+            if self._seen.get(entry.path) == (stat.st_mtime, stat.st_size):
+                continue
+            m = self._name_re.match(stem)
+            if m is None:
+                continue
+            pending.append((entry.path, m.group("backend").strip(), m.group("month").strip()))
+        return pending
+
+    def scan_once(self, on_result=None) -> list[IngestFileResult]:
+        """
+        处理一轮目录中的待处理文件，返回各文件结果。
+
+        Args:
+            on_result: 每完成一个文件时回调 on_result(IngestFileResult)
+        """
+        jobs = []
+        results = []
+        hashes_this_round = set()
+        for path, backend, month in self.pending_files():
+            signature = None
+            try:
+                signature = self._signature(path)
+                file_hash = hash_file(path)
+            except OSError as e:
+                results.append(self._finish(path, signature, IngestFileResult(
+                    path=path, backend=backend, month=month, error=str(e)), on_result))
+                continue
+            if file_hash in hashes_this_round or self._ingest_dao.is_ingested(file_hash):
+                results.append(self._finish(path, signature, IngestFileResult(
+                    path=path, backend=backend, month=month, skipped=True), on_result))
+                continue
+            hashes_this_round.add(file_hash)
+            jobs.append((path, backend, month, file_hash, signature))
+
+        if not jobs:
+            return results
+
+        if self._workers == 1 or len(jobs) == 1:
+            for job in jobs:
+                start = time.perf_counter()
+                try:
+                    parsed = parse_file(job[0])
+                except Exception as e:
+                    parsed = e
+                results.append(self._store(job, parsed, start, on_result))
+            return results
+
+        with ProcessPoolExecutor(max_workers=min(self._workers, len(jobs))) as pool:
+            queue = iter(jobs)
+            in_flight = {}
+
+            def submit_next():
+                job = next(queue, None)
+                if job is not None:
+                    in_flight[pool.submit(parse_file, job[0])] = (job, time.perf_counter())
+
+            # 同时在途的文件数不超过 workers，解析结果在主线程逐个写库
+            for _ in range(self._workers):
+                submit_next()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, start = in_flight.pop(future)
+                    try:
+                        parsed = future.result()
+                    except Exception as e:
+                        parsed = e
+                    results.append(self._store(job, parsed, start, on_result))
+                    submit_next()
+        return results
+
+    def run_forever(self, stop_event, interval: float = 10.0, on_result=None) -> None:
+        """每隔 interval 秒扫描一次目录，直到 stop_event（threading.Event）被设置。"""
+        while not stop_event.is_set():
+            self.scan_once(on_result)
+            stop_event.wait(interval)
+
+    # --- private helpers ---
+
+    def _store(self, job, parsed, start: float, on_result) -> IngestFileResult:
+        """将解析结果写入月份数据、执行匹配并登记入库记录。"""
+        path, backend, month, file_hash, signature = job
+        result = IngestFileResult(path=path, backend=backend, month=month)
+        try:
+            if isinstance(parsed, Exception):
+                raise parsed
+            headers, rows = parsed
+            if not headers:
+                raise ValueError("文件为空")
+            col_index = MatchEngine.find_column_index(headers, self._column)
+            backend_id = self._resolve_backend(backend)
+            month_id = self._resolve_month(backend_id, month)
+
+            data_dao = ImportedDataDAO(self._db)
+            result.row_count = data_dao.save_data(month_id, headers, rows)
+            matched = MatchEngine.match(rows, col_index, self._library.get(backend_id))
+            data_dao.save_match_results(month_id, matched)
+            SummaryDAO(self._db).rebuild(month_id, headers, rows, matched, self._column)
+            result.matched_count = len(matched)
+            self._ingest_dao.record(
+                file_hash, os.path.basename(path), month_id, result.row_count, result.matched_count
+            )
+        except Exception as e:
+            result.error = str(e)
+        result.seconds = time.perf_counter() - start
+        return self._finish(path, signature, result, on_result)
+
+    def _finish(self, path, signature, result: IngestFileResult, on_result) -> IngestFileResult:
+        # 失败的文件同样记下，文件内容变化（mtime 或大小改变）后才会重试
+        if signature is not None:
+            self._seen[path] = signature
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    def _resolve_backend(self, name: str) -> int:
+        backend_dao = BackendDAO(self._db)
+        backend_id = backend_dao.get_id(name)
+        if backend_id is None:
+            if not self._create:
+                raise ValueError(f"后台 '{name}' 不存在")
+            backend_id = backend_dao.create(name)
+        return backend_id
+
+    def _resolve_month(self, backend_id: int, label: str) -> int:
+        month_dao = MonthDAO(self._db)
+        month_id = month_dao.get_id(backend_id, label)
+        if month_id is None:
+            if not self._create:
+                raise ValueError(f"月份 '{label}' 不存在")
+            month_id = month_dao.create(backend_id, label)
+        return month_id
+
+    @staticmethod
+    def _signature(path: str) -> tuple[float, int]:
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+
+
+def parse_file(path: str, sheet: str | None = None) -> tuple[list[str], list[list]]:
+    """解析单个文件（sheet 为工作表名称，默认活动工作表；在工作进程中执行）。
+    不转换数值文本：写入时由 ImportedDataDAO 推断列类型并转换。"""
+    headers, rows = ExcelImporter.iter_file(path, sheet, convert=False)
+    return headers, list(rows)
@@ -1,14 +1,25 @@
 """命令行入口：解析参数，协调各组件完成匹配和标记流程。"""
 
 import argparse
+import multiprocessing
+import os
 import sys
+import time
 
-from openpyxl import load_workbook
+from src.batch import find_master_files, run_batch, write_report
+from src.highlighter import HIGHLIGHT_MODES
+from src.pipeline import load_lookup_set, run_match_pipeline
 
-from src.reader import read_drama_names
-from src.matcher import match_dramas
-from src.highlighter import highlight_rows
-from src.writer import save_workbook
+
+def positive_int(value: str) -> int:
+    """argparse 类型：正整数（如进程数）。"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"需要正整数: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"需要正整数: {value}")
+    return number
 
 
 def parse_args(argv=None):
@@ -16,8 +27,13 @@ def parse_args(argv=None):
     parser = argparse.ArgumentParser(
         description="Excel剧名匹配工具：在A文档中查找B文档中出现的剧名并高亮标记"
     )
-    parser.add_argument(
-        "--master", required=True, help="A文档（主表）Excel文件路径"
+    master_group = parser.add_mutually_exclusive_group(required=True)
+    master_group.add_argument(
+        "--master", help="A文档（主表）Excel文件路径"
+    )
+    master_group.add_argument(
+        "--master-dir",
+        help="批量模式：A文档所在目录（处理其中所有 .xlsx）或通配符，如 'data/*.xlsx'",
     )
     parser.add_argument(
         "--lookup", required=True, help="B文档（查找列表）Excel文件路径"
@@ -32,32 +48,49 @@ def parse_args(argv=None):
         required=True,
         help="B文档剧名列标识（列名或列号）",
     )
+    parser.add_argument(
+        "--highlight-mode",
+        choices=HIGHLIGHT_MODES + ("xml",),
+        default="cell",
+        help="高亮方式：cell=设置单元格填充（默认），conditional=添加一条条件格式规则，"
+             "xml=直接改写 .xlsx 内部 XML（不整体加载，保留其余格式）",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="批量模式的并行进程数，默认 CPU 核数",
+    )
+    parser.add_argument(
+        "--report",
+        help="批量模式的汇总报告输出路径（CSV）",
+    )
     return parser.parse_args(argv)
 
 
+def format_timings(timings: dict[str, float]) -> str:
+    """将各阶段耗时格式化为一行文本。"""
+    parts = [f"{name} {seconds:.3f}s" for name, seconds in timings.items()]
+    parts.append(f"合计 {sum(timings.values()):.3f}s")
+    return "耗时: " + " | ".join(parts)
+
+
 def main(argv=None):
     """解析命令行参数，协调各组件完成匹配和标记流程。"""
     args = parse_args(argv)
 
-    try:
-        # 1. 读取A文档剧名（带行号）
-        master_names = read_drama_names(args.master, args.master_col)
-
-        # 2. 读取B文档剧名，提取为集合
-        lookup_tuples = read_drama_names(args.lookup, args.lookup_col)
-        lookup_set = {name for _, name in lookup_tuples}
+    if args.master_dir:
+        main_batch(args)
+        return
 
-        # 3. 匹配
-        result = match_dramas(master_names, lookup_set)
-
-        # 4. 高亮并保存（仅在有匹配时）
-        if result.match_count > 0:
-            wb = load_workbook(args.master)
-            ws = wb.active
-            highlight_rows(ws, result.matched_rows)
-            save_workbook(wb, args.master)
+    try:
+        # 读取B文档剧名集合；A文档只打开一次，完成取列、匹配、高亮并保存（仅在有匹配时）
+        result, timings = run_match_pipeline(
+            args.master, args.lookup, args.master_col, args.lookup_col,
+            highlight_mode=args.highlight_mode,
+        )
 
-        # 5. 输出统计信息
+        # 输出统计信息
         print(f"A文档总数: {result.total_master}")
         print(f"B文档总数: {result.total_lookup}")
         print(f"匹配数量: {result.match_count}")
@@ -65,6 +98,8 @@ def main(argv=None):
         if result.match_count == 0:
             print("未找到匹配项")
 
+        print(format_timings(timings))
+
     except FileNotFoundError as e:
         print(f"错误: {e}", file=sys.stderr)
         sys.exit(1)
@@ -73,5 +108,48 @@ def main(argv=None):
         sys.exit(1)
 
 
+def main_batch(args):
+    """批量模式：B文档只读取一次，多个A文档并行匹配，最后输出汇总。"""
+    start = time.perf_counter()
+    try:
+        master_files = find_master_files(args.master_dir)
+        if not master_files:
+            raise FileNotFoundError(f"未找到任何A文档: {args.master_dir}")
+        lookup_set = load_lookup_set(args.lookup, args.lookup_col)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    def on_result(item):
+        name = os.path.basename(item.path)
+        if item.error:
+            print(f"[失败] {name}: {item.error}")
+        else:
+            print(f"[完成] {name}: A文档总数 {item.total_master}, "
+                  f"匹配数量 {item.match_count}, 耗时 {item.seconds:.3f}s")
+
+    results = run_batch(
+        master_files, lookup_set, args.master_col,
+        highlight_mode=args.highlight_mode, workers=args.workers, on_result=on_result,
+    )
+    failed = [item for item in results if item.error]
+
+    print("=" * 40)
+    print(f"文件数: {len(results)}  成功: {len(results) - len(failed)}  失败: {len(failed)}")
+    print(f"B文档总数: {len(lookup_set)}")
+    print(f"A文档总数: {sum(item.total_master for item in results)}")
+    print(f"匹配数量: {sum(item.match_count for item in results)}")
+    print(f"总耗时: {time.perf_counter() - start:.3f}s")
+
+    if args.report:
+        write_report(args.report, results)
+        print(f"汇总报告: {args.report}")
+
+    if failed:
+        sys.exit(1)
+
+
 if __name__ == "__main__":
+    # 打包为 exe 后进程池的子进程会重新启动程序本身，需先交给 multiprocessing 处理
+    multiprocessing.freeze_support()
     main()
@@ -1,19 +1,26 @@
 """匹配引擎：对导入数据执行剧名匹配。"""
 
+from collections.abc import Iterable
+
+from src import tracing
+
 
 class MatchEngine:
     @staticmethod
-    def match(rows: list[list], col_index: int, drama_set: set[str]) -> list[int]:
+    def match(rows: Iterable[list], col_index: int, drama_set: set[str]) -> list[int]:
         """
         对导入数据执行匹配，返回匹配行的索引列表（0-based）。
-        比对时去除首尾空格后精确匹配。
+        比对时去除首尾空格后精确匹配。rows 可以是任意可迭代对象（如逐页读取的数据库行）。
         """
-        matched = []
-        for i, row in enumerate(rows):
-            if col_index < len(row):
-                value = str(row[col_index]).strip()
-                if value in drama_set:
-                    matched.append(i)
+        with tracing.span("MatchEngine.match") as sp:
+            matched = []
+            i = -1
+            for i, row in enumerate(rows):
+                if col_index < len(row):
+                    value = str(row[col_index]).strip()
+                    if value in drama_set:
+                        matched.append(i)
+            sp.set_rows(i + 1)
         return matched
 
     @staticmethod
@@ -0,0 +1,188 @@
+"""内存分析模式：用 tracemalloc 记录月份加载、Excel 导入、导出等操作的峰值内存和分子系统分配。
+
+默认关闭，关闭时 section() / profiled() 不做任何事情。开启后每个 section 记录：
+
+- 峰值：操作期间 Python 分配内存的最高点相对操作开始时的增量；
+- 净增：操作结束后仍保留的内存（例如加载到 all_rows 的行数据）；
+- 分子系统：按分配发生的源文件归类（openpyxl、json、sqlite3、src 各模块等）的净增内存。
+
+注意 tracemalloc 只跟踪 Python 分配器：Treeview 条目保存在 Tcl/Tk 中，不计入统计；
+开启后程序整体会明显变慢，仅用于排查问题。嵌套的 section 只记录最外层。
+
+用法：
+    from src import memprofile
+
+    memprofile.enable()
+    with memprofile.section("加载月份"):
+        ...
+    print(memprofile.format_report())
+"""
+
+import os
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+
+# 每个 section 报告中最多列出的子系统数
+TOP_SUBSYSTEMS = 8
+
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+# 源文件路径片段 -> 子系统名，按顺序匹配
+_SUBSYSTEM_PATTERNS = (
+    ("openpyxl", "openpyxl"),
+    ("xlrd", "xlrd"),
+    ("et_xmlfile", "openpyxl"),
+    ("tkinter", "tkinter"),
+    ("sqlite3", "sqlite3"),
+    (os.sep + "json" + os.sep, "json"),
+    (os.sep + "xml" + os.sep, "xml"),
+    ("zipfile", "zipfile"),
+)
+
+_enabled = False
+_depth = 0
+_records: list = []
+
+
+@dataclass
+class MemoryRecord:
+    """一个 section 的内存统计（字节）"""
+    name: str                                       # 操作名
+    peak_bytes: int                                 # 峰值增量
+    net_bytes: int                                  # 净增
+    by_subsystem: dict[str, int] = field(default_factory=dict)  # 子系统 -> 净增，按绝对值降序
+
+
+def enable(nframes: int = 1) -> None:
+    """开启内存分析（启动 tracemalloc）。"""
+    global _enabled
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(nframes)
+    _enabled = True
+
+
+def disable() -> None:
+    """关闭内存分析并停止 tracemalloc（已记录的数据保留）。"""
+    global _enabled
+    _enabled = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled() -> bool:
+    """内存分析是否开启。"""
+    return _enabled
+
+
+def reset() -> None:
+    """清空已记录的 section。"""
+    _records.clear()
+
+
+def records() -> list[MemoryRecord]:
+    """返回已记录的 section，按完成先后排列。"""
+    return list(_records)
+
+
+def subsystem_of(filename: str) -> str:
+    """按源文件路径判断所属子系统。"""
+    if filename.startswith(_SRC_DIR):
+        module = os.path.splitext(os.path.relpath(filename, _SRC_DIR))[0]
+        return "src." + module.replace(os.sep, ".")
+    for pattern, name in _SUBSYSTEM_PATTERNS:
+        if pattern in filename:
+            return name
+    return "其他"
+
+
+@contextmanager
+def section(name: str):
+    """记录一段操作的内存；未开启或处于另一个 section 内时不做任何事情。"""
+    global _depth
+    if not _enabled or _depth > 0:
+        yield
+        return
+    _depth += 1
+    try:
+        with _measure(name) as record:
+            yield
+        _records.append(record)
+    finally:
+        _depth -= 1
+
+
+def profiled(name: str):
+    """函数装饰器：内存分析开启时以 name 记录每次调用。"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def measure(func, name: str = "") -> MemoryRecord:
+    """
+    调用 func() 并返回其内存统计，不依赖开关；tracemalloc 未启动时临时启动。
+    用于基准测试等一次性测量。
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        with _measure(name) as record:
+            func()
+        return record
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+@contextmanager
+def _measure(name: str):
+    record = MemoryRecord(name, 0, 0)
+    before = _snapshot()
+    start_current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    yield record
+    current, peak = tracemalloc.get_traced_memory()
+    after = _snapshot()
+    record.peak_bytes = max(peak - start_current, 0)
+    record.net_bytes = current - start_current
+    totals: dict[str, int] = {}
+    for stat in after.compare_to(before, "filename"):
+        if stat.size_diff:
+            key = subsystem_of(stat.traceback[0].filename)
+            totals[key] = totals.get(key, 0) + stat.size_diff
+    record.by_subsystem = dict(sorted(totals.items(), key=lambda kv: abs(kv[1]), reverse=True))
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+
+
+def format_report(limit: int = TOP_SUBSYSTEMS) -> str:
+    """格式化所有 section 的报告。"""
+    if not _records:
+        return "暂无内存分析数据"
+    return "\n".join(format_record(record, limit) for record in _records)
+
+
+def format_record(record: MemoryRecord, limit: int = TOP_SUBSYSTEMS) -> str:
+    """格式化单个 section：标题行 + 分子系统净增。"""
+    lines = [f"{record.name}: 峰值 {_mb(record.peak_bytes)}  净增 {_mb(record.net_bytes)}"]
+    for subsystem, size in list(record.by_subsystem.items())[:limit]:
+        lines.append(f"    {subsystem:<32}{_mb(size):>12}")
+    return "\n".join(lines)
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):+.2f} MB" if size < 0 else f"{size / (1024 * 1024):.2f} MB"
@@ -0,0 +1,74 @@
+"""合并导入：把文件合并到月份已有数据中，按行哈希去重，只写入变化的行。
+
+- ImportedDataDAO.merge_data 按整行（或指定的键列）计算行哈希，通过 (month_id, row_hash) 索引
+  查找重复行：重复行跳过，replace=True 时用新行替换键相同的旧行；
+- 匹配结果只对新增和被替换的行重新匹配，其余行保持原有的匹配状态；
+- 月度汇总按变化的行增量更新（SummaryDAO.apply_delta），不重新扫描整月数据。
+
+用法：
+    from src.merge_import import merge_rows
+
+    headers, rows = ExcelImporter.iter_file("1月_补充.xlsx", convert=False)
+    result = merge_rows(db, month_id, headers, rows, key_columns=[0, 1], replace=True)
+"""
+
+from collections.abc import Iterable
+
+from src import tracing
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.summary_dao import DEFAULT_TITLE_COLUMN, SummaryDAO
+from src.database import Database
+from src.match_engine import MatchEngine
+from src.models import MergeResult
+
+
+def merge_rows(db: Database, month_id: int, headers: list[str], rows: Iterable,
+               key_columns: list[int] | None = None, replace: bool = False,
+               drama_set: set[str] | None = None,
+               title_column: str = DEFAULT_TITLE_COLUMN) -> MergeResult:
+    """
+    合并行数据到月份，并增量更新匹配结果和月度汇总。
+
+    Args:
+        db: 数据库
+        month_id: 月份 ID
+        headers: 表头（月份已有数据时须与已有表头一致）
+        rows: 行数据
+        key_columns: 判断重复的键列下标，None 表示整行
+        replace: 键相同但内容不同时用新行替换旧行（默认跳过）
+        drama_set: 剧名库；给出时对新增和被替换的行重新匹配，None 时新增行视为未匹配、
+            被替换的行保持原有匹配状态
+        title_column: 剧名列名
+    """
+    data_dao = ImportedDataDAO(db)
+    with tracing.span("merge_rows") as sp:
+        result = data_dao.merge_data(month_id, headers, rows, key_columns, replace)
+        if not result.inserted and not result.replaced:
+            return result
+        headers = data_dao.get_headers(month_id)
+        matched = set(data_dao.get_match_results(month_id))
+
+        if drama_set is not None:
+            col_index = MatchEngine.find_column_index(headers, title_column)
+            new_rows = [new for _, _, new in result.replaced] + result.inserted
+            new_indices = [index for index, _, _ in result.replaced]
+            new_indices += range(result.start_index, result.start_index + len(result.inserted))
+            is_matched = [False] * len(new_rows)
+            for i in MatchEngine.match(new_rows, col_index, drama_set):
+                is_matched[i] = True
+            removed = [(old, index in matched) for index, old, _ in result.replaced]
+            for index, flag in zip(new_indices, is_matched):
+                if flag:
+                    matched.add(index)
+                else:
+                    matched.discard(index)
+            added = list(zip(new_rows, is_matched))
+        else:
+            removed = [(old, index in matched) for index, old, _ in result.replaced]
+            added = [(new, index in matched) for index, _, new in result.replaced]
+            added += [(row, False) for row in result.inserted]
+
+        data_dao.save_match_results(month_id, sorted(matched))
+        SummaryDAO(db).apply_delta(month_id, headers, removed, added, title_column)
+        sp.set_rows(len(result.inserted) + len(result.replaced))
+    return result
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -9,3 +9,95 @@ class MatchResult:
     total_master: int             # A文档总剧名数
     total_lookup: int             # B文档总剧名数
     match_count: int              # 匹配数量
+
+
+@dataclass
+class BatchFileResult:
+    """批量模式下单个A文档的处理结果"""
+    path: str                     # A文档路径
+    total_master: int = 0         # A文档总剧名数
+    match_count: int = 0          # 匹配数量
+    seconds: float = 0.0          # 处理耗时（秒）
+    timings: dict[str, float] = field(default_factory=dict)  # 各阶段耗时
+    error: str = ""               # 失败原因，成功时为空
+
+
+@dataclass
+class IngestFileResult:
+    """目录监控入库时单个文件的处理结果"""
+    path: str                     # 文件路径
+    backend: str = ""             # 后台名称
+    month: str = ""               # 月份标签
+    row_count: int = 0            # 导入行数
+    matched_count: int = 0        # 匹配行数
+    seconds: float = 0.0          # 处理耗时（秒）
+    skipped: bool = False         # 内容与已入库文件相同而跳过
+    error: str = ""               # 失败原因，成功时为空
+
+
+@dataclass
+class ImportFileResult:
+    """多文件导入一个月份时单个文件的结果"""
+    path: str                     # 文件路径
+    row_count: int = 0            # 导入行数
+    parse_seconds: float = 0.0    # 解析耗时（秒，在工作进程中计时）
+
+
+@dataclass
+class MultiImportResult:
+    """多文件导入一个月份的结果"""
+    headers: list[str] = field(default_factory=list)               # 月份表头
+    files: list[ImportFileResult] = field(default_factory=list)    # 各文件结果，按导入顺序
+    row_count: int = 0            # 导入总行数
+    seconds: float = 0.0          # 总耗时（秒）
+
+
+@dataclass
+class MergeResult:
+    """合并导入（按行哈希去重）的结果"""
+    inserted: list[list] = field(default_factory=list)                    # 新增的行，依次写在 start_index 之后
+    start_index: int = 0                                                   # 第一行新增行的行下标
+    replaced: list[tuple[int, list, list]] = field(default_factory=list)  # 被替换的 (行下标, 旧行, 新行)
+    skipped: int = 0                                                       # 与已有行或本次其它行重复而未写入的行数
+
+
+@dataclass
+class CachedImportResult:
+    """按文件指纹复用已导入数据的导入结果"""
+    file_hash: str                # 文件内容哈希（SHA-256）
+    row_count: int = 0            # 导入行数
+    source_month_id: int | None = None   # 复用了该月份的已编码行；None 表示重新解析了文件
+    headers: list[str] = field(default_factory=list)     # 表头
+    rows: list[list] | None = None       # 重新解析且 keep_rows 为 True 时的行数据
+
+    @property
+    def cached(self) -> bool:
+        return self.source_month_id is not None
+
+
+@dataclass
+class SheetInfo:
+    """工作簿中一个工作表的元数据（不解析单元格即可读取）"""
+    name: str                     # 工作表名称
+    index: int                    # 在工作簿中的位置（0-based）
+    max_row: int | None = None    # 声明的行数（含表头），未知时为 None
+    max_column: int | None = None  # 声明的列数，未知时为 None
+    active: bool = False          # 是否为默认读取的工作表
+
+
+@dataclass
+class SheetImportResult:
+    """多工作表导入时单个工作表的结果"""
+    sheet: str                    # 工作表名称
+    month_label: str = ""         # 写入的月份（子表）标签
+    month_id: int | None = None   # 写入的月份 ID，空工作表为 None
+    row_count: int = 0            # 导入行数
+    parse_seconds: float = 0.0    # 解析耗时（秒，在工作进程中计时）
+
+
+@dataclass
+class WorkbookImportResult:
+    """多工作表导入的结果"""
+    sheets: list[SheetImportResult] = field(default_factory=list)  # 各工作表结果，按工作簿中的顺序
+    row_count: int = 0            # 导入总行数
+    seconds: float = 0.0          # 总耗时（秒）
@@ -0,0 +1,177 @@
+"""月份对比：按剧名列比较同一后台的两个月份，找出新增、消失和数据变化的剧名。
+
+哈希对比，逐行流式处理：两个月份分别用 GroupBy 按剧名聚合（每个剧名一组累加器），
+rows 可以是 ImportedDataDAO.iter_rows 逐页读取的迭代器，内存只与剧名数有关。
+
+剧名与匹配时的比较方式一致（转为文本后去除首尾空格），剧名为空的行不参与对比。
+两个月份都有的数值列逐列比较合计并给出变化量。
+
+用法：
+    from src.month_diff import diff_months
+
+    diff = diff_months(old_headers, data_dao.iter_rows(old_id), new_headers, data_dao.iter_rows(new_id))
+    headers, rows = diff.table()
+"""
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from src import tracing
+from src.groupby import GroupBy, format_cell
+from src.match_engine import MatchEngine
+
+DEFAULT_KEY_COLUMN = "合集名称"
+
+# 对比状态，table() 中按此顺序排列
+ADDED = "新增"
+REMOVED = "消失"
+CHANGED = "变化"
+UNCHANGED = "不变"
+STATUSES = (ADDED, REMOVED, CHANGED, UNCHANGED)
+
+
+@dataclass
+class DiffEntry:
+    """一个剧名的对比结果"""
+    key: str
+    status: str
+    old_rows: int
+    new_rows: int
+    old_totals: list              # 各对比列在旧月份的合计，无数值时为 None
+    new_totals: list              # 各对比列在新月份的合计，无数值时为 None
+
+    @property
+    def deltas(self) -> list:
+        """各对比列的变化量（新 - 旧，缺失按 0 计），两边都无数值时为 None。"""
+        return [None if old is None and new is None else (new or 0.0) - (old or 0.0)
+                for old, new in zip(self.old_totals, self.new_totals)]
+
+
+@dataclass
+class MonthDiff:
+    """两个月份的对比结果"""
+    key_column: str
+    columns: list[str]            # 两个月份都有的数值列
+    old_label: str
+    new_label: str
+    entries: list[DiffEntry] = field(default_factory=list)
+    unchanged: int = 0            # 不变的剧名数（include_unchanged 为 False 时不在 entries 中）
+
+    def count(self, status: str) -> int:
+        """某种状态的剧名数。"""
+        if status == UNCHANGED:
+            return self.unchanged
+        return sum(1 for entry in self.entries if entry.status == status)
+
+    def table(self, statuses: Iterable[str] = STATUSES) -> tuple[list[str], list[list]]:
+        """转换为 (表头, 行) 形式，供显示和导出，只包含 statuses 中的状态。"""
+        headers = [self.key_column, "状态", f"{self.old_label} 行数", f"{self.new_label} 行数", "行数变化"]
+        for name in self.columns:
+            headers += [f"{name} {self.old_label}", f"{name} {self.new_label}", f"{name} 变化"]
+        wanted = set(statuses)
+        rows = []
+        for entry in self.entries:
+            if entry.status not in wanted:
+                continue
+            row = [entry.key, entry.status, entry.old_rows, entry.new_rows, entry.new_rows - entry.old_rows]
+            for values in zip(entry.old_totals, entry.new_totals, entry.deltas):
+                row.extend(values)
+            rows.append(row)
+        return headers, rows
+
+
+def diff_months(old_headers: list[str], old_rows: Iterable, new_headers: list[str], new_rows: Iterable,
+                key_column: str = DEFAULT_KEY_COLUMN, old_label: str = "上月", new_label: str = "本月",
+                include_unchanged: bool = False) -> MonthDiff:
+    """
+    对比两个月份。任一月份没有 key_column 列时抛出 ValueError。
+
+    Args:
+        old_headers / old_rows: 旧月份的表头和行数据
+        new_headers / new_rows: 新月份的表头和行数据
+        key_column: 剧名列名
+        old_label / new_label: 结果表头中使用的月份名称
+        include_unchanged: 为 True 时 entries 中包含不变的剧名
+    """
+    old_key = MatchEngine.find_column_index(old_headers, key_column)
+    new_key = MatchEngine.find_column_index(new_headers, key_column)
+    old_names = [str(h).strip() for h in old_headers]
+    columns = [str(h).strip() for i, h in enumerate(new_headers)
+               if i != new_key and str(h).strip() in old_names and str(h).strip() != key_column]
+    new_names = [str(h).strip() for h in new_headers]
+
+    with tracing.span("diff_months") as sp:
+        old = _title_totals(old_rows, old_key, [old_names.index(name) for name in columns])
+        new = _title_totals(new_rows, new_key, [new_names.index(name) for name in columns])
+        # 只保留至少一个月份有数值的列（去掉平台、日期等文本列）
+        keep = [i for i in range(len(columns))
+                if any(totals[i] is not None for _, totals in (*old.values(), *new.values()))]
+        if len(keep) < len(columns):
+            columns = [columns[i] for i in keep]
+            old = {key: (count, [totals[i] for i in keep]) for key, (count, totals) in old.items()}
+            new = {key: (count, [totals[i] for i in keep]) for key, (count, totals) in new.items()}
+
+        diff = MonthDiff(key_column, columns, old_label, new_label)
+        empty = [None] * len(columns)
+        for key, (new_count, new_totals) in new.items():
+            if key not in old:
+                diff.entries.append(DiffEntry(key, ADDED, 0, new_count, empty, new_totals))
+                continue
+            old_count, old_totals = old[key]
+            if old_count == new_count and all(map(_same_total, old_totals, new_totals)):
+                diff.unchanged += 1
+                if not include_unchanged:
+                    continue
+                status = UNCHANGED
+            else:
+                status = CHANGED
+            diff.entries.append(DiffEntry(key, status, old_count, new_count, old_totals, new_totals))
+        for key, (old_count, old_totals) in old.items():
+            if key not in new:
+                diff.entries.append(DiffEntry(key, REMOVED, old_count, 0, old_totals, empty))
+        order = {status: i for i, status in enumerate(STATUSES)}
+        diff.entries.sort(key=lambda entry: (order[entry.status], entry.key))
+        sp.set_rows(len(old) + len(new))
+    return diff
+
+
+def _title_totals(rows: Iterable, key_index: int, value_columns: list[int]) -> dict[str, tuple[int, list]]:
+    """按剧名聚合：剧名 -> (行数, [各列合计，无数值时为 None])。"""
+    grouping = GroupBy([key_index], value_columns)
+    grouping.add_rows(rows)
+    totals: dict[str, tuple[int, list]] = {}
+    for (key,), row_count, stats in grouping.iter_groups():
+        if key is None:
+            continue
+        # GroupBy 只去除文本的空格；123 与 "123" 转为文本后合并
+        key = str(key).strip()
+        if not key:
+            continue
+        sums = [total if count else None for total, count, _, _ in stats]
+        if key in totals:
+            count, previous = totals[key]
+            sums = [b if a is None else a if b is None else a + b for a, b in zip(previous, sums)]
+            row_count += count
+        totals[key] = (row_count, sums)
+    return totals
+
+
+def _same_total(old, new) -> bool:
+    if old is None or new is None:
+        return old is new
+    # 行顺序不同时浮点数累加结果可能有极小差异
+    return math.isclose(old, new, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def format_diff(diff: MonthDiff, limit: int | None = None) -> str:
+    """格式化为文本表格（制表符分隔），最多 limit 行，末尾附各状态的剧名数。"""
+    headers, rows = diff.table()
+    lines = ["\t".join(headers)]
+    shown = rows if limit is None else rows[:limit]
+    for row in shown:
+        lines.append("\t".join(format_cell(value) for value in row))
+    if len(shown) < len(rows):
+        lines.append(f"... 另有 {len(rows) - len(shown)} 行")
+    lines.append("，".join(f"{status} {diff.count(status)} 个" for status in STATUSES))
+    return "\n".join(lines)
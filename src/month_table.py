@@ -0,0 +1,301 @@
+"""紧凑的月份数据表：按列存储，替代 list[list] 形式的 all_rows。
+
+- 数值列（int / float / None）存为 array('d') 加一个类型字节（None / int / float），
+  每个单元格 9 字节，读取时还原为原来的 int 或 float；
+- 其它列（文本、布尔、混合类型）按字典编码：每种取值只保存一份，单元格存 4 字节编号，
+  平台名、日期等大量重复的文本只占一份内存；
+- 按行访问时返回 __slots__ 的 RowView，支持 len()、下标、切片、迭代和与 list 比较，
+  filter_rows、compute_column_sums、MatchEngine.match、导出等按行处理的代码无需修改。
+
+一列在追加过程中出现非数值时自动转换为字典编码列。
+"""
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import repeat
+
+# 数值列的类型字节
+_NONE = 0
+_INT = 1
+_FLOAT = 2
+
+# 超过该绝对值的整数无法用 double 精确表示，所在列改为字典编码
+_MAX_EXACT_INT = 2 ** 53
+
+
+def _is_number(value) -> bool:
+    kind = type(value)
+    return value is None or kind is float or (kind is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT)
+
+
+def _number_value(value: float, kind: int):
+    if kind == _FLOAT:
+        return value
+    if kind == _INT:
+        return int(value)
+    return None
+
+
+class _NumberColumn:
+    """数值列：array('d') 保存数值，bytearray 保存每个单元格的类型。"""
+
+    __slots__ = ("values", "kinds")
+
+    def __init__(self):
+        self.values = array("d")
+        self.kinds = bytearray()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def accepts(self, value) -> bool:
+        return _is_number(value)
+
+    def append(self, value) -> None:
+        if value is None:
+            self.values.append(0.0)
+            self.kinds.append(_NONE)
+        elif type(value) is int:
+            self.values.append(value)
+            self.kinds.append(_INT)
+        else:
+            self.values.append(value)
+            self.kinds.append(_FLOAT)
+
+    def get(self, index: int):
+        kind = self.kinds[index]
+        if kind == _FLOAT:
+            return self.values[index]
+        if kind == _INT:
+            return int(self.values[index])
+        return None
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.values) + sys.getsizeof(self.kinds)
+
+
+class _DictColumn:
+    """字典编码列：codes 保存编号，values 保存去重后的取值。"""
+
+    __slots__ = ("codes", "values", "numbers", "_lookup")
+
+    def __init__(self):
+        self.codes = array("I")
+        self.values: list = []
+        # 去重取值中 int / float / bool 的个数
+        self.numbers = 0
+        # 取值 -> 编号；构建完成后释放（见 release_lookup），再次追加时重建
+        self._lookup: dict | None = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def accepts(self, value) -> bool:
+        return True
+
+    def append(self, value) -> None:
+        if self._lookup is None:
+            self._lookup = {_dict_key(v): code for code, v in enumerate(self.values)}
+        key = _dict_key(value)
+        code = self._lookup.get(key)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._lookup[key] = code
+            if isinstance(value, (int, float)):
+                self.numbers += 1
+        self.codes.append(code)
+
+    def release_lookup(self) -> None:
+        self._lookup = None
+
+    def get(self, index: int):
+        return self.values[self.codes[index]]
+
+    def memory_bytes(self) -> int:
+        size = sys.getsizeof(self.codes) + sys.getsizeof(self.values)
+        size += sum(sys.getsizeof(value) for value in self.values)
+        if self._lookup is not None:
+            size += sys.getsizeof(self._lookup)
+        return size
+
+
+def _dict_key(value):
+    # 文本直接作键；其它取值带上类型，避免 1、1.0、True 被视为同一个取值
+    if type(value) is str:
+        return value
+    return (type(value), value)
+
+
+class RowView:
+    """MonthTable 中一行的只读视图。"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "MonthTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __len__(self):
+        return self._table._row_length(self._index)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        length = len(self)
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError("行下标超出范围")
+        return self._table._columns[key].get(self._index)
+
+    def __iter__(self):
+        index = self._index
+        for column in self._table._columns[:len(self)]:
+            yield column.get(index)
+
+    def __eq__(self, other):
+        if isinstance(other, (RowView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"RowView({list(self)!r})"
+
+
+class MonthTable:
+    """按列存储的月份数据表，实现按行访问的序列协议。"""
+
+    def __init__(self, num_columns: int = 0):
+        self._columns: list = [_NumberColumn() for _ in range(num_columns)]
+        self._count = 0
+        # 各行原始长度；所有行都与列数相同时为 None
+        self._lengths: array | None = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[list], num_columns: int = 0) -> "MonthTable":
+        """从行数据（list / tuple 的可迭代对象）构建，列数取 num_columns 与最长行的较大值。"""
+        table = cls(num_columns)
+        for row in rows:
+            table.append(row)
+        table.release_lookups()
+        return table
+
+    def append(self, row) -> None:
+        """追加一行。行比当前列数长时自动增加列（已有行在新列上视为缺失）。"""
+        length = len(row)
+        width = len(self._columns)
+        if length > width:
+            self._widen(length)
+            width = length
+        columns = self._columns
+        for i in range(width):
+            value = row[i] if i < length else None
+            column = columns[i]
+            if not column.accepts(value):
+                column = columns[i] = self._to_dict_column(column)
+            column.append(value)
+        if length != width and self._lengths is None:
+            self._lengths = array("I", [width]) * self._count
+        if self._lengths is not None:
+            self._lengths.append(length)
+        self._count += 1
+
+    def release_lookups(self) -> None:
+        """释放字典编码列的取值索引以节省内存；之后再追加行时自动重建。"""
+        for column in self._columns:
+            if isinstance(column, _DictColumn):
+                column.release_lookup()
+
+    @property
+    def num_columns(self) -> int:
+        return len(self._columns)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [RowView(self, i) for i in range(*key.indices(self._count))]
+        if key < 0:
+            key += self._count
+        if not 0 <= key < self._count:
+            raise IndexError("行下标超出范围")
+        return RowView(self, key)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield RowView(self, i)
+
+    def column_arrays(self, index: int) -> tuple:
+        """
+        返回第 index 列的底层存储（只读使用，供 aggregate 做向量化计算）：
+        数值列为 ("number", array('d') 数值, bytearray 类型字节)，类型字节为 0 表示缺失；
+        字典编码列为 ("dict", array('I') 编号, 去重后的取值列表)。
+        """
+        column = self._columns[index]
+        if isinstance(column, _NumberColumn):
+            return "number", column.values, column.kinds
+        return "dict", column.codes, column.values
+
+    def iter_columns(self, indices: list[int]) -> Iterator[tuple]:
+        """按行依次返回 indices 各列取值组成的元组，比逐行创建 RowView 快得多。"""
+        return zip(*(self._iter_column(i) for i in indices)) if indices else iter(())
+
+    def column_has_numbers(self, index: int) -> bool:
+        """第 index 列是否含有数值（int / float / bool）单元格。"""
+        column = self._columns[index]
+        if isinstance(column, _NumberColumn):
+            return column.kinds.count(_NONE) != len(column.kinds)
+        return column.numbers > 0
+
+    def to_rows(self) -> list[list]:
+        """转换回 list[list]。"""
+        return [list(row) for row in self]
+
+    def memory_bytes(self) -> int:
+        """估算占用的内存（字节）。"""
+        size = sys.getsizeof(self) + sys.getsizeof(self._columns)
+        size += sum(column.memory_bytes() for column in self._columns)
+        if self._lengths is not None:
+            size += sys.getsizeof(self._lengths)
+        return size
+
+    # --- private helpers ---
+
+    def _iter_column(self, index: int) -> Iterator:
+        if index >= len(self._columns):
+            return repeat(None, self._count)
+        column = self._columns[index]
+        if isinstance(column, _DictColumn):
+            return map(column.values.__getitem__, column.codes)
+        kinds = column.kinds
+        if kinds.count(_FLOAT) == len(kinds):
+            return iter(column.values)
+        if kinds.count(_INT) == len(kinds):
+            return map(int, column.values)
+        return map(_number_value, column.values, kinds)
+
+    def _row_length(self, index: int) -> int:
+        if self._lengths is None:
+            return len(self._columns)
+        return self._lengths[index]
+
+    def _widen(self, width: int) -> None:
+        if self._count and self._lengths is None:
+            self._lengths = array("I", [len(self._columns)]) * self._count
+        for _ in range(width - len(self._columns)):
+            column = _NumberColumn()
+            for _ in range(self._count):
+                column.append(None)
+            self._columns.append(column)
+
+    @staticmethod
+    def _to_dict_column(column: _NumberColumn) -> _DictColumn:
+        converted = _DictColumn()
+        for i in range(len(column)):
+            converted.append(column.get(i))
+        return converted
@@ -0,0 +1,246 @@
+"""多文件导入一个月份：部分平台把一个月的数据拆成 10-30 个工作簿交付。
+
+- 各文件在有界进程池中并行解析，同时在途的文件数不超过 workers；
+- 表头需与第一个文件（追加时与月份已有数据）一致，列顺序不同时按第一个文件的顺序重排，
+  缺少或多出列时报错；
+- 解析结果按文件顺序依次交给同一次 ImportedDataDAO.save_data 写入（一个事务、一次 executemany），
+  任一文件失败时整体回滚，月份数据保持不变；
+- 返回各文件行数、解析耗时和总耗时。
+
+多工作表导入（import_sheets）：一个工作簿中的多个工作表各有表头，分别作为月份的子表写入
+"<月份>/<工作表>" 月份（只选一个工作表时直接写入该月份）。只解析选中的工作表，
+各工作表同样在有界进程池中并行解析，按工作簿中的顺序逐个写入。
+
+用法：
+    from src.multi_import import import_files, import_sheets
+
+    result = import_files(db, month_id, ["1月_1.xlsx", "1月_2.xlsx"], workers=4)
+    result = import_sheets(db, backend_id, "2026年01月", "1月.xlsx", sheets=["直播", "短剧"])
+"""
+
+import os
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+
+from src import tracing
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import SUBTABLE_SEPARATOR, MonthDAO
+from src.database import Database
+from src.excel_importer import ExcelImporter
+from src.ingest import parse_file
+from src.models import (
+    ImportFileResult,
+    MultiImportResult,
+    SheetImportResult,
+    WorkbookImportResult,
+)
+
+
+def import_files(db: Database, month_id: int, paths: list[str], workers: int = None,
+                 append: bool = False,
+                 on_file: Callable[[ImportFileResult], None] | None = None) -> MultiImportResult:
+    """
+    按顺序导入多个文件到月份。
+
+    Args:
+        db: 数据库
+        month_id: 月份 ID
+        paths: 文件路径列表，行按此顺序写入
+        workers: 解析进程数，默认 CPU 核数；为 1 或只有一个文件时在当前进程内解析
+        append: 追加到月份已有数据之后（默认替换）
+        on_file: 每个文件写入完成时回调 on_file(ImportFileResult)
+    """
+    if not paths:
+        raise ValueError("没有要导入的文件")
+    for path in paths:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"文件未找到: {path}")
+
+    start = time.perf_counter()
+    data_dao = ImportedDataDAO(db)
+    result = MultiImportResult()
+    workers = max(min(workers or os.cpu_count() or 1, len(paths)), 1)
+
+    with tracing.span("import_files") as sp:
+        if workers == 1:
+            parsed = (_run_now(path) for path in paths)
+            result.row_count = _write(data_dao, month_id, paths, parsed, append, result, on_file)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = _ordered_results(pool, [(path,) for path in paths], workers)
+                try:
+                    result.row_count = _write(data_dao, month_id, paths, parsed, append, result, on_file)
+                finally:
+                    parsed.close()
+        sp.set_rows(result.row_count)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def import_sheets(db: Database, backend_id: int, month_label: str, path: str,
+                  sheets: list[str] | None = None, workers: int = None,
+                  on_sheet: Callable[[SheetImportResult], None] | None = None) -> WorkbookImportResult:
+    """
+    按工作表导入工作簿，每个工作表替换写入一个子表月份（不存在时创建）。
+
+    Args:
+        db: 数据库
+        backend_id: 后台 ID
+        month_label: 月份标签
+        path: 工作簿路径
+        sheets: 要导入的工作表名称，默认全部；只选一个时写入 month_label 本身
+        workers: 解析进程数，默认 CPU 核数；为 1 或只有一个工作表时在当前进程内解析
+        on_sheet: 每个工作表写入完成时回调 on_sheet(SheetImportResult)
+
+    空工作表（没有表头）跳过。各工作表分别提交，某个工作表失败时之前的工作表已写入。
+    """
+    names = [info.name for info in ExcelImporter.list_sheets(path)]
+    if sheets is None:
+        sheets = names
+    missing = [name for name in sheets if name not in names]
+    if missing:
+        raise ValueError(f"工作表不存在: {missing}。可用的工作表: {names}")
+    if not sheets:
+        raise ValueError("没有要导入的工作表")
+
+    start = time.perf_counter()
+    result = WorkbookImportResult()
+    workers = max(min(workers or os.cpu_count() or 1, len(sheets)), 1)
+    # 按工作簿中的顺序写入
+    sheets = [name for name in names if name in sheets]
+    jobs = [(path, name) for name in sheets]
+
+    with tracing.span("import_sheets") as sp:
+        if workers == 1:
+            parsed = (_run_now(*job) for job in jobs)
+            _write_sheets(db, backend_id, month_label, path, sheets, parsed, result, on_sheet)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = _ordered_results(pool, jobs, workers)
+                try:
+                    _write_sheets(db, backend_id, month_label, path, sheets, parsed, result, on_sheet)
+                finally:
+                    parsed.close()
+        sp.set_rows(result.row_count)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def sheet_month_label(month_label: str, sheet: str) -> str:
+    """工作表子表的月份标签。"""
+    return f"{month_label}{SUBTABLE_SEPARATOR}{sheet}"
+
+
+def _write_sheets(db: Database, backend_id: int, month_label: str, path: str, sheets: list[str],
+                  parsed: Iterator[Future], result: WorkbookImportResult, on_sheet) -> None:
+    """按顺序把各工作表替换写入对应的月份，空工作表跳过。"""
+    data_dao = ImportedDataDAO(db)
+    for name in sheets:
+        headers, rows, parse_seconds = _result(next(parsed), f"{path} [{name}]")
+        label = month_label if len(sheets) == 1 else sheet_month_label(month_label, name)
+        sheet_result = SheetImportResult(sheet=name, month_label=label, parse_seconds=parse_seconds)
+        if headers:
+            sheet_result.month_id = _month_id(db, backend_id, label)
+            sheet_result.row_count = data_dao.save_data(sheet_result.month_id, headers, rows)
+            result.row_count += sheet_result.row_count
+        # 写完即释放该工作表的行
+        del rows
+        result.sheets.append(sheet_result)
+        if on_sheet is not None:
+            on_sheet(sheet_result)
+
+
+def _month_id(db: Database, backend_id: int, label: str) -> int:
+    month_dao = MonthDAO(db)
+    month_id = month_dao.get_id(backend_id, label)
+    return month_dao.create(backend_id, label) if month_id is None else month_id
+
+
+def _write(data_dao: ImportedDataDAO, month_id: int, paths: list[str], parsed: Iterator[Future],
+           append: bool, result: MultiImportResult, on_file) -> int:
+    """以第一个文件（追加时为已有数据）的表头为准，把各文件的行依次交给 save_data。"""
+    first = _result(next(parsed), paths[0])
+    expected = data_dao.get_headers(month_id) if append else []
+    if not expected:
+        if not first[0]:
+            raise ValueError(f"{os.path.basename(paths[0])}: 文件为空")
+        expected = first[0]
+    result.headers = expected
+
+    def _rows():
+        nonlocal first
+        for index, path in enumerate(paths):
+            if index == 0:
+                (headers, rows, parse_seconds), first = first, None
+            else:
+                headers, rows, parse_seconds = _result(next(parsed), path)
+            file_result = ImportFileResult(path=path, parse_seconds=parse_seconds)
+            if headers:
+                order = _column_order(expected, headers, path)
+                for row in rows:
+                    file_result.row_count += 1
+                    yield row if order is None else [row[i] if i < len(row) else None for i in order]
+            # 写完即释放该文件的行，内存中最多保留 workers 个已解析的文件
+            del rows
+            result.files.append(file_result)
+            if on_file is not None:
+                on_file(file_result)
+
+    return data_dao.save_data(month_id, expected, _rows(), append=append)
+
+
+def _column_order(expected: list[str], headers: list[str], path: str) -> list[int] | None:
+    """返回把 headers 的列重排为 expected 顺序的下标列表，顺序相同时返回 None。"""
+    names = [str(h).strip() for h in headers]
+    wanted = [str(h).strip() for h in expected]
+    if names == wanted:
+        return None
+    name = os.path.basename(path)
+    missing = [h for h in wanted if h not in names]
+    extra = [h for h in names if h not in wanted]
+    if missing or extra:
+        raise ValueError(f"{name}: 表头与第一个文件不一致（缺少列: {missing}，多出列: {extra}）")
+    if len(set(names)) != len(names):
+        raise ValueError(f"{name}: 表头有重复列名且列顺序与第一个文件不同，无法对齐")
+    return [names.index(h) for h in wanted]
+
+
+def _ordered_results(pool: ProcessPoolExecutor, jobs: list[tuple], workers: int) -> Iterator[Future]:
+    """按顺序返回解析任务（jobs 为 _timed_parse 的参数）；同时在途的任务不超过 workers，取走一个才提交下一个。"""
+    queue = iter(jobs)
+    pending = [pool.submit(_timed_parse, *job) for job in islice(queue, workers)]
+    try:
+        while pending:
+            future = pending.pop(0)
+            next_job = next(queue, None)
+            if next_job is not None:
+                pending.append(pool.submit(_timed_parse, *next_job))
+            yield future
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _run_now(path: str, sheet: str | None = None) -> Future:
+    future = Future()
+    try:
+        future.set_result(_timed_parse(path, sheet))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _result(future: Future, path: str) -> tuple[list[str], list[list], float]:
+    try:
+        return future.result()
+    except Exception as e:
+        raise ValueError(f"{os.path.basename(path)}: {e}") from e
+
+
+def _timed_parse(path: str, sheet: str | None = None) -> tuple[list[str], list[list], float]:
+    """解析单个文件（或其中一个工作表）并计时（在工作进程中执行）。"""
+    start = time.perf_counter()
+    headers, rows = parse_file(path, sheet)
+    return headers, rows, time.perf_counter() - start
@@ -0,0 +1,164 @@
+"""单次读取的匹配流水线：A文档只打开一次，读取剧名列、匹配、高亮在同一份数据上完成。
+
+- xml 模式：流式扫描 .xlsx 工作表 XML，逐行取出剧名并立即决定是否改写样式，
+  A文档只被顺序读取一遍；
+- cell / conditional 模式：openpyxl 加载一次工作簿，从同一个工作表对象中取列、
+  高亮并保存。
+
+两种模式按数字列号取列时都以工作表声明的列数（ws.max_column）为上限；工作表为空时报错“没有数据”。
+每个阶段的耗时记录在返回的 timings 中（秒），按执行顺序排列。
+"""
+
+import os
+import time
+import zipfile
+from contextlib import contextmanager
+
+from openpyxl import load_workbook
+
+from src.highlighter import highlight_rows
+from src.matcher import match_dramas
+from src.models import MatchResult
+from src.reader import read_drama_names, resolve_header_index
+from src.writer import save_workbook
+from src.xlsx_patcher import load_shared_strings, patch_workbook, read_sheet_width, row_values
+
+EMPTY_MASTER_MESSAGE = "A文档的工作表没有数据"
+
+
+@contextmanager
+def _stage(timings: dict, name: str):
+    """记录一个阶段的耗时（秒）。"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def run_match_pipeline(master_path: str, lookup_path: str, master_col: str,
+                       lookup_col: str, highlight_mode: str = "cell") -> tuple[MatchResult, dict[str, float]]:
+    """
+    读取B文档剧名集合，再单次处理A文档完成匹配与高亮（有匹配时写回原文件）。
+
+    Returns:
+        (匹配结果, {阶段名: 耗时秒})
+    """
+    if not os.path.isfile(master_path):
+        raise FileNotFoundError(f"文件未找到: {master_path}")
+
+    timings: dict[str, float] = {}
+    with _stage(timings, "读取B文档"):
+        lookup_set = load_lookup_set(lookup_path, lookup_col)
+
+    result, master_timings = process_master(master_path, master_col, lookup_set, highlight_mode)
+    timings.update(master_timings)
+    return result, timings
+
+
+def load_lookup_set(lookup_path: str, lookup_col: str) -> set[str]:
+    """读取B文档指定列，返回剧名集合。"""
+    return {name for _, name in read_drama_names(lookup_path, lookup_col)}
+
+
+def process_master(master_path: str, master_col: str, lookup_set: set[str],
+                   highlight_mode: str = "cell") -> tuple[MatchResult, dict[str, float]]:
+    """
+    单次处理一个A文档：取剧名列、与已加载的剧名集合匹配、高亮并保存。
+
+    Returns:
+        (匹配结果, {阶段名: 耗时秒})
+    """
+    if not os.path.isfile(master_path):
+        raise FileNotFoundError(f"文件未找到: {master_path}")
+    if os.path.splitext(master_path)[1].lower() != ".xlsx":
+        raise ValueError("A文档仅支持 .xlsx 格式（需要写回高亮）")
+
+    timings: dict[str, float] = {}
+    if highlight_mode == "xml":
+        result = _run_xml(master_path, master_col, lookup_set, timings)
+    else:
+        result = _run_openpyxl(master_path, master_col, lookup_set, highlight_mode, timings)
+    return result, timings
+
+
+def _run_openpyxl(master_path, master_col, lookup_set, highlight_mode, timings) -> MatchResult:
+    """openpyxl 加载一次A文档：取列、匹配、高亮、保存共用同一个工作表对象。"""
+    with _stage(timings, "加载A文档"):
+        wb = load_workbook(master_path)
+    try:
+        ws = wb.active
+        with _stage(timings, "读取剧名列"):
+            header = next(ws.iter_rows(max_row=1, values_only=True), ())
+            if ws.max_row == 1 and all(value is None for value in header):
+                raise ValueError(EMPTY_MASTER_MESSAGE)
+            col_idx = resolve_header_index(list(header), master_col, ws.max_column)
+            master_names = []
+            column = ws.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx, values_only=True)
+            for row_num, (value,) in enumerate(column, start=2):
+                if value is not None:
+                    name = str(value).strip()
+                    if name:
+                        master_names.append((row_num, name))
+
+        with _stage(timings, "匹配"):
+            result = match_dramas(master_names, lookup_set)
+
+        if result.match_count > 0:
+            with _stage(timings, "高亮"):
+                highlight_rows(ws, result.matched_rows, mode=highlight_mode)
+            with _stage(timings, "保存"):
+                save_workbook(wb, master_path)
+        return result
+    finally:
+        wb.close()
+
+
+def _run_xml(master_path, master_col, lookup_set, timings) -> MatchResult:
+    """流式扫描A文档 XML，一遍完成取值、匹配和样式改写。"""
+    with _stage(timings, "加载共享字符串"):
+        with zipfile.ZipFile(master_path) as zin:
+            shared_strings = load_shared_strings(zin)
+            width = read_sheet_width(zin)
+
+    normalized_lookup = {name.strip() for name in lookup_set}
+    state = {"col": None}
+    matched_rows = []
+    matched_names = []
+    total_master = 0
+
+    def select_row(row_num: int, segment: bytes) -> bool:
+        nonlocal total_master
+        if state["col"] is None:
+            # 第一行为表头（第 1 行为空时 XML 中没有该行，表头视为空）
+            values = row_values(segment, shared_strings) if row_num == 1 else {}
+            header = [values.get(c) for c in range(1, max(values, default=0) + 1)]
+            state["col"] = resolve_header_index(header, master_col, max(len(header), width))
+            if row_num == 1:
+                return False
+        value = row_values(segment, shared_strings, only_col=state["col"]).get(state["col"])
+        if value is None:
+            return False
+        name = str(value).strip()
+        if not name:
+            return False
+        total_master += 1
+        if name in normalized_lookup:
+            matched_rows.append(row_num)
+            matched_names.append(name)
+            return True
+        return False
+
+    with _stage(timings, "扫描匹配并高亮"):
+        patch_workbook(master_path, select_row)
+    if state["col"] is None:
+        # XML 中没有任何 <row>：工作表为空
+        raise ValueError(EMPTY_MASTER_MESSAGE)
+
+    return MatchResult(
+        matched_rows=matched_rows,
+        matched_names=matched_names,
+        total_master=total_master,
+        total_lookup=len(lookup_set),
+        match_count=len(matched_rows),
+    )
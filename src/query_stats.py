@@ -0,0 +1,205 @@
+"""SQLite 语句统计：按语句汇总执行次数、总耗时和 p95，记录慢查询。
+
+Database.enable_query_stats() 开启后，get_connection() 返回 InstrumentedConnection，
+它包装原始连接，为 execute / executemany / commit 以及游标的 fetch 调用计时，
+其余属性和方法直接转发给原始连接。未开启时 DAO 拿到的仍是原始连接，没有任何额外开销。
+
+语句文本中的连续空白会被合并为一个空格，同一条 SQL（参数不同）汇总为一项。
+"""
+
+import math
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+# 每条语句最多保留的耗时样本数（用于计算 p95），超出后只保留最近的样本
+MAX_SAMPLES = 10_000
+
+
+def normalize_sql(sql: str) -> str:
+    """合并 SQL 中的连续空白。"""
+    return " ".join(sql.split())
+
+
+class _StatementStats:
+    __slots__ = ("count", "execute_seconds", "fetch_seconds", "max_seconds", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.execute_seconds = 0.0
+        self.fetch_seconds = 0.0
+        self.max_seconds = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+
+class QueryStats:
+    """语句统计汇总器，可在多个线程中共用。"""
+
+    def __init__(self, slow_query_ms: float | None = None, slow_log=None):
+        """
+        Args:
+            slow_query_ms: 慢查询阈值（毫秒），单次执行或读取结果超过该值时输出一条记录；None 不记录
+            slow_log: 慢查询输出函数，接收一行文本，默认输出到标准错误
+        """
+        self.slow_query_ms = slow_query_ms
+        self._slow_log = slow_log or (lambda line: print(line, file=sys.stderr))
+        self._stats: dict[str, _StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def record_execute(self, sql: str, seconds: float) -> None:
+        """记录一次语句执行。"""
+        key = normalize_sql(sql)
+        with self._lock:
+            item = self._stats.get(key)
+            if item is None:
+                item = self._stats[key] = _StatementStats()
+            item.count += 1
+            item.execute_seconds += seconds
+            item.max_seconds = max(item.max_seconds, seconds)
+            item.samples.append(seconds)
+        self._check_slow("执行", key, seconds)
+
+    def record_fetch(self, sql: str, seconds: float) -> None:
+        """记录一次读取结果（fetchone / fetchmany / fetchall / 迭代）的耗时。"""
+        key = normalize_sql(sql)
+        with self._lock:
+            item = self._stats.get(key)
+            if item is None:
+                item = self._stats[key] = _StatementStats()
+            item.fetch_seconds += seconds
+        self._check_slow("读取结果", key, seconds)
+
+    def reset(self) -> None:
+        """清空统计。"""
+        with self._lock:
+            self._stats.clear()
+
+    def rows(self) -> list[tuple[str, int, float, float, float]]:
+        """
+        返回 [(SQL, 次数, 总耗时秒, p95 秒, 最大秒), ...]，按总耗时降序。
+        总耗时包含执行和读取结果；p95 与最大值按单次执行耗时计算。
+        """
+        with self._lock:
+            items = [(sql, item.count, item.execute_seconds + item.fetch_seconds,
+                      percentile(list(item.samples), 0.95), item.max_seconds)
+                     for sql, item in self._stats.items()]
+        items.sort(key=lambda r: r[2], reverse=True)
+        return items
+
+    def format_report(self, limit: int = 30, sql_width: int = 80) -> str:
+        """格式化统计报告（耗时单位毫秒），最多 limit 条。"""
+        rows = self.rows()
+        if not rows:
+            return "暂无 SQL 统计数据"
+        lines = [f"{'次数':>8}{'总耗时ms':>12}{'平均ms':>10}{'p95ms':>10}{'最大ms':>10}  SQL"]
+        for sql, count, total, p95, longest in rows[:limit]:
+            average = total / count if count else 0.0
+            text = sql if len(sql) <= sql_width else sql[:sql_width - 3] + "..."
+            lines.append(
+                f"{count:>8}{total * 1000:>12.2f}{average * 1000:>10.2f}"
+                f"{p95 * 1000:>10.2f}{longest * 1000:>10.2f}  {text}"
+            )
+        if len(rows) > limit:
+            lines.append(f"... 另有 {len(rows) - limit} 条语句")
+        return "\n".join(lines)
+
+    def _check_slow(self, kind: str, sql: str, seconds: float) -> None:
+        if self.slow_query_ms is not None and seconds * 1000 >= self.slow_query_ms:
+            self._slow_log(f"[慢查询] {kind} {seconds * 1000:.1f}ms: {sql}")
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """最近秩法求分位数，空列表返回 0。"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered), max(1, math.ceil(fraction * len(ordered)))) - 1
+    return ordered[index]
+
+
+class InstrumentedCursor:
+    """包装游标：读取结果的耗时计入对应语句。"""
+
+    def __init__(self, cursor: sqlite3.Cursor, sql: str, stats: QueryStats):
+        self._cursor = cursor
+        self._sql = sql
+        self._stats = stats
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return self._cursor.fetchone()
+        finally:
+            self._stats.record_fetch(self._sql, time.perf_counter() - start)
+
+    def fetchmany(self, size: int = None):
+        start = time.perf_counter()
+        try:
+            if size is None:
+                return self._cursor.fetchmany()
+            return self._cursor.fetchmany(size)
+        finally:
+            self._stats.record_fetch(self._sql, time.perf_counter() - start)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return self._cursor.fetchall()
+        finally:
+            self._stats.record_fetch(self._sql, time.perf_counter() - start)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self._cursor)
+        finally:
+            self._stats.record_fetch(self._sql, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """包装 sqlite3.Connection：为语句执行、提交计时，其余操作转发给原始连接。"""
+
+    def __init__(self, conn: sqlite3.Connection, stats: QueryStats):
+        self._conn = conn
+        self.stats = stats
+
+    def execute(self, sql: str, parameters=()):
+        start = time.perf_counter()
+        try:
+            cursor = self._conn.execute(sql, parameters)
+        finally:
+            self.stats.record_execute(sql, time.perf_counter() - start)
+        return InstrumentedCursor(cursor, sql, self.stats)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        # 参数为生成器时，耗时包含生成参数（如 JSON 编码）的时间
+        start = time.perf_counter()
+        try:
+            cursor = self._conn.executemany(sql, seq_of_parameters)
+        finally:
+            self.stats.record_execute(sql, time.perf_counter() - start)
+        return InstrumentedCursor(cursor, sql, self.stats)
+
+    def commit(self) -> None:
+        start = time.perf_counter()
+        try:
+            self._conn.commit()
+        finally:
+            self.stats.record_execute("COMMIT", time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
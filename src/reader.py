@@ -9,21 +9,31 @@ def resolve_column_index(ws, column_id: str) -> int:
     将列标识解析为列索引（1-based）。
     优先按列名匹配第一行表头，若无匹配则尝试解析为数字列号。
     """
+    return resolve_header_index([cell.value for cell in ws[1]], column_id, ws.max_column)
+
+
+def resolve_header_index(header_values: list, column_id: str, max_column: int = None) -> int:
+    """
+    根据表头行的值列表解析列标识，返回列索引（1-based）。
+    优先按列名匹配，若无匹配则尝试解析为数字列号（范围为 1 到 max_column，默认表头长度）。
+    """
+    if max_column is None:
+        max_column = len(header_values)
+
     header_names = []
-    for cell in ws[1]:
-        value = cell.value
+    for col, value in enumerate(header_values, start=1):
         if value is not None:
             header_names.append(str(value).strip())
             if str(value).strip() == column_id.strip():
-                return cell.column
+                return col
         else:
             header_names.append("")
 
     try:
         col_num = int(column_id)
-        if 1 <= col_num <= ws.max_column:
+        if 1 <= col_num <= max_column:
             return col_num
-        raise ValueError(f"列号 {col_num} 超出范围（1-{ws.max_column}）")
+        raise ValueError(f"列号 {col_num} 超出范围（1-{max_column}）")
     except ValueError as e:
         if "超出范围" in str(e):
             raise
@@ -49,8 +59,8 @@ def read_drama_names(file_path: str, column_id: str, sheet_name: str = None) ->
 
 
 def _read_xlsx(file_path, column_id, sheet_name=None):
-    """读取 .xlsx 文件。"""
-    wb = load_workbook(file_path, read_only=False)
+    """读取 .xlsx 文件：只读模式流式读取表头和目标列，不加载其它列。"""
+    wb = load_workbook(file_path, read_only=True)
     try:
         if sheet_name:
             if sheet_name not in wb.sheetnames:
@@ -59,11 +69,15 @@ def _read_xlsx(file_path, column_id, sheet_name=None):
         else:
             ws = wb.active
 
-        col_idx = resolve_column_index(ws, column_id)
+        # 维度信息可能缺失或不准确：记下列数后重置，按实际内容读取全部行
+        declared_max_col = ws.max_column or 0
+        ws.reset_dimensions()
+        header = next(ws.iter_rows(max_row=1, values_only=True), ())
+        col_idx = resolve_header_index(list(header), column_id, max(len(header), declared_max_col))
 
         results = []
-        for row_num in range(2, ws.max_row + 1):
-            cell_value = ws.cell(row=row_num, column=col_idx).value
+        column = ws.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx, values_only=True)
+        for row_num, (cell_value,) in enumerate(column, start=2):
             if cell_value is not None:
                 name = str(cell_value).strip()
                 if name:
@@ -74,7 +88,7 @@ def _read_xlsx(file_path, column_id, sheet_name=None):
 
 
 def _read_xls(file_path, column_id, sheet_name=None):
-    """读取 .xls 文件（使用 xlrd）。"""
+    """读取 .xls 文件（使用 xlrd），一次取出整列。"""
     import xlrd
 
     wb = xlrd.open_workbook(file_path)
@@ -88,12 +102,11 @@ def _read_xls(file_path, column_id, sheet_name=None):
     col_idx = _resolve_column_xls(ws, column_id)
 
     results = []
-    for row_num in range(1, ws.nrows):
-        cell_value = ws.cell_value(row_num, col_idx)
+    for row_num, cell_value in enumerate(ws.col_values(col_idx, start_rowx=1), start=2):
         if cell_value is not None:
             name = str(cell_value).strip()
             if name:
-                results.append((row_num + 1, name))  # 1-based row number
+                results.append((row_num, name))  # 1-based row number
     return results
 
 
@@ -0,0 +1,137 @@
+"""列类型推断：导入时抽样每列的取值，判断数值列，并把数值列中以文本形式保存的数字转换为数值。
+
+Excel 中常有以文本形式保存的数字（"12,345.6"、"1.2万"），不转换时列求和、数值列识别都会忽略它们。
+逐行流式处理：先读取前 SAMPLE_ROWS 行推断列类型，再依次转换并输出全部行，不要求整表在内存中。
+
+列类型：
+- NUMBER：抽样的非空单元格中至少 NUMBER_RATIO 为数值或可解析为数值的文本；
+- TEXT：其它有内容的列；
+- EMPTY：抽样中全部为空。
+
+只转换 NUMBER 列中可解析的文本，无法解析的单元格（如 "-"、"未知"）保持原样；
+TEXT 列不做任何转换（避免改动数字与文本混杂的列，如备注、编号）。
+
+用法：
+    from src.schema import typed_rows
+
+    column_types, rows = typed_rows(rows, len(headers))
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+from itertools import chain, islice
+
+NUMBER = "number"
+TEXT = "text"
+EMPTY = "empty"
+
+# 推断列类型时抽样的行数
+SAMPLE_ROWS = 1000
+# 非空单元格中数值所占比例达到该值时判为数值列
+NUMBER_RATIO = 0.9
+
+# 可带千分位逗号的十进制数
+_NUMBER_PATTERN = re.compile(r"[+-]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|[+-]?\.\d+")
+_UNITS = {"万": 10_000, "亿": 100_000_000}
+_MAX_EXACT_INT = 2 ** 53
+# Excel 数值（双精度）可精确保存的有效数字位数；更长的数字串（订单号、账号）保留为文本
+_MAX_SIGNIFICANT_DIGITS = 15
+
+
+def parse_number(text: str) -> int | float | None:
+    """
+    将文本形式的数字解析为 int / float，无法解析时返回 None。
+    支持首尾空格、正负号、千分位逗号和 万 / 亿 单位（"1.2万" -> 12000）；
+    带前导零的整数（如编号 "007"）和超过 15 位有效数字的数字（如 18-20 位的订单号）不视为数字。
+    """
+    text = text.strip()
+    if not text:
+        return None
+    multiplier = _UNITS.get(text[-1])
+    if multiplier is not None:
+        text = text[:-1].rstrip()
+    if not _NUMBER_PATTERN.fullmatch(text):
+        return None
+    digits = text.lstrip("+-")
+    if len(digits) > 1 and digits[0] == "0" and digits[1].isdigit():
+        return None
+    text = text.replace(",", "")
+    if len(digits.replace(",", "").replace(".", "").strip("0")) > _MAX_SIGNIFICANT_DIGITS:
+        return None
+    if multiplier is None:
+        if "." in text:
+            return float(text)
+        value = int(text)
+        return value if abs(value) <= _MAX_EXACT_INT else None
+    # 按十进制计算，避免 1.1 * 10000 得到 11000.000000000002
+    value = Decimal(text) * multiplier
+    if value == value.to_integral_value() and abs(value) <= _MAX_EXACT_INT:
+        return int(value)
+    return float(value)
+
+
+def infer_column_types(rows: Iterable, num_columns: int) -> list[str]:
+    """根据 rows（通常为抽样的前若干行）推断 num_columns 列的类型。"""
+    filled = [0] * num_columns
+    numeric = [0] * num_columns
+    for row in rows:
+        for i, value in enumerate(islice(row, num_columns)):
+            if value is None:
+                continue
+            kind = type(value)
+            if kind is str:
+                if not value.strip():
+                    continue
+                if parse_number(value) is not None:
+                    numeric[i] += 1
+            elif kind is int or kind is float:
+                numeric[i] += 1
+            filled[i] += 1
+    types = []
+    for count, numbers in zip(filled, numeric):
+        if not count:
+            types.append(EMPTY)
+        elif numbers >= count * NUMBER_RATIO:
+            types.append(NUMBER)
+        else:
+            types.append(TEXT)
+    return types
+
+
+def number_columns(column_types: list[str]) -> list[int]:
+    """数值列的下标。"""
+    return [i for i, kind in enumerate(column_types) if kind == NUMBER]
+
+
+def convert_row(row, columns: list[int]) -> list:
+    """将 columns 列中可解析的文本转换为数值（row 为 list 时原地修改），返回转换后的行。"""
+    if type(row) is not list:
+        row = list(row)
+    length = len(row)
+    for i in columns:
+        if i < length:
+            value = row[i]
+            if type(value) is str:
+                parsed = parse_number(value)
+                if parsed is not None:
+                    row[i] = parsed
+    return row
+
+
+def typed_rows(rows: Iterable, num_columns: int,
+               sample_size: int = SAMPLE_ROWS) -> tuple[list[str], Iterator[list]]:
+    """
+    读取前 sample_size 行推断列类型，返回 (列类型列表, 转换后的行迭代器)。
+    已抽样的行暂存在内存中，随迭代依次输出，其余行边读取边转换。
+    """
+    iterator = iter(rows)
+    sample = list(islice(iterator, sample_size))
+    column_types = infer_column_types(sample, num_columns)
+    columns = number_columns(column_types)
+
+    def _rows():
+        for row in chain(sample, iterator):
+            yield convert_row(row, columns) if columns else row
+
+    return column_types, _rows()
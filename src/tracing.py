@@ -0,0 +1,227 @@
+"""轻量级阶段计时与追踪：记录导入、存储、匹配、导出、表格刷新各阶段的耗时和行数。
+
+默认关闭，关闭时 span() 只做一次全局开关判断并返回共享的空对象，几乎没有开销。
+开启后每个 span 记录 (名称, 开始时间, 耗时, 行数, 线程)，可以：
+
+- 导出 Chrome Trace JSON（在 chrome://tracing 或 https://ui.perfetto.dev 中打开查看时间线）；
+- 输出按名称汇总的表格（次数、总耗时、最大耗时、行数、吞吐量）。
+
+用法：
+    from src import tracing
+
+    tracing.enable()
+    with tracing.span("MatchEngine.match") as sp:
+        matched = ...
+        sp.set_rows(len(rows))
+    print(tracing.format_summary())
+    tracing.dump_chrome_trace("trace.json")
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+
+# 最多保留的 span 数，超出后丢弃新的记录，避免长时间运行时无限增长
+MAX_SPANS = 200_000
+
+_enabled = False
+_spans: list = []
+_lock = threading.Lock()
+_origin = time.perf_counter()
+
+
+@dataclass
+class SpanRecord:
+    """一条已结束的 span 记录"""
+    name: str                     # 阶段名
+    start: float                  # 开始时间（秒，相对 tracing 模块加载时刻）
+    seconds: float                # 耗时（秒）
+    rows: int | None              # 处理的行数，未知时为 None
+    thread_id: int                # 线程 ID
+
+
+class _NullSpan:
+    """追踪关闭时使用的空 span，所有操作均为空操作。"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_rows(self, rows: int) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """计时 span，作为上下文管理器使用，退出时记录耗时。"""
+
+    __slots__ = ("name", "rows", "_start")
+
+    def __init__(self, name: str, rows: int | None = None):
+        self.name = name
+        self.rows = rows
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        _record(self.name, self._start - _origin, end - self._start, self.rows)
+        return False
+
+    def set_rows(self, rows: int) -> None:
+        """设置本阶段处理的行数。"""
+        self.rows = rows
+
+
+def enable() -> None:
+    """开启追踪。"""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """关闭追踪（已记录的数据保留）。"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """追踪是否开启。"""
+    return _enabled
+
+
+def reset() -> None:
+    """清空已记录的 span。"""
+    with _lock:
+        _spans.clear()
+
+
+def span(name: str, rows: int | None = None):
+    """创建一个 span；追踪关闭时返回空 span。"""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, rows)
+
+
+def traced(name: str):
+    """函数装饰器：追踪开启时以 name 记录每次调用的耗时。"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_iter(name: str, iterable):
+    """
+    包装迭代器，追踪开启时把逐项取值所花的时间累计为一条 span（行数为项数）。
+    用于拆分流式处理中上游生产数据（解析、编码）与下游消费（写库）的耗时。
+    """
+    if not _enabled:
+        return iterable
+    return _timed_iter(name, iterable)
+
+
+def _timed_iter(name, iterable):
+    iterator = iter(iterable)
+    total = 0.0
+    count = 0
+    first_start = None
+    try:
+        while True:
+            start = time.perf_counter()
+            if first_start is None:
+                first_start = start
+            try:
+                item = next(iterator)
+            except StopIteration:
+                total += time.perf_counter() - start
+                break
+            total += time.perf_counter() - start
+            count += 1
+            yield item
+    finally:
+        # 提前结束迭代时同时关闭上游迭代器，使其及时释放文件等资源
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+        if first_start is not None:
+            _record(name, first_start - _origin, total, count)
+
+
+def _record(name: str, start: float, seconds: float, rows: int | None) -> None:
+    with _lock:
+        if len(_spans) < MAX_SPANS:
+            _spans.append(SpanRecord(name, start, seconds, rows, threading.get_ident()))
+
+
+def spans() -> list[SpanRecord]:
+    """返回已记录 span 的副本，按结束先后排列。"""
+    with _lock:
+        return list(_spans)
+
+
+def summary() -> list[tuple[str, int, float, float, int | None]]:
+    """
+    按名称汇总，返回 [(名称, 次数, 总耗时秒, 最大耗时秒, 总行数), ...]，按总耗时降序。
+    没有任何一次记录行数的名称，总行数为 None。
+    """
+    totals: dict[str, list] = {}
+    for record in spans():
+        item = totals.setdefault(record.name, [0, 0.0, 0.0, None])
+        item[0] += 1
+        item[1] += record.seconds
+        item[2] = max(item[2], record.seconds)
+        if record.rows is not None:
+            item[3] = (item[3] or 0) + record.rows
+    rows = [(name, *values) for name, values in totals.items()]
+    rows.sort(key=lambda r: r[2], reverse=True)
+    return rows
+
+
+def format_summary() -> str:
+    """格式化汇总表格。"""
+    lines = [f"{'阶段':<40}{'次数':>6}{'总耗时(s)':>12}{'最大(s)':>10}{'行数':>12}{'行/秒':>14}"]
+    for name, count, total, longest, rows in summary():
+        rows_text = f"{rows:,}" if rows is not None else "-"
+        rate_text = f"{rows / total:,.0f}" if rows and total > 0 else "-"
+        lines.append(
+            f"{name:<40}{count:>6}{total:>12.4f}{longest:>10.4f}{rows_text:>12}{rate_text:>14}"
+        )
+    return "\n".join(lines)
+
+
+def dump_chrome_trace(file_path: str) -> None:
+    """导出 Chrome Trace Event 格式的 JSON（时间单位为微秒）。"""
+    pid = os.getpid()
+    events = []
+    for record in spans():
+        event = {
+            "name": record.name,
+            "ph": "X",
+            "ts": round(record.start * 1_000_000, 3),
+            "dur": round(record.seconds * 1_000_000, 3),
+            "pid": pid,
+            "tid": record.thread_id,
+        }
+        if record.rows is not None:
+            event["args"] = {"rows": record.rows}
+        events.append(event)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
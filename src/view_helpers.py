@@ -1,5 +1,9 @@
 """视图筛选和统计辅助函数。"""
 
+from src.aggregate import column_sums
+from src.month_table import MonthTable
+from src.schema import number_columns
+
 
 def filter_rows(rows: list[list], matched_indices: list[int], mode: str) -> list[list]:
     """
@@ -20,20 +24,39 @@ def filter_rows(rows: list[list], matched_indices: list[int], mode: str) -> list
         raise ValueError(f"无效的筛选模式: {mode}")
 
 
-def compute_column_sums(rows: list[list], num_columns: int) -> list:
+def compute_column_sums(rows: list[list], num_columns: int, indices: list[int] | None = None) -> list:
     """
     计算每列的合计值。数值列求和，非数值列返回空字符串。
+    rows 为 MonthTable 时在类型化的列上计算（见 src.aggregate）；
+    indices 为参与计算的行下标，None 表示全部行。
     Returns list of sums/empty strings, one per column.
     """
-    sums = [0.0] * num_columns
-    has_numeric = [False] * num_columns
-
-    for row in rows:
-        for col_idx in range(num_columns):
-            if col_idx < len(row):
-                val = row[col_idx]
-                if isinstance(val, (int, float)):
-                    sums[col_idx] += val
-                    has_numeric[col_idx] = True
-
-    return [sums[i] if has_numeric[i] else "" for i in range(num_columns)]
+    return column_sums(rows, num_columns, indices)
+
+
+def sum_candidate_columns(table: MonthTable, num_columns: int, column_types: list[str]) -> list[int]:
+    """
+    列求和可选的列下标（前 num_columns 列）：导入时推断为数值的列，以及含有任一数值的列
+    （数值稀疏、与文本混杂或只出现在类型推断抽样范围之后的列）。
+    """
+    inferred = set(number_columns(column_types))
+    return [i for i in range(min(num_columns, table.num_columns))
+            if i in inferred or table.column_has_numbers(i)]
+
+
+def format_bytes(size: int) -> str:
+    """格式化字节数为 KB / MB / GB。"""
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.2f} GB"
+
+
+def format_perf(timings: dict[str, float], memory_bytes: int | None = None) -> str:
+    """格式化性能状态：各阶段耗时（毫秒，按记录顺序）和行数据内存。"""
+    parts = [f"{name} {ms:.0f}ms" for name, ms in timings.items()]
+    if memory_bytes is not None:
+        parts.append(f"内存 ≈ {format_bytes(memory_bytes)}")
+    return "  |  ".join(parts)
@@ -0,0 +1,434 @@
+"""xlsx 原地高亮：直接改写工作表 XML 中匹配行单元格的样式引用。
+
+不经过 openpyxl 加载整个工作簿，而是：
+1. 从 zip 中流式读取 xl/worksheets/sheetN.xml，按 <row> 切分；
+2. 改写匹配行中 <c> 标签的 s= 属性，指向新追加的高亮样式；
+   行内缺失的空白单元格按 <dimension> 声明的列宽补上带高亮样式的空 <c>，与 openpyxl 路径一致；
+3. 在 styles.xml 中追加一个填充和若干 xf（每种原样式一个，保留原字体/边框等）；
+4. 其余 zip 成员原样复制，生成新文件后替换原文件。
+
+内存占用只与单行 XML 大小有关，用户的其它格式逐字节保留。
+"""
+
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from html import unescape
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+CHUNK_SIZE = 1 << 20
+_SPOOL_SIZE = 32 << 20
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ROW_START = re.compile(rb"<(?:[\w.-]+:)?row\b")
+_ROW_TAG = re.compile(rb"<(?:[\w.-]+:)?row\b([^>]*)>")
+_ROW_NUM = re.compile(rb'(?:^|\s)r="(\d+)"')
+_CELL_TAG = re.compile(rb"<((?:[\w.-]+:)?c)\b([^>]*?)(/?)>")
+_STYLE_ATTR = re.compile(rb'(?:^|(?<=\s))s="(\d+)"')
+_DIMENSION = re.compile(rb'<(?:[\w.-]+:)?dimension\b[^>]*?\sref="([A-Z]+)\d*(?::([A-Z]+)\d*)?"')
+_SPANS_ATTR = re.compile(rb'\sspans="[^"]*"')
+
+
+def highlight_rows_in_place(file_path: str, matched_rows, color: str = "FFFF00",
+                            sheet_name: str = None, output_path: str = None) -> int:
+    """
+    直接改写 .xlsx 的工作表 XML，高亮指定行。
+
+    Args:
+        file_path: .xlsx 文件路径
+        matched_rows: 需要高亮的行号（1-based）
+        color: 十六进制颜色值，默认黄色
+        sheet_name: 工作表名，默认为活动工作表
+        output_path: 输出路径，默认覆盖原文件
+
+    Returns:
+        实际高亮的行数（工作表中不存在的行不计入）。
+    """
+    matched_set = set(matched_rows)
+    if not matched_set:
+        return 0
+    return patch_workbook(
+        file_path, lambda row_num, row_xml: row_num in matched_set,
+        color=color, sheet_name=sheet_name, output_path=output_path,
+    )
+
+
+def patch_workbook(file_path: str, select_row, color: str = "FFFF00",
+                   sheet_name: str = None, output_path: str = None) -> int:
+    """
+    流式遍历工作表的每一行，对 select_row(行号, 行XML字节) 返回 True 的行应用高亮。
+    没有任何行被选中时不写出文件。
+
+    Returns:
+        高亮的行数。
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"文件未找到: {file_path}")
+    if os.path.splitext(file_path)[1].lower() != ".xlsx":
+        raise ValueError("仅支持 .xlsx 格式的原地高亮")
+
+    output_path = output_path or file_path
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+
+    with zipfile.ZipFile(file_path) as zin:
+        sheet_path, styles_path = locate_sheet(zin, sheet_name)
+        if styles_path is None or styles_path not in zin.namelist():
+            raise ValueError("工作簿缺少 styles.xml，无法原地高亮")
+        styles_xml = zin.read(styles_path)
+        base_xf_count = _count_cell_xfs(styles_xml)
+
+        style_map: dict[int, int] = {}
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE) as sheet_out:
+            with zin.open(sheet_path) as sheet_in:
+                highlighted = _patch_sheet(sheet_in, sheet_out, select_row, style_map, base_xf_count)
+            if highlighted == 0:
+                return 0
+            sheet_size = sheet_out.tell()
+            sheet_out.seek(0)
+
+            new_styles = _patch_styles(styles_xml, style_map, color) if style_map else styles_xml
+
+            fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=out_dir)
+            os.close(fd)
+            try:
+                with zipfile.ZipFile(tmp_path, "w") as zout:
+                    for info in zin.infolist():
+                        if info.filename == sheet_path:
+                            _write_member(zout, info, sheet_out, sheet_size)
+                        elif info.filename == styles_path:
+                            zout.writestr(_clone_info(info), new_styles)
+                        else:
+                            with zin.open(info) as src:
+                                _write_member(zout, info, src, info.file_size)
+                shutil.copymode(file_path, tmp_path)
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+    return highlighted
+
+
+def locate_sheet(zin: zipfile.ZipFile, sheet_name: str = None) -> tuple[str, str | None]:
+    """
+    解析 workbook.xml 及其关系文件，返回 (工作表 XML 路径, styles.xml 路径)。
+    未指定 sheet_name 时返回活动工作表。
+    """
+    workbook = ET.fromstring(zin.read("xl/workbook.xml"))
+    rels = ET.fromstring(zin.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    styles_path = None
+    for rel in rels.iter(f"{_NS_PKG_REL}Relationship"):
+        target = _resolve_target(rel.get("Target"))
+        targets[rel.get("Id")] = target
+        if rel.get("Type", "").endswith("/styles"):
+            styles_path = target
+
+    sheets = [
+        (sheet.get("name"), sheet.get(f"{_NS_REL}id"))
+        for sheet in workbook.iter(f"{_NS_MAIN}sheet")
+    ]
+    if not sheets:
+        raise ValueError("工作簿中没有工作表")
+
+    if sheet_name:
+        names = [name for name, _ in sheets]
+        if sheet_name not in names:
+            raise ValueError(f"工作表 '{sheet_name}' 不存在。可用工作表: {names}")
+        rel_id = sheets[names.index(sheet_name)][1]
+    else:
+        active = 0
+        view = workbook.find(f"{_NS_MAIN}bookViews/{_NS_MAIN}workbookView")
+        if view is not None and view.get("activeTab"):
+            active = int(view.get("activeTab"))
+        rel_id = sheets[min(active, len(sheets) - 1)][1]
+
+    return targets[rel_id], styles_path
+
+
+def _resolve_target(target: str) -> str:
+    """将 workbook.xml.rels 中的 Target 转为 zip 内路径。"""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def load_shared_strings(zin: zipfile.ZipFile) -> list[str]:
+    """流式解析共享字符串表（sharedStrings.xml），不存在时返回空列表。"""
+    rels = ET.fromstring(zin.read("xl/_rels/workbook.xml.rels"))
+    path = None
+    for rel in rels.iter(f"{_NS_PKG_REL}Relationship"):
+        if rel.get("Type", "").endswith("/sharedStrings"):
+            path = _resolve_target(rel.get("Target"))
+    if path is None or path not in zin.namelist():
+        return []
+
+    strings = []
+    with zin.open(path) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag == f"{_NS_MAIN}si":
+                # 普通文本在 <t> 中，富文本在 <r><t> 中；忽略拼音注释 <rPh>
+                parts = [t.text or "" for t in elem.iterfind(f"{_NS_MAIN}t")]
+                parts += [t.text or "" for t in elem.iterfind(f"{_NS_MAIN}r/{_NS_MAIN}t")]
+                strings.append("".join(parts))
+                elem.clear()
+    return strings
+
+
+_CELL_REF = re.compile(rb'(?:^|\s)r="([A-Z]+)\d+"')
+_CELL_TYPE = re.compile(rb'(?:^|\s)t="(\w+)"')
+_CELL_V = re.compile(rb"<(?:[\w.-]+:)?v>(.*?)</(?:[\w.-]+:)?v>", re.S)
+_CELL_T = re.compile(rb"<(?:[\w.-]+:)?t(?:\s[^>]*)?>(.*?)</(?:[\w.-]+:)?t>", re.S)
+
+
+def row_values(segment: bytes, shared_strings: list[str], only_col: int = None) -> dict[int, object]:
+    """
+    解析行片段中的单元格值，返回 {列号(1-based): 值}。
+    文本返回 str，数字返回 int/float，布尔返回 bool；指定 only_col 时只解码该列。
+    """
+    values = {}
+    col = 0
+    for m in _CELL_TAG.finditer(segment):
+        attrs, closing = m.group(2), m.group(3)
+        ref = _CELL_REF.search(attrs)
+        col = column_index_from_string(ref.group(1).decode()) if ref else col + 1
+        if only_col is not None and col != only_col:
+            continue
+        if closing:
+            continue
+        end = segment.find(b"</" + m.group(1) + b">", m.end())
+        inner = segment[m.end():end if end != -1 else len(segment)]
+        cell_type = _CELL_TYPE.search(attrs)
+        values[col] = _decode_cell(inner, cell_type.group(1) if cell_type else b"n", shared_strings)
+    return values
+
+
+def _decode_cell(inner: bytes, cell_type: bytes, shared_strings: list[str]):
+    """按单元格类型解码 <c> 的内容。"""
+    if cell_type == b"inlineStr":
+        return unescape("".join(t.decode("utf-8") for t in _CELL_T.findall(inner)))
+    v = _CELL_V.search(inner)
+    if v is None:
+        return None
+    raw = v.group(1).decode("utf-8")
+    if cell_type == b"s":
+        return shared_strings[int(raw)]
+    if cell_type in (b"str", b"e"):
+        return unescape(raw)
+    if cell_type == b"b":
+        return raw == "1"
+    try:
+        number = float(raw)
+    except ValueError:
+        return unescape(raw)
+    return int(number) if number.is_integer() and "." not in raw and "E" not in raw.upper() else number
+
+
+def _clone_info(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    """复制 zip 成员元数据（文件名、时间、压缩方式）。"""
+    clone = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+    clone.compress_type = info.compress_type
+    clone.external_attr = info.external_attr
+    return clone
+
+
+def _write_member(zout: zipfile.ZipFile, info: zipfile.ZipInfo, src, size: int) -> None:
+    """流式写入一个 zip 成员。"""
+    with zout.open(_clone_info(info), "w", force_zip64=size > 0x7FFFFFFF) as dst:
+        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+
+def iter_row_segments(stream):
+    """
+    将工作表 XML 流切分为片段：第一个片段为 <sheetData> 之前的内容，
+    其后每个片段以一个 <row 开始标签开头，包含该行全部内容直到下一行之前。
+    """
+    buf = b""
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        buf += chunk
+        starts = [m.start() for m in _ROW_START.finditer(buf)]
+        if not starts:
+            continue
+        bounds = starts if starts[0] == 0 else [0] + starts
+        for begin, end in zip(bounds, bounds[1:]):
+            yield buf[begin:end]
+        buf = buf[starts[-1]:]
+    if buf:
+        yield buf
+
+
+def row_number(segment: bytes, last_row: int) -> int | None:
+    """返回片段对应的行号；不是行片段时返回 None。省略 r 属性时按上一行 +1。"""
+    tag = _ROW_TAG.match(segment)
+    if tag is None:
+        return None
+    m = _ROW_NUM.search(tag.group(1))
+    return int(m.group(1)) if m else last_row + 1
+
+
+def _patch_sheet(src, dst, select_row, style_map: dict, base_xf_count: int) -> int:
+    """逐行复制工作表 XML，改写被选中行的单元格样式，返回高亮行数。"""
+    highlighted = 0
+    last_row = 0
+    width = 0
+    for segment in iter_row_segments(src):
+        row_num = row_number(segment, last_row)
+        if row_num is None:
+            width = width or sheet_width(segment)
+        else:
+            last_row = row_num
+            if select_row(row_num, segment):
+                segment = _restyle_cells(segment, style_map, base_xf_count, row_num, width)
+                highlighted += 1
+        dst.write(segment)
+    return highlighted
+
+
+def read_sheet_width(zin: zipfile.ZipFile, sheet_name: str = None) -> int:
+    """读取工作表 <dimension> 声明的列数，只解析 <sheetData> 之前的片段；缺失时返回 0。"""
+    sheet_path, _ = locate_sheet(zin, sheet_name)
+    with zin.open(sheet_path) as f:
+        head = next(iter_row_segments(f), b"")
+    return 0 if row_number(head, 0) is not None else sheet_width(head)
+
+
+def sheet_width(segment: bytes) -> int:
+    """从 <sheetData> 之前的片段中读取 <dimension> 声明的列数（即 ws.max_column），缺失时返回 0。"""
+    m = _DIMENSION.search(segment)
+    if m is None:
+        return 0
+    return column_index_from_string((m.group(2) or m.group(1)).decode())
+
+
+def _restyle_cells(segment: bytes, style_map: dict, base_xf_count: int,
+                   row_num: int = None, width: int = 0) -> bytes:
+    """
+    将行片段中每个 <c> 的 s= 属性改为对应的高亮样式。
+    给出 row_num 和 width 时，为第 1 到 width 列中缺失的单元格插入带高亮样式的空 <c>。
+    """
+
+    def mapped(orig: int) -> int:
+        if orig not in style_map:
+            style_map[orig] = base_xf_count + len(style_map)
+        return style_map[orig]
+
+    def replace(m):
+        tag, attrs, closing = m.group(1), m.group(2), m.group(3)
+        style = _STYLE_ATTR.search(attrs)
+        if style:
+            new_id = mapped(int(style.group(1)))
+            attrs = attrs[:style.start(1)] + str(new_id).encode() + attrs[style.end(1):]
+        else:
+            attrs = attrs + b' s="%d"' % mapped(0)
+        return b"<" + tag + attrs + closing + b">"
+
+    restyled = _CELL_TAG.sub(replace, segment)
+    if row_num is None or width <= 0:
+        return restyled
+    return _fill_blank_cells(restyled, row_num, width, mapped(0))
+
+
+def _fill_blank_cells(segment: bytes, row_num: int, width: int, style_id: int) -> bytes:
+    """在行片段中按列顺序插入第 1 到 width 列缺失的空单元格。"""
+    row_tag = _ROW_TAG.match(segment)
+    name = _ROW_START.match(segment).group(0)[1:]
+    prefix = name[:-len(b"row")]
+    attrs = _SPANS_ATTR.sub(b"", row_tag.group(1))
+    self_closing = attrs.endswith(b"/")
+    if self_closing:
+        # 空行 <row r="5"/>：改为成对标签以容纳单元格
+        attrs = attrs[:-1]
+        body, tail = b"", b"</" + name + b">" + segment[row_tag.end():]
+    else:
+        close = segment.find(b"</" + name + b">", row_tag.end())
+        if close == -1:
+            close = len(segment)
+        body, tail = segment[row_tag.end():close], segment[close:]
+
+    def blanks(first: int, last: int) -> bytes:
+        return b"".join(
+            b'<%sc r="%s%d" s="%d"/>' % (prefix, get_column_letter(col).encode(), row_num, style_id)
+            for col in range(first, last)
+        )
+
+    parts = [b"<" + name + attrs + b">"]
+    pos = 0
+    col = 0
+    for m in _CELL_TAG.finditer(body):
+        ref = _CELL_REF.search(m.group(2))
+        cell_col = column_index_from_string(ref.group(1).decode()) if ref else col + 1
+        parts.append(body[pos:m.start()])
+        parts.append(blanks(col + 1, min(cell_col, width + 1)))
+        pos = m.start()
+        col = cell_col
+    parts.append(body[pos:])
+    parts.append(blanks(col + 1, width + 1))
+    parts.append(tail)
+    return b"".join(parts)
+
+
+_FILLS = re.compile(r"(<fills\b[^>]*>)(.*?)(</fills>)", re.S)
+_CELL_XFS = re.compile(r"(<cellXfs\b[^>]*>)(.*?)(</cellXfs>)", re.S)
+_XF = re.compile(r"<xf\b[^>]*?/>|<xf\b[^>]*?>.*?</xf>", re.S)
+_COUNT_ATTR = re.compile(r'\scount="\d+"')
+
+
+def _count_cell_xfs(styles_xml: bytes) -> int:
+    m = _CELL_XFS.search(styles_xml.decode("utf-8"))
+    if m is None:
+        raise ValueError("styles.xml 中缺少 cellXfs，无法原地高亮")
+    return len(_XF.findall(m.group(2)))
+
+
+def _set_count(open_tag: str, count: int) -> str:
+    if _COUNT_ATTR.search(open_tag):
+        return _COUNT_ATTR.sub(f' count="{count}"', open_tag, count=1)
+    return open_tag[:-1] + f' count="{count}">'
+
+
+def _set_attr(xf_tag: str, name: str, value: str) -> str:
+    pattern = re.compile(rf'(\s{name}=")[^"]*(")')
+    if pattern.search(xf_tag):
+        return pattern.sub(rf"\g<1>{value}\g<2>", xf_tag, count=1)
+    return re.sub(r"^<xf\b", f'<xf {name}="{value}"', xf_tag, count=1)
+
+
+def _patch_styles(styles_xml: bytes, style_map: dict, color: str) -> bytes:
+    """在 styles.xml 末尾追加一个高亮填充和 style_map 所需的 xf。"""
+    text = styles_xml.decode("utf-8")
+    rgb = color.upper() if len(color) == 8 else "00" + color.upper()
+
+    fills = _FILLS.search(text)
+    if fills is None:
+        raise ValueError("styles.xml 中缺少 fills，无法原地高亮")
+    fill_id = len(re.findall(r"<fill\b", fills.group(2)))
+    new_fill = (
+        f'<fill><patternFill patternType="solid"><fgColor rgb="{rgb}"/>'
+        f'<bgColor rgb="{rgb}"/></patternFill></fill>'
+    )
+    text = (
+        text[:fills.start()] + _set_count(fills.group(1), fill_id + 1)
+        + fills.group(2) + new_fill + fills.group(3) + text[fills.end():]
+    )
+
+    xfs_block = _CELL_XFS.search(text)
+    xfs = _XF.findall(xfs_block.group(2))
+    clones = []
+    for orig, _ in sorted(style_map.items(), key=lambda item: item[1]):
+        xf = xfs[orig] if orig < len(xfs) else xfs[0]
+        start_tag = re.match(r"<xf\b[^>]*?/?>", xf).group(0)
+        new_tag = _set_attr(_set_attr(start_tag, "fillId", str(fill_id)), "applyFill", "1")
+        clones.append(new_tag + xf[len(start_tag):])
+    text = (
+        text[:xfs_block.start()] + _set_count(xfs_block.group(1), len(xfs) + len(clones))
+        + xfs_block.group(2) + "".join(clones) + xfs_block.group(3) + text[xfs_block.end():]
+    )
+    return text.encode("utf-8")
@@ -0,0 +1,132 @@
+"""aggregate 单元测试。"""
+
+import pytest
+
+from src import aggregate as aggregate_module
+from src.aggregate import OPERATIONS, PartitionSums, aggregate, column_sums
+from src.month_table import MonthTable
+from src.view_helpers import filter_rows
+
+ROWS = [
+    ["琅琊榜", 100, 1.5, "抖音", 3],
+    ["庆余年", None, 2.5, "快手", "未知"],
+    ["琅琊榜", 300, None, "抖音", 7],
+    ["甄嬛传", 200, 4.0, None, True],
+]
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    """分别在纯 Python 实现和 NumPy 实现下运行。"""
+    if request.param == "python":
+        monkeypatch.setattr(aggregate_module, "np", None)
+    else:
+        np = pytest.importorskip("numpy")
+        monkeypatch.setattr(aggregate_module, "np", np)
+    return request.param
+
+
+class TestAggregate:
+    def test_number_column(self, backend):
+        table = MonthTable.from_rows(ROWS)
+        assert aggregate(table, 1) == {
+            "sum": 600.0, "count": 3, "mean": 200.0, "min": 100.0, "max": 300.0, "distinct": 3,
+        }
+
+    def test_mixed_column_counts_only_numbers(self, backend):
+        table = MonthTable.from_rows(ROWS)
+        result = aggregate(table, 4)
+        # True 与 isinstance(value, (int, float)) 一致按数值 1 计入
+        assert result["sum"] == 11.0
+        assert result["count"] == 3
+        assert result["min"] == 1.0 and result["max"] == 7.0
+        assert result["distinct"] == 4
+
+    def test_text_column(self, backend):
+        table = MonthTable.from_rows(ROWS)
+        result = aggregate(table, 0)
+        assert result["sum"] is None and result["mean"] is None
+        assert result["count"] == 0
+        assert result["distinct"] == 3
+        assert aggregate(table, 3, ("distinct",)) == {"distinct": 2}
+
+    def test_indices_mask(self, backend):
+        table = MonthTable.from_rows(ROWS)
+        assert aggregate(table, 1, ("sum", "count"), indices=[0, 1]) == {"sum": 100.0, "count": 1}
+        assert aggregate(table, 0, ("distinct",), indices=[0, 2]) == {"distinct": 1}
+        assert aggregate(table, 2, ("sum",), indices=[]) == {"sum": None}
+
+    def test_matches_row_lists(self, backend):
+        table = MonthTable.from_rows(ROWS)
+        for col in range(len(ROWS[0])):
+            assert aggregate(table, col) == aggregate(ROWS, col)
+            assert aggregate(table, col, indices=[3, 1]) == aggregate(ROWS, col, indices=[3, 1])
+
+    def test_column_out_of_range(self, backend):
+        assert aggregate(MonthTable.from_rows(ROWS), 9, ("sum", "count")) == {"sum": None, "count": 0}
+        assert aggregate([[1], [2, 3]], 1, ("sum",)) == {"sum": 3.0}
+
+    def test_empty_table(self, backend):
+        assert aggregate(MonthTable(2), 0) == {
+            "sum": None, "count": 0, "mean": None, "min": None, "max": None, "distinct": 0,
+        }
+
+    def test_invalid_operation(self):
+        with pytest.raises(ValueError):
+            aggregate(ROWS, 1, ("median",))
+
+    def test_all_operations_listed(self):
+        assert set(aggregate(ROWS, 1)) == set(OPERATIONS)
+
+
+class TestColumnSums:
+    def test_table_and_lists_agree(self, backend):
+        table = MonthTable.from_rows(ROWS, 6)
+        expected = ["", 600.0, 8.0, "", 11.0, ""]
+        assert column_sums(table, 6) == expected
+        assert column_sums(ROWS, 6) == expected
+
+    def test_with_indices(self, backend):
+        table = MonthTable.from_rows(ROWS)
+        assert column_sums(table, 3, [1, 3]) == ["", 200.0, 6.5]
+
+    def test_large_table_exact_sum(self, backend):
+        rows = [[i, 0.1] for i in range(10000)]
+        table = MonthTable.from_rows(rows)
+        sums = column_sums(table, 2)
+        assert sums[0] == float(sum(range(10000)))
+        assert sums[1] == pytest.approx(1000.0)
+
+
+class TestPartitionSums:
+    @staticmethod
+    def _expected(rows, matched, mode):
+        return column_sums(filter_rows(rows, matched, mode), 5)
+
+    def test_initial_partitions(self, backend):
+        partitions = PartitionSums(MonthTable.from_rows(ROWS), 5, [0, 3])
+        for mode in ("all", "matched", "unmatched"):
+            assert partitions.sums(mode) == self._expected(ROWS, [0, 3], mode)
+
+    def test_add_matched_updates_incrementally(self, backend):
+        partitions = PartitionSums(MonthTable.from_rows(ROWS), 5, [0])
+        partitions.add_matched([2, 0])
+        for mode in ("all", "matched", "unmatched"):
+            assert partitions.sums(mode) == self._expected(ROWS, [0, 2], mode)
+
+    def test_set_matched_moves_rows_both_ways(self, backend):
+        partitions = PartitionSums(MonthTable.from_rows(ROWS), 5, [0, 1, 2])
+        partitions.set_matched([1, 2, 3])
+        for mode in ("all", "matched", "unmatched"):
+            assert partitions.sums(mode) == self._expected(ROWS, [1, 2, 3], mode)
+        partitions.set_matched([])
+        assert partitions.sums("matched") == ["", "", "", "", ""]
+        assert partitions.sums("unmatched") == partitions.sums("all")
+
+    def test_plain_rows(self):
+        partitions = PartitionSums(ROWS, 5, [1])
+        assert partitions.sums("matched") == ["", "", 2.5, "", ""]
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            PartitionSums(ROWS, 5).sums("invalid")
@@ -132,3 +132,15 @@ class TestListAll:
         id2 = dao.create("第二个")
         backends = dao.list_all()
         assert backends[0][0] < backends[1][0]
+
+
+class TestGetId:
+    def test_get_id(self, tmp_path):
+        db = Database(str(tmp_path / "t.db"))
+        try:
+            dao = BackendDAO(db)
+            bid = dao.create("抖音")
+            assert dao.get_id("抖音") == bid
+            assert dao.get_id("不存在") is None
+        finally:
+            db.close()
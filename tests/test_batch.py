@@ -0,0 +1,160 @@
+"""batch 单元测试：多个A文档的批量匹配。"""
+
+import csv
+import multiprocessing
+import os
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import src.batch as batch
+from src.batch import find_master_files, run_batch, write_report
+from src.main import main
+
+
+_process_master = batch.process_master
+
+
+def _crash_on_b(path, master_col, lookup_set, highlight_mode):
+    """模拟工作进程被系统终止（如内存不足）。"""
+    if os.path.basename(path) == "b.xlsx":
+        os._exit(1)
+    return _process_master(path, master_col, lookup_set, highlight_mode)
+
+
+def _make_master(path, names):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["剧名", "类型"])
+    for name in names:
+        ws.append([name, "古装"])
+    wb.save(path)
+
+
+@pytest.fixture
+def master_dir(tmp_path):
+    d = tmp_path / "masters"
+    d.mkdir()
+    _make_master(str(d / "a.xlsx"), ["琅琊榜", "甄嬛传"])
+    _make_master(str(d / "b.xlsx"), ["人民的名义", "琅琊榜", "庆余年"])
+    _make_master(str(d / "~$a.xlsx"), ["临时文件"])
+    (d / "notes.txt").write_text("忽略", encoding="utf-8")
+    return str(d)
+
+
+@pytest.fixture
+def lookup_path(tmp_path):
+    path = str(tmp_path / "lookup.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["剧名"])
+    ws.append(["琅琊榜"])
+    ws.append(["人民的名义"])
+    wb.save(path)
+    return path
+
+
+class TestFindMasterFiles:
+    def test_directory_lists_xlsx_only(self, master_dir):
+        files = find_master_files(master_dir)
+        assert [os.path.basename(f) for f in files] == ["a.xlsx", "b.xlsx"]
+
+    def test_glob_pattern(self, master_dir):
+        files = find_master_files(os.path.join(master_dir, "b*.xlsx"))
+        assert [os.path.basename(f) for f in files] == ["b.xlsx"]
+
+
+class TestRunBatch:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_results_in_input_order(self, master_dir, workers):
+        files = find_master_files(master_dir)
+        results = run_batch(files, {"琅琊榜", "人民的名义"}, "剧名", workers=workers)
+
+        assert [r.path for r in results] == files
+        assert [r.match_count for r in results] == [1, 2]
+        assert [r.total_master for r in results] == [2, 3]
+        assert all(not r.error for r in results)
+
+        wb = load_workbook(files[1])
+        assert wb.active["A2"].fill.fgColor.rgb == "00FFFF00"
+        wb.close()
+
+    def test_failure_recorded_per_file(self, master_dir):
+        files = find_master_files(master_dir) + [os.path.join(master_dir, "missing.xlsx")]
+        seen = []
+        results = run_batch(files, {"琅琊榜"}, "剧名", workers=1, on_result=seen.append)
+
+        assert len(seen) == 3
+        assert results[2].error
+        assert results[0].match_count == 1
+
+
+    @pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                        reason="工作进程需继承补丁后的 process_master")
+    def test_broken_pool_marks_unfinished_files_failed(self, master_dir, monkeypatch):
+        monkeypatch.setattr(batch, "process_master", _crash_on_b)
+        files = find_master_files(master_dir)
+        seen = []
+
+        results = run_batch(files, {"琅琊榜"}, "剧名", workers=2, on_result=seen.append)
+
+        assert [r.path for r in results] == files
+        assert sorted(r.path for r in seen) == files
+        assert "工作进程异常退出" in results[1].error
+        assert all(r.error == "" or "工作进程异常退出" in r.error for r in results)
+
+
+class TestWriteReport:
+    def test_csv_report(self, master_dir, tmp_path):
+        files = find_master_files(master_dir)
+        results = run_batch(files, {"琅琊榜"}, "剧名", workers=1)
+        report = str(tmp_path / "report.csv")
+
+        write_report(report, results)
+
+        with open(report, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0][:3] == ["文件", "A文档总数", "匹配数量"]
+        assert [row[2] for row in rows[1:]] == ["1", "1"]
+
+
+class TestMainBatch:
+    def test_batch_mode_prints_summary(self, master_dir, lookup_path, tmp_path, capsys):
+        report = str(tmp_path / "summary.csv")
+        main([
+            "--master-dir", master_dir,
+            "--lookup", lookup_path,
+            "--master-col", "剧名",
+            "--lookup-col", "剧名",
+            "--workers", "1",
+            "--report", report,
+        ])
+        output = capsys.readouterr().out
+        assert "文件数: 2  成功: 2  失败: 0" in output
+        assert "匹配数量: 3" in output
+        assert os.path.isfile(report)
+
+    @pytest.mark.parametrize("workers", ["0", "-1", "abc"])
+    def test_invalid_workers_rejected(self, master_dir, lookup_path, workers, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            main([
+                "--master-dir", master_dir,
+                "--lookup", lookup_path,
+                "--master-col", "剧名",
+                "--lookup-col", "剧名",
+                "--workers", workers,
+            ])
+        assert exc_info.value.code == 2
+        assert "需要正整数" in capsys.readouterr().err
+
+    def test_empty_directory_exits_with_code_1(self, tmp_path, lookup_path):
+        empty = tmp_path / "empty"
+        empty.mkdir()
+        with pytest.raises(SystemExit) as exc_info:
+            main([
+                "--master-dir", str(empty),
+                "--lookup", lookup_path,
+                "--master-col", "剧名",
+                "--lookup-col", "剧名",
+            ])
+        assert exc_info.value.code == 1
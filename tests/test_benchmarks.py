@@ -0,0 +1,120 @@
+"""benchmarks 单元测试：合成数据的确定性和基准运行结果格式。"""
+
+import pytest
+
+from benchmarks.compare import EXIT_REGRESSION, compare_reports, iqr
+from benchmarks.compare import main as main_compare
+from benchmarks.datagen import HEADERS, drama_title, library, month_rows
+from benchmarks.run import CASES, load_results, main, parse_size, run_benchmarks, save_results
+from src.match_engine import MatchEngine
+
+
+class TestDatagen:
+    def test_titles_unique(self):
+        titles = [drama_title(i) for i in range(20000)]
+        assert len(set(titles)) == len(titles)
+
+    def test_deterministic(self):
+        assert library(100, seed=1) == library(100, seed=1)
+        assert month_rows(50, library(100), seed=1) == month_rows(50, library(100), seed=1)
+        assert library(100, seed=1) != library(100, seed=2)
+
+    def test_month_rows_shape_and_hit_rate(self):
+        names = library(1000)
+        headers, rows = month_rows(5000, names, hit_rate=0.3)
+        assert headers == HEADERS
+        assert all(len(row) == len(headers) for row in rows)
+        matched = MatchEngine.match(rows, 0, set(names))
+        assert 0.25 < len(matched) / len(rows) < 0.35
+
+
+class TestParseSize:
+    @pytest.mark.parametrize("text, expected", [("1000", 1000), ("1k", 1000), ("100K", 100_000), ("1m", 1_000_000)])
+    def test_valid(self, text, expected):
+        assert parse_size(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "abc", "0", "-1k"])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_size(text)
+
+
+class TestRun:
+    def test_all_cases_small(self):
+        report = run_benchmarks([50], list(CASES), repeats=2, library_size=20)
+        assert [item["case"] for item in report["results"]] == list(CASES)
+        for item in report["results"]:
+            assert item["rows"] == 50
+            assert len(item["seconds"]) == 2
+            assert item["median"] >= 0
+
+    def test_memory_mode(self):
+        report = run_benchmarks([50], ["match"], repeats=1, library_size=20, memory=True)
+        (item,) = report["results"]
+        assert item["peak_bytes"] >= 0
+        assert isinstance(item["memory_by_subsystem"], dict)
+
+    def test_unknown_case(self):
+        with pytest.raises(ValueError, match="未知的用例"):
+            run_benchmarks([10], ["nope"])
+
+    def test_main_writes_json(self, tmp_path, capsys):
+        out = str(tmp_path / "result.json")
+        main(["--sizes", "20", "--cases", "match,column_sums", "--repeats", "1",
+              "--library-size", "10", "--out", out])
+        report = load_results(out)
+        assert [item["case"] for item in report["results"]] == ["match", "column_sums"]
+        assert "结果已保存" in capsys.readouterr().out
+
+    def test_main_invalid_size_exits_with_code_1(self, tmp_path, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--sizes", "abc", "--out", str(tmp_path / "r.json")])
+        assert exc_info.value.code == 1
+        assert "无效的数据规模" in capsys.readouterr().err
+
+
+def _report(version, items):
+    return {"version": version, "results": [
+        {"case": case, "rows": rows, "seconds": seconds} for case, rows, seconds in items
+    ]}
+
+
+class TestCompare:
+    def test_regression_improvement_and_noise(self):
+        base = _report("1.0", [
+            ("match", 1000, [1.0, 1.0, 1.0]),
+            ("export", 1000, [1.0, 1.0, 1.0]),
+            ("import", 1000, [1.0, 0.5, 1.5]),
+            ("save_data", 1000, [0.001, 0.001, 0.001]),
+        ])
+        current = _report("1.1", [
+            ("match", 1000, [1.5, 1.5, 1.6]),
+            ("export", 1000, [0.5, 0.5, 0.5]),
+            ("import", 1000, [1.3, 0.8, 1.8]),
+            ("save_data", 1000, [0.002, 0.002, 0.002]),
+            ("highlight", 1000, [1.0]),
+        ])
+        statuses = {d.case: d.status for d in compare_reports(base, current)}
+        assert statuses == {"match": "回退", "export": "改进", "import": "持平", "save_data": "持平"}
+
+    def test_iqr(self):
+        assert iqr([1.0]) == 0.0
+        assert iqr([1.0, 2.0, 3.0, 4.0, 5.0]) == pytest.approx(2.0)
+
+    def test_main_exit_codes(self, tmp_path, capsys):
+        base = str(tmp_path / "base.json")
+        slow = str(tmp_path / "slow.json")
+        save_results(base, _report("1.0", [("match", 10, [1.0, 1.0])]))
+        save_results(slow, _report("1.1", [("match", 10, [2.0, 2.0])]))
+
+        main_compare([base, base])
+        assert "未发现性能回退" in capsys.readouterr().out
+
+        with pytest.raises(SystemExit) as exc_info:
+            main_compare([base, slow])
+        assert exc_info.value.code == EXIT_REGRESSION
+        assert "+100.0%" in capsys.readouterr().out
+
+        with pytest.raises(SystemExit) as exc_info:
+            main_compare([base, str(tmp_path / "missing.json")])
+        assert exc_info.value.code == 1
@@ -0,0 +1,370 @@
+"""cli 单元测试：无界面命令行的导入、匹配、导出流程。"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from src.cli import main
+from src.dao.backend_dao import BackendDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import MonthDAO
+from src.dao.summary_dao import SummaryDAO
+from src.database import Database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cli.db")
+
+
+@pytest.fixture
+def month_file(tmp_path):
+    path = str(tmp_path / "month.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["合集名称", "收入"])
+    ws.append(["琅琊榜", 100])
+    ws.append(["甄嬛传", 200])
+    ws.append([" 庆余年 ", 300])
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def names_file(tmp_path):
+    path = str(tmp_path / "names.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("琅琊榜\n庆余年\n")
+    return path
+
+
+def _month_id(db_path, backend="抖音", label="2026年01月"):
+    db = Database(db_path)
+    try:
+        backend_id = BackendDAO(db).get_id(backend)
+        return db, MonthDAO(db).get_id(backend_id, label)
+    except Exception:
+        db.close()
+        raise
+
+
+class TestCli:
+    def test_import_match_export(self, db_path, month_file, names_file, tmp_path, capsys):
+        main(["--db", db_path, "library-import", "--backend", "抖音", "--file", names_file, "--create"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create"])
+        main(["--db", db_path, "match", "--backend", "抖音", "--month", "2026年01月"])
+        out = str(tmp_path / "out.xlsx")
+        main(["--db", db_path, "export", "--backend", "抖音", "--month", "2026年01月", "--out", out])
+
+        output = capsys.readouterr().out
+        assert "新增 2 个" in output
+        assert "已导入 3 行" in output
+        assert "共匹配 2 行" in output
+        assert "耗时" in output
+
+        db, month_id = _month_id(db_path)
+        try:
+            dao = ImportedDataDAO(db)
+            assert dao.get_match_results(month_id) == [0, 2]
+            assert dao.get_all_rows(month_id)[1] == ["甄嬛传", 200]
+        finally:
+            db.close()
+
+        wb = load_workbook(out)
+        ws = wb.active
+        assert ws["A2"].fill.fgColor.rgb == "00FFFF00"
+        assert ws["A3"].fill.fill_type is None
+        wb.close()
+
+    def test_import_with_match_flag_and_match_all(self, db_path, month_file, names_file, capsys):
+        main(["--db", db_path, "library-import", "--backend", "抖音", "--file", names_file, "--create"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create", "--match"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年02月",
+              "--file", month_file, "--create"])
+        capsys.readouterr()
+
+        main(["--db", db_path, "match-all", "--backend", "抖音"])
+
+        output = capsys.readouterr().out
+        assert "2026年01月: 共匹配 2 行" in output
+        assert "2026年02月: 共匹配 2 行" in output
+
+    def test_reimport_clears_match_results(self, db_path, month_file, names_file):
+        main(["--db", db_path, "library-import", "--backend", "抖音", "--file", names_file, "--create"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create", "--match"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file])
+
+        db, month_id = _month_id(db_path)
+        try:
+            assert ImportedDataDAO(db).get_match_results(month_id) == []
+        finally:
+            db.close()
+
+    def test_import_and_match_maintain_summary(self, db_path, month_file, names_file):
+        main(["--db", db_path, "library-import", "--backend", "抖音", "--file", names_file, "--create"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create"])
+        db, month_id = _month_id(db_path)
+        try:
+            backend_id = BackendDAO(db).get_id("抖音")
+            assert SummaryDAO(db).totals_by_month(backend_id, matched=True) == []
+            assert SummaryDAO(db).totals_by_month(backend_id) == [("2026年01月", 3, {"收入": 600.0})]
+        finally:
+            db.close()
+
+        main(["--db", db_path, "match", "--backend", "抖音", "--month", "2026年01月"])
+        db, month_id = _month_id(db_path)
+        try:
+            backend_id = BackendDAO(db).get_id("抖音")
+            assert SummaryDAO(db).totals_by_month(backend_id, matched=True) == [("2026年01月", 2, {"收入": 400.0})]
+        finally:
+            db.close()
+
+    def test_import_multiple_files_and_append(self, db_path, month_file, tmp_path, capsys):
+        second = str(tmp_path / "month_2.xlsx")
+        wb = Workbook()
+        wb.active.append(["合集名称", "收入"])
+        wb.active.append(["长相思", 400])
+        wb.save(second)
+
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, second, "--workers", "2", "--create"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", second, "--append"])
+
+        output = capsys.readouterr().out
+        assert "month_2.xlsx: 1 行" in output
+        assert "已导入 4 行" in output
+        db, month_id = _month_id(db_path)
+        try:
+            rows = ImportedDataDAO(db).get_all_rows(month_id)
+            assert [row[0] for row in rows] == ["琅琊榜", "甄嬛传", " 庆余年 ", "长相思", "长相思"]
+        finally:
+            db.close()
+
+    def test_reimport_same_file_uses_cache(self, db_path, month_file, capsys):
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年02月",
+              "--file", month_file, "--create"])
+        output = capsys.readouterr().out
+        assert output.count("未重新解析") == 1
+        db, month_id = _month_id(db_path, label="2026年02月")
+        try:
+            assert ImportedDataDAO(db).get_all_rows(month_id)[0] == ["琅琊榜", 100]
+        finally:
+            db.close()
+
+    def test_list_and_import_sheets(self, db_path, tmp_path, capsys):
+        path = str(tmp_path / "sheets.xlsx")
+        wb = Workbook()
+        wb.active.title = "直播"
+        wb.active.append(["合集名称", "收入"])
+        wb.active.append(["琅琊榜", 100])
+        ws = wb.create_sheet("短剧")
+        ws.append(["合集名称", "平台"])
+        ws.append(["繁花", "抖音"])
+        wb.save(path)
+
+        main(["--db", db_path, "sheets", "--file", path])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", path, "--all-sheets", "--create"])
+        output = capsys.readouterr().out
+        assert "1. 直播\t1 行 × 2 列\t（活动）" in output
+        assert "[短剧] -> 2026年01月/短剧: 1 行" in output
+        db, month_id = _month_id(db_path, label="2026年01月/短剧")
+        try:
+            assert ImportedDataDAO(db).get_all_rows(month_id) == [["繁花", "抖音"]]
+            assert SummaryDAO(db).title_trend(BackendDAO(db).get_id("抖音"), "繁花")[0][1] == 1
+        finally:
+            db.close()
+
+    def test_import_merge(self, db_path, month_file, names_file, tmp_path, capsys):
+        update = str(tmp_path / "update.xlsx")
+        wb = Workbook()
+        wb.active.append(["合集名称", "收入"])
+        wb.active.append(["琅琊榜", 150])
+        wb.active.append(["甄嬛传", 200])
+        wb.active.append(["长相思", 400])
+        wb.save(update)
+
+        main(["--db", db_path, "library-import", "--backend", "抖音", "--file", names_file, "--create"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create", "--match"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", update, "--merge", "--key", "合集名称", "--replace", "--match"])
+
+        output = capsys.readouterr().out
+        assert "新增 1 行，替换 1 行，跳过重复 1 行" in output
+        db, month_id = _month_id(db_path)
+        try:
+            data_dao = ImportedDataDAO(db)
+            assert data_dao.get_all_rows(month_id) == [
+                ["琅琊榜", 150], ["甄嬛传", 200], [" 庆余年 ", 300], ["长相思", 400],
+            ]
+            assert data_dao.get_match_results(month_id) == [0, 2]
+        finally:
+            db.close()
+
+        with pytest.raises(SystemExit):
+            main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+                  "--file", update, "--key", "合集名称"])
+        assert "--merge" in capsys.readouterr().err
+
+    def test_watch_once(self, db_path, month_file, names_file, tmp_path, capsys):
+        inbox = tmp_path / "inbox"
+        inbox.mkdir()
+        os.replace(month_file, inbox / "抖音_2026年01月.xlsx")
+        main(["--db", db_path, "library-import", "--backend", "抖音", "--file", names_file, "--create"])
+        main(["--db", db_path, "watch", "--dir", str(inbox), "--once", "--workers", "1", "--create"])
+        main(["--db", db_path, "watch", "--dir", str(inbox), "--once", "--workers", "1", "--create"])
+        out = capsys.readouterr().out
+        assert "[完成]" in out and "匹配 2 行" in out
+        assert "[跳过]" in out
+
+    def test_trace_writes_chrome_trace(self, db_path, month_file, tmp_path, capsys):
+        trace = str(tmp_path / "trace.json")
+        main(["--db", db_path, "--trace", trace, "import-month", "--backend", "抖音",
+              "--month", "2026年01月", "--file", month_file, "--create"])
+        out = capsys.readouterr().out
+        assert "ImportedDataDAO.save_data" in out
+        assert os.path.isfile(trace)
+
+    def test_sql_stats_report(self, db_path, month_file, capsys):
+        main(["--db", db_path, "--sql-stats", "import-month", "--backend", "抖音",
+              "--month", "2026年01月", "--file", month_file, "--create"])
+        out = capsys.readouterr().out
+        assert "p95ms" in out
+        assert "INSERT INTO imported_rows" in out
+
+    def test_groupby(self, db_path, month_file, names_file, tmp_path, capsys):
+        main(["--db", db_path, "library-import", "--backend", "抖音", "--file", names_file, "--create"])
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create", "--match"])
+        capsys.readouterr()
+        out_file = str(tmp_path / "groups.xlsx")
+        main(["--db", db_path, "groupby", "--backend", "抖音", "--month", "2026年01月",
+              "--values", "收入", "--agg", "sum", "count", "--rows", "matched", "--out", out_file])
+        out = capsys.readouterr().out
+        assert "合集名称\t行数\t收入 求和\t收入 计数" in out
+        assert "庆余年\t1\t300\t1" in out
+        assert "甄嬛传" not in out
+        assert "共 2 个分组" in out
+        ws = load_workbook(out_file).active
+        assert [c.value for c in ws[1]] == ["合集名称", "行数", "收入 求和", "收入 计数"]
+        assert ws.max_row == 3
+
+    def test_groupby_unknown_column_exits_with_code_1(self, db_path, month_file, capsys):
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create"])
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--db", db_path, "groupby", "--backend", "抖音", "--month", "2026年01月",
+                  "--by", "平台"])
+        assert exc_info.value.code == 1
+        assert "未找到列" in capsys.readouterr().err
+
+    def test_diff_with_previous_month(self, db_path, month_file, tmp_path, capsys):
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create"])
+        path = str(tmp_path / "month2.xlsx")
+        wb = Workbook()
+        wb.active.append(["合集名称", "收入"])
+        wb.active.append(["琅琊榜", 150])
+        wb.active.append(["长相思", 80])
+        wb.active.append(["庆余年", 300])
+        wb.save(path)
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年02月",
+              "--file", path, "--create"])
+        capsys.readouterr()
+        out = str(tmp_path / "diff.xlsx")
+
+        main(["--db", db_path, "diff", "--backend", "抖音", "--month", "2026年02月", "--out", out])
+
+        output = capsys.readouterr().out
+        assert "长相思\t新增" in output
+        assert "甄嬛传\t消失" in output
+        assert "琅琊榜\t变化\t1\t1\t0\t100\t150\t50" in output
+        assert "新增 1 个，消失 1 个，变化 1 个，不变 1 个" in output
+        rows = list(load_workbook(out).active.iter_rows(values_only=True))
+        assert rows[0][:3] == ("合集名称", "状态", "2026年01月 行数")
+        assert len(rows) == 4
+
+    def test_diff_base_follows_label_order(self, db_path, month_file, tmp_path, capsys):
+        """默认旧月份按标签中的年月确定，不受创建顺序影响，并跳过子表月份。"""
+        path = str(tmp_path / "month2.xlsx")
+        wb = Workbook()
+        wb.active.append(["合集名称", "收入"])
+        wb.active.append(["长相思", 80])
+        wb.save(path)
+        for month, file in [("2026年02月", path), ("2026年01月/直播", path), ("2026年01月", month_file)]:
+            main(["--db", db_path, "import-month", "--backend", "抖音", "--month", month,
+                  "--file", file, "--create"])
+        capsys.readouterr()
+
+        main(["--db", db_path, "diff", "--backend", "抖音", "--month", "2026年02月"])
+
+        output = capsys.readouterr().out
+        assert "甄嬛传\t消失" in output
+        assert "2026年01月 -> 2026年02月" in output
+
+    def test_diff_first_month_exits_with_code_1(self, db_path, month_file, capsys):
+        main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+              "--file", month_file, "--create"])
+        with pytest.raises(SystemExit) as exc:
+            main(["--db", db_path, "diff", "--backend", "抖音", "--month", "2026年01月"])
+        assert exc.value.code == 1
+        assert "没有可对比的月份" in capsys.readouterr().err
+
+    def test_import_month_rejects_zero_workers(self, db_path, month_file, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+                  "--file", month_file, month_file, "--workers", "0", "--create"])
+        assert exc_info.value.code == 2
+        assert "需要正整数" in capsys.readouterr().err
+
+    def test_watch_rejects_negative_workers(self, db_path, tmp_path, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--db", db_path, "watch", "--dir", str(tmp_path), "--once", "--workers", "-1"])
+        assert exc_info.value.code == 2
+        assert "需要正整数" in capsys.readouterr().err
+
+    @pytest.mark.parametrize("name", ["bad.xlsx", "bad.xls"])
+    def test_corrupt_excel_exits_with_code_1(self, db_path, tmp_path, capsys, name):
+        path = tmp_path / name
+        path.write_bytes(b"not an excel file")
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--db", db_path, "import-month", "--backend", "抖音", "--month", "2026年01月",
+                  "--file", str(path), "--create"])
+        assert exc_info.value.code == 1
+        assert "无法读取 Excel 文件" in capsys.readouterr().err
+
+    def test_corrupt_database_exits_with_code_1(self, tmp_path, month_file, capsys):
+        db_file = tmp_path / "broken.db"
+        db_file.write_bytes(b"not a database" * 100)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--db", str(db_file), "import-month", "--backend", "抖音", "--month", "2026年01月",
+                  "--file", month_file, "--create"])
+        assert exc_info.value.code == 1
+        assert "无法打开数据库" in capsys.readouterr().err
+
+    def test_unknown_backend_exits_with_code_1(self, db_path, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--db", db_path, "match", "--backend", "不存在", "--month", "2026年01月"])
+        assert exc_info.value.code == 1
+        assert "不存在" in capsys.readouterr().err
+
+    def test_missing_subcommand_exits(self, db_path):
+        with pytest.raises(SystemExit):
+            main(["--db", db_path])
+
+    def test_does_not_import_tkinter(self):
+        code = "import sys, src.cli; sys.exit('tkinter' in sys.modules)"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
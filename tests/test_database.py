@@ -15,7 +15,7 @@ def db(tmp_path):
 
 
 class TestTableCreation:
-    """验证所有 6 张表被正确创建。"""
+    """验证所有表被正确创建。"""
 
     EXPECTED_TABLES = {
         "backends",
@@ -24,6 +24,9 @@ class TestTableCreation:
         "imported_headers",
         "imported_rows",
         "match_results",
+        "ingested_files",
+        "month_summaries",
+        "import_cache",
     }
 
     def test_all_tables_exist(self, db):
@@ -156,6 +159,53 @@ class TestCascadeDelete:
             assert count == 0, f"{table} should be empty after backend deletion"
 
 
+class TestMigration:
+    """验证旧版本数据库的升级。"""
+
+    def test_adds_column_types_to_imported_headers(self, tmp_path):
+        db_path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE imported_headers (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "month_id INTEGER NOT NULL UNIQUE, headers_json TEXT NOT NULL)"
+        )
+        conn.execute("INSERT INTO imported_headers (month_id, headers_json) VALUES (1, '[]')")
+        conn.commit()
+        conn.close()
+
+        database = Database(db_path)
+        try:
+            row = database.get_connection().execute(
+                "SELECT headers_json, column_types_json FROM imported_headers"
+            ).fetchone()
+            assert row == ("[]", None)
+        finally:
+            database.close()
+        Database(db_path).close()
+
+    def test_adds_row_hash_and_index(self, tmp_path):
+        db_path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE imported_rows (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "month_id INTEGER NOT NULL, row_index INTEGER NOT NULL, row_json TEXT NOT NULL)"
+        )
+        conn.execute("INSERT INTO imported_rows (month_id, row_index, row_json) VALUES (1, 0, '[]')")
+        conn.commit()
+        conn.close()
+
+        database = Database(db_path)
+        try:
+            conn = database.get_connection()
+            assert conn.execute("SELECT row_hash FROM imported_rows").fetchone() == (None,)
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(imported_rows)")}
+            assert "idx_imported_rows_hash" in indexes
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(imported_headers)")}
+            assert "row_key_json" in columns
+        finally:
+            database.close()
+
+
 class TestGetConnectionAndClose:
     """验证连接获取和关闭。"""
 
@@ -0,0 +1,26 @@
+"""diff_dialog 单元测试：对比对话框默认选中的月份。"""
+
+from src.gui.diff_dialog import default_labels
+
+
+class TestDefaultLabels:
+    def test_previous_month_by_label(self):
+        months = [(1, "2026年03月"), (2, "2026年01月"), (3, "2026年02月")]
+        assert default_labels(months, 0) == ("2026年02月", "2026年03月")
+        assert default_labels(months) == ("2026年01月", "2026年02月")
+
+    def test_no_earlier_month_leaves_old_empty(self):
+        """按创建顺序的前一项不是更早的月份，不能作为默认旧月份。"""
+        months = [(1, "2026年03月"), (2, "2026年01月")]
+        assert default_labels(months, 1) == ("", "2026年01月")
+        assert default_labels(months, 0) == ("2026年01月", "2026年03月")
+
+    def test_first_selected_kept(self):
+        months = [(1, "2026年01月"), (2, "2026年02月")]
+        assert default_labels(months, 0) == ("", "2026年01月")
+
+    def test_unparsable_label_leaves_old_empty(self):
+        assert default_labels([(1, "2026年01月"), (2, "春节特辑")], 1) == ("", "春节特辑")
+
+    def test_no_months(self):
+        assert default_labels([]) == ("", "")
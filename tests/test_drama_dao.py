@@ -139,3 +139,19 @@ class TestGetSet:
         dao.add(bid1, "独有剧名")
         dao.add(bid2, "另一个剧名")
         assert dao.get_set(bid1) == {"独有剧名"}
+
+
+class TestGetVersion:
+    """验证剧名库版本标识随增删变化。"""
+
+    def test_empty_library(self, dao, backend_id):
+        assert dao.get_version(backend_id) == (0, 0)
+
+    def test_changes_after_add_and_delete(self, dao, backend_id):
+        dao.add_batch(backend_id, ["琅琊榜", "甄嬛传"])
+        v1 = dao.get_version(backend_id)
+        dao.add(backend_id, "庆余年")
+        v2 = dao.get_version(backend_id)
+        dao.delete(backend_id, "琅琊榜")
+        v3 = dao.get_version(backend_id)
+        assert len({v1, v2, v3}) == 3
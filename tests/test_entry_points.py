@@ -0,0 +1,20 @@
+"""入口模块测试：直接运行时先调用 multiprocessing.freeze_support()（打包为 exe 后进程池需要）。"""
+
+import multiprocessing
+import runpy
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize("module", ["src.app", "src.cli", "src.main"])
+def test_entry_point_calls_freeze_support(module, monkeypatch):
+    calls = []
+    monkeypatch.setattr(multiprocessing, "freeze_support", lambda: calls.append(module))
+    # --help 在解析参数时退出，不会启动界面或执行命令
+    monkeypatch.setattr(sys, "argv", [module, "--help"])
+    # 像 python -m 一样重新执行模块，避免 runpy 因模块已导入而告警
+    monkeypatch.delitem(sys.modules, module, raising=False)
+    with pytest.raises(SystemExit):
+        runpy.run_module(module, run_name="__main__")
+    assert calls == [module]
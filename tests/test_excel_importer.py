@@ -66,6 +66,18 @@ class TestImportFile:
         headers, rows = ExcelImporter.import_file(path)
         assert rows[0] == ["hello", 42, 3.14, True]
 
+    def test_numbers_stored_as_text_converted(self, tmp_dir):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["合集名称", "收入", "编号"])
+        ws.append(["琅琊榜", "12,345.6", "007"])
+        ws.append(["庆余年", "1.2万", "008"])
+        ws.append(["甄嬛传", 300, "009"])
+        path = self._save(wb, tmp_dir)
+        headers, rows = ExcelImporter.import_file(path)
+        assert [row[1] for row in rows] == [12345.6, 12000, 300]
+        assert [row[2] for row in rows] == ["007", "008", "009"]
+
     def test_none_header_becomes_empty_string(self, tmp_dir):
         wb = Workbook()
         ws = wb.active
@@ -178,3 +190,70 @@ class TestImportDramaNames:
         path = self._save(wb, tmp_dir)
         with pytest.raises(ValueError, match="未找到"):
             ExcelImporter.import_drama_names(path, column_id="不存在")
+
+
+class TestIterFile:
+    """Tests for ExcelImporter.iter_file."""
+
+    def test_streams_rows(self, sample_workbook, tmp_dir):
+        path = os.path.join(tmp_dir, "stream.xlsx")
+        sample_workbook.save(path)
+        headers, rows = ExcelImporter.iter_file(path)
+        assert headers == ["剧名", "类型", "年份"]
+        assert next(rows) == ["琅琊榜", "古装", 2015]
+        assert len(list(rows)) == 2
+
+    def test_short_rows_padded_to_header_width(self, tmp_dir):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["A", "B", "C"])
+        ws.append(["x"])
+        path = os.path.join(tmp_dir, "short.xlsx")
+        wb.save(path)
+        _, rows = ExcelImporter.iter_file(path)
+        assert list(rows) == [["x", None, None]]
+
+
+class TestSheets:
+    """Tests for ExcelImporter.list_sheets and iter_file(sheet=...)."""
+
+    @pytest.fixture
+    def workbook_path(self, tmp_dir):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "直播"
+        ws.append(["合集名称", "收入"])
+        ws.append(["琅琊榜", 100])
+        ws = wb.create_sheet("短剧")
+        ws.append(["剧名", "平台", "播放量"])
+        ws.append(["繁花", "抖音", "1.2万"])
+        ws.append(["庆余年", "快手", 300])
+        path = os.path.join(tmp_dir, "sheets.xlsx")
+        wb.save(path)
+        return path
+
+    def test_list_sheets_reads_metadata(self, workbook_path):
+        sheets = ExcelImporter.list_sheets(workbook_path)
+        assert [(s.name, s.index, s.max_row, s.max_column, s.active) for s in sheets] == [
+            ("直播", 0, 2, 2, True), ("短剧", 1, 3, 3, False),
+        ]
+
+    def test_iter_named_sheet(self, workbook_path):
+        headers, rows = ExcelImporter.iter_file(workbook_path, "短剧")
+        assert headers == ["剧名", "平台", "播放量"]
+        assert list(rows) == [["繁花", "抖音", 12000], ["庆余年", "快手", 300]]
+
+    def test_default_is_active_sheet(self, workbook_path):
+        headers, _ = ExcelImporter.iter_file(workbook_path)
+        assert headers == ["合集名称", "收入"]
+
+    def test_unknown_sheet(self, workbook_path):
+        with pytest.raises(ValueError, match="工作表不存在"):
+            ExcelImporter.iter_file(workbook_path, "不存在")
+
+    def test_list_sheets_unsupported_format(self, tmp_dir):
+        path = os.path.join(tmp_dir, "names.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("琅琊榜\n")
+        with pytest.raises(ValueError, match="不支持的文件格式"):
+            ExcelImporter.list_sheets(path)
@@ -1,6 +1,9 @@
 """Exporter 单元测试：验证 Excel 导出功能。"""
 
+import glob
 import os
+import tempfile
+
 import pytest
 from openpyxl import load_workbook
 from src.exporter import Exporter
@@ -90,3 +93,83 @@ class TestExportToExcel:
         actual_row2 = [cell.value for cell in ws[3]]
         assert actual_row2 == [1, None, 3]
         wb.close()
+
+
+class TestExportWithHighlight:
+    def test_matched_rows_highlighted(self, tmp_xlsx):
+        """匹配行所有表头列应为黄色，未匹配行无填充。"""
+        headers = ["合集名称", "播放量"]
+        rows = [["剧名A", 1], ["剧名B", 2], ["剧名C", 3]]
+
+        Exporter.export_with_highlight(tmp_xlsx, headers, rows, [0, 2])
+
+        wb = load_workbook(tmp_xlsx)
+        ws = wb.active
+        assert [c.value for c in ws[2]] == ["剧名A", 1]
+        for row in (2, 4):
+            for col in (1, 2):
+                assert ws.cell(row=row, column=col).fill.fgColor.rgb == "00FFFF00"
+        assert ws.cell(row=3, column=1).fill.fill_type is None
+        wb.close()
+
+    def test_short_matched_row_padded_to_header_width(self, tmp_xlsx):
+        """匹配行数据少于表头列数时，空白列也应高亮。"""
+        Exporter.export_with_highlight(tmp_xlsx, ["A", "B", "C"], [["x"]], [0])
+
+        wb = load_workbook(tmp_xlsx)
+        ws = wb.active
+        assert ws.cell(row=2, column=3).value is None
+        assert ws.cell(row=2, column=3).fill.fgColor.rgb == "00FFFF00"
+        wb.close()
+
+
+class TestExportStreaming:
+    def test_accepts_row_iterator(self, tmp_xlsx):
+        """行数据可以是生成器，返回写入行数。"""
+        rows = ([i, f"剧{i}"] for i in range(5))
+        written = Exporter.export_streaming(tmp_xlsx, ["序号", "剧名"], rows, [1])
+
+        assert written == 5
+        wb = load_workbook(tmp_xlsx)
+        ws = wb.active
+        assert ws.max_row == 6
+        assert ws.cell(row=3, column=2).fill.fgColor.rgb == "00FFFF00"
+        wb.close()
+
+    def test_progress_callback(self, tmp_xlsx, monkeypatch):
+        """进度回调应按间隔触发，最后一次报告全部行数。"""
+        monkeypatch.setattr("src.exporter.PROGRESS_INTERVAL", 2)
+        calls = []
+        Exporter.export_streaming(
+            tmp_xlsx, ["A"], [[i] for i in range(5)], total=5,
+            progress_callback=lambda done, total: calls.append((done, total)),
+        )
+        assert calls == [(2, 5), (4, 5), (5, 5)]
+
+    def test_cancel_leaves_no_file(self, tmp_xlsx, monkeypatch):
+        """取消导出应抛出 ExportCancelled 且不写入目标文件。"""
+        from src.exporter import ExportCancelled
+
+        monkeypatch.setattr("src.exporter.PROGRESS_INTERVAL", 2)
+        with pytest.raises(ExportCancelled):
+            Exporter.export_streaming(
+                tmp_xlsx, ["A"], [[i] for i in range(10)], cancel_check=lambda: True,
+            )
+        assert not os.path.exists(tmp_xlsx)
+
+    @pytest.mark.parametrize("private_cleanup", [True, False])
+    def test_cancel_removes_write_only_temp_file(self, tmp_xlsx, monkeypatch, private_cleanup):
+        """取消导出删除 write-only 工作表的临时文件；openpyxl 没有私有的 _writer 时走公开接口。"""
+        from src.exporter import ExportCancelled
+
+        if not private_cleanup:
+            monkeypatch.setattr("src.exporter._writer_cleanup", lambda ws: None)
+        pattern = os.path.join(tempfile.gettempdir(), "openpyxl.*")
+        before = set(glob.glob(pattern))
+        monkeypatch.setattr("src.exporter.PROGRESS_INTERVAL", 2)
+        with pytest.raises(ExportCancelled):
+            Exporter.export_streaming(
+                tmp_xlsx, ["A"], [[i] for i in range(10)], cancel_check=lambda: True,
+            )
+        assert set(glob.glob(pattern)) <= before
+        assert not os.path.exists(tmp_xlsx)
@@ -0,0 +1,112 @@
+"""groupby 单元测试。"""
+
+import pytest
+
+from src.groupby import GroupBy, format_summary, resolve_columns
+from src.month_table import MonthTable
+
+HEADERS = ["合集名称", "平台", "播放量", "收入"]
+ROWS = [
+    ["琅琊榜", "抖音", 100, 1.5],
+    ["庆余年 ", "快手", 50, 2.5],
+    [" 琅琊榜", "快手", 300, None],
+    ["庆余年", "快手", None, 4.0],
+    [None, "抖音", 10, "未知"],
+    ["甄嬛传"],
+]
+
+
+class TestResolveColumns:
+    def test_names_and_numbers(self):
+        assert resolve_columns(HEADERS, ["收入", "2", 1]) == [3, 1, 0]
+
+    def test_unknown_name(self):
+        with pytest.raises(ValueError, match="未找到列"):
+            resolve_columns(HEADERS, ["分成"])
+
+    def test_number_out_of_range(self):
+        with pytest.raises(ValueError, match="超出范围"):
+            resolve_columns(HEADERS, ["9"])
+
+
+class TestGroupBy:
+    def test_single_key_sum_and_count(self):
+        grouping = GroupBy.from_headers(HEADERS, ["合集名称"], ["播放量", "收入"], ["sum", "count"])
+        grouping.add_rows(ROWS)
+        summary = grouping.summary()
+        assert summary.headers == ["合集名称", "行数", "播放量 求和", "播放量 计数", "收入 求和", "收入 计数"]
+        assert summary.source_rows == 6
+        # 按第一个聚合值降序；文本键去除首尾空格
+        assert summary.rows == [
+            ["琅琊榜", 2, 400.0, 2, 1.5, 1],
+            ["庆余年", 2, 50.0, 1, 6.5, 2],
+            ["", 1, 10.0, 1, None, 0],
+            ["甄嬛传", 1, None, 0, None, 0],
+        ]
+
+    def test_multiple_keys_mean_min_max(self):
+        grouping = GroupBy.from_headers(HEADERS, ["合集名称", "平台"], ["播放量"], ["mean", "min", "max"])
+        grouping.add_rows(ROWS[:3])
+        rows = {tuple(row[:2]): row[2:] for row in grouping.summary().rows}
+        assert rows[("琅琊榜", "抖音")] == [1, 100.0, 100, 100]
+        assert rows[("琅琊榜", "快手")] == [1, 300.0, 300, 300]
+        assert rows[("庆余年", "快手")] == [1, 50.0, 50, 50]
+
+    def test_without_value_columns_sorted_by_row_count(self):
+        grouping = GroupBy.from_headers(HEADERS, ["平台"], [])
+        grouping.add_rows(ROWS)
+        assert grouping.summary().rows == [["快手", 3], ["抖音", 2], ["", 1]]
+
+    def test_month_table_matches_lists(self):
+        table = MonthTable.from_rows(ROWS, len(HEADERS))
+        expected = GroupBy.from_headers(HEADERS, ["合集名称"], ["播放量", "收入"], ["sum", "max"])
+        expected.add_rows(ROWS)
+        grouping = GroupBy.from_headers(HEADERS, ["合集名称"], ["播放量", "收入"], ["sum", "max"])
+        grouping.add_rows(table)
+        assert grouping.summary() == expected.summary()
+
+    def test_matched_and_unmatched_modes(self):
+        matched = GroupBy.from_headers(HEADERS, ["合集名称"], ["播放量"])
+        matched.add_rows(iter(ROWS), [0, 2], "matched")
+        assert matched.summary().rows == [["琅琊榜", 2, 400.0]]
+        unmatched = GroupBy.from_headers(HEADERS, ["合集名称"], ["播放量"])
+        unmatched.add_rows(MonthTable.from_rows(ROWS), [0, 2], "unmatched")
+        assert [row[0] for row in unmatched.summary().rows] == ["庆余年", "", "甄嬛传"]
+        with pytest.raises(ValueError):
+            matched.add_rows(ROWS, [], "invalid")
+
+    def test_split_matched(self):
+        grouping = GroupBy.from_headers(HEADERS, ["合集名称"], ["播放量"])
+        grouping.split_matched = True
+        grouping.add_rows(MonthTable.from_rows(ROWS), [0, 3])
+        summary = grouping.summary()
+        assert summary.headers[:3] == ["合集名称", "匹配", "行数"]
+        assert ["琅琊榜", "是", 1, 100.0] in summary.rows
+        assert ["琅琊榜", "否", 1, 300.0] in summary.rows
+        groups = {key: (count, stats[0][:2]) for key, count, stats in grouping.iter_groups()}
+        assert groups[("庆余年", True)] == (1, (0.0, 0))
+        assert groups[("庆余年", False)] == (1, (50.0, 1))
+
+    def test_accumulates_across_calls(self):
+        grouping = GroupBy.from_headers(HEADERS, ["平台"], ["播放量"])
+        grouping.add_rows(ROWS[:2])
+        grouping.add(ROWS[2])
+        assert grouping.group_count == 2
+        assert grouping.summary().rows[0] == ["快手", 2, 350.0]
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            GroupBy([], [2])
+        with pytest.raises(ValueError):
+            GroupBy([0], [2], ["median"])
+
+
+class TestFormatSummary:
+    def test_tab_separated_with_limit(self):
+        grouping = GroupBy.from_headers(HEADERS, ["合集名称"], ["收入"], ["sum", "mean"])
+        grouping.add_rows(ROWS)
+        text = format_summary(grouping.summary(), limit=2)
+        lines = text.splitlines()
+        assert lines[0] == "合集名称\t行数\t收入 求和\t收入 平均"
+        assert lines[1] == "庆余年\t2\t6.50\t3.25"
+        assert lines[-1] == "... 另有 2 个分组"
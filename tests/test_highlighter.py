@@ -1,5 +1,6 @@
 """Tests for the highlighter module."""
 
+import pytest
 from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side, PatternFill
 
@@ -84,3 +85,46 @@ class TestHighlightRows:
         for row in range(1, ws.max_row + 1):
             for col in range(1, ws.max_column + 1):
                 assert ws.cell(row=row, column=col).fill != yellow
+
+    def test_invalid_mode_raises(self):
+        ws = self._make_ws()
+        with pytest.raises(ValueError):
+            highlight_rows(ws, [2], mode="unknown")
+
+
+class TestConditionalHighlight:
+    """Tests for highlight_rows(mode="conditional")."""
+
+    def _make_ws(self):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["剧名", "类型", "年份"])
+        for i in range(6):
+            ws.append([f"剧{i}", "古装", 2000 + i])
+        return ws
+
+    def test_single_rule_covers_merged_ranges(self):
+        ws = self._make_ws()
+        highlight_rows(ws, [2, 3, 4, 7], mode="conditional")
+
+        ranges = list(ws.conditional_formatting)
+        assert len(ranges) == 1
+        assert str(ranges[0].sqref) == "A2:C4 A7:C7"
+        assert len(ranges[0].rules) == 1
+        assert ranges[0].rules[0].dxf.fill.fgColor.rgb == "00FFFF00"
+
+    def test_cell_styles_untouched(self):
+        ws = self._make_ws()
+        yellow = PatternFill(fill_type="solid", fgColor="FFFF00")
+
+        highlight_rows(ws, [2], mode="conditional")
+
+        assert ws.cell(row=2, column=1).fill != yellow
+
+
+class TestRowRanges:
+    def test_merges_consecutive_rows(self):
+        from src.highlighter import row_ranges
+
+        assert row_ranges([5, 2, 3, 9, 4, 3]) == [(2, 5), (9, 9)]
+        assert row_ranges([]) == []
@@ -0,0 +1,122 @@
+"""import_cache 单元测试：按文件指纹复用已导入月份的数据、缓存失效和哈希复用。"""
+
+import os
+
+import pytest
+from openpyxl import Workbook
+
+from src import import_cache
+from src.dao.backend_dao import BackendDAO
+from src.dao.import_cache_dao import ImportCacheDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import MonthDAO
+from src.database import Database
+from src.excel_importer import ExcelImporter
+from src.import_cache import import_file
+
+HEADERS = ["合集名称", "收入"]
+ROWS = [["琅琊榜", "1,000"], ["庆余年", 200]]
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "cache.db"))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def months(db):
+    backend_id = BackendDAO(db).create("抖音")
+    month_dao = MonthDAO(db)
+    return [month_dao.create(backend_id, label) for label in ("2026年01月", "2026年02月")]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return _write(tmp_path / "1月.xlsx", ROWS)
+
+
+def _write(path, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(HEADERS)
+    for row in rows:
+        ws.append(row)
+    wb.save(str(path))
+    return str(path)
+
+
+def _no_parse(monkeypatch):
+    def fail(path):
+        raise AssertionError("不应重新解析文件")
+
+    monkeypatch.setattr(ExcelImporter, "iter_file", staticmethod(fail))
+
+
+class TestImportFile:
+    def test_second_import_copies_encoded_rows(self, db, months, workbook, monkeypatch):
+        first = import_file(db, months[0], workbook, keep_rows=True)
+        assert not first.cached
+        assert first.rows == [["琅琊榜", 1000], ["庆余年", 200]]
+
+        _no_parse(monkeypatch)
+        second = import_file(db, months[1], workbook)
+        assert second.cached and second.source_month_id == months[0]
+        assert second.row_count == 2 and second.headers == HEADERS
+        data_dao = ImportedDataDAO(db)
+        assert data_dao.get_all_rows(months[1]) == data_dao.get_all_rows(months[0])
+        assert data_dao.get_column_types(months[1]) == data_dao.get_column_types(months[0])
+
+    def test_reimport_into_same_month(self, db, months, workbook, monkeypatch):
+        import_file(db, months[0], workbook)
+        _no_parse(monkeypatch)
+        result = import_file(db, months[0], workbook)
+        assert result.source_month_id == months[0] and result.row_count == 2
+
+    def test_changed_month_is_not_reused(self, db, months, workbook):
+        import_file(db, months[0], workbook)
+        ImportedDataDAO(db).save_data(months[0], HEADERS, [["甄嬛传", 1]], append=True)
+        result = import_file(db, months[1], workbook)
+        assert not result.cached
+        assert ImportedDataDAO(db).count_rows(months[1]) == 2
+
+    def test_different_content_is_parsed(self, db, months, workbook, tmp_path):
+        import_file(db, months[0], workbook)
+        other = _write(tmp_path / "2月.xlsx", [["繁花", 1]])
+        assert not import_file(db, months[1], other).cached
+
+    def test_unchanged_file_reuses_known_hash(self, db, months, workbook, monkeypatch):
+        first = import_file(db, months[0], workbook)
+        monkeypatch.setattr(import_cache, "hash_file", lambda path: pytest.fail("不应重新计算哈希"))
+        assert import_file(db, months[1], workbook).file_hash == first.file_hash
+
+    def test_touched_file_is_rehashed(self, db, months, workbook):
+        first = import_file(db, months[0], workbook)
+        stat = os.stat(workbook)
+        os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert ImportCacheDAO(db).known_hash(os.path.abspath(workbook), stat.st_size,
+                                             stat.st_mtime_ns + 1_000_000_000) is None
+        result = import_file(db, months[1], workbook)
+        assert result.cached and result.file_hash == first.file_hash
+
+    def test_deleted_month_drops_cache(self, db, months, workbook):
+        first = import_file(db, months[0], workbook)
+        MonthDAO(db).delete(months[0])
+        assert ImportCacheDAO(db).find_month(first.file_hash) is None
+        assert not import_file(db, months[1], workbook).cached
+
+    def test_missing_file(self, db, months, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            import_file(db, months[0], str(tmp_path / "none.xlsx"))
+
+    def test_column_types_inferred_once(self, db, months, workbook, monkeypatch):
+        from src import schema
+
+        calls = []
+        infer = schema.infer_column_types
+        monkeypatch.setattr(schema, "infer_column_types", lambda *a: calls.append(1) or infer(*a))
+        result = import_file(db, months[0], workbook, keep_rows=True)
+        assert len(calls) == 1
+        assert result.rows == [["琅琊榜", 1000], ["庆余年", 200]]
+        assert ImportedDataDAO(db).get_all_rows(months[0]) == [["琅琊榜", 1000], ["庆余年", 200]]
@@ -48,6 +48,48 @@ class TestSaveDataAndGetHeaders:
         assert rows == [["a", "b"]]
 
 
+    def test_column_types_saved_with_headers(self, dao, month_id):
+        dao.save_data(month_id, ["合集名称", "收入", "备注"], [["琅琊榜", "1,200.5", None], ["庆余年", "3万", None]])
+        assert dao.get_column_types(month_id) == ["text", "number", "empty"]
+        assert dao.get_all_rows(month_id) == [["琅琊榜", 1200.5, None], ["庆余年", 30000, None]]
+
+    def test_column_types_missing(self, dao, db, month_id):
+        assert dao.get_column_types(month_id) == []
+        dao.save_data(month_id, ["合集名称"], [["琅琊榜"]])
+        db.get_connection().execute("UPDATE imported_headers SET column_types_json = NULL")
+        assert dao.get_column_types(month_id) == []
+
+
+class TestAppend:
+    """验证 save_data 的追加模式。"""
+
+    def test_append_continues_row_index(self, dao, month_id):
+        dao.save_data(month_id, ["合集名称", "收入"], [["琅琊榜", 1]])
+        assert dao.save_data(month_id, ["合集名称", "收入"], [["庆余年", "2,000"]], append=True) == 1
+        assert dao.get_all_rows(month_id) == [["琅琊榜", 1], ["庆余年", 2000]]
+
+    def test_append_to_empty_month(self, dao, month_id):
+        dao.save_data(month_id, ["合集名称"], [["琅琊榜"]], append=True)
+        assert dao.get_headers(month_id) == ["合集名称"]
+
+    def test_append_with_different_headers(self, dao, month_id):
+        dao.save_data(month_id, ["合集名称"], [["琅琊榜"]])
+        with pytest.raises(ValueError):
+            dao.save_data(month_id, ["剧名"], [["庆余年"]], append=True)
+        assert dao.get_all_rows(month_id) == [["琅琊榜"]]
+
+    def test_failing_rows_roll_back(self, dao, month_id):
+        dao.save_data(month_id, ["合集名称"], [["琅琊榜"]])
+
+        def _rows():
+            yield ["庆余年"]
+            raise OSError("读取中断")
+
+        with pytest.raises(OSError):
+            dao.save_data(month_id, ["合集名称"], _rows())
+        assert dao.get_all_rows(month_id) == [["琅琊榜"]]
+
+
 class TestGetAllRows:
     """验证 get_all_rows。"""
 
@@ -64,6 +106,13 @@ class TestGetAllRows:
         dao.save_data(month_id, ["col"], rows)
         assert dao.get_all_rows(month_id) == rows
 
+    def test_fetch_then_decode(self, dao, month_id):
+        rows = [["剧A", 1], ["剧B", 2.5]]
+        dao.save_data(month_id, ["c0", "c1"], rows)
+        row_jsons = dao.fetch_row_json(month_id)
+        assert all(isinstance(text, str) for text in row_jsons)
+        assert ImportedDataDAO.decode_rows(row_jsons) == rows
+
 
 class TestMatchResults:
     """验证 save_match_results 和 get_match_results。"""
@@ -99,3 +148,98 @@ class TestHasData:
         dao.save_data(month_id, ["old"], [["v"]])
         dao.save_data(month_id, ["new"], [["w"]])
         assert dao.has_data(month_id) is True
+
+
+class TestStreaming:
+    """验证 save_data 接受迭代器、iter_rows 和 count_rows。"""
+
+    def test_save_data_accepts_generator(self, dao, month_id):
+        count = dao.save_data(month_id, ["c"], ([i] for i in range(5)))
+        assert count == 5
+        assert dao.count_rows(month_id) == 5
+
+    def test_iter_rows_pages_in_order(self, dao, month_id):
+        rows = [[f"r{i}", i] for i in range(7)]
+        dao.save_data(month_id, ["名称", "值"], rows)
+        assert list(dao.iter_rows(month_id, page_size=3)) == rows
+
+    def test_iter_rows_empty(self, dao, month_id):
+        assert list(dao.iter_rows(month_id)) == []
+        assert dao.count_rows(month_id) == 0
+
+
+class TestMergeData:
+    """验证 merge_data 按行哈希去重合并。"""
+
+    HEADERS = ["合集名称", "平台", "收入"]
+
+    def test_first_merge_imports_all_rows(self, dao, month_id):
+        result = dao.merge_data(month_id, self.HEADERS, [["琅琊榜", "抖音", "1,000"], ["琅琊榜", "抖音", 1000]])
+        assert result.inserted == [["琅琊榜", "抖音", 1000]]
+        assert result.skipped == 1
+        assert dao.get_all_rows(month_id) == [["琅琊榜", "抖音", 1000]]
+
+    def test_skips_existing_rows_and_appends_new(self, dao, month_id):
+        dao.save_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 100], ["庆余年", "快手", 200]])
+        result = dao.merge_data(month_id, self.HEADERS, [["庆余年", "快手", 200], ["甄嬛传", "抖音", 300]])
+        assert result.start_index == 2
+        assert result.inserted == [["甄嬛传", "抖音", 300]]
+        assert result.replaced == []
+        assert result.skipped == 1
+        assert dao.count_rows(month_id) == 3
+
+    def test_key_columns_replace_changed_rows(self, dao, month_id):
+        dao.save_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 100], ["庆余年", "快手", 200]])
+        result = dao.merge_data(month_id, self.HEADERS,
+                                [[" 琅琊榜", "抖音", 150], ["庆余年", "快手", 200], ["繁花", "抖音", 1]],
+                                key_columns=[0, 1], replace=True)
+        assert result.replaced == [(0, ["琅琊榜", "抖音", 100], [" 琅琊榜", "抖音", 150])]
+        assert result.skipped == 1
+        assert dao.get_all_rows(month_id) == [
+            [" 琅琊榜", "抖音", 150], ["庆余年", "快手", 200], ["繁花", "抖音", 1],
+        ]
+        assert dao.get_row_key(month_id) == [0, 1]
+
+    def test_key_columns_skip_keeps_existing_rows(self, dao, month_id):
+        dao.save_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 100]])
+        result = dao.merge_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 150]], key_columns=[0])
+        assert result.inserted == [] and result.skipped == 1
+        assert dao.get_all_rows(month_id) == [["琅琊榜", "抖音", 100]]
+
+    def test_changing_key_rehashes_existing_rows(self, dao, month_id):
+        dao.merge_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 100]], key_columns=[0, 1])
+        result = dao.merge_data(month_id, self.HEADERS, [["琅琊榜", "快手", 100]], key_columns=[0])
+        assert result.skipped == 1
+        result = dao.merge_data(month_id, self.HEADERS, [["琅琊榜", "快手", 100]])
+        assert len(result.inserted) == 1
+        assert dao.get_row_key(month_id) is None
+
+    def test_rows_without_hash_are_rehashed(self, db, dao, month_id):
+        dao.save_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 100]])
+        db.get_connection().execute("UPDATE imported_rows SET row_hash = NULL")
+        db.get_connection().commit()
+        result = dao.merge_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 100]])
+        assert result.skipped == 1 and result.inserted == []
+
+    def test_header_mismatch_rolls_back(self, dao, month_id):
+        dao.save_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 100]])
+        with pytest.raises(ValueError, match="表头"):
+            dao.merge_data(month_id, ["合集名称"], [["庆余年"]])
+        assert dao.count_rows(month_id) == 1
+
+    def test_error_during_rows_rolls_back(self, dao, month_id):
+        dao.save_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 100]])
+
+        def rows():
+            yield ["庆余年", "快手", 200]
+            raise RuntimeError("读取失败")
+
+        with pytest.raises(RuntimeError):
+            dao.merge_data(month_id, self.HEADERS, rows())
+        assert dao.get_all_rows(month_id) == [["琅琊榜", "抖音", 100]]
+
+    def test_append_keeps_row_key(self, dao, month_id):
+        dao.merge_data(month_id, self.HEADERS, [["琅琊榜", "抖音", 100]], key_columns=[0])
+        dao.save_data(month_id, self.HEADERS, [["庆余年", "快手", 200]], append=True)
+        result = dao.merge_data(month_id, self.HEADERS, [["庆余年", "抖音", 1]], key_columns=[0])
+        assert result.skipped == 1
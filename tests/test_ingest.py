@@ -0,0 +1,131 @@
+"""ingest 单元测试：目录监控入库的文件名映射、去重、匹配和失败处理。"""
+
+import os
+import shutil
+
+import pytest
+from openpyxl import Workbook
+
+from src.dao.backend_dao import BackendDAO
+from src.dao.drama_dao import DramaDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import MonthDAO
+from src.database import Database
+from src.ingest import IngestService, LibraryCache
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "ingest.db"))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    path = tmp_path / "inbox"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def backend_id(db):
+    backend_id = BackendDAO(db).create("抖音")
+    DramaDAO(db).add_batch(backend_id, ["琅琊榜", "庆余年"])
+    return backend_id
+
+
+def _write_month(path, names):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["合集名称", "收入"])
+    for i, name in enumerate(names):
+        ws.append([name, i])
+    wb.save(str(path))
+
+
+def _service(db, inbox, **kwargs):
+    kwargs.setdefault("workers", 1)
+    kwargs.setdefault("settle_seconds", 0)
+    return IngestService(db, str(inbox), **kwargs)
+
+
+class TestIngestService:
+    def test_imports_and_matches_by_file_name(self, db, inbox, backend_id):
+        _write_month(inbox / "抖音_2026年01月.xlsx", ["琅琊榜", "甄嬛传", " 庆余年 "])
+        results = _service(db, inbox, create=True).scan_once()
+
+        assert len(results) == 1
+        assert results[0].error == ""
+        assert (results[0].backend, results[0].month) == ("抖音", "2026年01月")
+        assert (results[0].row_count, results[0].matched_count) == (3, 2)
+        month_id = MonthDAO(db).get_id(backend_id, "2026年01月")
+        assert ImportedDataDAO(db).get_match_results(month_id) == [0, 2]
+
+    def test_same_content_ingested_once(self, db, inbox, backend_id):
+        _write_month(inbox / "抖音_2026年01月.xlsx", ["琅琊榜"])
+        _service(db, inbox, create=True).scan_once()
+        shutil.copy(inbox / "抖音_2026年01月.xlsx", inbox / "抖音_2026年01月 副本.xlsx")
+
+        # 新的服务实例（如进程重启）仍按入库记录识别相同内容
+        results = _service(db, inbox, create=True).scan_once()
+        assert len(results) == 2
+        assert all(r.skipped for r in results)
+
+    def test_unchanged_files_not_rescanned(self, db, inbox, backend_id):
+        _write_month(inbox / "抖音_2026年01月.xlsx", ["琅琊榜"])
+        service = _service(db, inbox, create=True)
+        assert len(service.scan_once()) == 1
+        assert service.scan_once() == []
+
+    def test_skips_unmatched_names_and_temp_files(self, db, inbox, backend_id):
+        _write_month(inbox / "说明.xlsx", ["琅琊榜"])
+        _write_month(inbox / "~$抖音_2026年01月.xlsx", ["琅琊榜"])
+        (inbox / "抖音_2026年01月.txt").write_text("琅琊榜", encoding="utf-8")
+        assert _service(db, inbox, create=True).scan_once() == []
+
+    def test_unsettled_files_wait(self, db, inbox, backend_id):
+        _write_month(inbox / "抖音_2026年01月.xlsx", ["琅琊榜"])
+        assert _service(db, inbox, create=True, settle_seconds=3600).scan_once() == []
+
+    def test_missing_backend_without_create_fails(self, db, inbox):
+        _write_month(inbox / "快手_2026年01月.xlsx", ["琅琊榜"])
+        service = _service(db, inbox)
+        results = service.scan_once()
+        assert "不存在" in results[0].error
+        assert BackendDAO(db).get_id("快手") is None
+        # 失败的文件未变化时不重复处理
+        assert service.scan_once() == []
+
+    def test_missing_match_column_fails_without_import(self, db, inbox, backend_id):
+        wb = Workbook()
+        wb.active.append(["剧名"])
+        wb.active.append(["琅琊榜"])
+        wb.save(str(inbox / "抖音_2026年02月.xlsx"))
+        results = _service(db, inbox, create=True).scan_once()
+        assert "合集名称" in results[0].error
+        assert MonthDAO(db).get_id(backend_id, "2026年02月") is None
+
+    def test_process_pool(self, db, inbox, backend_id):
+        for month in ("2026年01月", "2026年02月", "2026年03月"):
+            _write_month(inbox / f"抖音_{month}.xlsx", ["琅琊榜", month])
+        results = _service(db, inbox, create=True, workers=2).scan_once()
+        assert sorted(r.month for r in results) == ["2026年01月", "2026年02月", "2026年03月"]
+        assert all(r.matched_count == 1 and not r.error for r in results)
+
+    def test_custom_pattern_requires_groups(self, db, inbox):
+        with pytest.raises(ValueError, match="month"):
+            IngestService(db, str(inbox), name_pattern=r"(?P<backend>.+)")
+
+    def test_missing_directory(self, db, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            IngestService(db, str(tmp_path / "nope"))
+
+
+class TestLibraryCache:
+    def test_reloads_when_library_changes(self, db, backend_id):
+        cache = LibraryCache(db)
+        first = cache.get(backend_id)
+        assert cache.get(backend_id) is first
+        DramaDAO(db).add(backend_id, "甄嬛传")
+        assert "甄嬛传" in cache.get(backend_id)
@@ -0,0 +1,49 @@
+"""IngestDAO 单元测试 - 验证入库记录的登记与查询。"""
+
+import pytest
+from src.database import Database
+from src.dao.backend_dao import BackendDAO
+from src.dao.ingest_dao import IngestDAO
+from src.dao.month_dao import MonthDAO
+
+
+@pytest.fixture
+def db(tmp_path):
+    """创建临时数据库实例。"""
+    db_path = str(tmp_path / "test.db")
+    database = Database(db_path)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def month_id(db):
+    """创建一个后台和月份并返回月份 ID。"""
+    backend_id = BackendDAO(db).create("测试后台")
+    return MonthDAO(db).create(backend_id, "2026年01月")
+
+
+@pytest.fixture
+def dao(db):
+    """创建 IngestDAO 实例。"""
+    return IngestDAO(db)
+
+
+class TestRecord:
+    """验证入库登记功能。"""
+
+    def test_is_ingested_after_record(self, dao, month_id):
+        assert not dao.is_ingested("abc")
+        dao.record("abc", "抖音_2026年01月.xlsx", month_id, 10, 3)
+        assert dao.is_ingested("abc")
+
+    def test_list_recent_newest_first(self, dao, month_id):
+        dao.record("h1", "a.xlsx", month_id, 10, 3)
+        dao.record("h2", "b.xlsx", month_id, 20, 5)
+        recent = dao.list_recent()
+        assert [r[:4] for r in recent] == [("b.xlsx", month_id, 20, 5), ("a.xlsx", month_id, 10, 3)]
+
+    def test_deleted_with_month(self, db, dao, month_id):
+        dao.record("abc", "a.xlsx", month_id, 10, 3)
+        MonthDAO(db).delete(month_id)
+        assert not dao.is_ingested("abc")
@@ -136,3 +136,50 @@ class TestMainFlow:
         ])
         output = capsys.readouterr().out
         assert "匹配数量: 2" in output
+
+    def test_conditional_highlight_mode(self, excel_pair, capsys):
+        master_path, lookup_path = excel_pair
+        main([
+            "--master", master_path,
+            "--lookup", lookup_path,
+            "--master-col", "剧名",
+            "--lookup-col", "剧名",
+            "--highlight-mode", "conditional",
+        ])
+        assert "匹配数量: 2" in capsys.readouterr().out
+
+        wb = load_workbook(master_path)
+        ws = wb.active
+        ranges = [str(cf.sqref) for cf in ws.conditional_formatting]
+        assert ranges == ["A2:B2 A4:B4"]
+        wb.close()
+
+    def test_xml_highlight_mode(self, excel_pair, capsys):
+        master_path, lookup_path = excel_pair
+        main([
+            "--master", master_path,
+            "--lookup", lookup_path,
+            "--master-col", "剧名",
+            "--lookup-col", "剧名",
+            "--highlight-mode", "xml",
+        ])
+        assert "匹配数量: 2" in capsys.readouterr().out
+
+        wb = load_workbook(master_path)
+        ws = wb.active
+        assert ws.cell(row=2, column=1).fill.fgColor.rgb == "00FFFF00"
+        assert ws.cell(row=4, column=2).fill.fgColor.rgb == "00FFFF00"
+        assert ws.cell(row=3, column=1).fill.fgColor.rgb != "00FFFF00"
+        wb.close()
+
+    def test_stage_timings_reported(self, excel_pair, capsys):
+        master_path, lookup_path = excel_pair
+        main([
+            "--master", master_path,
+            "--lookup", lookup_path,
+            "--master-col", "剧名",
+            "--lookup-col", "剧名",
+        ])
+        output = capsys.readouterr().out
+        assert "耗时: 读取B文档" in output
+        assert "合计" in output
@@ -0,0 +1,76 @@
+"""memprofile 单元测试：开关、section 记录、子系统归类和报告。"""
+
+import json
+import os
+
+import pytest
+
+from src import memprofile
+from src.excel_importer import ExcelImporter
+
+
+@pytest.fixture(autouse=True)
+def clean_memprofile():
+    memprofile.disable()
+    memprofile.reset()
+    yield
+    memprofile.disable()
+    memprofile.reset()
+
+
+class TestSection:
+    def test_disabled_records_nothing(self):
+        with memprofile.section("a"):
+            data = [0] * 1000
+        assert data
+        assert memprofile.records() == []
+
+    def test_records_peak_and_net(self):
+        memprofile.enable()
+        with memprofile.section("keep"):
+            kept = [str(i) for i in range(20000)]
+        with memprofile.section("temp"):
+            temp = [str(i) for i in range(20000)]
+            del temp
+        keep, temp = memprofile.records()
+        assert kept
+        assert keep.net_bytes > 500_000
+        assert temp.peak_bytes > 500_000
+        assert temp.net_bytes < temp.peak_bytes / 10
+        assert sum(keep.by_subsystem.values()) > 500_000
+
+    def test_nested_section_records_outer_only(self):
+        memprofile.enable()
+        with memprofile.section("outer"):
+            with memprofile.section("inner"):
+                pass
+        assert [r.name for r in memprofile.records()] == ["outer"]
+
+    def test_profiled_import_file(self, tmp_path, sample_workbook):
+        path = str(tmp_path / "a.xlsx")
+        sample_workbook.save(path)
+        memprofile.enable()
+        ExcelImporter.import_file(path)
+        (record,) = memprofile.records()
+        assert record.name == "ExcelImporter.import_file"
+        assert "ExcelImporter.import_file" in memprofile.format_report()
+
+
+class TestMeasure:
+    def test_measure_without_enable(self):
+        record = memprofile.measure(lambda: [0] * 100_000, "list")
+        assert record.name == "list"
+        assert record.peak_bytes >= 800_000
+        assert not memprofile.is_enabled()
+
+
+def test_subsystem_of():
+    src_dir = os.path.dirname(os.path.abspath(memprofile.__file__))
+    assert memprofile.subsystem_of(os.path.join(src_dir, "dao", "imported_data_dao.py")) == "src.dao.imported_data_dao"
+    assert memprofile.subsystem_of(os.path.join("lib", "openpyxl", "cell", "cell.py")) == "openpyxl"
+    assert memprofile.subsystem_of(os.path.dirname(json.__file__) + os.sep + "decoder.py") == "json"
+    assert memprofile.subsystem_of("/somewhere/else.py") == "其他"
+
+
+def test_empty_report():
+    assert memprofile.format_report() == "暂无内存分析数据"
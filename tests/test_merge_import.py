@@ -0,0 +1,73 @@
+"""merge_import 单元测试：合并导入后匹配结果和月度汇总的增量更新。"""
+
+import pytest
+
+from src.dao.backend_dao import BackendDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import MonthDAO
+from src.dao.summary_dao import SummaryDAO
+from src.database import Database
+from src.match_engine import MatchEngine
+from src.merge_import import merge_rows
+
+HEADERS = ["合集名称", "平台", "收入"]
+ROWS = [["琅琊榜", "抖音", 100], ["庆余年", "快手", 200], ["甄嬛传", "抖音", 300]]
+LIBRARY = {"琅琊榜", "繁花"}
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "merge.db"))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def backend_id(db):
+    return BackendDAO(db).create("抖音")
+
+
+@pytest.fixture
+def month_id(db, backend_id):
+    month_id = MonthDAO(db).create(backend_id, "2026年01月")
+    data_dao = ImportedDataDAO(db)
+    data_dao.save_data(month_id, HEADERS, ROWS)
+    data_dao.save_match_results(month_id, MatchEngine.match(ROWS, 0, LIBRARY))
+    SummaryDAO(db).rebuild_from_db(month_id)
+    return month_id
+
+
+def _summary(db, month_id):
+    return db.get_connection().execute(
+        "SELECT title, matched, column_name, total, value_count, row_count FROM month_summaries "
+        "WHERE month_id = ? ORDER BY title, matched, column_name", (month_id,),
+    ).fetchall()
+
+
+class TestMergeRows:
+    def test_incremental_state_matches_full_rebuild(self, db, month_id):
+        new_rows = [["琅琊榜", "抖音", 100], ["繁花", "抖音", 50], ["庆余年", "快手", 250]]
+        result = merge_rows(db, month_id, HEADERS, new_rows, key_columns=[0, 1], replace=True,
+                            drama_set=LIBRARY)
+        assert len(result.inserted) == 1 and len(result.replaced) == 1 and result.skipped == 1
+
+        data_dao = ImportedDataDAO(db)
+        rows = data_dao.get_all_rows(month_id)
+        assert data_dao.get_match_results(month_id) == MatchEngine.match(rows, 0, LIBRARY) == [0, 3]
+        incremental = _summary(db, month_id)
+        SummaryDAO(db).rebuild_from_db(month_id)
+        assert incremental == _summary(db, month_id)
+
+    def test_without_library_keeps_match_state(self, db, month_id):
+        merge_rows(db, month_id, HEADERS, [["琅琊榜", "抖音", 120], ["繁花", "抖音", 50]],
+                   key_columns=[0], replace=True)
+        assert ImportedDataDAO(db).get_match_results(month_id) == [0]
+        incremental = _summary(db, month_id)
+        SummaryDAO(db).rebuild_from_db(month_id)
+        assert incremental == _summary(db, month_id)
+
+    def test_no_changes_leaves_state_untouched(self, db, month_id):
+        before = _summary(db, month_id)
+        result = merge_rows(db, month_id, HEADERS, ROWS, drama_set=LIBRARY)
+        assert result.skipped == 3 and not result.inserted
+        assert _summary(db, month_id) == before
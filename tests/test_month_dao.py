@@ -3,7 +3,7 @@
 import pytest
 from src.database import Database
 from src.dao.backend_dao import BackendDAO
-from src.dao.month_dao import MonthDAO
+from src.dao.month_dao import MonthDAO, month_sort_key, parse_month_label, previous_month
 
 
 @pytest.fixture
@@ -114,3 +114,53 @@ class TestListAll:
         result = month_dao.list_all(bid1)
         assert len(result) == 1
         assert result[0][1] == "2024年01月"
+
+
+class TestGetId:
+    def test_get_id(self, tmp_path):
+        db = Database(str(tmp_path / "t.db"))
+        try:
+            bid = BackendDAO(db).create("抖音")
+            dao = MonthDAO(db)
+            mid = dao.create(bid, "2026年01月")
+            assert dao.get_id(bid, "2026年01月") == mid
+            assert dao.get_id(bid, "2026年02月") is None
+        finally:
+            db.close()
+
+
+class TestMonthLabels:
+    @pytest.mark.parametrize("label, expected", [
+        ("2026年01月", (2026, 1)),
+        ("2026-1", (2026, 1)),
+        ("202612", (2026, 12)),
+        ("2026/03", (2026, 3)),
+        ("1月", (0, 1)),
+        ("2026年13月", None),
+        ("2026年01月/直播", None),
+        ("春节特辑", None),
+    ])
+    def test_parse_month_label(self, label, expected):
+        assert parse_month_label(label) == expected
+
+    def test_sort_key_orders_by_label(self):
+        months = [(1, "2026年02月"), (2, "春节特辑"), (3, "2026年01月/直播"), (4, "2026年01月"), (5, "2025年12月")]
+        ordered = sorted(months, key=lambda m: month_sort_key(m[1], m[0]))
+        assert [label for _, label in ordered] == [
+            "2025年12月", "2026年01月", "2026年01月/直播", "2026年02月", "春节特辑",
+        ]
+
+    def test_previous_month_ignores_creation_order_and_subtables(self):
+        months = [(1, "2026年03月"), (2, "2026年02月/直播"), (3, "2026年01月"), (4, "2026年02月")]
+        assert previous_month(months, 1) == (4, "2026年02月")
+        assert previous_month(months, 4) == (3, "2026年01月")
+        assert previous_month(months, 3) is None
+
+    def test_previous_month_of_subtable_uses_same_sheet(self):
+        months = [(1, "2026年02月/直播"), (2, "2026年01月/短剧"), (3, "2026年01月/直播")]
+        assert previous_month(months, 1) == (3, "2026年01月/直播")
+
+    def test_previous_month_ambiguous_returns_none(self):
+        assert previous_month([(1, "2026年01月"), (2, "2026-1"), (3, "2026年02月")], 3) is None
+        assert previous_month([(1, "1月"), (2, "2026年02月")], 2) is None
+        assert previous_month([(1, "2026年01月"), (2, "春节特辑")], 2) is None
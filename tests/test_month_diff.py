@@ -0,0 +1,71 @@
+"""month_diff 单元测试。"""
+
+import pytest
+
+from src.month_diff import ADDED, CHANGED, REMOVED, UNCHANGED, diff_months, format_diff
+from src.month_table import MonthTable
+
+HEADERS = ["合集名称", "平台", "播放量", "收入"]
+OLD = [
+    ["琅琊榜", "抖音", 100, 1.5],
+    ["庆余年", "快手", 50, 2.5],
+    ["甄嬛传", "抖音", 10, None],
+    [None, "抖音", 5, 1.0],
+]
+NEW = [
+    [" 琅琊榜", "抖音", 100, 1.5],
+    ["庆余年", "快手", 80, 2.5],
+    ["庆余年", "抖音", None, "未知"],
+    ["长相思", "快手", 30, 0.5],
+    ["", "快手", 1, 1.0],
+]
+
+
+def _by_key(diff):
+    return {entry.key: entry for entry in diff.entries}
+
+
+class TestDiffMonths:
+    def test_added_removed_changed(self):
+        diff = diff_months(HEADERS, OLD, HEADERS, iter(NEW))
+        entries = _by_key(diff)
+        assert [(e.key, e.status) for e in diff.entries] == [
+            ("长相思", ADDED), ("甄嬛传", REMOVED), ("庆余年", CHANGED),
+        ]
+        assert diff.columns == ["播放量", "收入"]
+        assert diff.unchanged == 1
+        changed = entries["庆余年"]
+        assert (changed.old_rows, changed.new_rows) == (1, 2)
+        assert changed.old_totals == [50.0, 2.5] and changed.new_totals == [80.0, 2.5]
+        assert changed.deltas == [30.0, 0.0]
+        assert entries["甄嬛传"].deltas == [-10.0, None]
+
+    def test_include_unchanged(self):
+        diff = diff_months(HEADERS, OLD, HEADERS, NEW, include_unchanged=True)
+        assert _by_key(diff)["琅琊榜"].status == UNCHANGED
+        assert diff.count(UNCHANGED) == 1 and diff.count(ADDED) == 1
+
+    def test_month_table_and_reordered_columns(self):
+        new_headers = ["收入", "合集名称", "分成"]
+        new_rows = [[row[3], row[0], 1] for row in OLD]
+        diff = diff_months(HEADERS, MonthTable.from_rows(OLD), new_headers, MonthTable.from_rows(new_rows))
+        assert diff.columns == ["收入"]
+        assert diff.entries == [] and diff.unchanged == 3
+
+    def test_numeric_and_text_titles_merge(self):
+        diff = diff_months(["合集名称", "收入"], [[123, 1], ["123", 2]], ["合集名称", "收入"], [["123 ", 3], [" 123", None]])
+        assert diff.entries == [] and diff.unchanged == 1
+
+    def test_missing_key_column(self):
+        with pytest.raises(ValueError, match="未找到目标列"):
+            diff_months(HEADERS, OLD, ["剧名"], [])
+
+    def test_table_and_format(self):
+        diff = diff_months(HEADERS, OLD, HEADERS, NEW, old_label="1月", new_label="2月")
+        headers, rows = diff.table([ADDED])
+        assert headers[:5] == ["合集名称", "状态", "1月 行数", "2月 行数", "行数变化"]
+        assert headers[5:8] == ["播放量 1月", "播放量 2月", "播放量 变化"]
+        assert rows == [["长相思", ADDED, 0, 1, 1, None, 30.0, 30.0, None, 0.5, 0.5]]
+        text = format_diff(diff, limit=1)
+        assert "... 另有 2 行" in text
+        assert text.splitlines()[-1] == "新增 1 个，消失 1 个，变化 1 个，不变 1 个"
@@ -0,0 +1,106 @@
+"""MonthTable 单元测试：按列存储的往返一致性、序列协议和内存占用。"""
+
+import json
+import sys
+
+import pytest
+
+from src.match_engine import MatchEngine
+from src.month_table import MonthTable, RowView
+from src.view_helpers import compute_column_sums, filter_rows
+
+
+ROWS = [
+    ["琅琊榜", 100, 1.5, "2026-01-01", None, True],
+    ["甄嬛传", 200, 2, "2026-01-01", "备注", False],
+    [" 庆余年 ", None, 3.25, "2026-01-02", None, 1],
+]
+
+
+class TestRoundTrip:
+    def test_values_and_types_preserved(self):
+        table = MonthTable.from_rows(ROWS)
+        assert table.to_rows() == ROWS
+        restored = table.to_rows()
+        assert [type(v) for v in restored[1]] == [str, int, int, str, str, bool]
+        assert type(restored[0][2]) is float
+        assert type(restored[2][5]) is int
+
+    def test_column_converted_when_text_appears(self):
+        table = MonthTable.from_rows([[1], [2.5], ["合计"], [None]])
+        assert table.to_rows() == [[1], [2.5], ["合计"], [None]]
+        assert type(table[0][0]) is int
+
+    def test_huge_int_kept_exact(self):
+        big = 2 ** 60 + 1
+        assert MonthTable.from_rows([[big], [1]]).to_rows() == [[big], [1]]
+
+    def test_ragged_rows_keep_length(self):
+        rows = [["a", 1], ["b"], ["c", 2, "x"]]
+        table = MonthTable.from_rows(rows)
+        assert [len(row) for row in table] == [2, 1, 3]
+        assert table.to_rows() == rows
+        assert table.num_columns == 3
+
+    def test_num_columns_pads_width(self):
+        table = MonthTable.from_rows([["a"]], num_columns=3)
+        assert table.num_columns == 3
+        assert len(table[0]) == 1
+
+    def test_json_rows(self):
+        decoded = [json.loads(json.dumps(row, ensure_ascii=False)) for row in ROWS]
+        assert MonthTable.from_rows(decoded).to_rows() == decoded
+
+
+class TestSequenceProtocol:
+    def test_indexing_and_slicing(self):
+        table = MonthTable.from_rows(ROWS)
+        assert len(table) == 3
+        assert table[-1][0] == " 庆余年 "
+        assert table[0][-1] is True
+        assert table[1][1:3] == [200, 2]
+        assert [row[0] for row in table[1:]] == ["甄嬛传", " 庆余年 "]
+        with pytest.raises(IndexError):
+            table[3]
+        with pytest.raises(IndexError):
+            table[0][6]
+
+    def test_row_view_equality_and_repr(self):
+        table = MonthTable.from_rows(ROWS)
+        assert isinstance(table[0], RowView)
+        assert table[0] == ROWS[0]
+        assert table[0] == tuple(ROWS[0])
+        assert table[0] != ROWS[1]
+        assert "琅琊榜" in repr(table[0])
+
+    def test_append_after_from_rows_reuses_codes(self):
+        table = MonthTable.from_rows(ROWS)
+        table.append(ROWS[0])
+        assert table[-1] == ROWS[0]
+        assert table.to_rows() == ROWS + [ROWS[0]]
+        assert table._columns[0].codes[-1] == table._columns[0].codes[0]
+
+    def test_empty_table_is_falsy(self):
+        assert not MonthTable()
+        assert MonthTable.from_rows([]).to_rows() == []
+
+    def test_works_with_view_helpers_and_match(self):
+        table = MonthTable.from_rows(ROWS)
+        assert compute_column_sums(table, 6) == compute_column_sums(ROWS, 6)
+        assert filter_rows(table, [1], "matched") == [ROWS[1]]
+        assert MatchEngine.match(table, 0, {"琅琊榜", "庆余年"}) == [0, 2]
+
+
+class TestMemory:
+    def test_several_times_smaller_than_lists(self):
+        platforms = ["抖音", "快手", "视频号"]
+        rows = [
+            [f"剧名{i % 500}", i, i * 1.5, platforms[i % 3], f"2026-01-{i % 28 + 1:02d}"]
+            for i in range(20000)
+        ]
+        decoded = [json.loads(json.dumps(row, ensure_ascii=False)) for row in rows]
+        table = MonthTable.from_rows(decoded)
+        list_bytes = sys.getsizeof(decoded) + sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in decoded
+        )
+        assert list_bytes > 3 * table.memory_bytes()
@@ -0,0 +1,139 @@
+"""multi_import 单元测试：多文件并行解析、表头校验、按顺序写入和回滚，多工作表导入。"""
+
+import pytest
+from openpyxl import Workbook
+
+from src.dao.backend_dao import BackendDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import MonthDAO
+from src.database import Database
+from src.multi_import import import_files, import_sheets
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "multi.db"))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def month_id(db):
+    backend_id = BackendDAO(db).create("抖音")
+    return MonthDAO(db).create(backend_id, "2026年01月")
+
+
+def _write(path, headers, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+    wb.save(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def parts(tmp_path):
+    return [
+        _write(tmp_path / "part1.xlsx", ["合集名称", "收入"], [["琅琊榜", "1,000"], ["庆余年", 200]]),
+        _write(tmp_path / "part2.xlsx", ["收入", "合集名称"], [[300, "甄嬛传"]]),
+        _write(tmp_path / "part3.xlsx", ["合集名称", "收入"], [["长相思", 400], ["繁花", 500]]),
+    ]
+
+
+class TestImportFiles:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_rows_in_file_order(self, db, month_id, parts, workers):
+        reported = []
+        result = import_files(db, month_id, parts, workers=workers, on_file=reported.append)
+        assert result.row_count == 5
+        assert result.headers == ["合集名称", "收入"]
+        assert [f.row_count for f in result.files] == [2, 1, 2]
+        assert reported == result.files
+        assert ImportedDataDAO(db).get_all_rows(month_id) == [
+            ["琅琊榜", 1000], ["庆余年", 200], ["甄嬛传", 300], ["长相思", 400], ["繁花", 500],
+        ]
+
+    def test_replace_and_append(self, db, month_id, parts):
+        dao = ImportedDataDAO(db)
+        import_files(db, month_id, parts[:1], workers=1)
+        import_files(db, month_id, parts[1:], workers=1)
+        assert dao.count_rows(month_id) == 3
+        result = import_files(db, month_id, parts[:2], workers=2, append=True)
+        assert result.row_count == 3
+        # 替换后的表头取自 part2（收入在前），追加的文件按该顺序重排
+        rows = dao.get_all_rows(month_id)
+        assert rows[3] == [1000, "琅琊榜"]
+        assert [row[1] for row in rows] == ["甄嬛传", "长相思", "繁花", "琅琊榜", "庆余年", "甄嬛传"]
+
+    def test_incompatible_headers_roll_back(self, db, month_id, parts, tmp_path):
+        dao = ImportedDataDAO(db)
+        import_files(db, month_id, parts[:1], workers=1)
+        bad = _write(tmp_path / "bad.xlsx", ["合集名称", "分成"], [["繁花", 1]])
+        with pytest.raises(ValueError, match="bad.xlsx.*缺少列"):
+            import_files(db, month_id, [parts[2], bad], workers=2)
+        assert dao.get_all_rows(month_id) == [["琅琊榜", 1000], ["庆余年", 200]]
+
+    def test_unreadable_file_names_the_file(self, db, month_id, parts, tmp_path):
+        broken = tmp_path / "broken.xlsx"
+        broken.write_bytes(b"not a workbook")
+        with pytest.raises(ValueError, match="broken.xlsx"):
+            import_files(db, month_id, [parts[0], str(broken)], workers=1)
+        assert ImportedDataDAO(db).count_rows(month_id) == 0
+
+    def test_missing_file(self, db, month_id, parts):
+        with pytest.raises(FileNotFoundError):
+            import_files(db, month_id, parts + ["missing.xlsx"])
+        with pytest.raises(ValueError):
+            import_files(db, month_id, [])
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "直播"
+    ws.append(["合集名称", "收入"])
+    ws.append(["琅琊榜", "1,000"])
+    ws = wb.create_sheet("短剧")
+    ws.append(["剧名", "平台", "播放量"])
+    ws.append(["繁花", "抖音", 10])
+    ws.append(["庆余年", "快手", 20])
+    wb.create_sheet("空")
+    path = str(tmp_path / "sheets.xlsx")
+    wb.save(path)
+    return path
+
+
+class TestImportSheets:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_each_sheet_to_own_subtable(self, db, workbook, workers):
+        backend_id = BackendDAO(db).create("快手")
+        reported = []
+        result = import_sheets(db, backend_id, "2026年01月", workbook, workers=workers,
+                               on_sheet=reported.append)
+        assert reported == result.sheets
+        assert [(s.sheet, s.month_label, s.row_count) for s in result.sheets] == [
+            ("直播", "2026年01月/直播", 1), ("短剧", "2026年01月/短剧", 2), ("空", "2026年01月/空", 0),
+        ]
+        assert result.sheets[2].month_id is None
+        assert result.row_count == 3
+        dao = ImportedDataDAO(db)
+        live, short = result.sheets[0].month_id, result.sheets[1].month_id
+        assert dao.get_headers(live) == ["合集名称", "收入"]
+        assert dao.get_all_rows(live) == [["琅琊榜", 1000]]
+        assert dao.get_headers(short) == ["剧名", "平台", "播放量"]
+        assert MonthDAO(db).get_id(backend_id, "2026年01月/空") is None
+
+    def test_single_sheet_goes_to_month(self, db, month_id, workbook):
+        backend_id = BackendDAO(db).get_id("抖音")
+        result = import_sheets(db, backend_id, "2026年01月", workbook, sheets=["短剧"])
+        assert result.sheets[0].month_id == month_id
+        assert ImportedDataDAO(db).count_rows(month_id) == 2
+
+    def test_unknown_sheet(self, db, month_id, workbook):
+        backend_id = BackendDAO(db).get_id("抖音")
+        with pytest.raises(ValueError, match="工作表不存在"):
+            import_sheets(db, backend_id, "2026年01月", workbook, sheets=["直播", "不存在"])
+        assert ImportedDataDAO(db).count_rows(month_id) == 0
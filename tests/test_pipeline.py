@@ -0,0 +1,165 @@
+"""pipeline 单元测试：A文档单次读取的匹配高亮流水线。"""
+
+import zipfile
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from src.pipeline import run_match_pipeline
+
+SHEET_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>'
+    '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c></row>'
+    '<row r="2"><c r="A2" t="s"><v>2</v></c><c r="B2"><v>9.2</v></c></row>'
+    '<row r="3"><c r="A3" t="s"><v>3</v></c><c r="B3"><v>7</v></c></row>'
+    '<row r="5"><c r="A5" t="inlineStr"><is><t> 人民的名义 </t></is></c></row>'
+    '</sheetData></worksheet>'
+)
+SHARED_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="4" uniqueCount="4">'
+    '<si><t>剧名</t></si><si><t>评分</t></si>'
+    '<si><r><t>琅琊</t></r><r><t>榜</t></r></si><si><t>甄嬛传</t></si>'
+    '</sst>'
+)
+
+
+def _make_shared_strings_master(path):
+    """生成使用共享字符串表的 xlsx（与 Excel 保存的文件结构一致）。"""
+    wb = Workbook()
+    wb.active.append(["占位"])
+    wb.save(path)
+    with zipfile.ZipFile(path) as z:
+        members = {name: z.read(name) for name in z.namelist()}
+    members["xl/worksheets/sheet1.xml"] = SHEET_XML.encode("utf-8")
+    members["xl/sharedStrings.xml"] = SHARED_XML.encode("utf-8")
+    members["xl/_rels/workbook.xml.rels"] = members["xl/_rels/workbook.xml.rels"].replace(
+        b"</Relationships>",
+        b'<Relationship Id="rId99" Type="http://schemas.openxmlformats.org/officeDocument/'
+        b'2006/relationships/sharedStrings" Target="sharedStrings.xml"/></Relationships>',
+    )
+    members["[Content_Types].xml"] = members["[Content_Types].xml"].replace(
+        b"</Types>",
+        b'<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+        b'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>',
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+
+
+@pytest.fixture
+def lookup_path(tmp_path):
+    path = str(tmp_path / "lookup.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["剧名"])
+    ws.append(["琅琊榜"])
+    ws.append(["人民的名义"])
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def master_path(tmp_path):
+    path = str(tmp_path / "master.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["剧名", "类型"])
+    ws.append(["琅琊榜", "古装"])
+    ws.append(["甄嬛传", "古装"])
+    ws.append(["人民的名义", "现代"])
+    wb.save(path)
+    return path
+
+
+class TestRunMatchPipeline:
+    @pytest.mark.parametrize("mode", ["cell", "conditional", "xml"])
+    def test_modes_agree(self, master_path, lookup_path, mode):
+        result, timings = run_match_pipeline(master_path, lookup_path, "剧名", "剧名", mode)
+
+        assert result.matched_rows == [2, 4]
+        assert result.matched_names == ["琅琊榜", "人民的名义"]
+        assert result.total_master == 3
+        assert result.total_lookup == 2
+        assert "读取B文档" in timings
+        assert all(seconds >= 0 for seconds in timings.values())
+
+    def test_xml_mode_with_shared_strings(self, tmp_path, lookup_path):
+        master = str(tmp_path / "shared.xlsx")
+        _make_shared_strings_master(master)
+
+        result, timings = run_match_pipeline(master, lookup_path, "剧名", "剧名", "xml")
+
+        assert result.matched_rows == [2, 5]
+        assert result.matched_names == ["琅琊榜", "人民的名义"]
+        assert result.total_master == 3
+        assert "扫描匹配并高亮" in timings
+
+        wb = load_workbook(master)
+        ws = wb.active
+        assert ws["A2"].fill.fgColor.rgb == "00FFFF00"
+        assert ws["B2"].fill.fgColor.rgb == "00FFFF00"
+        assert ws["A3"].fill.fill_type is None
+        assert ws["A2"].value == "琅琊榜"
+        wb.close()
+
+    def test_xml_mode_column_by_number(self, master_path, lookup_path):
+        result, _ = run_match_pipeline(master_path, lookup_path, "1", "剧名", "xml")
+        assert result.match_count == 2
+
+    @pytest.mark.parametrize("mode", ["cell", "xml"])
+    def test_no_match_leaves_file_untouched(self, tmp_path, master_path, mode):
+        lookup = str(tmp_path / "none.xlsx")
+        wb = Workbook()
+        wb.active.append(["剧名"])
+        wb.active.append(["三体"])
+        wb.save(lookup)
+        with open(master_path, "rb") as f:
+            before = f.read()
+
+        result, _ = run_match_pipeline(master_path, lookup, "剧名", "剧名", mode)
+
+        assert result.match_count == 0
+        with open(master_path, "rb") as f:
+            assert f.read() == before
+
+    @pytest.mark.parametrize("mode", ["cell", "xml"])
+    def test_invalid_column_raises(self, master_path, lookup_path, mode):
+        with pytest.raises(ValueError, match="未找到"):
+            run_match_pipeline(master_path, lookup_path, "不存在的列", "剧名", mode)
+
+    def test_xml_and_openpyxl_agree_on_column_beyond_header(self, tmp_path, lookup_path):
+        """表头比数据窄时，按列号取列以工作表宽度为上限，两种模式结果一致。"""
+        path = str(tmp_path / "wide.xlsx")
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["序号"])
+        ws.append([1, None, "琅琊榜"])
+        ws.append([2, None, "甄嬛传"])
+        wb.save(path)
+
+        results = {}
+        for mode in ("cell", "xml"):
+            master = str(tmp_path / f"{mode}.xlsx")
+            with open(path, "rb") as src, open(master, "wb") as dst:
+                dst.write(src.read())
+            result, _ = run_match_pipeline(master, lookup_path, "3", "剧名", mode)
+            results[mode] = (result.matched_rows, result.matched_names, result.total_master)
+            ws = load_workbook(master).active
+            results[mode] += (ws["B2"].fill.fgColor.rgb,)
+
+        assert results["xml"] == results["cell"] == ([2], ["琅琊榜"], 2, "00FFFF00")
+
+    @pytest.mark.parametrize("mode", ["cell", "xml"])
+    def test_empty_sheet_reports_no_data(self, tmp_path, lookup_path, mode):
+        path = str(tmp_path / "empty.xlsx")
+        Workbook().save(path)
+        with pytest.raises(ValueError, match="没有数据"):
+            run_match_pipeline(path, lookup_path, "1", "剧名", mode)
+
+    def test_missing_master_raises(self, tmp_path, lookup_path):
+        with pytest.raises(FileNotFoundError):
+            run_match_pipeline(str(tmp_path / "none.xlsx"), lookup_path, "剧名", "剧名")
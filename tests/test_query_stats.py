@@ -0,0 +1,81 @@
+"""query_stats 单元测试：包装连接的语句统计、p95 和慢查询记录。"""
+
+import pytest
+
+from src.dao.backend_dao import BackendDAO
+from src.dao.drama_dao import DramaDAO
+from src.database import Database
+from src.query_stats import QueryStats, normalize_sql, percentile
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "stats.db"))
+    yield database
+    database.close()
+
+
+class TestDatabaseStats:
+    def test_disabled_by_default(self, db):
+        assert db.query_stats is None
+        assert type(db.get_connection()).__name__ == "Connection"
+
+    def test_counts_dao_statements(self, db):
+        stats = db.enable_query_stats()
+        backend_id = BackendDAO(db).create("抖音")
+        dao = DramaDAO(db)
+        dao.add_batch(backend_id, ["琅琊榜", "甄嬛传"])
+        dao.get_set(backend_id)
+        dao.get_set(backend_id)
+
+        by_sql = {sql: count for sql, count, *_ in stats.rows()}
+        assert by_sql["SELECT name FROM drama_names WHERE backend_id = ?"] == 2
+        assert "COMMIT" in by_sql
+        assert "SELECT name FROM drama_names" in stats.format_report()
+
+    def test_enable_twice_keeps_stats(self, db):
+        stats = db.enable_query_stats()
+        BackendDAO(db).list_all()
+        assert db.enable_query_stats(slow_query_ms=5) is stats
+        assert stats.slow_query_ms == 5
+        assert stats.rows()
+
+    def test_cursor_attributes_forwarded(self, db):
+        db.enable_query_stats()
+        backend_id = BackendDAO(db).create("抖音")
+        assert backend_id > 0
+        cursor = db.get_connection().execute("SELECT id FROM backends")
+        assert [row for row in cursor] == [(backend_id,)]
+
+
+class TestQueryStats:
+    def test_slow_query_logged(self):
+        lines = []
+        stats = QueryStats(slow_query_ms=10, slow_log=lines.append)
+        stats.record_execute("SELECT  1", 0.001)
+        stats.record_execute("SELECT 1", 0.02)
+        stats.record_fetch("SELECT 1", 0.05)
+        assert len(lines) == 2
+        assert lines[0].startswith("[慢查询] 执行 20.0ms")
+        assert "读取结果" in lines[1]
+        ((sql, count, total, p95, longest),) = stats.rows()
+        assert (sql, count) == ("SELECT 1", 2)
+        assert total == pytest.approx(0.071)
+        assert p95 == longest == 0.02
+
+    def test_reset_and_empty_report(self):
+        stats = QueryStats()
+        stats.record_execute("SELECT 1", 0.001)
+        stats.reset()
+        assert stats.format_report() == "暂无 SQL 统计数据"
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.95) == 95.0
+    assert percentile([3.0], 0.95) == 3.0
+    assert percentile([], 0.95) == 0.0
+
+
+def test_normalize_sql():
+    assert normalize_sql("\n  SELECT *\n   FROM t ") == "SELECT * FROM t"
@@ -129,3 +129,42 @@ class TestReadDramaNames:
         path = self._save_wb(wb, tmp_dir)
         result = read_drama_names(path, "剧名")
         assert result == []
+
+    def test_row_numbers_across_gaps(self, tmp_dir):
+        """只读模式下跳过的空行不影响行号。"""
+        wb = Workbook()
+        ws = wb.active
+        ws["A1"] = "剧名"
+        ws["A3"] = "琅琊榜"
+        ws["B6"] = "其它列"
+        ws["A7"] = "甄嬛传"
+        path = self._save_wb(wb, tmp_dir)
+        result = read_drama_names(path, "剧名")
+        assert result == [(3, "琅琊榜"), (7, "甄嬛传")]
+
+    def test_column_number_beyond_header(self, tmp_dir):
+        """表头比数据窄时仍可按列号读取。"""
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["剧名"])
+        ws.append(["琅琊榜", "古装"])
+        path = self._save_wb(wb, tmp_dir)
+        assert read_drama_names(path, "2") == [(2, "古装")]
+
+
+class TestResolveHeaderIndex:
+    """Tests for resolve_header_index."""
+
+    def test_match_by_name_and_number(self):
+        from src.reader import resolve_header_index
+
+        assert resolve_header_index(["剧名", None, " 类型 "], "类型") == 3
+        assert resolve_header_index(["剧名", None, "类型"], "2") == 2
+
+    def test_errors(self):
+        from src.reader import resolve_header_index
+
+        with pytest.raises(ValueError, match="超出范围"):
+            resolve_header_index(["剧名"], "5")
+        with pytest.raises(ValueError, match="未找到"):
+            resolve_header_index(["剧名"], "不存在")
@@ -0,0 +1,78 @@
+"""schema 单元测试。"""
+
+import pytest
+
+from src.schema import EMPTY, NUMBER, TEXT, convert_row, infer_column_types, parse_number, typed_rows
+
+
+class TestParseNumber:
+    @pytest.mark.parametrize("text, expected", [
+        ("12,345.6", 12345.6),
+        (" 1,234 ", 1234),
+        ("-5", -5),
+        ("+0.5", 0.5),
+        (".5", 0.5),
+        ("1.2万", 12000),
+        ("1.1万", 11000),
+        ("3 亿", 300000000),
+        ("1.23456万", 12345.6),
+        ("0", 0),
+        ("0.25", 0.25),
+        ("123,456,789,012,345", 123456789012345),
+        ("1000000000000000", 10 ** 15),
+    ])
+    def test_numbers(self, text, expected):
+        value = parse_number(text)
+        assert value == expected
+        assert type(value) is type(expected)
+
+    @pytest.mark.parametrize("text", ["", "  ", "未知", "-", "007", "1,23", "12.3.4", "2026-01", "万", "1e5",
+                                      "1234567890123456", "12345678901234567890", "-123456789012345678",
+                                      "9007199254740993000", "1234567890.1234567"])
+    def test_not_numbers(self, text):
+        assert parse_number(text) is None
+
+
+class TestInferColumnTypes:
+    def test_types(self):
+        rows = [
+            ["琅琊榜", "12,345.6", 100, None, "001"],
+            ["庆余年", "1.2万", 2.5, "", "002"],
+            ["甄嬛传", "-", 3, None, "003"],
+        ] * 4
+        assert infer_column_types(rows, 6) == [TEXT, TEXT, NUMBER, EMPTY, TEXT, EMPTY]
+
+    def test_number_ratio(self):
+        rows = [["1,000"]] * 9 + [["未知"]]
+        assert infer_column_types(rows, 1) == [NUMBER]
+        assert infer_column_types(rows + [["-"]], 1) == [TEXT]
+
+    def test_bool_is_not_number(self):
+        assert infer_column_types([[True], [False]], 1) == [TEXT]
+
+
+class TestTypedRows:
+    def test_converts_number_columns_only(self):
+        rows = [["2026", "1,000"], ["2027", "2.5万"], ["2028", "未知"]] * 4
+        rows[0] = ["2026", "1,000"]
+        column_types, converted = typed_rows(iter(rows), 2)
+        assert column_types == [NUMBER, TEXT]
+        first = next(converted)
+        assert first == [2026, "1,000"]
+
+    def test_rows_after_sample_are_converted(self):
+        rows = [["1,000"], ["2,000"], ["3万"], ("4",)]
+        column_types, converted = typed_rows(rows, 1, sample_size=2)
+        assert column_types == [NUMBER]
+        assert list(converted) == [[1000], [2000], [30000], [4]]
+
+    def test_long_id_column_stays_text(self):
+        rows = [["12345678901234567890", 1], ["987654321098765432", 2], ["1234567890123456789", 3]]
+        column_types, converted = typed_rows(rows, 2)
+        assert column_types == [TEXT, NUMBER]
+        assert [row[0] for row in converted] == [
+            "12345678901234567890", "987654321098765432", "1234567890123456789",
+        ]
+
+    def test_convert_row_keeps_unparsable(self):
+        assert convert_row(["-", "5", None], [0, 1, 2, 3]) == ["-", 5, None]
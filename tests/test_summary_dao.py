@@ -0,0 +1,177 @@
+"""SummaryDAO 单元测试 - 验证月度汇总的生成和跨月份查询。"""
+
+import pytest
+from src.database import Database
+from src.dao.backend_dao import BackendDAO
+from src.dao.imported_data_dao import ImportedDataDAO
+from src.dao.month_dao import MonthDAO
+from src.dao.summary_dao import SummaryDAO
+from src.month_table import MonthTable
+
+HEADERS = ["合集名称", "平台", "播放量", "收入"]
+ROWS = [
+    ["琅琊榜", "抖音", 100, 1.5],
+    ["庆余年", "快手", 50, 2.5],
+    [" 琅琊榜", "快手", 300, None],
+    ["甄嬛传", "抖音", None, "未知"],
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """创建临时数据库实例。"""
+    db_path = str(tmp_path / "test.db")
+    database = Database(db_path)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def backend_id(db):
+    return BackendDAO(db).create("测试后台")
+
+
+@pytest.fixture
+def dao(db):
+    return SummaryDAO(db)
+
+
+def _month(db, backend_id, label, rows=ROWS, matched=(0,)):
+    """创建月份并保存数据和匹配结果，返回月份 ID。"""
+    month_id = MonthDAO(db).create(backend_id, label)
+    data_dao = ImportedDataDAO(db)
+    data_dao.save_data(month_id, HEADERS, rows)
+    data_dao.save_match_results(month_id, list(matched))
+    return month_id
+
+
+class TestRebuild:
+    """验证汇总的生成。"""
+
+    def test_groups_by_title_and_matched(self, db, dao, backend_id):
+        month_id = _month(db, backend_id, "2025年12月")
+        assert dao.rebuild_from_db(month_id) == 4
+        trend = dao.title_trend(backend_id, "琅琊榜")
+        assert trend == [("2025年12月", 2, 1, {"播放量": 400.0, "收入": 1.5})]
+
+    def test_rebuild_replaces_previous_summary(self, db, dao, backend_id):
+        month_id = _month(db, backend_id, "2025年12月")
+        dao.rebuild(month_id, HEADERS, MonthTable.from_rows(ROWS), [0, 2])
+        dao.rebuild(month_id, HEADERS, ROWS, [])
+        assert dao.title_trend(backend_id, "琅琊榜") == [("2025年12月", 2, 0, {"播放量": 400.0, "收入": 1.5})]
+
+    def test_without_title_column(self, db, dao, backend_id):
+        month_id = _month(db, backend_id, "2025年12月")
+        dao.rebuild_from_db(month_id)
+        assert dao.rebuild(month_id, ["剧名", "收入"], [["琅琊榜", 1]], []) == 0
+        assert dao.totals_by_month(backend_id) == []
+        assert dao.rebuild_from_db(month_id, "剧名") == 0
+
+    def test_failed_rebuild_keeps_previous_summary(self, db, dao, backend_id):
+        """重建中途出错时回滚，月份保留原有汇总。"""
+        month_id = _month(db, backend_id, "2025年12月")
+        dao.rebuild_from_db(month_id)
+        before = dao.totals_by_month(backend_id)
+
+        def broken_rows():
+            yield ROWS[0]
+            raise RuntimeError("读取中断")
+
+        with pytest.raises(RuntimeError):
+            dao.rebuild(month_id, HEADERS, broken_rows(), [])
+        assert dao.totals_by_month(backend_id) == before
+
+    def test_deleted_with_month(self, db, dao, backend_id):
+        month_id = _month(db, backend_id, "2025年12月")
+        dao.rebuild_from_db(month_id)
+        MonthDAO(db).delete(month_id)
+        assert dao.totals_by_month(backend_id) == []
+
+
+class TestApplyDelta:
+    """验证汇总的增量更新与重建结果一致。"""
+
+    def _all(self, db, month_id):
+        return db.get_connection().execute(
+            "SELECT title, matched, column_name, total, value_count, row_count FROM month_summaries "
+            "WHERE month_id = ? ORDER BY title, matched, column_name", (month_id,),
+        ).fetchall()
+
+    def test_matches_rebuild(self, db, dao, backend_id):
+        month_id = _month(db, backend_id, "2025年12月")
+        dao.rebuild_from_db(month_id)
+        removed = [(ROWS[1], False), (ROWS[3], False)]
+        added = [(["庆余年", "快手", 80, 3.5], True), (["繁花", "抖音", 10, 1.0], False)]
+        dao.apply_delta(month_id, HEADERS, removed, added)
+
+        rows = [ROWS[0], added[0][0], ROWS[2], added[1][0]]
+        expected_id = _month(db, backend_id, "2026年01月", rows, matched=(0, 1))
+        dao.rebuild_from_db(expected_id)
+        assert self._all(db, month_id) == self._all(db, expected_id)
+        assert dao.search_titles(backend_id, "甄嬛") == []
+
+    def test_failed_delta_rolled_back(self, db, dao, backend_id):
+        """减去旧行后加入新行时出错，整个增量更新回滚。"""
+        month_id = _month(db, backend_id, "2025年12月")
+        dao.rebuild_from_db(month_id)
+        before = self._all(db, month_id)
+
+        with pytest.raises(TypeError):
+            dao.apply_delta(month_id, HEADERS, [(ROWS[1], False)], [(None, False)])
+        assert self._all(db, month_id) == before
+
+    def test_without_summary_rebuilds(self, db, dao, backend_id):
+        month_id = _month(db, backend_id, "2025年12月")
+        dao.apply_delta(month_id, HEADERS, [], [(ROWS[0], True)])
+        assert dao.title_trend(backend_id, "琅琊榜") == [("2025年12月", 2, 1, {"播放量": 400.0, "收入": 1.5})]
+
+
+class TestQueries:
+    """验证跨月份查询。"""
+
+    @pytest.fixture
+    def months(self, db, dao, backend_id):
+        for label, matched in [("2025年12月", [0]), ("2026年01月", [1, 2]), ("汇总", [])]:
+            dao.rebuild_from_db(_month(db, backend_id, label, matched=matched))
+
+    def test_title_trend_across_months(self, dao, backend_id, months):
+        trend = dao.title_trend(backend_id, "琅琊榜 ")
+        assert [(label, rows, matched) for label, rows, matched, _ in trend] == [
+            ("2025年12月", 2, 1), ("2026年01月", 2, 1), ("汇总", 2, 0),
+        ]
+        assert dao.title_trend(backend_id, "不存在") == []
+
+    def test_totals_by_month(self, dao, backend_id, months):
+        totals = dao.totals_by_month(backend_id)
+        assert totals[0] == ("2025年12月", 4, {"播放量": 450.0, "收入": 4.0})
+        matched = dao.totals_by_month(backend_id, matched=True)
+        assert matched == [
+            ("2025年12月", 1, {"播放量": 100.0, "收入": 1.5}),
+            ("2026年01月", 2, {"播放量": 350.0, "收入": 2.5}),
+        ]
+        unmatched = dao.totals_by_month(backend_id, matched=False)
+        assert unmatched[1] == ("2026年01月", 2, {"播放量": 100.0, "收入": 1.5})
+
+    def test_months_ordered_by_label_not_creation(self, db, dao, backend_id):
+        for label in ["2026年02月", "2025年11月", "2026年01月"]:
+            dao.rebuild_from_db(_month(db, backend_id, label))
+        expected = ["2025年11月", "2026年01月", "2026年02月"]
+        assert [item[0] for item in dao.totals_by_month(backend_id)] == expected
+        assert [item[0] for item in dao.title_trend(backend_id, "琅琊榜")] == expected
+
+    def test_totals_by_year(self, dao, backend_id, months):
+        assert dao.totals_by_year(backend_id) == [
+            ("2025", 4, {"播放量": 450.0, "收入": 4.0}),
+            ("2026", 4, {"播放量": 450.0, "收入": 4.0}),
+            ("其他", 4, {"播放量": 450.0, "收入": 4.0}),
+        ]
+
+    def test_search_titles(self, dao, backend_id, months):
+        assert dao.search_titles(backend_id, "琊") == ["琅琊榜"]
+        assert len(dao.search_titles(backend_id, "")) == 3
+        assert dao.search_titles(backend_id, "", limit=1) == ["庆余年"]
+
+    def test_months_without_summary(self, db, dao, backend_id, months):
+        month_id = _month(db, backend_id, "2026年02月")
+        MonthDAO(db).create(backend_id, "2026年03月")
+        assert dao.months_without_summary(backend_id) == [(month_id, "2026年02月")]
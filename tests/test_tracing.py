@@ -0,0 +1,106 @@
+"""tracing 单元测试：开关、span 记录、汇总和 Chrome Trace 导出。"""
+
+import json
+
+import pytest
+
+from src import tracing
+from src.match_engine import MatchEngine
+
+
+@pytest.fixture(autouse=True)
+def clean_tracing():
+    tracing.disable()
+    tracing.reset()
+    yield
+    tracing.disable()
+    tracing.reset()
+
+
+class TestSpan:
+    def test_disabled_records_nothing(self):
+        with tracing.span("a") as sp:
+            sp.set_rows(10)
+        assert tracing.span("a") is tracing.span("b")
+        assert tracing.spans() == []
+
+    def test_records_name_rows_and_duration(self):
+        tracing.enable()
+        with tracing.span("a") as sp:
+            sp.set_rows(10)
+        with tracing.span("b", 5):
+            pass
+        records = tracing.spans()
+        assert [(r.name, r.rows) for r in records] == [("a", 10), ("b", 5)]
+        assert all(r.seconds >= 0 for r in records)
+
+    def test_recorded_on_exception(self):
+        tracing.enable()
+        with pytest.raises(RuntimeError):
+            with tracing.span("boom"):
+                raise RuntimeError
+        assert [r.name for r in tracing.spans()] == ["boom"]
+
+    def test_traced_decorator(self):
+        @tracing.traced("f")
+        def f(x):
+            return x * 2
+
+        assert f(2) == 4
+        assert tracing.spans() == []
+        tracing.enable()
+        assert f(3) == 6
+        assert [r.name for r in tracing.spans()] == ["f"]
+
+
+class TestTimedIter:
+    def test_disabled_returns_same_iterable(self):
+        items = [1, 2]
+        assert tracing.timed_iter("x", items) is items
+
+    def test_counts_items(self):
+        tracing.enable()
+        assert list(tracing.timed_iter("x", iter(range(5)))) == [0, 1, 2, 3, 4]
+        assert [(r.name, r.rows) for r in tracing.spans()] == [("x", 5)]
+
+    def test_early_close_closes_source(self):
+        closed = []
+
+        def source():
+            try:
+                yield from range(10)
+            finally:
+                closed.append(True)
+
+        tracing.enable()
+        it = tracing.timed_iter("x", source())
+        next(it)
+        it.close()
+        assert closed == [True]
+        assert tracing.spans()[0].rows == 1
+
+
+class TestReport:
+    def test_summary_groups_and_sorts(self):
+        tracing.enable()
+        MatchEngine.match([["a"], ["b"]], 0, {"a"})
+        MatchEngine.match([["a"]], 0, {"a"})
+        with tracing.span("other"):
+            pass
+        summary = {name: (count, rows) for name, count, _, _, rows in tracing.summary()}
+        assert summary["MatchEngine.match"] == (2, 3)
+        assert summary["other"] == (1, None)
+        assert "MatchEngine.match" in tracing.format_summary()
+
+    def test_dump_chrome_trace(self, tmp_path):
+        tracing.enable()
+        with tracing.span("a", 3):
+            pass
+        path = str(tmp_path / "trace.json")
+        tracing.dump_chrome_trace(path)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        (event,) = data["traceEvents"]
+        assert event["name"] == "a"
+        assert event["ph"] == "X"
+        assert event["args"] == {"rows": 3}
@@ -1,7 +1,11 @@
 """view_helpers 单元测试。"""
 
 import pytest
-from src.view_helpers import filter_rows, compute_column_sums
+from src.month_table import MonthTable
+from src.schema import NUMBER, TEXT
+from src.view_helpers import (
+    compute_column_sums, filter_rows, format_bytes, format_perf, sum_candidate_columns,
+)
 
 
 class TestFilterRows:
@@ -99,3 +103,38 @@ class TestComputeColumnSums:
     def test_zero_columns(self):
         result = compute_column_sums([[1, 2]], 0)
         assert result == []
+
+
+class TestSumCandidateColumns:
+    """Tests for sum_candidate_columns."""
+
+    def test_inferred_and_any_numeric_columns(self):
+        rows = [["琅琊榜", "-", None, "备注"]] * 1200 + [["庆余年", 5, None, "备注"]]
+        table = MonthTable.from_rows(rows, 4)
+        # 第 2 列的数值只出现在抽样范围之后，推断为文本，但仍可求和
+        assert sum_candidate_columns(table, 4, [TEXT, TEXT, NUMBER, TEXT]) == [1, 2]
+
+    def test_old_months_without_types(self):
+        table = MonthTable.from_rows([["a", 1, "x"], ["b", None, 2.5]], 3)
+        assert sum_candidate_columns(table, 3, []) == [1, 2]
+
+    def test_limited_to_header_columns(self):
+        table = MonthTable.from_rows([["a", 1, 2]], 3)
+        assert sum_candidate_columns(table, 2, []) == [1]
+
+
+class TestFormatPerf:
+    """测试 format_bytes 和 format_perf 函数。"""
+
+    def test_format_bytes(self):
+        assert format_bytes(512) == "512 B"
+        assert format_bytes(2048) == "2.0 KB"
+        assert format_bytes(5 * 1024 * 1024) == "5.0 MB"
+        assert format_bytes(3 * 1024 ** 3) == "3.00 GB"
+
+    def test_format_perf(self):
+        text = format_perf({"加载": 12.4, "渲染": 300.0}, 2048)
+        assert text == "加载 12ms  |  渲染 300ms  |  内存 ≈ 2.0 KB"
+
+    def test_format_perf_without_memory(self):
+        assert format_perf({"匹配": 1.0}) == "匹配 1ms"
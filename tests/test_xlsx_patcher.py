@@ -0,0 +1,172 @@
+"""xlsx_patcher 单元测试：直接改写 XML 的原地高亮。"""
+
+import io
+import zipfile
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, Border, Side
+
+import src.xlsx_patcher as xlsx_patcher
+from src.xlsx_patcher import highlight_rows_in_place, iter_row_segments
+
+
+@pytest.fixture
+def master_path(tmp_path):
+    """带格式的主表：A3 加粗、B2 有边框。"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "数据"
+    ws.append(["剧名", "类型", "年份"])
+    ws.append(["琅琊榜", "古装", 2015])
+    ws.append(["甄嬛传", "古装", 2011])
+    ws.append(["人民的名义", "现代", 2017])
+    ws["A3"].font = Font(bold=True, name="Arial")
+    ws["B2"].border = Border(left=Side(style="thin"))
+    ws.column_dimensions["A"].width = 30
+    path = str(tmp_path / "master.xlsx")
+    wb.save(path)
+    return path
+
+
+class TestHighlightRowsInPlace:
+    def test_matched_rows_get_fill(self, master_path):
+        count = highlight_rows_in_place(master_path, [2, 4])
+        assert count == 2
+
+        wb = load_workbook(master_path)
+        ws = wb.active
+        for row in (2, 4):
+            for col in (1, 2, 3):
+                assert ws.cell(row=row, column=col).fill.fgColor.rgb == "00FFFF00"
+        for col in (1, 2, 3):
+            assert ws.cell(row=3, column=col).fill.fill_type is None
+        wb.close()
+
+    def test_existing_formatting_preserved(self, master_path):
+        highlight_rows_in_place(master_path, [2, 3])
+
+        wb = load_workbook(master_path)
+        ws = wb.active
+        assert ws["A3"].font.bold is True
+        assert ws["A3"].font.name == "Arial"
+        assert ws["A3"].fill.fgColor.rgb == "00FFFF00"
+        assert ws["B2"].border.left.style == "thin"
+        assert ws["B2"].fill.fgColor.rgb == "00FFFF00"
+        assert ws.column_dimensions["A"].width == 30
+        assert ws.title == "数据"
+        assert [c.value for c in ws[4]] == ["人民的名义", "现代", 2017]
+        wb.close()
+
+    def test_other_members_copied_verbatim(self, master_path):
+        with zipfile.ZipFile(master_path) as z:
+            before = {name: z.read(name) for name in z.namelist()}
+
+        highlight_rows_in_place(master_path, [2])
+
+        with zipfile.ZipFile(master_path) as z:
+            after = {name: z.read(name) for name in z.namelist()}
+            assert z.namelist() == list(before)
+        changed = {name for name in before if before[name] != after[name]}
+        assert changed == {"xl/worksheets/sheet1.xml", "xl/styles.xml"}
+
+    def test_output_path_leaves_source_untouched(self, master_path, tmp_path):
+        out = str(tmp_path / "out.xlsx")
+        with open(master_path, "rb") as f:
+            original = f.read()
+
+        highlight_rows_in_place(master_path, [2], output_path=out)
+
+        with open(master_path, "rb") as f:
+            assert f.read() == original
+        wb = load_workbook(out)
+        assert wb.active["A2"].fill.fgColor.rgb == "00FFFF00"
+        wb.close()
+
+    def test_sparse_row_blank_cells_filled(self, tmp_path):
+        """匹配行中没有 <c> 的空白单元格也要高亮，与 openpyxl 逐单元格填充一致。"""
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["剧名", "类型", "年份", "备注"])
+        ws["A2"] = "琅琊榜"
+        ws["C2"] = 2015
+        ws["B3"] = "古装"
+        path = str(tmp_path / "sparse.xlsx")
+        wb.save(path)
+
+        assert highlight_rows_in_place(path, [2]) == 1
+
+        wb = load_workbook(path)
+        ws = wb.active
+        for col in (1, 2, 3, 4):
+            assert ws.cell(row=2, column=col).fill.fgColor.rgb == "00FFFF00"
+        assert [c.value for c in ws[2]] == ["琅琊榜", None, 2015, None]
+        assert ws.cell(row=3, column=1).fill.fill_type is None
+        wb.close()
+
+    def test_empty_matched_rows_is_noop(self, master_path):
+        assert highlight_rows_in_place(master_path, []) == 0
+
+    def test_missing_rows_not_counted(self, master_path):
+        assert highlight_rows_in_place(master_path, [3, 100]) == 1
+
+    def test_named_sheet(self, tmp_path):
+        wb = Workbook()
+        wb.active.append(["第一页"])
+        ws2 = wb.create_sheet("第二页")
+        ws2.append(["剧名"])
+        ws2.append(["琅琊榜"])
+        path = str(tmp_path / "two.xlsx")
+        wb.save(path)
+
+        highlight_rows_in_place(path, [2], sheet_name="第二页")
+
+        wb = load_workbook(path)
+        assert wb["第二页"]["A2"].fill.fgColor.rgb == "00FFFF00"
+        wb.close()
+
+    def test_unknown_sheet_raises(self, master_path):
+        with pytest.raises(ValueError, match="不存在"):
+            highlight_rows_in_place(master_path, [2], sheet_name="不存在")
+
+    def test_file_not_found(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            highlight_rows_in_place(str(tmp_path / "missing.xlsx"), [2])
+
+    def test_xls_rejected(self, tmp_path):
+        path = tmp_path / "old.xls"
+        path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            highlight_rows_in_place(str(path), [2])
+
+
+class TestFillBlankCells:
+    def test_gaps_filled_in_column_order(self):
+        segment = b'<row r="5" spans="2:3"><c r="B5"><v>1</v></c></row></sheetData>'
+        result = xlsx_patcher._fill_blank_cells(segment, 5, 3, 7)
+        assert result == (
+            b'<row r="5"><c r="A5" s="7"/><c r="B5"><v>1</v></c>'
+            b'<c r="C5" s="7"/></row></sheetData>'
+        )
+
+    def test_empty_row_element_expanded(self):
+        result = xlsx_patcher._fill_blank_cells(b'<x:row r="2"/>', 2, 2, 3)
+        assert result == b'<x:row r="2"><x:c r="A2" s="3"/><x:c r="B2" s="3"/></x:row>'
+
+    def test_sheet_width_from_dimension(self):
+        assert xlsx_patcher.sheet_width(b'<worksheet><dimension ref="A1:D9"/>') == 4
+        assert xlsx_patcher.sheet_width(b'<worksheet><dimension ref="B2"/>') == 2
+        assert xlsx_patcher.sheet_width(b"<worksheet>") == 0
+
+
+class TestIterRowSegments:
+    def test_segments_reassemble_with_small_chunks(self, master_path, monkeypatch):
+        monkeypatch.setattr(xlsx_patcher, "CHUNK_SIZE", 7)
+        with zipfile.ZipFile(master_path) as z:
+            data = z.read("xl/worksheets/sheet1.xml")
+
+        segments = list(iter_row_segments(io.BytesIO(data)))
+
+        assert b"".join(segments) == data
+        row_segments = [s for s in segments if s.startswith(b"<row")]
+        assert len(row_segments) == 4